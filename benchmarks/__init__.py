@@ -0,0 +1,8 @@
+"""Contains the performance benchmarks for flake8-carrot, runnable as individual modules."""
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+__all__: Sequence[str] = ()
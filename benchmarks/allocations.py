@@ -0,0 +1,127 @@
+"""Benchmark each garbage-collection mode & report the rules that allocate the most memory."""
+
+import argparse
+import ast
+import gc
+import sys
+import time
+import tokenize
+from io import StringIO
+from pathlib import Path
+from typing import TYPE_CHECKING, override
+
+import flake8_carrot
+from flake8_carrot import CarrotPlugin
+from flake8_carrot.profiling import (
+    GCMode,
+    audit_rule_allocations,
+    format_allocation_report,
+    gc_execution_mode,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Mapping, Sequence
+    from tokenize import TokenInfo
+
+__all__: Sequence[str] = ("main",)
+
+
+class _GCTimer:
+    @override
+    def __init__(self) -> None:
+        self.collections_count: int = 0
+        self.duration: float = 0.0
+        self._start: float | None = None
+
+    def __call__(self, phase: str, _info: Mapping[str, int]) -> None:
+        if phase == "start":
+            self._start = time.perf_counter()
+            return
+
+        if self._start is not None:
+            self.collections_count += 1
+            self.duration += time.perf_counter() - self._start
+            self._start = None
+
+
+def _time_gc_mode(
+    gc_mode: GCMode,
+    parsed_sources: Collection[tuple[ast.Module, Sequence[TokenInfo], Sequence[str]]],
+) -> tuple[float, _GCTimer]:
+    gc_timer: _GCTimer = _GCTimer()
+    gc.collect()
+    gc.callbacks.append(gc_timer)
+
+    start: float = time.perf_counter()
+    try:
+        tree: ast.Module
+        file_tokens: Sequence[TokenInfo]
+        lines: Sequence[str]
+        for tree, file_tokens, lines in parsed_sources:
+            with gc_execution_mode(gc_mode):
+                list(CarrotPlugin(tree=tree, file_tokens=file_tokens, lines=lines).run())
+
+    finally:
+        gc.callbacks.remove(gc_timer)
+
+    return time.perf_counter() - start, gc_timer
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the garbage-collection benchmark & print the per-rule allocation report."""
+    arg_parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument(
+        "paths",
+        nargs="*",
+        type=Path,
+        default=[Path(flake8_carrot.__file__).parent],
+        help="Python files, or directories of them, to lint during the benchmark.",
+    )
+    arg_parser.add_argument("--top", type=int, default=10)
+    parsed_args: argparse.Namespace = arg_parser.parse_args(argv)
+
+    parsed_sources: list[tuple[ast.Module, Sequence[TokenInfo], Sequence[str]]] = []
+
+    source_path: Path
+    for source_path in sorted(
+        source_path
+        for path in parsed_args.paths
+        for source_path in (path.rglob("*.py") if path.is_dir() else (path,))
+    ):
+        source: str = source_path.read_text(encoding="utf-8")
+        parsed_sources.append(
+            (
+                ast.parse(source),
+                list(tokenize.generate_tokens(StringIO(source).readline)),
+                source.splitlines(keepends=True),
+            ),
+        )
+
+    _time_gc_mode(
+        GCMode.DEFAULT, parsed_sources
+    )  # NOTE: Warm-up run, so the modes compare fairly
+
+    sys.stdout.write(f"`CarrotPlugin` run over {len(parsed_sources)} files:\n")
+
+    gc_mode: GCMode
+    for gc_mode in GCMode:
+        duration, gc_timer = _time_gc_mode(gc_mode, parsed_sources)
+        sys.stdout.write(
+            f"    {f'{gc_mode.value} GC mode':<18} {duration * 1000:10.2f} ms "
+            f"({gc_timer.collections_count} collections, "
+            f"{gc_timer.duration * 1000:.2f} ms collecting)\n"
+        )
+
+    sys.stdout.write(f"\nTop {parsed_args.top} allocating rules (per file):\n")
+    sys.stdout.write(
+        format_allocation_report(
+            audit_rule_allocations(CarrotPlugin, parsed_sources), limit=parsed_args.top
+        )
+    )
+    sys.stdout.write("\n")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,141 @@
+"""Benchmark the startup time, memory & throughput of each batch linting backend."""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, override
+
+import flake8_carrot
+from flake8_carrot.batch import BatchBackend, lint_paths
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from typing import Final
+
+__all__: Sequence[str] = ("main",)
+
+
+SAMPLE_INTERVAL: Final[float] = 0.02
+STARTUP_SOURCE: Final[str] = '"""Startup."""\n'
+
+
+def _read_private_memory_kib(pid: int) -> int:
+    try:
+        return sum(
+            int(line.split()[1])
+            for line in Path(f"/proc/{pid}/smaps_rollup")
+            .read_text(encoding="utf-8")
+            .splitlines()
+            if line.startswith(("Private_Clean:", "Private_Dirty:"))
+        )
+    except OSError:
+        return 0
+
+
+class _PeakMemorySampler:
+    """Record the peak private memory of this process & all its child processes."""
+
+    @override
+    def __init__(self) -> None:
+        self.peak_private_memory_kib: int = 0
+        self._stopped: threading.Event = threading.Event()
+        self._thread: threading.Thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> int:
+        """Stop sampling & return the peak private memory, in KiB."""
+        self._stopped.set()
+        self._thread.join()
+        return self.peak_private_memory_kib
+
+    def _sample(self) -> None:
+        while not self._stopped.wait(SAMPLE_INTERVAL):
+            self.peak_private_memory_kib = max(
+                self.peak_private_memory_kib,
+                _read_private_memory_kib(os.getpid())
+                + sum(
+                    _read_private_memory_kib(child.pid)
+                    for child in multiprocessing.active_children()
+                    if child.pid is not None
+                ),
+            )
+
+
+def _measure_backend(
+    backend: BatchBackend, source_paths: Sequence[str], startup_path: str, jobs: int
+) -> tuple[float, float, int]:
+    start: float = time.perf_counter()
+    for _ in lint_paths(
+        [startup_path] * jobs, max_workers=jobs, chunk_size=1, backend=backend
+    ):
+        pass
+    startup_duration: float = time.perf_counter() - start
+
+    peak_memory_sampler: _PeakMemorySampler = _PeakMemorySampler()
+    start = time.perf_counter()
+    for _ in lint_paths(source_paths, max_workers=jobs, backend=backend):
+        pass
+    lint_duration: float = time.perf_counter() - start
+
+    return startup_duration, lint_duration, peak_memory_sampler.stop()
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the batch backend benchmark & print the measurements of each backend."""
+    arg_parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument(
+        "paths",
+        nargs="*",
+        type=Path,
+        default=[Path(flake8_carrot.__file__).parent],
+        help="Python files, or directories of them, to lint during the benchmark.",
+    )
+    arg_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.process_cpu_count() or 1,
+        help="Number of workers in each pool. (Default: %(default)s)",
+    )
+    arg_parser.add_argument(
+        "--backends",
+        nargs="+",
+        choices=[backend.value for backend in BatchBackend],
+        default=[backend.value for backend in BatchBackend],
+        help="Backends to benchmark.",
+    )
+    parsed_args: argparse.Namespace = arg_parser.parse_args(argv)
+
+    source_paths: Sequence[str] = sorted(
+        str(source_path)
+        for path in parsed_args.paths
+        for source_path in (path.rglob("*.py") if path.is_dir() else (path,))
+    )
+
+    sys.stdout.write(f"Linting {len(source_paths)} files with {parsed_args.jobs} workers:\n")
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        startup_path: Path = Path(temporary_directory) / "startup.py"
+        startup_path.write_text(STARTUP_SOURCE, encoding="utf-8")
+
+        backend_value: str
+        for backend_value in parsed_args.backends:
+            startup_duration, lint_duration, peak_private_memory_kib = _measure_backend(
+                BatchBackend(backend_value), source_paths, str(startup_path), parsed_args.jobs
+            )
+            sys.stdout.write(
+                f"    {backend_value:<12} "
+                f"startup {startup_duration * 1000:9.2f} ms, "
+                f"{len(source_paths) / lint_duration:9.1f} files/s, "
+                f"peak private memory {peak_private_memory_kib / 1024:8.2f} MiB\n"
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
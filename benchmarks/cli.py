@@ -0,0 +1,83 @@
+"""Benchmark the standalone command-line linter, against running Flake8 with the same rules."""
+
+import argparse
+import subprocess
+import sys
+import time
+from typing import TYPE_CHECKING
+
+import flake8_carrot
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+__all__: Sequence[str] = ("main",)
+
+
+_SELECTED_CODES: str = "CAR,TXB"
+
+
+def _time_command(command: Sequence[str], rounds: int) -> tuple[float, bytes]:
+    output: bytes = b""
+    durations: list[float] = []
+
+    for _ in range(rounds):
+        start: float = time.perf_counter()
+        output = subprocess.run(command, capture_output=True, check=False).stdout
+        durations.append(time.perf_counter() - start)
+
+    return min(durations), output
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the command-line benchmark & print the time taken by each linter."""
+    arg_parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument(
+        "paths",
+        nargs="*",
+        default=[flake8_carrot.__path__[0]],
+        help="Python files, or directories of them, to lint during the benchmark.",
+    )
+    arg_parser.add_argument(
+        "--rounds", type=int, default=3, help="Times to run each linter, keeping the fastest."
+    )
+    parsed_args: argparse.Namespace = arg_parser.parse_args(argv)
+
+    flake8_duration, flake8_output = _time_command(
+        (sys.executable, "-m", "flake8", "--select", _SELECTED_CODES, *parsed_args.paths),
+        parsed_args.rounds,
+    )
+    cli_duration, cli_output = _time_command(
+        (
+            sys.executable,
+            "-m",
+            "flake8_carrot.cli",
+            "--select",
+            _SELECTED_CODES,
+            *parsed_args.paths,
+        ),
+        parsed_args.rounds,
+    )
+
+    sys.stdout.write(f"Linting {', '.join(parsed_args.paths)} with {_SELECTED_CODES}:\n")
+
+    label: str
+    duration: float
+    output: bytes
+    for label, duration, output in (
+        ("flake8", flake8_duration, flake8_output),
+        ("flake8-carrot", cli_duration, cli_output),
+    ):
+        sys.stdout.write(
+            f"    {label:<15} {duration * 1000:10.2f} ms ({output.count(b'\n')} problems)\n"
+        )
+
+    if flake8_output != cli_output:
+        sys.stdout.write("    The outputs of the two linters differ.\n")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
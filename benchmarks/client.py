@@ -0,0 +1,184 @@
+"""Benchmark the startup of the thin daemon client, using `-X importtime`, against the CLI."""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import TYPE_CHECKING
+
+import flake8_carrot
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+__all__: Sequence[str] = ("main",)
+
+
+_IMPORT_TIME_PREFIX: str = "import time:"
+_FORBIDDEN_MODULES: Sequence[str] = (
+    "flake8",
+    "flake8_carrot.carrot",
+    "flake8_carrot.session",
+    "flake8_carrot.tex_bot",
+    "flake8_carrot.utils",
+)
+_DAEMON_START_TIMEOUT: float = 30
+
+
+def _measure_import_time(module_name: str) -> float:
+    import_times: str = subprocess.run(
+        (sys.executable, "-X", "importtime", "-c", f"import {module_name}"),
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stderr
+
+    line: str
+    for line in import_times.splitlines():
+        if not line.startswith(_IMPORT_TIME_PREFIX):
+            continue
+
+        cumulative_time: str
+        imported_module_name: str
+        _, cumulative_time, imported_module_name = line.removeprefix(
+            _IMPORT_TIME_PREFIX
+        ).split("|")
+        if imported_module_name.strip() == module_name:
+            return int(cumulative_time) / 1_000_000
+
+    # NOTE: Already imported during the interpreter's startup
+    return 0
+
+
+def _find_imported_modules(module_name: str) -> Sequence[str]:
+    imported_modules: Sequence[str] = json.loads(
+        subprocess.run(
+            (
+                sys.executable,
+                "-c",
+                (
+                    f"import json, sys; import {module_name}; "
+                    "print(json.dumps(list(sys.modules)))"
+                ),
+            ),
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout,
+    )
+    return [
+        module
+        for module in imported_modules
+        if module in _FORBIDDEN_MODULES or module.startswith("flake8.")
+    ]
+
+
+def _time_command(command: Sequence[str], rounds: int) -> float:
+    durations: list[float] = []
+
+    for _ in range(rounds):
+        start: float = time.perf_counter()
+        subprocess.run(command, capture_output=True, check=False)
+        durations.append(time.perf_counter() - start)
+
+    return statistics.median(durations)
+
+
+def _time_daemon_client(path: str, rounds: int) -> float:
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        socket_path: str = os.path.join(temporary_directory, "daemon.sock")  # noqa: PTH118
+        daemon_process: subprocess.Popen[bytes] = subprocess.Popen(
+            (sys.executable, "-m", "flake8_carrot.cli", "--daemon", "--socket", socket_path)
+        )
+        try:
+            deadline: float = time.monotonic() + _DAEMON_START_TIMEOUT
+            while not os.path.exists(socket_path):  # noqa: PTH110
+                if time.monotonic() > deadline:
+                    DAEMON_TIMEOUT_MESSAGE: str = "The lint daemon did not start in time."
+                    raise TimeoutError(DAEMON_TIMEOUT_MESSAGE)
+
+                time.sleep(0.01)
+
+            return _time_command(
+                (sys.executable, "-m", "flake8_carrot.client", "--socket", socket_path, path),
+                rounds,
+            )
+
+        finally:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+                connection.connect(socket_path)
+                connection.sendall(b'{"command": "shutdown"}\n')
+                connection.recv(1024)
+
+            daemon_process.wait()
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the client benchmark, failing if the client imports too slowly or too much."""
+    arg_parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument(
+        "path",
+        nargs="?",
+        default=os.path.join(flake8_carrot.__path__[0], "session.py"),  # noqa: PTH118
+        help="Python file to lint through the daemon & the command-line linter.",
+    )
+    arg_parser.add_argument(
+        "--rounds",
+        type=int,
+        default=5,
+        help="Times to run each measurement, keeping the median.",
+    )
+    arg_parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=30,
+        help="Most milliseconds the client may take to import. (Default: %(default)s)",
+    )
+    parsed_args: argparse.Namespace = arg_parser.parse_args(argv)
+
+    sys.stdout.write("Import time (-X importtime, median):\n")
+
+    import_times: dict[str, float] = {}
+
+    module_name: str
+    for module_name in ("flake8_carrot.client", "flake8_carrot.cli"):
+        import_times[module_name] = statistics.median(
+            _measure_import_time(module_name) for _ in range(parsed_args.rounds)
+        )
+        sys.stdout.write(f"    {module_name:<22} {import_times[module_name] * 1000:9.2f} ms\n")
+
+    startup_duration: float = _time_command((sys.executable, "-c", "pass"), parsed_args.rounds)
+    client_duration: float = _time_daemon_client(parsed_args.path, parsed_args.rounds)
+    cli_duration: float = _time_command(
+        (sys.executable, "-m", "flake8_carrot.cli", "--no-cache", parsed_args.path),
+        parsed_args.rounds,
+    )
+
+    sys.stdout.write(f"Linting {parsed_args.path} (wall time, median):\n")
+    sys.stdout.write(f"    {'interpreter startup':<22} {startup_duration * 1000:9.2f} ms\n")
+    sys.stdout.write(f"    {'daemon client':<22} {client_duration * 1000:9.2f} ms\n")
+    sys.stdout.write(f"    {'command-line linter':<22} {cli_duration * 1000:9.2f} ms\n")
+
+    exit_code: int = 0
+
+    forbidden_modules: Sequence[str] = _find_imported_modules("flake8_carrot.client")
+    if forbidden_modules:
+        sys.stdout.write(f"The client imports {', '.join(sorted(forbidden_modules))}.\n")
+        exit_code = 1
+
+    if import_times["flake8_carrot.client"] * 1000 > parsed_args.budget_ms:
+        sys.stdout.write(
+            f"The client takes longer than {parsed_args.budget_ms} ms to import.\n"
+        )
+        exit_code = 1
+
+    return exit_code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
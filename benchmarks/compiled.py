@@ -0,0 +1,168 @@
+"""Benchmark the compiled rule modules against their pure-Python fallback source."""
+
+import argparse
+import ast
+import importlib.machinery
+import importlib.util
+import sys
+import time
+import tokenize
+from io import StringIO
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import flake8_carrot
+from flake8_carrot import CarrotPlugin
+from flake8_carrot.traversal import TraversalEngine
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Sequence
+    from tokenize import TokenInfo
+    from types import ModuleType
+
+    from flake8_carrot.utils import BaseRule
+
+__all__: Sequence[str] = ("main",)
+
+
+def _module_is_compiled(module: ModuleType) -> bool:
+    return str(module.__file__).endswith(tuple(importlib.machinery.EXTENSION_SUFFIXES))
+
+
+def _load_pure_python_rule(
+    RuleClass: type[BaseRule[CarrotPlugin]],  # noqa: N803
+) -> type[BaseRule[CarrotPlugin]] | None:
+    source_path: Path = Path(str(sys.modules[RuleClass.__module__].__file__)).parent.joinpath(
+        f"{RuleClass.__module__.rpartition('.')[2]}.py",
+    )
+    spec: importlib.machinery.ModuleSpec | None = importlib.util.spec_from_file_location(
+        f"_pure_{RuleClass.__module__}", source_path
+    )
+    if not source_path.is_file() or spec is None or spec.loader is None:
+        return None
+
+    pure_python_module: ModuleType = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(pure_python_module)
+
+    pure_python_rule: type[BaseRule[CarrotPlugin]] = getattr(
+        pure_python_module, RuleClass.__name__
+    )
+    return pure_python_rule
+
+
+def _run_rules(
+    rules: Collection[type[BaseRule[CarrotPlugin]]],
+    parsed_sources: Collection[tuple[ast.Module, Sequence[TokenInfo], Sequence[str]]],
+) -> int:
+    problems_count: int = 0
+
+    tree: ast.Module
+    file_tokens: Sequence[TokenInfo]
+    lines: Sequence[str]
+    for tree, file_tokens, lines in parsed_sources:
+        plugin: CarrotPlugin = CarrotPlugin(tree=tree, file_tokens=file_tokens, lines=lines)
+        traversal_engine: TraversalEngine = TraversalEngine()
+
+        rule_instances: Sequence[BaseRule[CarrotPlugin]] = [
+            RuleClass(plugin=plugin) for RuleClass in rules
+        ]
+
+        rule: BaseRule[CarrotPlugin]
+        for rule in rule_instances:
+            rule.run_check(tree=tree, file_tokens=file_tokens, lines=lines)
+            rule.register_traversal_hooks(traversal_engine)
+
+        traversal_engine.traverse(tree)
+
+        problems_count += sum(len(rule.problems) for rule in rule_instances)
+
+    return problems_count
+
+
+def _time_rules(
+    rules: Collection[type[BaseRule[CarrotPlugin]]],
+    parsed_sources: Collection[tuple[ast.Module, Sequence[TokenInfo], Sequence[str]]],
+    repeats: int,
+) -> float:
+    fastest: float | None = None
+
+    for _ in range(repeats):
+        start: float = time.perf_counter()
+        _run_rules(rules, parsed_sources)
+        duration: float = time.perf_counter() - start
+
+        fastest = duration if fastest is None else min(fastest, duration)
+
+    return fastest or 0.0
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the compiled-rules benchmark & print the timings of both variants."""
+    arg_parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument(
+        "paths",
+        nargs="*",
+        type=Path,
+        default=[Path(flake8_carrot.__file__).parent],
+        help="Python files, or directories of them, to lint during the benchmark.",
+    )
+    arg_parser.add_argument("--repeats", type=int, default=5)
+    parsed_args: argparse.Namespace = arg_parser.parse_args(argv)
+
+    compiled_rules: Sequence[type[BaseRule[CarrotPlugin]]] = [
+        RuleClass
+        for RuleClass in CarrotPlugin.RULES
+        if _module_is_compiled(sys.modules[RuleClass.__module__])
+    ]
+    if not compiled_rules:
+        sys.stderr.write(
+            "No compiled rule modules are installed; "
+            "build the wheel with `HATCH_BUILD_HOOK_ENABLE_MYPYC=true`.\n"
+        )
+        return 1
+
+    pure_python_rules: Sequence[type[BaseRule[CarrotPlugin]]] = [
+        pure_python_rule
+        for RuleClass in compiled_rules
+        if (pure_python_rule := _load_pure_python_rule(RuleClass)) is not None
+    ]
+    if len(pure_python_rules) != len(compiled_rules):
+        sys.stderr.write("The pure-Python source of every compiled rule must be installed.\n")
+        return 1
+
+    source_paths: Collection[Path] = sorted(
+        source_path
+        for path in parsed_args.paths
+        for source_path in (path.rglob("*.py") if path.is_dir() else (path,))
+    )
+    parsed_sources: list[tuple[ast.Module, Sequence[TokenInfo], Sequence[str]]] = []
+    for source_path in source_paths:
+        source: str = source_path.read_text(encoding="utf-8")
+        parsed_sources.append(
+            (
+                ast.parse(source),
+                list(tokenize.generate_tokens(StringIO(source).readline)),
+                source.splitlines(keepends=True),
+            ),
+        )
+
+    sys.stdout.write(
+        f"{len(compiled_rules)} compiled rules over {len(parsed_sources)} files:\n"
+    )
+
+    compiled_duration: float = _time_rules(compiled_rules, parsed_sources, parsed_args.repeats)
+    pure_python_duration: float = _time_rules(
+        pure_python_rules, parsed_sources, parsed_args.repeats
+    )
+
+    sys.stdout.write(
+        f"    {'pure-Python rules':<20} {pure_python_duration * 1000:10.2f} ms\n"
+        f"    {'compiled rules':<20} {compiled_duration * 1000:10.2f} ms\n"
+        f"    {'speed-up':<20} {pure_python_duration / compiled_duration:10.2f} x\n"
+    )
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
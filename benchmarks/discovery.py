@@ -0,0 +1,111 @@
+"""Benchmark discovering source files in parallel, against a naive walk matching each path."""
+
+import argparse
+import fnmatch
+import functools
+import os
+import sys
+import sysconfig
+import time
+from typing import TYPE_CHECKING
+
+from flake8 import defaults as flake8_defaults
+
+from flake8_carrot.discovery import find_source_paths
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator, Sequence
+
+__all__: Sequence[str] = ("main",)
+
+
+def _is_excluded_naively(path: str, exclude_patterns: Sequence[str]) -> bool:
+    return any(
+        fnmatch.fnmatch(os.path.basename(path), pattern)  # noqa: PTH119
+        or fnmatch.fnmatch(os.path.abspath(path), pattern)  # noqa: PTH100
+        for pattern in exclude_patterns
+    )
+
+
+def _find_source_paths_naively(
+    paths: Sequence[str], exclude_patterns: Sequence[str]
+) -> Iterator[str]:
+    path: str
+    for path in paths:
+        root: str
+        directory_names: list[str]
+        file_names: list[str]
+        for root, directory_names, file_names in os.walk(path):
+            directory_names[:] = [
+                directory_name
+                for directory_name in directory_names
+                if not _is_excluded_naively(
+                    os.path.join(root, directory_name),  # noqa: PTH118
+                    exclude_patterns,
+                )
+            ]
+            yield from (
+                os.path.join(root, file_name)  # noqa: PTH118
+                for file_name in file_names
+                if fnmatch.fnmatch(file_name, "*.py")
+                and not _is_excluded_naively(
+                    os.path.join(root, file_name),  # noqa: PTH118
+                    exclude_patterns,
+                )
+            )
+
+
+def _time_discovery(find_paths: Callable[[], Iterator[str]]) -> tuple[float, int]:
+    start: float = time.perf_counter()
+    paths_count: int = sum(1 for _ in find_paths())
+    return time.perf_counter() - start, paths_count
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the discovery benchmark & print the time taken by each walker."""
+    arg_parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument(
+        "paths",
+        nargs="*",
+        default=[sysconfig.get_paths()["stdlib"]],
+        help="Directories to discover the Python files within.",
+    )
+    arg_parser.add_argument(
+        "--workers",
+        nargs="+",
+        type=int,
+        default=[1, 8],
+        help="Numbers of listing threads to benchmark.",
+    )
+    parsed_args: argparse.Namespace = arg_parser.parse_args(argv)
+
+    exclude_patterns: Sequence[str] = [*flake8_defaults.EXCLUDE, "test*", "*_test.py"]
+
+    naive_duration, naive_paths_count = _time_discovery(
+        lambda: _find_source_paths_naively(parsed_args.paths, exclude_patterns)
+    )
+    sys.stdout.write(
+        f"    naive walk          {naive_duration * 1000:9.1f} ms, {naive_paths_count} files\n"
+    )
+
+    workers: int
+    for workers in parsed_args.workers:
+        duration, paths_count = _time_discovery(
+            functools.partial(
+                find_source_paths,
+                parsed_args.paths,
+                exclude_patterns,
+                respect_gitignore=False,
+                max_workers=workers,
+            ),
+        )
+        sys.stdout.write(
+            f"    {workers:2d} listing threads  {duration * 1000:9.1f} ms, "
+            f"{paths_count} files\n"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,209 @@
+"""Benchmark the memory of each worker of a real `flake8 --jobs` run, with GC freezing."""
+
+import argparse
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import flake8_carrot
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+    from typing import Final
+
+__all__: Sequence[str] = ("main",)
+
+
+PROC_PATH: Final[Path] = Path("/proc")
+SAMPLE_INTERVAL_SECONDS: Final[float] = 0.02
+
+# NOTE: Sets the start method before Flake8 creates its pool, when one is given
+_FLAKE8_LAUNCHER: Final[str] = (
+    "import multiprocessing, sys\n"
+    "if sys.argv[1]:\n"
+    "    multiprocessing.set_start_method(sys.argv[1])\n"
+    "from flake8.main.cli import main\n"
+    "raise SystemExit(main(sys.argv[2:]))\n"
+)
+
+
+def _find_child_ids() -> Mapping[int, Sequence[int]]:
+    child_ids: dict[int, list[int]] = {}
+
+    stat_path: Path
+    for stat_path in PROC_PATH.glob("[0-9]*/stat"):
+        try:
+            stat: str = stat_path.read_text(encoding="utf-8")
+        except OSError:
+            continue
+
+        # NOTE: The parent ID follows the state, after the parenthesised command name
+        parent_id: int = int(stat.rpartition(")")[2].split()[1])
+        child_ids.setdefault(parent_id, []).append(int(stat_path.parent.name))
+
+    return child_ids
+
+
+def _find_leaf_process_ids(flake8_process_id: int) -> Mapping[int, bool]:
+    """Find every descendant without children, mapped to whether it is a helper process."""
+    child_ids: Mapping[int, Sequence[int]] = _find_child_ids()
+    pending_ids: list[tuple[int, int]] = [
+        (flake8_process_id, child_id) for child_id in child_ids.get(flake8_process_id, ())
+    ]
+    leaf_process_ids: dict[int, bool] = {}
+
+    while pending_ids:
+        parent_id: int
+        process_id: int
+        parent_id, process_id = pending_ids.pop()
+        if process_id in child_ids:
+            pending_ids.extend((process_id, child_id) for child_id in child_ids[process_id])
+            continue
+
+        try:
+            command_line: bytes = (PROC_PATH / str(process_id) / "cmdline").read_bytes()
+        except OSError:
+            continue
+
+        # NOTE: Workers forked from a forkserver share its command line, but not its parent
+        leaf_process_ids[process_id] = any(
+            (
+                b"multiprocessing.resource_tracker" in command_line,
+                all(
+                    (
+                        parent_id == flake8_process_id,
+                        b"multiprocessing.forkserver" in command_line,
+                    )
+                ),
+            )
+        )
+
+    return leaf_process_ids
+
+
+def _read_memory_kib(process_id: int) -> tuple[int, int] | None:
+    try:
+        smaps_rollup: str = (PROC_PATH / str(process_id) / "smaps_rollup").read_text(
+            encoding="utf-8"
+        )
+    except OSError:
+        return None
+
+    fields: Mapping[str, int] = {
+        line.split()[0]: int(line.split()[1])
+        for line in smaps_rollup.splitlines()
+        if line.endswith(" kB")
+    }
+    return (
+        fields.get("Rss:", 0),
+        fields.get("Private_Clean:", 0) + fields.get("Private_Dirty:", 0),
+    )
+
+
+def _measure_flake8_workers(
+    flake8_args: Sequence[str], start_method: str | None
+) -> Sequence[tuple[int, int]]:
+    peak_memory_kib: dict[int, tuple[int, int]] = {}
+    helper_process_ids: set[int] = set()
+
+    with subprocess.Popen(
+        (sys.executable, "-c", _FLAKE8_LAUNCHER, start_method or "", *flake8_args),
+        stdout=subprocess.DEVNULL,
+    ) as flake8_process:
+        while flake8_process.poll() is None:
+            process_id: int
+            is_helper: bool
+            for process_id, is_helper in _find_leaf_process_ids(flake8_process.pid).items():
+                if is_helper:
+                    helper_process_ids.add(process_id)
+                    continue
+
+                memory_kib: tuple[int, int] | None = _read_memory_kib(process_id)
+                if memory_kib is None:
+                    continue
+
+                previous_memory_kib: tuple[int, int] = peak_memory_kib.get(process_id, (0, 0))
+                peak_memory_kib[process_id] = (
+                    max(previous_memory_kib[0], memory_kib[0]),
+                    max(previous_memory_kib[1], memory_kib[1]),
+                )
+
+            time.sleep(SAMPLE_INTERVAL_SECONDS)
+
+    # NOTE: A helper may be sampled once before it executes its own command line
+    return sorted(
+        memory_kib
+        for process_id, memory_kib in peak_memory_kib.items()
+        if process_id not in helper_process_ids
+    )
+
+
+def _format_worker_memory(label: str, worker_memory_kib: Sequence[tuple[int, int]]) -> str:
+    if not worker_memory_kib:
+        return f"    {label:<18} no worker processes were found\n"
+
+    resident_kib: Sequence[int] = [memory_kib[0] for memory_kib in worker_memory_kib]
+    private_kib: Sequence[int] = [memory_kib[1] for memory_kib in worker_memory_kib]
+    return (
+        f"    {label:<18} {len(worker_memory_kib):3d} workers, "
+        f"mean RSS {sum(resident_kib) / len(resident_kib) / 1024:7.2f} MiB, "
+        f"mean private {sum(private_kib) / len(private_kib) / 1024:7.2f} MiB, "
+        f"total private {sum(private_kib) / 1024:8.2f} MiB\n"
+    )
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the Flake8 worker memory benchmark & print the peak memory of the workers."""
+    arg_parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description=__doc__,
+        epilog=(
+            "Any other arguments, including the paths to lint, are passed on to Flake8. "
+            "(Default: this package's own source files)"
+        ),
+    )
+    arg_parser.add_argument("--jobs", type=int, default=32)
+    arg_parser.add_argument(
+        "--start-method",
+        choices=("fork", "forkserver", "spawn"),
+        default=None,
+        help="Multiprocessing start method for Flake8's workers. (Default: the platform's)",
+    )
+    parsed_args: argparse.Namespace
+    extra_flake8_args: Sequence[str]
+    parsed_args, extra_flake8_args = arg_parser.parse_known_args(argv)
+
+    if not (PROC_PATH / "self" / "smaps_rollup").is_file():
+        sys.stderr.write("Measuring worker memory requires Linux's `/proc` filesystem.\n")
+        return 1
+
+    flake8_args: Sequence[str] = (
+        f"--jobs={parsed_args.jobs}",
+        *(extra_flake8_args or (str(Path(flake8_carrot.__file__).parent),)),
+    )
+
+    sys.stdout.write(
+        f"Peak memory of each worker of `flake8 --jobs {parsed_args.jobs}` "
+        f"({parsed_args.start_method or 'default start method'}):\n"
+    )
+    sys.stdout.write(
+        _format_worker_memory(
+            "default",
+            _measure_flake8_workers(flake8_args, parsed_args.start_method),
+        )
+    )
+    sys.stdout.write(
+        _format_worker_memory(
+            "--carrot-gc-freeze",
+            _measure_flake8_workers(
+                ("--carrot-gc-freeze", *flake8_args), parsed_args.start_method
+            ),
+        )
+    )
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
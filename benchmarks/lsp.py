@@ -0,0 +1,79 @@
+"""Benchmark relinting an edited document statement by statement, against a full lint."""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from typing import TYPE_CHECKING
+
+import flake8_carrot
+from flake8_carrot.session import LintSession, StatementProblemsCache
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+__all__: Sequence[str] = ("main",)
+
+
+_EDITED_STATEMENT: str = "\n\nEDITED_VALUE: int = {index}\n"
+
+
+def _time_edits(lint: Callable[[str], object], source: str, rounds: int) -> float:
+    durations: list[float] = []
+
+    index: int
+    for index in range(rounds):
+        edited_source: str = source + _EDITED_STATEMENT.format(index=index)
+        start: float = time.perf_counter()
+        lint(edited_source)
+        durations.append(time.perf_counter() - start)
+
+    return statistics.median(durations)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the incremental relinting benchmark, printing the median time of each edit."""
+    arg_parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument(
+        "path",
+        nargs="?",
+        default=os.path.join(flake8_carrot.__path__[0], "utils.py"),  # noqa: PTH118
+        help="Python file to edit & relint.",
+    )
+    arg_parser.add_argument(
+        "--rounds",
+        type=int,
+        default=20,
+        help="Edits to relint with each approach, keeping the median.",
+    )
+    parsed_args: argparse.Namespace = arg_parser.parse_args(argv)
+
+    with open(parsed_args.path, encoding="utf-8") as source_file:  # noqa: PTH123
+        source: str = source_file.read()
+
+    lint_session: LintSession = LintSession(result_cache_size=0)
+    statement_cache: StatementProblemsCache = StatementProblemsCache()
+    lint_session.lint_source(source, statement_cache=statement_cache)
+
+    full_duration: float = _time_edits(lint_session.lint_source, source, parsed_args.rounds)
+    incremental_duration: float = _time_edits(
+        lambda edited_source: lint_session.lint_source(
+            edited_source, statement_cache=statement_cache
+        ),
+        source,
+        parsed_args.rounds,
+    )
+
+    sys.stdout.write(f"Relinting {parsed_args.path} after each edit (median):\n")
+    sys.stdout.write(f"    {'full lint':<22} {full_duration * 1000:9.2f} ms\n")
+    sys.stdout.write(f"    {'changed statements':<22} {incremental_duration * 1000:9.2f} ms\n")
+    sys.stdout.write(
+        f"    {'statements relinted':<22} {statement_cache.linted_statements_count:9d}\n"
+    )
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,90 @@
+"""Benchmark linting in-process with & without prefetching the upcoming source files."""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import flake8_carrot
+from flake8_carrot import pipeline
+from flake8_carrot.batch import lint_paths
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from os import PathLike
+
+    from flake8_carrot.pipeline import SourceFile
+
+__all__: Sequence[str] = ("main",)
+
+
+def _time_linting(source_paths: Sequence[str], prefetch_workers: int) -> float:
+    start: float = time.perf_counter()
+    for _ in lint_paths(source_paths, max_workers=1, prefetch_workers=prefetch_workers):
+        pass
+    return time.perf_counter() - start
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the prefetching benchmark & print the time taken with each number of threads."""
+    arg_parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument(
+        "paths",
+        nargs="*",
+        type=Path,
+        default=[Path(flake8_carrot.__file__).parent],
+        help="Python files, or directories of them, to lint during the benchmark.",
+    )
+    arg_parser.add_argument(
+        "--prefetch-workers",
+        nargs="+",
+        type=int,
+        default=[0, 1, pipeline.DEFAULT_PREFETCH_WORKERS],
+        help="Numbers of prefetch threads to benchmark.",
+    )
+    arg_parser.add_argument(
+        "--read-latency",
+        type=float,
+        default=0.0,
+        help=(
+            "Milliseconds added to each file read, "
+            "to emulate a network-mounted workspace. (Default: %(default)s)"
+        ),
+    )
+    parsed_args: argparse.Namespace = arg_parser.parse_args(argv)
+
+    source_paths: Sequence[str] = sorted(
+        str(source_path)
+        for path in parsed_args.paths
+        for source_path in (path.rglob("*.py") if path.is_dir() else (path,))
+    )
+
+    read_latency: float = parsed_args.read_latency / 1000
+    if read_latency:
+        read_source_file = pipeline.read_source_file
+
+        def _read_source_file_slowly(path: str | PathLike[str]) -> SourceFile:
+            time.sleep(read_latency)
+            return read_source_file(path)
+
+        pipeline.read_source_file = _read_source_file_slowly
+
+    sys.stdout.write(
+        f"Linting {len(source_paths)} files, "
+        f"with {parsed_args.read_latency:.1f} ms of added read latency:\n"
+    )
+
+    prefetch_workers: int
+    for prefetch_workers in parsed_args.prefetch_workers:
+        duration: float = _time_linting(source_paths, prefetch_workers)
+        sys.stdout.write(
+            f"    {prefetch_workers:2d} prefetch threads "
+            f"{duration:8.3f} s, {len(source_paths) / duration:9.1f} files/s\n"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,77 @@
+"""Benchmark linting only the module headers, against parsing & linting each whole file."""
+
+import argparse
+import sys
+import time
+import tokenize
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import flake8_carrot
+from flake8_carrot import CarrotPlugin
+from flake8_carrot.preamble import PREAMBLE_RULES, lint_preamble_file
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+__all__: Sequence[str] = ("main",)
+
+
+def _lint_whole_file(path: Path) -> Sequence[tuple[int, int, str, type[CarrotPlugin]]]:
+    with tokenize.open(path) as file:
+        return list(CarrotPlugin.from_source(file.read()).run_rules(PREAMBLE_RULES))
+
+
+def _time_linting(
+    lint_file: Callable[[Path], Sequence[tuple[int, int, str, type[CarrotPlugin]]]],
+    source_paths: Sequence[Path],
+) -> tuple[float, int]:
+    problems_count: int = 0
+
+    start: float = time.perf_counter()
+
+    source_path: Path
+    for source_path in source_paths:
+        problems_count += len(lint_file(source_path))
+
+    return time.perf_counter() - start, problems_count
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the module-header benchmark & print the time taken by each mode."""
+    arg_parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument(
+        "paths",
+        nargs="*",
+        type=Path,
+        default=[Path(flake8_carrot.__file__).parent],
+        help="Python files, or directories of them, to lint during the benchmark.",
+    )
+    parsed_args: argparse.Namespace = arg_parser.parse_args(argv)
+
+    source_paths: Sequence[Path] = sorted(
+        source_path
+        for path in parsed_args.paths
+        for source_path in (path.rglob("*.py") if path.is_dir() else (path,))
+    )
+
+    _time_linting(lint_preamble_file, source_paths)  # NOTE: Warm-up run, so files are cached
+
+    sys.stdout.write(f"Module-header rules run over {len(source_paths)} files:\n")
+
+    label: str
+    lint_file: Callable[[Path], Sequence[tuple[int, int, str, type[CarrotPlugin]]]]
+    for label, lint_file in (
+        ("whole file", _lint_whole_file),
+        ("preamble", lint_preamble_file),
+    ):
+        duration, problems_count = _time_linting(lint_file, source_paths)
+        sys.stdout.write(
+            f"    {label:<12} {duration * 1000:10.2f} ms ({problems_count} problems)\n"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,83 @@
+"""Benchmark linting sources through a long-lived session, against running each plugin."""
+
+import argparse
+import sys
+import time
+import tokenize
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import flake8_carrot
+from flake8_carrot import CarrotPlugin, LintSession
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+__all__: Sequence[str] = ("main",)
+
+
+def _time_linting(lint_source: Callable[[str], int], sources: Sequence[str]) -> float:
+    start: float = time.perf_counter()
+
+    source: str
+    for source in sources:
+        lint_source(source)
+
+    return time.perf_counter() - start
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the session benchmark & print the time taken by each mode."""
+    arg_parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument(
+        "paths",
+        nargs="*",
+        type=Path,
+        default=[Path(flake8_carrot.__file__).parent],
+        help="Python files, or directories of them, to lint during the benchmark.",
+    )
+    parsed_args: argparse.Namespace = arg_parser.parse_args(argv)
+
+    sources: list[str] = []
+
+    source_path: Path
+    for source_path in sorted(
+        source_path
+        for path in parsed_args.paths
+        for source_path in (path.rglob("*.py") if path.is_dir() else (path,))
+    ):
+        with tokenize.open(source_path) as file:
+            sources.append(file.read())
+
+    plugin_duration: float = _time_linting(
+        lambda source: len(list(CarrotPlugin.from_source(source).run())), sources
+    )
+
+    start: float = time.perf_counter()
+    lint_session: LintSession = LintSession((CarrotPlugin,), result_cache_size=len(sources))
+    session_start_duration: float = time.perf_counter() - start
+
+    cold_duration: float = _time_linting(
+        lambda source: len(lint_session.lint_source(source)), sources
+    )
+    warm_duration: float = _time_linting(
+        lambda source: len(lint_session.lint_source(source)), sources
+    )
+
+    sys.stdout.write(f"Linting {len(sources)} sources:\n")
+
+    label: str
+    duration: float
+    for label, duration in (
+        ("plugin run", plugin_duration),
+        ("session start", session_start_duration),
+        ("session", cold_duration),
+        ("session cached", warm_duration),
+    ):
+        sys.stdout.write(f"    {label:<15} {duration * 1000:10.2f} ms\n")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,165 @@
+"""Benchmark the iterative traversal engine against recursive `ast.NodeVisitor` traversal."""
+
+import argparse
+import ast
+import functools
+import sys
+import time
+import tokenize
+from io import StringIO
+from typing import TYPE_CHECKING, override
+
+from flake8_carrot import CarrotPlugin
+from flake8_carrot.traversal import TraversalEngine
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping, Sequence
+    from tokenize import TokenInfo
+
+__all__: Sequence[str] = ("main",)
+
+
+def _generate_elif_chain(length: int) -> str:
+    return (
+        "def classify(value: int) -> int:\n"
+        "    if value == 0:\n"
+        "        return 0\n"
+        + "".join(
+            f"    elif value == {index}:\n        return {index}\n"
+            for index in range(1, length)
+        )
+        + "    return -1\n"
+    )
+
+
+def _generate_nested_dicts(depth: int, count: int) -> str:
+    return "".join(
+        f"SCHEMA_{index} = {'{"key": ' * depth}{index}{'}' * depth}\n"
+        for index in range(count)
+    )
+
+
+class _RecursiveCountingVisitor(ast.NodeVisitor):
+    @override
+    def __init__(self) -> None:
+        self.count: int = 0
+
+    @override
+    def generic_visit(self, node: ast.AST) -> None:
+        self.count += 1
+        super().generic_visit(node)
+
+
+class _IterativeCounter:
+    @override
+    def __init__(self) -> None:
+        self.count: int = 0
+
+    def register_traversal_hooks(self, engine: TraversalEngine) -> None:
+        node_type: type[ast.AST]
+        for node_type in {
+            node_type
+            for node_type in vars(ast).values()
+            if isinstance(node_type, type) and issubclass(node_type, ast.AST)
+        }:
+            engine.add_pre_hook(node_type, self._increment, owner=self)
+
+    def _increment(self, _node: ast.AST) -> None:
+        self.count += 1
+
+
+def _time_call(function: Callable[[], object], repeats: int) -> float | None:
+    fastest: float | None = None
+
+    for _ in range(repeats):
+        start: float = time.perf_counter()
+        try:
+            function()
+        except RecursionError:
+            return None
+        duration: float = time.perf_counter() - start
+
+        fastest = duration if fastest is None else min(fastest, duration)
+
+    return fastest
+
+
+def _run_recursive(tree: ast.Module) -> int:
+    visitor: _RecursiveCountingVisitor = _RecursiveCountingVisitor()
+    visitor.visit(tree)
+    return visitor.count
+
+
+def _run_iterative(tree: ast.Module, *, compiled: bool) -> int:
+    counter: _IterativeCounter = _IterativeCounter()
+    engine: TraversalEngine = TraversalEngine(compiled=compiled)
+    counter.register_traversal_hooks(engine)
+    engine.traverse(tree)
+    return counter.count
+
+
+def _run_plugin(source: str, tree: ast.Module) -> int:
+    file_tokens: Sequence[TokenInfo] = list(
+        tokenize.generate_tokens(StringIO(source).readline),
+    )
+    return sum(
+        1
+        for _ in CarrotPlugin(
+            tree=tree, file_tokens=file_tokens, lines=source.splitlines(keepends=True)
+        ).run()
+    )
+
+
+def _format_duration(duration: float | None) -> str:
+    return "RecursionError" if duration is None else f"{duration * 1000:10.2f} ms"
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the traversal benchmark & print the timings for each generated input."""
+    arg_parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--elif-length", type=int, default=5000)
+    arg_parser.add_argument("--dict-depth", type=int, default=150)
+    arg_parser.add_argument("--dict-count", type=int, default=200)
+    arg_parser.add_argument("--repeats", type=int, default=3)
+    parsed_args: argparse.Namespace = arg_parser.parse_args(argv)
+
+    inputs: Mapping[str, str] = {
+        f"elif chain (length {parsed_args.elif_length})": _generate_elif_chain(
+            parsed_args.elif_length
+        ),
+        (
+            f"nested dicts (depth {parsed_args.dict_depth}, count {parsed_args.dict_count})"
+        ): _generate_nested_dicts(parsed_args.dict_depth, parsed_args.dict_count),
+    }
+
+    input_name: str
+    source: str
+    for input_name, source in inputs.items():
+        tree: ast.Module = ast.parse(source)
+
+        sys.stdout.write(f"{input_name}:\n")
+
+        benchmark_name: str
+        benchmark_function: Callable[[], object]
+        for benchmark_name, benchmark_function in (
+            ("recursive `ast.NodeVisitor`", functools.partial(_run_recursive, tree)),
+            (
+                "interpreted traversal engine",
+                functools.partial(_run_iterative, tree, compiled=False),
+            ),
+            (
+                "generated traversal engine",
+                functools.partial(_run_iterative, tree, compiled=True),
+            ),
+            ("complete `CarrotPlugin` run", functools.partial(_run_plugin, source, tree)),
+        ):
+            sys.stdout.write(
+                f"    {benchmark_name:<28} "
+                f"{_format_duration(_time_call(benchmark_function, parsed_args.repeats))}\n"
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
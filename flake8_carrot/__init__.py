@@ -1,11 +1,40 @@
 """Custom opinionated linting rules to adhere Python code to CarrotManMatt's style guide."""
 
+import importlib
 from typing import TYPE_CHECKING
 
-from .carrot import CarrotPlugin
-from .tex_bot import TeXBotPlugin
-
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import Mapping, Sequence
+    from typing import Final
+
+    from .carrot import CarrotPlugin
+    from .session import LintSession, Problem
+    from .tex_bot import TeXBotPlugin
+
+__all__: Sequence[str] = ("CarrotPlugin", "LintSession", "Problem", "TeXBotPlugin")
+
+
+# NOTE: Imported only once first used, so that `flake8_carrot.client` starts without any rules
+_LAZY_ATTRIBUTE_MODULES: Final[Mapping[str, str]] = {
+    "CarrotPlugin": ".carrot",
+    "LintSession": ".session",
+    "Problem": ".session",
+    "TeXBotPlugin": ".tex_bot",
+}
+
+
+def __getattr__(name: str) -> object:
+    module_name: str | None = _LAZY_ATTRIBUTE_MODULES.get(name, None)
+    if module_name is None:
+        MISSING_ATTRIBUTE_MESSAGE: Final[str] = (
+            f"module {__name__!r} has no attribute {name!r}"
+        )
+        raise AttributeError(MISSING_ATTRIBUTE_MESSAGE)
+
+    value: object = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__: Sequence[str] = ("CarrotPlugin", "TeXBotPlugin")
+def __dir__() -> Sequence[str]:
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,258 @@
+"""Shared analyses of a module's AST, computed lazily & at most once per file."""
+
+import abc
+import ast
+import weakref
+from typing import TYPE_CHECKING, cast, final, override
+
+from . import utils
+from .traversal import TraversalEngine
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Iterable, Sequence
+    from collections.abc import Set as AbstractSet
+    from typing import Final
+
+__all__: Sequence[str] = (
+    "AnalysisCache",
+    "BaseAnalysis",
+    "FirstAllExportLineNumbersAnalysis",
+    "LoggersAnalysis",
+    "PprintImportedForDebuggingAnalysis",
+    "SlashCommandGroupNamesAnalysis",
+    "get_shared_analysis_cache",
+)
+
+
+if __name__ == "__main__":
+    CANNOT_RUN_AS_SCRIPT_MESSAGE: Final[str] = "This module cannot be run as a script."
+    raise RuntimeError(CANNOT_RUN_AS_SCRIPT_MESSAGE)
+
+
+class BaseAnalysis[T_Result](abc.ABC):
+    """
+    Base analysis class, defining a single value computed from a module's AST.
+
+    Each analysis is computed by registering hooks upon a traversal engine,
+    so that any number of required analyses can be computed within a single traversal.
+    """
+
+    @abc.abstractmethod
+    def register_traversal_hooks(self, engine: TraversalEngine) -> None:
+        """Add the node hooks required to compute this analysis to the traversal engine."""
+
+    @property
+    @abc.abstractmethod
+    def result(self) -> T_Result:
+        """The final computed value of this analysis, once the traversal has completed."""
+
+
+@final
+class AnalysisCache:
+    """Memoised results of every analysis that has been requested for a single module."""
+
+    @override
+    def __init__(self, tree: ast.AST) -> None:
+        # NOTE: Only a weak reference is held, so the tree can still be a weak cache key
+        self._tree_reference: weakref.ReferenceType[ast.AST] = weakref.ref(tree)
+        self._results: dict[type[BaseAnalysis[object]], object] = {}
+
+    def prepare(self, analysis_classes: Iterable[type[BaseAnalysis[object]]]) -> None:
+        """Compute all the given analyses that are not yet known, in a single traversal."""
+        analyses: Collection[BaseAnalysis[object]] = [
+            AnalysisClass()
+            for AnalysisClass in set(analysis_classes)
+            if AnalysisClass not in self._results
+        ]
+        if not analyses:
+            return
+
+        tree: ast.AST | None = self._tree_reference()
+        if tree is None:
+            TREE_NO_LONGER_EXISTS_MESSAGE: Final[str] = (
+                "Cannot compute analyses of a tree that no longer exists."
+            )
+            raise RuntimeError(TREE_NO_LONGER_EXISTS_MESSAGE)
+
+        traversal_engine: TraversalEngine = TraversalEngine()
+
+        analysis: BaseAnalysis[object]
+        for analysis in analyses:
+            analysis.register_traversal_hooks(traversal_engine)
+
+        traversal_engine.traverse(tree)
+
+        for analysis in analyses:
+            self._results[type(analysis)] = analysis.result
+
+    def get[T_Result](self, analysis_class: type[BaseAnalysis[T_Result]]) -> T_Result:
+        """Retrieve the result of the given analysis, computing it if not already known."""
+        if analysis_class not in self._results:
+            self.prepare((analysis_class,))
+
+        return cast("T_Result", self._results[analysis_class])
+
+    def is_computed(self, analysis_class: type[BaseAnalysis[object]]) -> bool:
+        """Whether the given analysis has already been computed for this module."""
+        return analysis_class in self._results
+
+
+_SHARED_ANALYSIS_CACHES: Final[weakref.WeakKeyDictionary[ast.Module, AnalysisCache]] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_shared_analysis_cache(tree: ast.Module) -> AnalysisCache:
+    """Retrieve the analysis cache shared by every plugin that lints the given module."""
+    analysis_cache: AnalysisCache | None = _SHARED_ANALYSIS_CACHES.get(tree, None)
+    if analysis_cache is None:
+        analysis_cache = AnalysisCache(tree)
+        _SHARED_ANALYSIS_CACHES[tree] = analysis_cache
+
+    return analysis_cache
+
+
+def _node_is_slash_command_group_assignment(node: ast.Assign | ast.AnnAssign) -> bool:
+    match node.value:
+        case ast.Call(
+            func=(
+                ast.Name(id="SlashCommandGroup")
+                | ast.Attribute(
+                    value=(
+                        ast.Name(id="discord")
+                        | ast.Attribute(
+                            value=ast.Name(id="discord"),
+                            attr="commands",
+                        )
+                        | ast.Attribute(
+                            value=ast.Attribute(
+                                value=ast.Name(id="discord"),
+                                attr="commands",
+                            ),
+                            attr="core",
+                        )
+                    ),
+                    attr="SlashCommandGroup",
+                )
+            ),
+        ):
+            return True
+
+        case _:
+            return False
+
+
+class SlashCommandGroupNamesAnalysis(BaseAnalysis["AbstractSet[str]"]):
+    """The names of all variables that have been assigned a Pycord slash-command group."""
+
+    @override
+    def __init__(self) -> None:
+        self._found_slash_command_group_names: set[str] = set()
+
+    @override
+    def register_traversal_hooks(self, engine: TraversalEngine) -> None:
+        engine.add_pre_hook(ast.Assign, self._visit_assign, owner=self)
+        engine.add_pre_hook(ast.AnnAssign, self._visit_ann_assign, owner=self)
+
+    @property
+    @override
+    def result(self) -> AbstractSet[str]:
+        return frozenset(self._found_slash_command_group_names)
+
+    def _visit_assign(self, node: ast.Assign) -> None:
+        if not _node_is_slash_command_group_assignment(node):
+            return
+
+        target: ast.expr
+        for target in node.targets:
+            if not isinstance(target, ast.Name):
+                continue
+
+            self._found_slash_command_group_names.add(target.id)
+
+    def _visit_ann_assign(self, node: ast.AnnAssign) -> None:
+        if isinstance(node.target, ast.Name) and _node_is_slash_command_group_assignment(node):
+            self._found_slash_command_group_names.add(node.target.id)
+
+
+class FirstAllExportLineNumbersAnalysis(BaseAnalysis["tuple[int, int] | None"]):
+    """The start & end line numbers of the first `__all__` export within the module."""
+
+    @override
+    def __init__(self) -> None:
+        self._first_all_export_line_numbers: tuple[int, int] | None = None
+
+    @override
+    def register_traversal_hooks(self, engine: TraversalEngine) -> None:
+        engine.add_pre_hook(ast.Assign, self._visit_assign, owner=self)
+        engine.add_pre_hook(ast.AnnAssign, self._visit_ann_assign, owner=self)
+
+    @property
+    @override
+    def result(self) -> tuple[int, int] | None:
+        return self._first_all_export_line_numbers
+
+    def _visit_assign(self, node: ast.Assign) -> None:
+        if self._first_all_export_line_numbers is not None:
+            return
+
+        target: ast.expr
+        for target in node.targets:
+            match target:
+                case ast.Name(id="__all__"):
+                    self._first_all_export_line_numbers = (
+                        node.lineno,
+                        node.end_lineno or node.lineno,
+                    )
+                    return
+
+    def _visit_ann_assign(self, node: ast.AnnAssign) -> None:
+        match node.target:
+            case ast.Name(id="__all__") if self._first_all_export_line_numbers is None:
+                self._first_all_export_line_numbers = (
+                    node.lineno,
+                    (node.end_lineno or node.lineno),
+                )
+
+
+class PprintImportedForDebuggingAnalysis(BaseAnalysis[bool]):
+    """Whether a debugging pretty-print function has been imported within the module."""
+
+    @override
+    def __init__(self) -> None:
+        self._pprint_imported_for_debugging: bool = False
+
+    @override
+    def register_traversal_hooks(self, engine: TraversalEngine) -> None:
+        engine.add_pre_hook(ast.ImportFrom, self._visit_import_from, owner=self)
+
+    @property
+    @override
+    def result(self) -> bool:
+        return self._pprint_imported_for_debugging
+
+    def _visit_import_from(self, node: ast.ImportFrom) -> None:
+        if node.module in utils.PPRINT_MODULES:
+            import_alias: ast.alias
+            for import_alias in node.names:
+                if "print" in import_alias.name:
+                    self._pprint_imported_for_debugging = True
+                    break
+
+
+class LoggersAnalysis(BaseAnalysis["AbstractSet[ast.Assign | ast.AnnAssign]"]):
+    """All the assignments of `logging.Logger` objects within the module."""
+
+    @override
+    def __init__(self) -> None:
+        # TODO: Implement finding using rule 201  # noqa: FIX002
+        self._found_loggers: set[ast.Assign | ast.AnnAssign] = set()
+
+    @override
+    def register_traversal_hooks(self, engine: TraversalEngine) -> None:
+        pass
+
+    @property
+    @override
+    def result(self) -> AbstractSet[ast.Assign | ast.AnnAssign]:
+        return frozenset(self._found_loggers)
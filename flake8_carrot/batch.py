@@ -0,0 +1,368 @@
+"""Parallel linting of many files across a pool of worker processes or subinterpreters."""
+
+import concurrent.futures
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from enum import Enum
+from typing import TYPE_CHECKING, NamedTuple
+
+from . import pipeline
+from .session import LintSession, Problem
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+    from concurrent.futures import Executor, Future
+    from multiprocessing.context import BaseContext
+    from os import PathLike
+    from typing import Final
+
+    from .pipeline import SourceFile
+    from .scheduling import CostScheduler
+
+__all__: Sequence[str] = ("BatchBackend", "FileProblems", "lint_paths")
+
+
+if __name__ == "__main__":
+    CANNOT_RUN_AS_SCRIPT_MESSAGE: Final[str] = "This module cannot be run as a script."
+    raise RuntimeError(CANNOT_RUN_AS_SCRIPT_MESSAGE)
+
+
+_DEFAULT_CHUNK_SIZE: Final[int] = 32
+_DEFAULT_CHUNK_BYTES: Final[int] = 256 * 1024
+_PENDING_CHUNKS_PER_WORKER: Final[int] = 2
+_STATM_PATH: Final[str] = "/proc/self/statm"
+
+if TYPE_CHECKING:
+    type _CompactProblem = tuple[int, int, str, str]
+    type _CompactFileProblems = tuple[str, Sequence[_CompactProblem], float]
+
+
+class BatchBackend(Enum):
+    """Which kind of pool the files of a batch are linted across."""
+
+    PROCESS = "process"
+    """A pool of worker processes, each with its own copy of the interpreter."""
+
+    INTERPRETER = "interpreter"
+    """A pool of subinterpreters within this process, each with its own GIL."""
+
+
+class FileProblems(NamedTuple):
+    """The problems found within a single linted file."""
+
+    path: str
+    problems: Sequence[Problem]
+
+
+class _SessionOptions(NamedTuple):
+    select: tuple[str, ...] | None
+    ignore: tuple[str, ...] | None
+    disable_noqa: bool
+
+
+class _ChunkResult(NamedTuple):
+    file_problems: Sequence[_CompactFileProblems]
+    worker_id: str
+    worker_rss: int
+
+
+# NOTE: Each worker process keeps one warm session per set of options, across all its chunks
+_WORKER_SESSIONS: Final[dict[_SessionOptions, LintSession]] = {}
+
+
+def _get_worker_session(options: _SessionOptions) -> LintSession:
+    lint_session: LintSession | None = _WORKER_SESSIONS.get(options, None)
+    if lint_session is None:
+        lint_session = LintSession(
+            select=options.select,
+            ignore=options.ignore,
+            disable_noqa=options.disable_noqa,
+            result_cache_size=0,
+        )
+        _WORKER_SESSIONS[options] = lint_session
+
+    return lint_session
+
+
+def _get_current_rss() -> int:
+    try:
+        with open(_STATM_PATH, "rb") as statm_file:  # noqa: PTH123
+            return int(statm_file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        pass
+
+    if sys.platform == "win32":
+        return 0
+
+    import resource  # noqa: PLC0415
+
+    # NOTE: Without `/proc`, only the peak resident set size can be measured
+    peak_rss: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak_rss if sys.platform == "darwin" else peak_rss * 1024
+
+
+def _initialise_worker(options: _SessionOptions) -> None:
+    _get_worker_session(options)
+
+
+def _lint_source_files_compactly(
+    lint_session: LintSession, source_files: Iterable[SourceFile]
+) -> Iterator[_CompactFileProblems]:
+    source_file: SourceFile
+    for source_file in source_files:
+        start: float = time.perf_counter()
+
+        # NOTE: Only plain tuples are sent back, as they are the cheapest results to pickle
+        compact_problems: Sequence[_CompactProblem] = [
+            (problem.line, problem.column, problem.code, problem.message)
+            for problem in lint_session.lint_source_file(source_file)
+        ]
+
+        yield source_file.path, compact_problems, time.perf_counter() - start
+
+
+def _lint_chunk(
+    options: _SessionOptions, paths: Sequence[str], prefetch_workers: int
+) -> _ChunkResult:
+    return _ChunkResult(
+        file_problems=list(
+            _lint_source_files_compactly(
+                _get_worker_session(options),
+                pipeline.prefetch_source_files(
+                    paths, max_workers=min(prefetch_workers, len(paths) - 1)
+                ),
+            ),
+        ),
+        worker_id=f"{os.getpid()}-{threading.get_ident()}",
+        worker_rss=_get_current_rss(),
+    )
+
+
+def _expand_compact_file_problems(
+    file_problems: Iterable[_CompactFileProblems],
+    worker_id: str,
+    scheduler: CostScheduler | None,
+) -> Iterator[FileProblems]:
+    path: str
+    compact_problems: Sequence[_CompactProblem]
+    seconds: float
+    for path, compact_problems, seconds in file_problems:
+        if scheduler is not None:
+            scheduler.record(path, seconds, worker_id)
+
+        yield FileProblems(
+            path, [Problem(path, *compact_problem) for compact_problem in compact_problems]
+        )
+
+
+def _make_chunks(
+    paths: Iterable[str | PathLike[str]], chunk_size: int, chunk_bytes: int
+) -> Iterator[Sequence[str]]:
+    chunk: list[str] = []
+    chunk_total_bytes: int = 0
+
+    path: str | PathLike[str]
+    for path in paths:
+        try:
+            file_size: int = os.stat(path).st_size  # noqa: PTH116
+        except OSError:
+            file_size = 0
+
+        chunk.append(os.fspath(path))
+        chunk_total_bytes += file_size
+
+        if len(chunk) >= chunk_size or chunk_total_bytes >= chunk_bytes:
+            yield chunk
+            chunk = []
+            chunk_total_bytes = 0
+
+    if chunk:
+        yield chunk
+
+
+def lint_paths(  # noqa: PLR0913
+    paths: Iterable[str | PathLike[str]],
+    *,
+    select: Iterable[str] | None = None,
+    ignore: Iterable[str] | None = None,
+    disable_noqa: bool = False,
+    max_workers: int | None = None,
+    chunk_size: int = _DEFAULT_CHUNK_SIZE,
+    chunk_bytes: int = _DEFAULT_CHUNK_BYTES,
+    max_worker_rss: int | None = None,
+    backend: BatchBackend = BatchBackend.PROCESS,
+    scheduler: CostScheduler | None = None,
+    prefetch_workers: int = pipeline.DEFAULT_PREFETCH_WORKERS,
+    mp_context: BaseContext | None = None,
+) -> Iterator[FileProblems]:
+    """
+    Lint each of the given files across a pool of worker processes or subinterpreters.
+
+    The problems of each file are yielded in the same order as the given paths,
+    as soon as the files before it have been linted.
+    Only a few chunks of files are in flight at once,
+    so neither the paths nor their problems are all held in memory together.
+    Each chunk holds up to `chunk_size` files, but is closed early once its files total
+    `chunk_bytes`, so that large files are not grouped together.
+    Once a worker's resident memory is over `max_worker_rss` bytes,
+    the pool is replaced by a fresh one for the rest, without waiting for it to drain.
+    The old pool's workers finish its submitted chunks & then exit,
+    so until then both pools' workers are alive at once.
+    Forked workers are the exception: forking while the old pool's threads still run
+    can deadlock the new workers, so the old pool is drained first.
+    If a scheduler is given, the files are instead sent longest-first in chunks of similar
+    estimated cost, to the central queue that each idle worker takes its next chunk from.
+    Their problems are then yielded as soon as each chunk is finished,
+    & the time taken by each file is recorded by the scheduler.
+    Within each chunk, up to `prefetch_workers` threads read & decode the upcoming files
+    while the current one is linted, so slow file systems stall the linting less.
+    Each subinterpreter imports its own copy of the rules, so the compiled rule modules
+    of the optional mypyc build cannot be used with the interpreter backend.
+    """
+    if chunk_size < 1 or chunk_bytes < 1:
+        INVALID_CHUNK_SIZE_MESSAGE: Final[str] = "Chunk sizes must be at least 1."
+        raise ValueError(INVALID_CHUNK_SIZE_MESSAGE)
+
+    if prefetch_workers < 0:
+        INVALID_PREFETCH_WORKERS_MESSAGE: Final[str] = "Prefetch workers must be at least 0."
+        raise ValueError(INVALID_PREFETCH_WORKERS_MESSAGE)
+
+    options: _SessionOptions = _SessionOptions(
+        select=None if select is None else tuple(select),
+        ignore=None if ignore is None else tuple(ignore),
+        disable_noqa=disable_noqa,
+    )
+    workers_count: int = max_workers or os.process_cpu_count() or 1
+
+    chunks: Iterator[Sequence[str]] = (
+        _make_chunks(paths, chunk_size, chunk_bytes)
+        if scheduler is None
+        else scheduler.make_chunks(paths, workers_count)
+    )
+
+    if workers_count == 1:
+        # NOTE: In-process, the files are prefetched across chunks so reading never pauses
+        yield from _expand_compact_file_problems(
+            _lint_source_files_compactly(
+                _get_worker_session(options),
+                pipeline.prefetch_source_files(
+                    (path for chunk in chunks for path in chunk), max_workers=prefetch_workers
+                ),
+            ),
+            str(os.getpid()),
+            scheduler,
+        )
+        return
+
+    yield from _lint_chunks_in_pool(
+        chunks,
+        options,
+        workers_count=workers_count,
+        max_worker_rss=max_worker_rss,
+        backend=backend,
+        scheduler=scheduler,
+        prefetch_workers=prefetch_workers,
+        mp_context=mp_context,
+    )
+
+
+def _lint_chunks_in_pool(  # noqa: PLR0913
+    chunks: Iterator[Sequence[str]],
+    options: _SessionOptions,
+    *,
+    workers_count: int,
+    max_worker_rss: int | None,
+    backend: BatchBackend,
+    scheduler: CostScheduler | None,
+    prefetch_workers: int,
+    mp_context: BaseContext | None,
+) -> Iterator[FileProblems]:
+    def _make_executor() -> Executor:
+        if backend is BatchBackend.INTERPRETER:
+            # NOTE: Both branches are checked against the version, so type-checkers
+            # targeting older versions neither look up the missing executor class
+            # nor report the other branch as unreachable
+            if sys.version_info >= (3, 14):  # noqa: UP036
+                return concurrent.futures.InterpreterPoolExecutor(
+                    max_workers=workers_count,
+                    initializer=_initialise_worker,
+                    initargs=(options,),
+                )
+            else:  # noqa: RET505
+                UNSUPPORTED_INTERPRETER_BACKEND_MESSAGE: Final[str] = (
+                    "Subinterpreter pools require Python 3.14 or later."
+                )
+                raise RuntimeError(UNSUPPORTED_INTERPRETER_BACKEND_MESSAGE)
+
+        return concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers_count,
+            mp_context=mp_context,
+            initializer=_initialise_worker,
+            initargs=(options,),
+        )
+
+    # NOTE: Insertion-ordered, so the oldest chunk is always first
+    pending_chunks: dict[Future[_ChunkResult], int] = {}
+    executor: Executor = _make_executor()
+    executor_generation: int = 0
+    retired_executors: list[Executor] = []
+    forks_workers: bool = all(
+        (
+            backend is BatchBackend.PROCESS,
+            (mp_context or multiprocessing.get_context()).get_start_method() == "fork",
+        ),
+    )
+
+    try:
+        while True:
+            while len(pending_chunks) < workers_count * _PENDING_CHUNKS_PER_WORKER:
+                chunk: Sequence[str] | None = next(chunks, None)
+                if chunk is None:
+                    break
+
+                pending_chunks[
+                    executor.submit(_lint_chunk, options, chunk, prefetch_workers)
+                ] = executor_generation
+
+            if not pending_chunks:
+                return
+
+            chunk_future: Future[_ChunkResult] = (
+                next(iter(pending_chunks))
+                if scheduler is None
+                else next(
+                    iter(
+                        concurrent.futures.wait(
+                            pending_chunks, return_when=concurrent.futures.FIRST_COMPLETED
+                        ).done
+                    )
+                )
+            )
+            chunk_generation: int = pending_chunks.pop(chunk_future)
+            chunk_result: _ChunkResult = chunk_future.result()
+
+            if all(
+                (
+                    max_worker_rss is not None,
+                    chunk_generation == executor_generation,
+                    chunk_result.worker_rss > (max_worker_rss or 0),
+                ),
+            ):
+                # NOTE: Not waited for, so the rest of the chunks are not stalled behind
+                # the slowest of the old pool's submitted chunks
+                executor.shutdown(wait=forks_workers)
+                retired_executors.append(executor)
+                executor = _make_executor()
+                executor_generation += 1
+
+            yield from _expand_compact_file_problems(
+                chunk_result.file_problems, chunk_result.worker_id, scheduler
+            )
+
+    finally:
+        pool: Executor
+        for pool in (*retired_executors, executor):
+            pool.shutdown(wait=False, cancel_futures=True)
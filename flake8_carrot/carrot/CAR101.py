@@ -3,11 +3,18 @@
 import ast
 from typing import TYPE_CHECKING, override
 
-from flake8_carrot.utils import CarrotRule
+from typed_classproperties import classproperty
+
+from flake8_carrot.analyses import FirstAllExportLineNumbersAnalysis
+from flake8_carrot.utils import CarrotRule, RuleInput, RuleScope
 
 if TYPE_CHECKING:
     from collections.abc import Mapping, Sequence
+    from collections.abc import Set as AbstractSet
     from tokenize import TokenInfo
+    from typing import ClassVar
+
+    from flake8_carrot.analyses import BaseAnalysis
 
 __all__: Sequence[str] = ("RuleCAR101",)
 
@@ -15,6 +22,16 @@ __all__: Sequence[str] = ("RuleCAR101",)
 class RuleCAR101(CarrotRule):
     """Linting rule to ensure the `__all__` export is not missing from a module."""
 
+    REQUIRED_INPUTS: ClassVar[AbstractSet[RuleInput]] = frozenset(
+        {RuleInput.TREE, RuleInput.LINES}
+    )
+    SCOPE: ClassVar[RuleScope] = RuleScope.PREAMBLE
+
+    @classproperty
+    @override
+    def REQUIRED_ANALYSES(cls) -> AbstractSet[type[BaseAnalysis[object]]]:
+        return {FirstAllExportLineNumbersAnalysis}
+
     @classmethod
     @override
     def _format_error_message(cls, ctx: Mapping[str, object]) -> str:
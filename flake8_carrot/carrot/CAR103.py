@@ -3,29 +3,38 @@
 import ast
 from typing import TYPE_CHECKING, override
 
-from flake8_carrot import utils
+from typed_classproperties import classproperty
+
+from flake8_carrot.analyses import FirstAllExportLineNumbersAnalysis
 from flake8_carrot.utils import CarrotRule
 
 if TYPE_CHECKING:
     from collections.abc import Iterable, Mapping, Sequence
-    from tokenize import TokenInfo
+    from collections.abc import Set as AbstractSet
+
+    from flake8_carrot.analyses import BaseAnalysis
+    from flake8_carrot.traversal import TraversalEngine
 
 __all__: Sequence[str] = ("RuleCAR103",)
 
 
-class RuleCAR103(CarrotRule, ast.NodeVisitor):
+class RuleCAR103(CarrotRule):
     """Linting rule to ensure the `__all__` export is annotated as `Sequence[str]`."""
 
+    @classproperty
+    @override
+    def REQUIRED_ANALYSES(cls) -> AbstractSet[type[BaseAnalysis[object]]]:
+        return {FirstAllExportLineNumbersAnalysis}
+
     @classmethod
     @override
     def _format_error_message(cls, ctx: Mapping[str, object]) -> str:
         return "`__all__` export should be annotated as `Sequence[str]`"
 
     @override
-    def run_check(
-        self, tree: ast.Module, file_tokens: Sequence[TokenInfo], lines: Sequence[str]
-    ) -> None:
-        self.visit(tree)
+    def register_traversal_hooks(self, engine: TraversalEngine) -> None:
+        engine.add_pre_hook(ast.Assign, self._visit_assign, owner=self)
+        engine.add_pre_hook(ast.AnnAssign, self._visit_ann_assign, owner=self)
 
     @classmethod
     def _get_unannotated_all_from_assignment_targets(
@@ -39,9 +48,7 @@ class RuleCAR103(CarrotRule, ast.NodeVisitor):
 
         return None
 
-    @utils.generic_visit_before_return
-    @override
-    def visit_Assign(self, node: ast.Assign) -> None:
+    def _visit_assign(self, node: ast.Assign) -> None:
         if self.plugin.first_all_export_line_numbers is None:
             return
 
@@ -61,9 +68,7 @@ class RuleCAR103(CarrotRule, ast.NodeVisitor):
             ),
         )
 
-    @utils.generic_visit_before_return
-    @override
-    def visit_AnnAssign(self, node: ast.AnnAssign) -> None:
+    def _visit_ann_assign(self, node: ast.AnnAssign) -> None:
         if self.plugin.first_all_export_line_numbers is None:
             return
 
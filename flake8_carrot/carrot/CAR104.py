@@ -7,33 +7,42 @@ Only applies to simple static `__all__` exports.
 import ast
 from typing import TYPE_CHECKING, override
 
-from flake8_carrot import utils
+from typed_classproperties import classproperty
+
+from flake8_carrot.analyses import FirstAllExportLineNumbersAnalysis
 from flake8_carrot.utils import CarrotRule
 
 if TYPE_CHECKING:
     from collections.abc import Iterable, Mapping, Sequence
-    from tokenize import TokenInfo
+    from collections.abc import Set as AbstractSet
+
+    from flake8_carrot.analyses import BaseAnalysis
+    from flake8_carrot.traversal import TraversalEngine
 
 __all__: Sequence[str] = ("RuleCAR104",)
 
 
-class RuleCAR104(CarrotRule, ast.NodeVisitor):
+class RuleCAR104(CarrotRule):
     """
     Linting rule to ensure the `__all__` export is a tuple.
 
     Only applies to simple static `__all__` exports.
     """
 
+    @classproperty
+    @override
+    def REQUIRED_ANALYSES(cls) -> AbstractSet[type[BaseAnalysis[object]]]:
+        return {FirstAllExportLineNumbersAnalysis}
+
     @classmethod
     @override
     def _format_error_message(cls, ctx: Mapping[str, object]) -> str:
         return "Simple `__all__` export should be of type `tuple`, not `list`"
 
     @override
-    def run_check(
-        self, tree: ast.Module, file_tokens: Sequence[TokenInfo], lines: Sequence[str]
-    ) -> None:
-        self.visit(tree)
+    def register_traversal_hooks(self, engine: TraversalEngine) -> None:
+        engine.add_pre_hook(ast.Assign, self._visit_assign, owner=self)
+        engine.add_pre_hook(ast.AnnAssign, self._visit_ann_assign, owner=self)
 
     @classmethod
     def _targets_contain_all(cls, targets: Iterable[ast.expr]) -> bool:
@@ -45,9 +54,7 @@ class RuleCAR104(CarrotRule, ast.NodeVisitor):
 
         return False
 
-    @utils.generic_visit_before_return
-    @override
-    def visit_Assign(self, node: ast.Assign) -> None:
+    def _visit_assign(self, node: ast.Assign) -> None:
         if self.plugin.first_all_export_line_numbers is None:
             return
 
@@ -60,9 +67,7 @@ class RuleCAR104(CarrotRule, ast.NodeVisitor):
         if self._targets_contain_all(node.targets):
             self.problems.add_without_ctx((node.value.lineno, node.value.col_offset))
 
-    @utils.generic_visit_before_return
-    @override
-    def visit_AnnAssign(self, node: ast.AnnAssign) -> None:
+    def _visit_ann_assign(self, node: ast.AnnAssign) -> None:
         if self.plugin.first_all_export_line_numbers is None:
             return
 
@@ -3,11 +3,18 @@
 import ast
 from typing import TYPE_CHECKING, override
 
-from flake8_carrot.utils import CarrotRule
+from typed_classproperties import classproperty
+
+from flake8_carrot.analyses import FirstAllExportLineNumbersAnalysis
+from flake8_carrot.utils import CarrotRule, RuleScope
 
 if TYPE_CHECKING:
     from collections.abc import Mapping, Sequence
+    from collections.abc import Set as AbstractSet
     from tokenize import TokenInfo
+    from typing import ClassVar
+
+    from flake8_carrot.analyses import BaseAnalysis
 
 __all__: Sequence[str] = ("RuleCAR105",)
 
@@ -15,6 +22,13 @@ __all__: Sequence[str] = ("RuleCAR105",)
 class RuleCAR105(CarrotRule):
     """Linting rule to ensure only imports and the module docstring are above the export."""
 
+    SCOPE: ClassVar[RuleScope] = RuleScope.PREAMBLE
+
+    @classproperty
+    @override
+    def REQUIRED_ANALYSES(cls) -> AbstractSet[type[BaseAnalysis[object]]]:
+        return {FirstAllExportLineNumbersAnalysis}
+
     @classmethod
     @override
     def _format_error_message(cls, ctx: Mapping[str, object]) -> str:
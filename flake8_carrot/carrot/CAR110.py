@@ -2,12 +2,19 @@
 
 from typing import TYPE_CHECKING, override
 
-from flake8_carrot.utils import CarrotRule
+from typed_classproperties import classproperty
+
+from flake8_carrot.analyses import FirstAllExportLineNumbersAnalysis
+from flake8_carrot.utils import CarrotRule, RuleInput, RuleScope
 
 if TYPE_CHECKING:
     import ast
     from collections.abc import Iterator, Mapping, Sequence
+    from collections.abc import Set as AbstractSet
     from tokenize import TokenInfo
+    from typing import ClassVar
+
+    from flake8_carrot.analyses import BaseAnalysis
 
 __all__: Sequence[str] = ("RuleCAR110",)
 
@@ -15,6 +22,16 @@ __all__: Sequence[str] = ("RuleCAR110",)
 class RuleCAR110(CarrotRule):
     """Linting rule to ensure a double newline is present after the `__all__` export."""
 
+    REQUIRED_INPUTS: ClassVar[AbstractSet[RuleInput]] = frozenset(
+        {RuleInput.TREE, RuleInput.LINES}
+    )
+    SCOPE: ClassVar[RuleScope] = RuleScope.PREAMBLE
+
+    @classproperty
+    @override
+    def REQUIRED_ANALYSES(cls) -> AbstractSet[type[BaseAnalysis[object]]]:
+        return {FirstAllExportLineNumbersAnalysis}
+
     @classmethod
     @override
     def _format_error_message(cls, ctx: Mapping[str, object]) -> str:
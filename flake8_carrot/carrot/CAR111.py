@@ -3,18 +3,50 @@
 import ast
 from typing import TYPE_CHECKING, override
 
-from flake8_carrot.utils import CarrotRule
+from flake8_carrot.patterns import ImportPattern
+from flake8_carrot.utils import CarrotRule, RuleInput, RuleScope
 
 if TYPE_CHECKING:
     from collections.abc import Mapping, Sequence
+    from collections.abc import Set as AbstractSet
     from tokenize import TokenInfo
+    from typing import ClassVar, Final
 
 __all__: Sequence[str] = ("RuleCAR111",)
 
 
+_PREAMBLE_IMPORT_FROM_NAMES: Final[Sequence[tuple[str, str]]] = (
+    ("collections", "abc.Sequence"),
+    ("collections", "abc.Iterable"),
+    ("collections.abc", "Sequence"),
+    ("collections.abc", "Iterable"),
+    ("typing", "Sequence"),
+    ("typing", "Iterable"),
+)
+_PREAMBLE_IMPORT_NAMES: Final[Sequence[str]] = (
+    "collections",
+    "collections.abc",
+    "collections.abc.Sequence",
+    "collections.abc.Iterable",
+)
+_FIRST_PREAMBLE_IMPORT_PATTERN: Final[ImportPattern] = ImportPattern(
+    import_from_names=_PREAMBLE_IMPORT_FROM_NAMES, import_names=_PREAMBLE_IMPORT_NAMES
+)
+_SECOND_PREAMBLE_IMPORT_PATTERN: Final[ImportPattern] = ImportPattern(
+    import_from_names=_PREAMBLE_IMPORT_FROM_NAMES,
+    import_names=_PREAMBLE_IMPORT_NAMES,
+    allow_trailing_names=True,
+)
+
+
 class RuleCAR111(CarrotRule):
     """Linting rule to ensure preamble lines are separated by only single newlines."""
 
+    REQUIRED_INPUTS: ClassVar[AbstractSet[RuleInput]] = frozenset(
+        {RuleInput.TREE, RuleInput.LINES}
+    )
+    SCOPE: ClassVar[RuleScope] = RuleScope.PREAMBLE
+
     @classmethod
     @override
     def _format_error_message(cls, ctx: Mapping[str, object]) -> str:
@@ -31,52 +63,18 @@ class RuleCAR111(CarrotRule):
             return
 
         match tree.body[0]:
-            case (
-                ast.Expr(value=ast.Constant(value=str()))
-                | ast.ImportFrom(module="collections", names=[ast.alias(name="abc.Sequence")])
-                | ast.ImportFrom(module="collections", names=[ast.alias(name="abc.Iterable")])
-                | ast.ImportFrom(module="collections.abc", names=[ast.alias(name="Sequence")])
-                | ast.ImportFrom(module="collections.abc", names=[ast.alias(name="Iterable")])
-                | ast.ImportFrom(module="typing", names=[ast.alias(name="Sequence")])
-                | ast.ImportFrom(module="typing", names=[ast.alias(name="Iterable")])
-                | ast.Import(names=[ast.alias(name="collections")])
-                | ast.Import(names=[ast.alias(name="collections.abc")])
-                | ast.Import(names=[ast.alias(name="collections.abc.Sequence")])
-                | ast.Import(names=[ast.alias(name="collections.abc.Iterable")])
-            ):
+            case ast.Expr(value=ast.Constant(value=str())):
                 pass
-            case _:
+            case _ if not _FIRST_PREAMBLE_IMPORT_PATTERN.matches(tree.body[0]):
                 return
 
         match tree.body[1]:
             case (
-                ast.ImportFrom(
-                    module="collections",
-                    names=[ast.alias(name="abc.Sequence"), *_],
-                )
-                | ast.ImportFrom(
-                    module="collections",
-                    names=[ast.alias(name="abc.Iterable"), *_],
-                )
-                | ast.ImportFrom(
-                    module="collections.abc",
-                    names=[ast.alias(name="Sequence"), *_],
-                )
-                | ast.ImportFrom(
-                    module="collections.abc",
-                    names=[ast.alias(name="Iterable"), *_],
-                )
-                | ast.ImportFrom(module="typing", names=[ast.alias(name="Sequence"), *_])
-                | ast.ImportFrom(module="typing", names=[ast.alias(name="Iterable"), *_])
-                | ast.Import(names=[ast.alias(name="collections")])
-                | ast.Import(names=[ast.alias(name="collections.abc")])
-                | ast.Import(names=[ast.alias(name="collections.abc.Sequence")])
-                | ast.Import(names=[ast.alias(name="collections.abc.Iterable")])
-                | ast.AnnAssign(target=ast.Name(id="__all__"))
+                ast.AnnAssign(target=ast.Name(id="__all__"))
                 | ast.Assign(targets=[ast.Name(id="__all__"), *_])
             ):
                 pass
-            case _:
+            case _ if not _SECOND_PREAMBLE_IMPORT_PATTERN.matches(tree.body[1]):
                 return
 
         first_line_end_index: int = (tree.body[0].end_lineno or tree.body[0].lineno) - 1
@@ -4,13 +4,15 @@ import re
 import tokenize
 from typing import TYPE_CHECKING, override
 
-from flake8_carrot.utils import CarrotRule, ProblemsContainer
+from flake8_carrot import utils
+from flake8_carrot.utils import CarrotRule, RuleInput, RuleScope
 
 if TYPE_CHECKING:
     import ast
-    from collections.abc import Mapping, Sequence
+    from collections.abc import Callable, Mapping, Sequence
+    from collections.abc import Set as AbstractSet
     from tokenize import TokenInfo
-    from typing import Final
+    from typing import ClassVar, Final
 
 __all__: Sequence[str] = ("RuleCAR120",)
 
@@ -18,6 +20,9 @@ __all__: Sequence[str] = ("RuleCAR120",)
 class RuleCAR120(CarrotRule):
     """Linting rule to ensure ignore comments have the correct amount of whitespace."""
 
+    REQUIRED_INPUTS: ClassVar[AbstractSet[RuleInput]] = frozenset({RuleInput.FILE_TOKENS})
+    SCOPE: ClassVar[RuleScope] = RuleScope.COMMENTS
+
     TYPE_IGNORE_REGEX: Final[str] = (
         r"\s*#(\s*)type(\s*):(\s*)ignore(?:(\s*)\[(\s*)"
         r"[a-z_-]+(\s*)((?:,\s*[a-z_-]+\s*)*)(?:,(\s*))*])?"
@@ -26,6 +31,16 @@ class RuleCAR120(CarrotRule):
         r"\s*#(\s*)noqa(?:(\s*):(\s*)[A-Z0-9]+"
         r"((?:\s*,\s*[A-Z0-9]+)*)(?:\s*,)*)?"
     )
+    TYPE_IGNORE_PATTERN: Final[re.Pattern[str]] = re.compile(rf"{TYPE_IGNORE_REGEX}\Z")
+    NOQA_PATTERN: Final[re.Pattern[str]] = re.compile(rf"{NOQA_REGEX}\Z")
+    TYPE_IGNORE_FIRST_PATTERN: Final[re.Pattern[str]] = re.compile(
+        rf"(?P<type_ignore>{TYPE_IGNORE_REGEX})(?P<noqa>{NOQA_REGEX})\Z"
+    )
+    NOQA_FIRST_PATTERN: Final[re.Pattern[str]] = re.compile(
+        rf"(?P<noqa>{NOQA_REGEX})(?P<type_ignore>{TYPE_IGNORE_REGEX})\Z"
+    )
+    TYPE_IGNORE_CODE_PATTERN: Final[re.Pattern[str]] = re.compile(r",(\s*)[a-z_-]+(\s*)")
+    NOQA_CODE_PATTERN: Final[re.Pattern[str]] = re.compile(r"(\s*),(\s*)[A-Z0-9]+")
 
     @classmethod
     @override
@@ -45,7 +60,7 @@ class RuleCAR120(CarrotRule):
     def _get_single_type_ignore_error_locations(
         cls, line: str, offset: int = 0
     ) -> dict[int, str]:
-        match: re.Match[str] | None = re.search(rf"{cls.TYPE_IGNORE_REGEX}\Z", line)
+        match: re.Match[str] | None = cls.TYPE_IGNORE_PATTERN.search(line)
         if match is None:
             return {}
 
@@ -72,7 +87,7 @@ class RuleCAR120(CarrotRule):
             GROUP7_MATCH_START: Final[int] = match.span(7)[0]
 
             group7_match: re.Match[str]
-            for group7_match in re.finditer(r",(\s*)[a-z_-]+(\s*)", group7):
+            for group7_match in cls.TYPE_IGNORE_CODE_PATTERN.finditer(group7):
                 if group7_match.group(1) != " ":
                     error_locations[offset + GROUP7_MATCH_START + group7_match.span(1)[0]] = (
                         "Replace with a single space"
@@ -90,7 +105,7 @@ class RuleCAR120(CarrotRule):
 
     @classmethod
     def _get_single_noqa_error_locations(cls, line: str, offset: int = 0) -> dict[int, str]:
-        match: re.Match[str] | None = re.search(rf"{cls.NOQA_REGEX}\Z", line)
+        match: re.Match[str] | None = cls.NOQA_PATTERN.search(line)
         if match is None:
             return {}
 
@@ -112,7 +127,7 @@ class RuleCAR120(CarrotRule):
             GROUP4_MATCH_START: Final[int] = match.span(4)[0]
 
             group4_match: re.Match[str]
-            for group4_match in re.finditer(r"(\s*),(\s*)[A-Z0-9]+", group4):
+            for group4_match in cls.NOQA_CODE_PATTERN.finditer(group4):
                 if group4_match.group(1) != "":
                     error_locations[offset + GROUP4_MATCH_START + group4_match.span(1)[0]] = (
                         "Remove all spaces"
@@ -126,10 +141,7 @@ class RuleCAR120(CarrotRule):
 
     @classmethod
     def _get_type_ignore_first_error_locations(cls, line: str) -> Mapping[int, str]:
-        match: re.Match[str] | None = re.search(
-            rf"(?P<type_ignore>{cls.TYPE_IGNORE_REGEX})(?P<noqa>{cls.NOQA_REGEX})\Z",
-            line,
-        )
+        match: re.Match[str] | None = cls.TYPE_IGNORE_FIRST_PATTERN.search(line)
         if match is None:
             return {}
 
@@ -143,10 +155,7 @@ class RuleCAR120(CarrotRule):
 
     @classmethod
     def _get_noqa_first_error_locations(cls, line: str) -> Mapping[int, str]:
-        match: re.Match[str] | None = re.search(
-            rf"(?P<noqa>{cls.NOQA_REGEX})(?P<type_ignore>{cls.TYPE_IGNORE_REGEX})\Z",
-            line,
-        )
+        match: re.Match[str] | None = cls.NOQA_FIRST_PATTERN.search(line)
         if match is None:
             return {}
 
@@ -190,18 +199,21 @@ class RuleCAR120(CarrotRule):
     def run_check(
         self, tree: ast.Module, file_tokens: Sequence[TokenInfo], lines: Sequence[str]
     ) -> None:
-        self.problems = ProblemsContainer(
-            (
-                self.problems
-                | {
-                    (file_token.start[0], file_token.start[1] + match_location): {
-                        "replacement_message": replacement_message,
-                    }
-                    for file_token in file_tokens
-                    for match_location, replacement_message in self._get_all_error_locations(
-                        file_token.string.rstrip(),
-                    ).items()
-                    if file_token.type == tokenize.COMMENT
+        file_token: TokenInfo
+        for file_token in file_tokens:
+            if file_token.type != tokenize.COMMENT:
+                continue
+
+            match_location: int
+            replacement_message: str
+            for match_location, replacement_message in _get_all_error_locations(
+                file_token.string.rstrip(),
+            ).items():
+                self.problems[file_token.start[0], file_token.start[1] + match_location] = {
+                    "replacement_message": replacement_message,
                 }
-            ),
-        )
+
+
+_get_all_error_locations: Final[Callable[[str], Mapping[int, str]]] = (
+    utils.memoise_comment_parser(RuleCAR120._get_all_error_locations)  # noqa: SLF001
+)
@@ -6,12 +6,15 @@ from collections.abc import Mapping
 from enum import Enum
 from typing import TYPE_CHECKING, override
 
-from flake8_carrot.utils import CarrotRule, ProblemsContainer
+from flake8_carrot import utils
+from flake8_carrot.utils import CarrotRule, RuleInput, RuleScope
 
 if TYPE_CHECKING:
     import ast
-    from collections.abc import Sequence
+    from collections.abc import Callable, Sequence
+    from collections.abc import Set as AbstractSet
     from tokenize import TokenInfo
+    from typing import ClassVar, Final
 
 __all__: Sequence[str] = ("RuleCAR121",)
 
@@ -29,9 +32,32 @@ class _IgnoreCommentType(Enum):
     NOQA = (r"\s*#\s*noqa\s*:\s*[A-Z0-9]+(?:\s*,\s*[A-Z0-9]+)*\s*((?:,\s*)+)", "NOQA")
 
 
+def _remove_trailing_commas_group(ignore_comment_type: _IgnoreCommentType) -> str:
+    return ignore_comment_type.value[0].replace(r"((?:,\s*)+)", r"(?:,\s*)*")
+
+
+_SINGLE_ERROR_PATTERNS: Final[Mapping[_IgnoreCommentType, re.Pattern[str]]] = {
+    ignore_comment_type: re.compile(rf"{ignore_comment_type.value[0]}\Z")
+    for ignore_comment_type in _IgnoreCommentType
+}
+_TYPE_IGNORE_FIRST_PATTERN: Final[re.Pattern[str]] = re.compile(
+    rf"(?P<type_ignore>{_remove_trailing_commas_group(_IgnoreCommentType.TYPE_IGNORE)})"
+    rf"(?P<noqa>{_remove_trailing_commas_group(_IgnoreCommentType.NOQA)})"
+    r"\Z"
+)
+_NOQA_FIRST_PATTERN: Final[re.Pattern[str]] = re.compile(
+    rf"(?P<noqa>{_remove_trailing_commas_group(_IgnoreCommentType.NOQA)})"
+    rf"(?P<type_ignore>{_remove_trailing_commas_group(_IgnoreCommentType.TYPE_IGNORE)})"
+    r"\Z"
+)
+
+
 class RuleCAR121(CarrotRule):
     """Linting rule to ensure linting comments do not have an incorrect number of commas."""
 
+    REQUIRED_INPUTS: ClassVar[AbstractSet[RuleInput]] = frozenset({RuleInput.FILE_TOKENS})
+    SCOPE: ClassVar[RuleScope] = RuleScope.COMMENTS
+
     @classmethod
     @override
     def _format_error_message(cls, ctx: Mapping[str, object]) -> str:
@@ -58,7 +84,7 @@ class RuleCAR121(CarrotRule):
     def _get_single_error_locations(
         cls, ignore_comment_type: _IgnoreCommentType, line: str, offset: int = 0
     ) -> _ErrorLocationsDict:
-        match: re.Match[str] | None = re.search(rf"{ignore_comment_type.value[0]}\Z", line)
+        match: re.Match[str] | None = _SINGLE_ERROR_PATTERNS[ignore_comment_type].search(line)
         if match is None:
             return {}
 
@@ -76,24 +102,7 @@ class RuleCAR121(CarrotRule):
 
     @classmethod
     def _get_type_ignore_first_error_locations(cls, line: str) -> _ErrorLocationsMapping:
-        match: re.Match[str] | None = re.search(
-            (
-                rf"(?P<type_ignore>{
-                    _IgnoreCommentType.TYPE_IGNORE.value[0].replace(
-                        r'((?:,\s*)+)',
-                        r'(?:,\s*)*',
-                    )
-                })"
-                rf"(?P<noqa>{
-                    _IgnoreCommentType.NOQA.value[0].replace(
-                        r'((?:,\s*)+)',
-                        r'(?:,\s*)*',
-                    )
-                })"
-                r"\Z"
-            ),
-            line,
-        )
+        match: re.Match[str] | None = _TYPE_IGNORE_FIRST_PATTERN.search(line)
         if match is None:
             return {}
 
@@ -109,24 +118,7 @@ class RuleCAR121(CarrotRule):
 
     @classmethod
     def _get_noqa_first_error_locations(cls, line: str) -> _ErrorLocationsMapping:
-        match: re.Match[str] | None = re.search(
-            (
-                rf"(?P<noqa>{
-                    _IgnoreCommentType.NOQA.value[0].replace(
-                        r'((?:,\s*)+)',
-                        r'(?:,\s*)*',
-                    )
-                })"
-                rf"(?P<type_ignore>{
-                    _IgnoreCommentType.TYPE_IGNORE.value[0].replace(
-                        r'((?:,\s*)+)',
-                        r'(?:,\s*)*',
-                    )
-                })"
-                r"\Z"
-            ),
-            line,
-        )
+        match: re.Match[str] | None = _NOQA_FIRST_PATTERN.search(line)
         if match is None:
             return {}
 
@@ -176,20 +168,24 @@ class RuleCAR121(CarrotRule):
     def run_check(
         self, tree: ast.Module, file_tokens: Sequence[TokenInfo], lines: Sequence[str]
     ) -> None:
-        self.problems = ProblemsContainer(
-            self.problems
-            | {
-                (file_token.start[0], file_token.start[1] + match_location): {
+        file_token: TokenInfo
+        for file_token in file_tokens:
+            if file_token.type != tokenize.COMMENT:
+                continue
+
+            match_location: int
+            ignore_comment_type: _IgnoreCommentType
+            multiple_commas: bool
+            for match_location, (
+                ignore_comment_type,
+                multiple_commas,
+            ) in _get_all_error_locations(file_token.string.rstrip()).items():
+                self.problems[file_token.start[0], file_token.start[1] + match_location] = {
                     "ignore_comment_type": ignore_comment_type,
                     "multiple_commas": multiple_commas,
                 }
-                for file_token in file_tokens
-                for match_location, (
-                    ignore_comment_type,
-                    multiple_commas,
-                ) in self._get_all_error_locations(
-                    file_token.string.rstrip(),
-                ).items()
-                if file_token.type == tokenize.COMMENT
-            },
-        )
+
+
+_get_all_error_locations: Final[Callable[[str], _ErrorLocationsMapping]] = (
+    utils.memoise_comment_parser(RuleCAR121._get_all_error_locations)  # noqa: SLF001
+)
@@ -4,19 +4,32 @@ import re
 import tokenize
 from typing import TYPE_CHECKING, override
 
-from flake8_carrot.utils import CarrotRule
+from flake8_carrot.utils import CarrotRule, RuleInput, RuleScope
 
 if TYPE_CHECKING:
     import ast
     from collections.abc import Mapping, Sequence
+    from collections.abc import Set as AbstractSet
     from tokenize import TokenInfo
+    from typing import ClassVar, Final
 
 __all__: Sequence[str] = ("RuleCAR122",)
 
 
+_NOQA_BEFORE_TYPE_IGNORE_PATTERN: Final[re.Pattern[str]] = re.compile(
+    r"\A.*"
+    r"#\s*(?P<noqa>noqa)(?:\s*:\s*[A-Z0-9]+(?:\s*,\s*[A-Z0-9]+)*(?:\s*,)*)?"
+    r"\s*#\s*type\s*:\s*ignore(?:\s*\[\s*[a-z_-]+\s*(?:,\s*[a-z_-]+\s*)*(?:,\s*)*])?"
+    r"\Z"
+)
+
+
 class RuleCAR122(CarrotRule):
     """Linting rule to enforce correct ordering of NOQA and `type: ignore` comments."""
 
+    REQUIRED_INPUTS: ClassVar[AbstractSet[RuleInput]] = frozenset({RuleInput.FILE_TOKENS})
+    SCOPE: ClassVar[RuleScope] = RuleScope.COMMENTS
+
     @classmethod
     @override
     def _format_error_message(cls, ctx: Mapping[str, object]) -> str:
@@ -31,13 +44,7 @@ class RuleCAR122(CarrotRule):
             if file_token.type != tokenize.COMMENT:
                 continue
 
-            match: re.Match[str] | None = re.fullmatch(
-                (
-                    r"\A.*"
-                    r"#\s*(?P<noqa>noqa)(?:\s*:\s*[A-Z0-9]+(?:\s*,\s*[A-Z0-9]+)*(?:\s*,)*)?"
-                    r"\s*#\s*type\s*:\s*ignore(?:\s*\[\s*[a-z_-]+\s*(?:,\s*[a-z_-]+\s*)*(?:,\s*)*])?"
-                    r"\Z"
-                ),
+            match: re.Match[str] | None = _NOQA_BEFORE_TYPE_IGNORE_PATTERN.fullmatch(
                 file_token.string.rstrip(),
             )
             if match is not None:
@@ -4,19 +4,29 @@ import re
 import tokenize
 from typing import TYPE_CHECKING, override
 
-from flake8_carrot.utils import CarrotRule
+from flake8_carrot.utils import CarrotRule, RuleInput, RuleScope
 
 if TYPE_CHECKING:
     import ast
     from collections.abc import Mapping, Sequence
+    from collections.abc import Set as AbstractSet
     from tokenize import TokenInfo
+    from typing import ClassVar, Final
 
 __all__: Sequence[str] = ("RuleCAR123",)
 
 
+_COMMENT_AFTER_IGNORE_COMMENT_PATTERN: Final[re.Pattern[str]] = re.compile(
+    r"\A.*(?:#\s+noqa[^#]*|#\s+type:\s*ignore[^#]*)+(?!#\s+noqa[^#]*|#\s+type:\s*ignore[^#]*)(#.+)\Z"
+)
+
+
 class RuleCAR123(CarrotRule):
     """Linting rule to enforce correct ordering of line comments and lint ignore comments."""
 
+    REQUIRED_INPUTS: ClassVar[AbstractSet[RuleInput]] = frozenset({RuleInput.FILE_TOKENS})
+    SCOPE: ClassVar[RuleScope] = RuleScope.COMMENTS
+
     @classmethod
     @override
     def _format_error_message(cls, ctx: Mapping[str, object]) -> str:
@@ -31,8 +41,7 @@ class RuleCAR123(CarrotRule):
             if file_token.type != tokenize.COMMENT:
                 continue
 
-            match: re.Match[str] | None = re.fullmatch(
-                r"\A.*(?:#\s+noqa[^#]*|#\s+type:\s*ignore[^#]*)+(?!#\s+noqa[^#]*|#\s+type:\s*ignore[^#]*)(#.+)\Z",
+            match: re.Match[str] | None = _COMMENT_AFTER_IGNORE_COMMENT_PATTERN.fullmatch(
                 file_token.string,
             )
             if match is not None:
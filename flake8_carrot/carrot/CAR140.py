@@ -3,33 +3,32 @@
 import ast
 from typing import TYPE_CHECKING, override
 
-from flake8_carrot import utils
-from flake8_carrot.utils import CarrotRule
+from flake8_carrot.utils import CarrotRule, RuleScope
 
 if TYPE_CHECKING:
     from collections.abc import Mapping, Sequence
-    from tokenize import TokenInfo
+    from typing import ClassVar
+
+    from flake8_carrot.traversal import TraversalEngine
 
 __all__: Sequence[str] = ("RuleCAR140",)
 
 
-class RuleCAR140(CarrotRule, ast.NodeVisitor):
+class RuleCAR140(CarrotRule):
     """Linting rule to warn on the unnecessary use of string strip functions."""
 
+    SCOPE: ClassVar[RuleScope] = RuleScope.STATEMENT
+
     @classmethod
     @override
     def _format_error_message(cls, ctx: Mapping[str, object]) -> str:
         return "Unnecessary use of string strip function"
 
     @override
-    def run_check(
-        self, tree: ast.Module, file_tokens: Sequence[TokenInfo], lines: Sequence[str]
-    ) -> None:
-        self.visit(tree)
+    def register_traversal_hooks(self, engine: TraversalEngine) -> None:
+        engine.add_pre_hook(ast.Compare, self._visit_compare, owner=self)
 
-    @utils.generic_visit_before_return
-    @override
-    def visit_Compare(self, node: ast.Compare) -> None:
+    def _visit_compare(self, node: ast.Compare) -> None:
         string_object: ast.expr
         fallback_column_number: int
         match node:
@@ -3,29 +3,43 @@
 import ast
 from typing import TYPE_CHECKING, override
 
-from flake8_carrot import utils
-from flake8_carrot.utils import CarrotRule
+from flake8_carrot.utils import CarrotRule, RuleScope
 
 if TYPE_CHECKING:
     from collections.abc import Iterable, Mapping, Sequence
-    from tokenize import TokenInfo
+    from typing import ClassVar
+
+    from flake8_carrot.traversal import TraversalEngine
 
 __all__: Sequence[str] = ("RuleCAR141",)
 
 
-class RuleCAR141(CarrotRule, ast.NodeVisitor):
+class RuleCAR141(CarrotRule):
     """Linting rule to warn about uses of string functions that have will have no effect."""
 
+    SCOPE: ClassVar[RuleScope] = RuleScope.STATEMENT
+
     @classmethod
     @override
     def _format_error_message(cls, ctx: Mapping[str, object]) -> str:
         return "String function seems to have no effect"
 
     @override
-    def run_check(
-        self, tree: ast.Module, file_tokens: Sequence[TokenInfo], lines: Sequence[str]
-    ) -> None:
-        self.visit(tree)
+    def register_traversal_hooks(self, engine: TraversalEngine) -> None:
+        engine.add_pre_hook(ast.Module, self._visit_module, owner=self)
+        engine.add_pre_hook(ast.FunctionDef, self._visit_function_def, owner=self)
+        engine.add_pre_hook(ast.AsyncFunctionDef, self._visit_async_function_def, owner=self)
+        engine.add_pre_hook(ast.ClassDef, self._visit_class_def, owner=self)
+        engine.add_pre_hook(ast.For, self._visit_for, owner=self)
+        engine.add_pre_hook(ast.AsyncFor, self._visit_async_for, owner=self)
+        engine.add_pre_hook(ast.While, self._visit_while, owner=self)
+        engine.add_pre_hook(ast.If, self._visit_if, owner=self)
+        engine.add_pre_hook(ast.With, self._visit_with, owner=self)
+        engine.add_pre_hook(ast.AsyncWith, self._visit_async_with, owner=self)
+        engine.add_pre_hook(ast.Try, self._visit_try, owner=self)
+        engine.add_pre_hook(ast.TryStar, self._visit_try_star, owner=self)
+        engine.add_pre_hook(ast.ExceptHandler, self._visit_except_handler, owner=self)
+        engine.add_pre_hook(ast.Match, self._visit_match, owner=self)
 
     def _check_for_string_function(self, statements: Iterable[ast.stmt]) -> None:
         statement: ast.stmt
@@ -39,82 +53,54 @@ class RuleCAR141(CarrotRule, ast.NodeVisitor):
                 case _:
                     continue
 
-    @utils.generic_visit_before_return
-    @override
-    def visit_Module(self, node: ast.Module) -> None:
+    def _visit_module(self, node: ast.Module) -> None:
         self._check_for_string_function(node.body)
 
-    @utils.generic_visit_before_return
-    @override
-    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+    def _visit_function_def(self, node: ast.FunctionDef) -> None:
         self._check_for_string_function(node.body)
 
-    @utils.generic_visit_before_return
-    @override
-    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+    def _visit_async_function_def(self, node: ast.AsyncFunctionDef) -> None:
         self._check_for_string_function(node.body)
 
-    @utils.generic_visit_before_return
-    @override
-    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+    def _visit_class_def(self, node: ast.ClassDef) -> None:
         self._check_for_string_function(node.body)
 
-    @utils.generic_visit_before_return
-    @override
-    def visit_For(self, node: ast.For) -> None:
+    def _visit_for(self, node: ast.For) -> None:
         self._check_for_string_function(node.body)
         self._check_for_string_function(node.orelse)
 
-    @utils.generic_visit_before_return
-    @override
-    def visit_AsyncFor(self, node: ast.AsyncFor) -> None:
+    def _visit_async_for(self, node: ast.AsyncFor) -> None:
         self._check_for_string_function(node.body)
         self._check_for_string_function(node.orelse)
 
-    @utils.generic_visit_before_return
-    @override
-    def visit_While(self, node: ast.While) -> None:
+    def _visit_while(self, node: ast.While) -> None:
         self._check_for_string_function(node.body)
         self._check_for_string_function(node.orelse)
 
-    @utils.generic_visit_before_return
-    @override
-    def visit_If(self, node: ast.If) -> None:
+    def _visit_if(self, node: ast.If) -> None:
         self._check_for_string_function(node.body)
         self._check_for_string_function(node.orelse)
 
-    @utils.generic_visit_before_return
-    @override
-    def visit_With(self, node: ast.With) -> None:
+    def _visit_with(self, node: ast.With) -> None:
         self._check_for_string_function(node.body)
 
-    @utils.generic_visit_before_return
-    @override
-    def visit_AsyncWith(self, node: ast.AsyncWith) -> None:
+    def _visit_async_with(self, node: ast.AsyncWith) -> None:
         self._check_for_string_function(node.body)
 
-    @utils.generic_visit_before_return
-    @override
-    def visit_Try(self, node: ast.Try) -> None:
+    def _visit_try(self, node: ast.Try) -> None:
         self._check_for_string_function(node.body)
         self._check_for_string_function(node.orelse)
         self._check_for_string_function(node.finalbody)
 
-    @utils.generic_visit_before_return
-    @override
-    def visit_TryStar(self, node: ast.TryStar) -> None:
+    def _visit_try_star(self, node: ast.TryStar) -> None:
         self._check_for_string_function(node.body)
         self._check_for_string_function(node.orelse)
         self._check_for_string_function(node.finalbody)
 
-    @utils.generic_visit_before_return
-    @override
-    def visit_ExceptHandler(self, node: ast.ExceptHandler) -> None:
+    def _visit_except_handler(self, node: ast.ExceptHandler) -> None:
         self._check_for_string_function(node.body)
 
-    @utils.generic_visit_before_return
-    @override
-    def visit_Match(self, node: ast.Match) -> None:
+    def _visit_match(self, node: ast.Match) -> None:
         case: ast.match_case
         for case in node.cases:
             self._check_for_string_function(case.body)
@@ -4,19 +4,22 @@ import ast
 from enum import Enum
 from typing import TYPE_CHECKING, override
 
-from flake8_carrot import utils
-from flake8_carrot.utils import CarrotRule
+from flake8_carrot.utils import CarrotRule, RuleScope
 
 if TYPE_CHECKING:
     from collections.abc import Mapping, Sequence
-    from tokenize import TokenInfo
+    from typing import ClassVar
+
+    from flake8_carrot.traversal import TraversalEngine
 
 __all__: Sequence[str] = ("RuleCAR150",)
 
 
-class RuleCAR150(CarrotRule, ast.NodeVisitor):
+class RuleCAR150(CarrotRule):
     """Linting rule to warn about declaring `*args` or `**kwargs` as function parameters."""
 
+    SCOPE: ClassVar[RuleScope] = RuleScope.STATEMENT
+
     class _InvalidArgumentType(Enum):
         STAR_ARGS = "`*args`"
         STAR_STAR_KWARGS = "`**kwargs`"
@@ -37,10 +40,9 @@ class RuleCAR150(CarrotRule, ast.NodeVisitor):
         } in function definition"
 
     @override
-    def run_check(
-        self, tree: ast.Module, file_tokens: Sequence[TokenInfo], lines: Sequence[str]
-    ) -> None:
-        self.visit(tree)
+    def register_traversal_hooks(self, engine: TraversalEngine) -> None:
+        engine.add_pre_hook(ast.FunctionDef, self._visit_function_def, owner=self)
+        engine.add_pre_hook(ast.AsyncFunctionDef, self._visit_async_function_def, owner=self)
 
     def _check_args(self, args: ast.arguments) -> None:
         if args.vararg is not None:
@@ -53,12 +55,8 @@ class RuleCAR150(CarrotRule, ast.NodeVisitor):
                 "invalid_argument_type": self._InvalidArgumentType.STAR_STAR_KWARGS,
             }
 
-    @utils.generic_visit_before_return
-    @override
-    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+    def _visit_function_def(self, node: ast.FunctionDef) -> None:
         self._check_args(node.args)
 
-    @utils.generic_visit_before_return
-    @override
-    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+    def _visit_async_function_def(self, node: ast.AsyncFunctionDef) -> None:
         self._check_args(node.args)
@@ -4,19 +4,22 @@ import ast
 from enum import Enum
 from typing import TYPE_CHECKING, override
 
-from flake8_carrot import utils
-from flake8_carrot.utils import CarrotRule
+from flake8_carrot.utils import CarrotRule, RuleScope
 
 if TYPE_CHECKING:
     from collections.abc import Mapping, Sequence
-    from tokenize import TokenInfo
+    from typing import ClassVar
+
+    from flake8_carrot.traversal import TraversalEngine
 
 __all__: Sequence[str] = ("RuleCAR151",)
 
 
-class RuleCAR151(CarrotRule, ast.NodeVisitor):
+class RuleCAR151(CarrotRule):
     """Linting rule to warn about passing `*args` or `**kwargs` as function arguments."""
 
+    SCOPE: ClassVar[RuleScope] = RuleScope.STATEMENT
+
     class _InvalidArgumentType(Enum):
         STAR_ARGS = "`*args`"
         STAR_STAR_KWARGS = "`**kwargs`"
@@ -37,14 +40,10 @@ class RuleCAR151(CarrotRule, ast.NodeVisitor):
         } passed to super-function call"
 
     @override
-    def run_check(
-        self, tree: ast.Module, file_tokens: Sequence[TokenInfo], lines: Sequence[str]
-    ) -> None:
-        self.visit(tree)
+    def register_traversal_hooks(self, engine: TraversalEngine) -> None:
+        engine.add_pre_hook(ast.Call, self._visit_call, owner=self)
 
-    @utils.generic_visit_before_return
-    @override
-    def visit_Call(self, node: ast.Call) -> None:
+    def _visit_call(self, node: ast.Call) -> None:
         match node.func:
             case ast.Attribute(value=ast.Call(func=ast.Name(id="super"))):
                 arg: ast.expr
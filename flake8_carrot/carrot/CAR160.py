@@ -3,18 +3,23 @@
 import ast
 from typing import TYPE_CHECKING, override
 
-from flake8_carrot.utils import CarrotRule
+from flake8_carrot.traversal import TraversalSignal
+from flake8_carrot.utils import CarrotRule, RuleScope
 
 if TYPE_CHECKING:
     from collections.abc import Mapping, Sequence
-    from tokenize import TokenInfo
+    from typing import ClassVar
+
+    from flake8_carrot.traversal import TraversalEngine
 
 __all__: Sequence[str] = ("RuleCAR160",)
 
 
-class RuleCAR160(CarrotRule, ast.NodeVisitor):
+class RuleCAR160(CarrotRule):
     """Linting rule to ensure classes are not defined inside functions."""
 
+    SCOPE: ClassVar[RuleScope] = RuleScope.STATEMENT
+
     @classmethod
     @override
     def _format_error_message(cls, ctx: Mapping[str, object]) -> str:
@@ -47,10 +52,9 @@ class RuleCAR160(CarrotRule, ast.NodeVisitor):
         }"
 
     @override
-    def run_check(
-        self, tree: ast.Module, file_tokens: Sequence[TokenInfo], lines: Sequence[str]
-    ) -> None:
-        self.visit(tree)
+    def register_traversal_hooks(self, engine: TraversalEngine) -> None:
+        engine.add_pre_hook(ast.FunctionDef, self._visit_function_def, owner=self)
+        engine.add_pre_hook(ast.AsyncFunctionDef, self._visit_async_function_def, owner=self)
 
     def _check_function(self, node: ast.FunctionDef | ast.AsyncFunctionDef) -> None:
         inner_node: ast.AST
@@ -63,11 +67,11 @@ class RuleCAR160(CarrotRule, ast.NodeVisitor):
                 }
 
     # NOTE: Don't descend into visitor children
-    @override
-    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+    def _visit_function_def(self, node: ast.FunctionDef) -> TraversalSignal:
         self._check_function(node)
+        return TraversalSignal.SKIP_CHILDREN
 
     # NOTE: Don't descend into visitor children
-    @override
-    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+    def _visit_async_function_def(self, node: ast.AsyncFunctionDef) -> TraversalSignal:
         self._check_function(node)
+        return TraversalSignal.SKIP_CHILDREN
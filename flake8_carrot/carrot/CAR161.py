@@ -4,19 +4,42 @@ import ast
 import builtins
 from typing import TYPE_CHECKING, override
 
-from flake8_carrot import utils
-from flake8_carrot.utils import CarrotRule
+from flake8_carrot.patterns import DottedNamePattern
+from flake8_carrot.utils import CarrotRule, RuleScope
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable, Mapping, Sequence
-    from tokenize import TokenInfo
+    from collections.abc import Mapping, Sequence
+    from typing import ClassVar, Final
+
+    from flake8_carrot.traversal import TraversalEngine
 
 __all__: Sequence[str] = ("RuleCAR161",)
 
 
-class RuleCAR161(CarrotRule, ast.NodeVisitor):
+_ABSTRACTMETHOD_DECORATOR_PATTERN: Final[DottedNamePattern] = DottedNamePattern(
+    ("abstractmethod", "abc.abstractmethod"), match_calls=True
+)
+_PROPERTY_DECORATOR_PATTERN: Final[DottedNamePattern] = DottedNamePattern(
+    (
+        "property",
+        "cached_property",
+        "classproperty",
+        "cached_classproperty",
+        "classproperties.classproperty",
+        "classproperties.cached_classproperty",
+    ),
+    match_calls=True,
+)
+_OVERLOAD_DECORATOR_PATTERN: Final[DottedNamePattern] = DottedNamePattern(
+    ("overload", "typing.overload", "typing_extensions.overload"), match_calls=True
+)
+
+
+class RuleCAR161(CarrotRule):
     """Linting rule to ensure the body of abstract methods only contains the docstring."""
 
+    SCOPE: ClassVar[RuleScope] = RuleScope.STATEMENT
+
     @classmethod
     @override
     def _format_error_message(cls, ctx: Mapping[str, object]) -> str:
@@ -42,89 +65,12 @@ class RuleCAR161(CarrotRule, ast.NodeVisitor):
         } "
 
     @override
-    def run_check(
-        self, tree: ast.Module, file_tokens: Sequence[TokenInfo], lines: Sequence[str]
-    ) -> None:
-        self.visit(tree)
-
-    @classmethod
-    def _has_abstractmethod_decorator(cls, decorators: Iterable[ast.expr]) -> bool:
-        decorator_node: ast.expr
-        for decorator_node in decorators:
-            match decorator_node:
-                case (
-                    ast.Name(id="abstractmethod")
-                    | ast.Attribute(value=ast.Name(id="abc"), attr="abstractmethod")
-                    | ast.Call(
-                        func=(
-                            ast.Name(id="abstractmethod")
-                            | ast.Attribute(value=ast.Name(id="abc"), attr="abstractmethod")
-                        )
-                    )
-                ):
-                    return True
-
-        return False
-
-    @classmethod
-    def _has_property_decorator(cls, decorators: Iterable[ast.expr]) -> bool:
-        decorator_node: ast.expr
-        for decorator_node in decorators:
-            match decorator_node:
-                case (
-                    ast.Name(id="property")
-                    | ast.Name("cached_property")
-                    | ast.Name(id="classproperty")
-                    | ast.Name(id="cached_classproperty")
-                    | ast.Attribute(value=ast.Name(id="classproperties"), attr="classproperty")
-                    | ast.Attribute(
-                        value=ast.Name(id="classproperties"), attr="cached_classproperty"
-                    )
-                    | ast.Call(
-                        func=(
-                            ast.Name(id="property")
-                            | ast.Name("cached_property")
-                            | ast.Name(id="classproperty")
-                            | ast.Name(id="cached_classproperty")
-                            | ast.Attribute(
-                                value=ast.Name(id="classproperties"), attr="classproperty"
-                            )
-                            | ast.Attribute(
-                                value=ast.Name(id="classproperties"),
-                                attr="cached_classproperty",
-                            )
-                        )
-                    )
-                ):
-                    return True
-
-        return False
-
-    @classmethod
-    def _has_overload_decorator(cls, decorators: Iterable[ast.expr]) -> bool:
-        decorator_node: ast.expr
-        for decorator_node in decorators:
-            match decorator_node:
-                case (
-                    ast.Name(id="overload")
-                    | ast.Attribute(value=ast.Name(id="typing"), attr="overload")
-                    | ast.Attribute(value=ast.Name(id="typing_extensions"), attr="overload")
-                    | ast.Call(
-                        func=(
-                            ast.Name(id="overload")
-                            | ast.Attribute(value=ast.Name(id="typing"), attr="overload")
-                            | ast.Attribute(
-                                value=ast.Name(id="typing_extensions"), attr="overload"
-                            )
-                        )
-                    )
-                ):
-                    return True
-
-        return False
+    def register_traversal_hooks(self, engine: TraversalEngine) -> None:
+        engine.add_pre_hook(ast.FunctionDef, self._visit_function_def, owner=self)
+        engine.add_pre_hook(ast.AsyncFunctionDef, self._visit_async_function_def, owner=self)
 
     def _check_function(self, node: ast.FunctionDef | ast.AsyncFunctionDef) -> None:
-        if not self._has_abstractmethod_decorator(node.decorator_list):
+        if not _ABSTRACTMETHOD_DECORATOR_PATTERN.matches_any(node.decorator_list):
             return
 
         body_node: ast.stmt
@@ -134,10 +80,10 @@ class RuleCAR161(CarrotRule, ast.NodeVisitor):
                     continue
                 case ast.Pass() if node.name.strip().startswith(
                     "_"
-                ) or self._has_property_decorator(node.decorator_list):
+                ) or _PROPERTY_DECORATOR_PATTERN.matches_any(node.decorator_list):
                     continue
                 case ast.Expr(value=ast.Constant(value=builtins.Ellipsis)) if (
-                    self._has_overload_decorator(node.decorator_list)
+                    _OVERLOAD_DECORATOR_PATTERN.matches_any(node.decorator_list)
                 ):
                     continue
                 case _:
@@ -145,12 +91,8 @@ class RuleCAR161(CarrotRule, ast.NodeVisitor):
                         "abstract_method_name": node.name
                     }
 
-    @utils.generic_visit_before_return
-    @override
-    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+    def _visit_function_def(self, node: ast.FunctionDef) -> None:
         self._check_function(node)
 
-    @utils.generic_visit_before_return
-    @override
-    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+    def _visit_async_function_def(self, node: ast.AsyncFunctionDef) -> None:
         self._check_function(node)
@@ -3,19 +3,34 @@
 import ast
 from typing import TYPE_CHECKING, override
 
-from flake8_carrot import utils
-from flake8_carrot.utils import CarrotRule
+from flake8_carrot.patterns import DottedNamePattern
+from flake8_carrot.utils import CarrotRule, RuleScope
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable, Mapping, Sequence
-    from tokenize import TokenInfo
+    from collections.abc import Mapping, Sequence
+    from typing import ClassVar, Final
+
+    from flake8_carrot.traversal import TraversalEngine
 
 __all__: Sequence[str] = ("RuleCAR162",)
 
 
-class RuleCAR162(CarrotRule, ast.NodeVisitor):
+_CLASSPROPERTY_DECORATOR_PATTERN: Final[DottedNamePattern] = DottedNamePattern(
+    (
+        "classproperty",
+        "cached_classproperty",
+        "classproperties.classproperty",
+        "classproperties.cached_classproperty",
+    ),
+    match_calls=True,
+)
+
+
+class RuleCAR162(CarrotRule):
     """Linting rule class-property names should be in all caps."""
 
+    SCOPE: ClassVar[RuleScope] = RuleScope.STATEMENT
+
     @classmethod
     @override
     def _format_error_message(cls, ctx: Mapping[str, object]) -> str:
@@ -33,54 +48,19 @@ class RuleCAR162(CarrotRule, ast.NodeVisitor):
         }"
 
     @override
-    def run_check(
-        self, tree: ast.Module, file_tokens: Sequence[TokenInfo], lines: Sequence[str]
-    ) -> None:
-        self.visit(tree)
-
-    @classmethod
-    def _has_classproperty_decorator(cls, decorators: Iterable[ast.expr]) -> bool:
-        decorator_node: ast.expr
-        for decorator_node in decorators:
-            match decorator_node:
-                case (
-                    ast.Name(id="classproperty")
-                    | ast.Name(id="cached_classproperty")
-                    | ast.Attribute(value=ast.Name(id="classproperties"), attr="classproperty")
-                    | ast.Attribute(
-                        value=ast.Name(id="classproperties"), attr="cached_classproperty"
-                    )
-                    | ast.Call(
-                        func=(
-                            ast.Name(id="classproperty")
-                            | ast.Name(id="cached_classproperty")
-                            | ast.Attribute(
-                                value=ast.Name(id="classproperties"), attr="classproperty"
-                            )
-                            | ast.Attribute(
-                                value=ast.Name(id="classproperties"),
-                                attr="cached_classproperty",
-                            )
-                        )
-                    )
-                ):
-                    return True
-
-        return False
+    def register_traversal_hooks(self, engine: TraversalEngine) -> None:
+        engine.add_pre_hook(ast.FunctionDef, self._visit_function_def, owner=self)
+        engine.add_pre_hook(ast.AsyncFunctionDef, self._visit_async_function_def, owner=self)
 
     def _check_function(self, node: ast.FunctionDef | ast.AsyncFunctionDef) -> None:
-        if not self._has_classproperty_decorator(node.decorator_list):
+        if not _CLASSPROPERTY_DECORATOR_PATTERN.matches_any(node.decorator_list):
             return
 
         if not node.name.isupper():
             self.problems[(node.lineno, node.col_offset)] = {"classproperty_name": node.name}
 
-    @utils.generic_visit_before_return
-    @override
-    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+    def _visit_function_def(self, node: ast.FunctionDef) -> None:
         self._check_function(node)
 
-    @utils.generic_visit_before_return
-    @override
-    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+    def _visit_async_function_def(self, node: ast.AsyncFunctionDef) -> None:
         self._check_function(node)
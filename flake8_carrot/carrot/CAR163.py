@@ -3,58 +3,40 @@
 import ast
 from typing import TYPE_CHECKING, override
 
-from flake8_carrot import utils
-from flake8_carrot.utils import CarrotRule
+from flake8_carrot.patterns import DottedNamePattern
+from flake8_carrot.utils import CarrotRule, RuleScope
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable, Mapping, Sequence
-    from tokenize import TokenInfo
+    from collections.abc import Mapping, Sequence
+    from typing import ClassVar, Final
+
+    from flake8_carrot.traversal import TraversalEngine
 
 __all__: Sequence[str] = ("RuleCAR163",)
 
 
-class RuleCAR163(CarrotRule, ast.NodeVisitor):
+_OVERRIDE_DECORATOR_PATTERN: Final[DottedNamePattern] = DottedNamePattern(
+    ("override", "typing.override", "typing_extensions.override"), match_calls=True
+)
+
+
+class RuleCAR163(CarrotRule):
     """Linting rule to warn when`__init__()` methods are not marked with `@override`."""
 
+    SCOPE: ClassVar[RuleScope] = RuleScope.STATEMENT
+
     @classmethod
     @override
     def _format_error_message(cls, ctx: Mapping[str, object]) -> str:
         return "`__init__()` method not marked with `@override`"
 
     @override
-    def run_check(
-        self, tree: ast.Module, file_tokens: Sequence[TokenInfo], lines: Sequence[str]
-    ) -> None:
-        self.visit(tree)
+    def register_traversal_hooks(self, engine: TraversalEngine) -> None:
+        engine.add_pre_hook(ast.FunctionDef, self._visit_function_def, owner=self)
 
-    @classmethod
-    def _has_override_decorator(cls, decorators: Iterable[ast.expr]) -> bool:
-        decorator_node: ast.expr
-        for decorator_node in decorators:
-            match decorator_node:
-                case (
-                    ast.Name(id="override")
-                    | ast.Attribute(value=ast.Name(id="typing"), attr="override")
-                    | ast.Attribute(value=ast.Name(id="typing_extensions"), attr="override")
-                    | ast.Call(
-                        func=(
-                            ast.Name(id="override")
-                            | ast.Attribute(value=ast.Name(id="typing"), attr="override")
-                            | ast.Attribute(
-                                value=ast.Name(id="typing_extensions"), attr="override"
-                            )
-                        )
-                    )
-                ):
-                    return True
-
-        return False
-
-    @utils.generic_visit_before_return
-    @override
-    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+    def _visit_function_def(self, node: ast.FunctionDef) -> None:
         if node.name != "__init__":
             return
 
-        if not self._has_override_decorator(node.decorator_list):
+        if not _OVERRIDE_DECORATOR_PATTERN.matches_any(node.decorator_list):
             self.problems.add_without_ctx((node.lineno, node.col_offset))
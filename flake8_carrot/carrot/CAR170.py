@@ -3,18 +3,22 @@
 import ast
 from typing import TYPE_CHECKING, override
 
-from flake8_carrot.utils import CarrotRule
+from flake8_carrot.utils import CarrotRule, RuleScope
 
 if TYPE_CHECKING:
     from collections.abc import Mapping, Sequence
-    from tokenize import TokenInfo
+    from typing import ClassVar
+
+    from flake8_carrot.traversal import TraversalEngine
 
 __all__: Sequence[str] = ("RuleCAR170",)
 
 
-class RuleCAR170(CarrotRule, ast.NodeVisitor):
+class RuleCAR170(CarrotRule):
     """Linting rule to ensure union typesin `isintance()` calls are replaced by tuples."""
 
+    SCOPE: ClassVar[RuleScope] = RuleScope.STATEMENT
+
     @classmethod
     def _convert_expr_to_tuple(cls, expr: ast.expr) -> str:
         match expr:
@@ -54,13 +58,10 @@ class RuleCAR170(CarrotRule, ast.NodeVisitor):
         }"
 
     @override
-    def run_check(
-        self, tree: ast.Module, file_tokens: Sequence[TokenInfo], lines: Sequence[str]
-    ) -> None:
-        self.visit(tree)
+    def register_traversal_hooks(self, engine: TraversalEngine) -> None:
+        engine.add_pre_hook(ast.Call, self._visit_call, owner=self)
 
-    @override
-    def generic_visit(self, node: ast.AST) -> None:
+    def _visit_call(self, node: ast.Call) -> None:
         match node:
             case ast.Call(
                 func=(
@@ -73,5 +74,3 @@ class RuleCAR170(CarrotRule, ast.NodeVisitor):
                 args=[_, ast.BinOp(op=ast.BitOr()) as type_union],
             ):
                 self.problems[(node.lineno, node.col_offset)] = {"type_union": type_union}
-
-        super().generic_visit(node=node)
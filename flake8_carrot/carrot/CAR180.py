@@ -4,19 +4,22 @@ import ast
 from enum import Enum
 from typing import TYPE_CHECKING, override
 
-from flake8_carrot import utils
-from flake8_carrot.utils import CarrotRule
+from flake8_carrot.utils import CarrotRule, RuleScope
 
 if TYPE_CHECKING:
     from collections.abc import Mapping, Sequence
-    from tokenize import TokenInfo
+    from typing import ClassVar
+
+    from flake8_carrot.traversal import TraversalEngine
 
 __all__: Sequence[str] = ("RuleCAR180",)
 
 
-class RuleCAR180(CarrotRule, ast.NodeVisitor):
+class RuleCAR180(CarrotRule):
     """Linting rule to suggest replacing repeated boolean operators with `all()`/`any()`."""
 
+    SCOPE: ClassVar[RuleScope] = RuleScope.STATEMENT
+
     class _OpType(Enum):
         OR = "or", "any(...)"
         AND = "and", "all(...)"
@@ -33,14 +36,10 @@ class RuleCAR180(CarrotRule, ast.NodeVisitor):
         } with {f' `{op_type.value[1]}`' if op_type is not None else 'call to `any()`/'}"
 
     @override
-    def run_check(
-        self, tree: ast.Module, file_tokens: Sequence[TokenInfo], lines: Sequence[str]
-    ) -> None:
-        self.visit(tree)
+    def register_traversal_hooks(self, engine: TraversalEngine) -> None:
+        engine.add_pre_hook(ast.BoolOp, self._visit_bool_op, owner=self)
 
-    @utils.generic_visit_before_return
-    @override
-    def visit_BoolOp(self, node: ast.BoolOp) -> None:
+    def _visit_bool_op(self, node: ast.BoolOp) -> None:
         if len(node.values) < 4:
             return
 
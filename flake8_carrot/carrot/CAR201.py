@@ -3,29 +3,36 @@
 import ast
 from typing import TYPE_CHECKING, override
 
-from flake8_carrot import utils
-from flake8_carrot.utils import CarrotRule
+from flake8_carrot.traversal import TraversalSignal
+from flake8_carrot.utils import CarrotRule, RuleScope
 
 if TYPE_CHECKING:
     from collections.abc import Mapping, Sequence
-    from tokenize import TokenInfo
+    from typing import ClassVar
+
+    from flake8_carrot.traversal import TraversalEngine
 
 __all__: Sequence[str] = ("RuleCAR201",)
 
 
-class RuleCAR201(CarrotRule, ast.NodeVisitor):
+class RuleCAR201(CarrotRule):
     """Linting rule to ensure assignment of `logging.Logger` objects are annotated as final."""
 
+    SCOPE: ClassVar[RuleScope] = RuleScope.STATEMENT
+
     @classmethod
     @override
     def _format_error_message(cls, ctx: Mapping[str, object]) -> str:
         return "Assignment of `logging.Logger` object should be annotated as `Final[Logger]`"
 
     @override
-    def run_check(
-        self, tree: ast.Module, file_tokens: Sequence[TokenInfo], lines: Sequence[str]
-    ) -> None:
-        self.visit(tree)
+    def register_traversal_hooks(self, engine: TraversalEngine) -> None:
+        engine.add_pre_hook(ast.Assign, self._visit_assign, owner=self)
+        engine.add_pre_hook(ast.AnnAssign, self._visit_ann_assign, owner=self)
+        engine.add_pre_hook(ast.AsyncFunctionDef, self._skip_children, owner=self)
+        engine.add_pre_hook(ast.FunctionDef, self._skip_children, owner=self)
+        engine.add_pre_hook(ast.ClassDef, self._skip_children, owner=self)
+        engine.add_pre_hook(ast.For, self._skip_children, owner=self)
 
     def _add_unannotated_problem(self, node: ast.Assign) -> None:
         self.problems.add_without_ctx(
@@ -89,9 +96,7 @@ class RuleCAR201(CarrotRule, ast.NodeVisitor):
             case _:
                 return False
 
-    @utils.generic_visit_before_return
-    @override
-    def visit_Assign(self, node: ast.Assign) -> None:
+    def _visit_assign(self, node: ast.Assign) -> None:
         match node.value:
             case (
                 ast.Call(func=ast.Attribute(value=ast.Name(id="logging"), attr="getLogger"))
@@ -106,9 +111,7 @@ class RuleCAR201(CarrotRule, ast.NodeVisitor):
                 self._add_unannotated_problem(node)
                 return
 
-    @utils.generic_visit_before_return
-    @override
-    def visit_AnnAssign(self, node: ast.AnnAssign) -> None:
+    def _visit_ann_assign(self, node: ast.AnnAssign) -> None:
         match node.annotation:
             case (
                 ast.Constant(value="Final[Logger]")
@@ -148,18 +151,6 @@ class RuleCAR201(CarrotRule, ast.NodeVisitor):
                 )
                 return
 
-    @override
-    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
-        return
-
-    @override
-    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
-        return
-
-    @override
-    def visit_ClassDef(self, node: ast.ClassDef) -> None:
-        return
-
-    @override
-    def visit_For(self, node: ast.For) -> None:
-        return
+    @classmethod
+    def _skip_children(cls, _node: ast.AST) -> TraversalSignal:
+        return TraversalSignal.SKIP_CHILDREN
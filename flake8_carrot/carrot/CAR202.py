@@ -3,33 +3,33 @@
 import ast
 from typing import TYPE_CHECKING, override
 
-from flake8_carrot import utils
-from flake8_carrot.utils import CarrotRule
+from flake8_carrot.utils import CarrotRule, RuleScope
 
 if TYPE_CHECKING:
     from collections.abc import Mapping, Sequence
-    from tokenize import TokenInfo
+    from typing import ClassVar
+
+    from flake8_carrot.traversal import TraversalEngine
 
 __all__: Sequence[str] = ("RuleCAR202",)
 
 
-class RuleCAR202(CarrotRule, ast.NodeVisitor):
+class RuleCAR202(CarrotRule):
     """Linting rule to ensure `logging.Logger` variables contain the word 'logger'."""
 
+    SCOPE: ClassVar[RuleScope] = RuleScope.STATEMENT
+
     @classmethod
     @override
     def _format_error_message(cls, ctx: Mapping[str, object]) -> str:
         return "`logging.Logger` variable name should contain the word 'logger'"
 
     @override
-    def run_check(
-        self, tree: ast.Module, file_tokens: Sequence[TokenInfo], lines: Sequence[str]
-    ) -> None:
-        self.visit(tree)
+    def register_traversal_hooks(self, engine: TraversalEngine) -> None:
+        engine.add_pre_hook(ast.Assign, self._visit_assign, owner=self)
+        engine.add_pre_hook(ast.AnnAssign, self._visit_ann_assign, owner=self)
 
-    @utils.generic_visit_before_return
-    @override
-    def visit_Assign(self, node: ast.Assign) -> None:
+    def _visit_assign(self, node: ast.Assign) -> None:
         if "logger" in "".join(ast.unparse(target) for target in node.targets).lower():
             return
 
@@ -42,9 +42,7 @@ class RuleCAR202(CarrotRule, ast.NodeVisitor):
             ):
                 self.problems.add_without_ctx((node.lineno, node.col_offset))
 
-    @utils.generic_visit_before_return
-    @override
-    def visit_AnnAssign(self, node: ast.AnnAssign) -> None:
+    def _visit_ann_assign(self, node: ast.AnnAssign) -> None:
         if "logger" in ast.unparse(node.target).lower():
             return
 
@@ -5,20 +5,37 @@ import re
 from enum import Enum
 from typing import TYPE_CHECKING, override
 
+from typed_classproperties import classproperty
+
 from flake8_carrot import utils
+from flake8_carrot.analyses import SlashCommandGroupNamesAnalysis
 from flake8_carrot.utils import CarrotRule
 
 if TYPE_CHECKING:
     from collections.abc import Mapping, Sequence
-    from tokenize import TokenInfo
+    from collections.abc import Set as AbstractSet
     from typing import Final
 
+    from flake8_carrot.analyses import BaseAnalysis
+    from flake8_carrot.traversal import TraversalEngine
+
 __all__: Sequence[str] = ("RuleCAR301",)
 
 
-class RuleCAR301(CarrotRule, ast.NodeVisitor):
+_INVALID_CHARACTER_PATTERNS: Final[Sequence[tuple[str, re.Pattern[str]]]] = tuple(
+    (invalid_character, re.compile(rf"\{invalid_character}"))
+    for invalid_character in "`!¬£$€%^&*+=,<>?#~`"
+)
+
+
+class RuleCAR301(CarrotRule):
     """Linting rule to ensure pycord names don't have any invalid characters."""
 
+    @classproperty
+    @override
+    def REQUIRED_ANALYSES(cls) -> AbstractSet[type[BaseAnalysis[object]]]:
+        return {SlashCommandGroupNamesAnalysis}
+
     class _FunctionType(Enum):
         COMMAND = "slash-command"
         OPTION = "option"
@@ -61,10 +78,8 @@ class RuleCAR301(CarrotRule, ast.NodeVisitor):
         }"
 
     @override
-    def run_check(
-        self, tree: ast.Module, file_tokens: Sequence[TokenInfo], lines: Sequence[str]
-    ) -> None:
-        self.visit(tree)
+    def register_traversal_hooks(self, engine: TraversalEngine) -> None:
+        engine.add_pre_hook(ast.AsyncFunctionDef, self._visit_async_function_def, owner=self)
 
     def _check_single_argument(
         self, argument: ast.expr, function_type: RuleCAR301._FunctionType
@@ -89,11 +104,10 @@ class RuleCAR301(CarrotRule, ast.NodeVisitor):
                 "incorrect_name": argument.value,
             }
 
-        for invalid_character in "`!¬£$€%^&*+=,<>?#~`":
+        invalid_character_pattern: re.Pattern[str]
+        for invalid_character, invalid_character_pattern in _INVALID_CHARACTER_PATTERNS:
             invalid_character_match: re.Match[str]
-            for invalid_character_match in re.finditer(
-                rf"\{invalid_character}", argument.value
-            ):
+            for invalid_character_match in invalid_character_pattern.finditer(argument.value):
                 self.problems[
                     (
                         argument.lineno,
@@ -143,11 +157,7 @@ class RuleCAR301(CarrotRule, ast.NodeVisitor):
                 if (
                     possible_slash_command_group_name
                     in self.plugin.found_slash_command_group_names
-                    and possible_pycord_decorator_name
-                    in (
-                        utils.PYCORD_SLASH_COMMAND_DECORATOR_NAMES
-                        | utils.PYCORD_CONTEXT_COMMAND_DECORATOR_NAMES
-                    )
+                    and possible_pycord_decorator_name in utils.PYCORD_COMMAND_DECORATOR_NAMES
                 ):
                     self._check_all_arguments(decorator_node, self._FunctionType.COMMAND)
                     return
@@ -160,9 +170,7 @@ class RuleCAR301(CarrotRule, ast.NodeVisitor):
                     self._check_all_arguments(decorator_node, self._FunctionType.OPTION)
                     return
 
-    @utils.generic_visit_before_return
-    @override
-    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+    def _visit_async_function_def(self, node: ast.AsyncFunctionDef) -> None:
         decorator_node: ast.expr
         for decorator_node in node.decorator_list:
             self._check_decorator(decorator_node)
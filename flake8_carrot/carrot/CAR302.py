@@ -3,20 +3,31 @@
 import ast
 from typing import TYPE_CHECKING, override
 
+from typed_classproperties import classproperty
+
 from flake8_carrot import utils
+from flake8_carrot.analyses import SlashCommandGroupNamesAnalysis
 from flake8_carrot.utils import CarrotRule
 
 if TYPE_CHECKING:
     from collections.abc import Iterable, Mapping, Sequence
-    from tokenize import TokenInfo
+    from collections.abc import Set as AbstractSet
     from typing import Final
 
+    from flake8_carrot.analyses import BaseAnalysis
+    from flake8_carrot.traversal import TraversalEngine
+
 __all__: Sequence[str] = ("RuleCAR302",)
 
 
-class RuleCAR302(CarrotRule, ast.NodeVisitor):
+class RuleCAR302(CarrotRule):
     """Linting rule to ensure cog subclass names end with "Command(s)"."""
 
+    @classproperty
+    @override
+    def REQUIRED_ANALYSES(cls) -> AbstractSet[type[BaseAnalysis[object]]]:
+        return {SlashCommandGroupNamesAnalysis}
+
     @classmethod
     @override
     def _format_error_message(cls, ctx: Mapping[str, object]) -> str:
@@ -39,10 +50,8 @@ class RuleCAR302(CarrotRule, ast.NodeVisitor):
         )
 
     @override
-    def run_check(
-        self, tree: ast.Module, file_tokens: Sequence[TokenInfo], lines: Sequence[str]
-    ) -> None:
-        self.visit(tree)
+    def register_traversal_hooks(self, engine: TraversalEngine) -> None:
+        engine.add_pre_hook(ast.ClassDef, self._visit_class_def, owner=self)
 
     def _function_is_command(self, node: ast.AsyncFunctionDef) -> bool:
         if node.name.startswith("_") or node.name.startswith("autocomplete_"):
@@ -142,9 +151,7 @@ class RuleCAR302(CarrotRule, ast.NodeVisitor):
 
         return number_of_commands_in_class > 1 and not class_name.endswith("CommandsCog")
 
-    @utils.generic_visit_before_return
-    @override
-    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+    def _visit_class_def(self, node: ast.ClassDef) -> None:
         if not self._is_class_a_cog_subclass(node.name, node.bases):
             return
 
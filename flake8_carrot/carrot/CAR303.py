@@ -5,20 +5,34 @@ import re
 from enum import Enum
 from typing import TYPE_CHECKING, override
 
+from typed_classproperties import classproperty
+
 from flake8_carrot import utils
+from flake8_carrot.analyses import SlashCommandGroupNamesAnalysis
 from flake8_carrot.utils import CarrotRule
 
 if TYPE_CHECKING:
     from collections.abc import Mapping, Sequence
-    from tokenize import TokenInfo
-    from typing import Literal
+    from collections.abc import Set as AbstractSet
+    from typing import Final, Literal
+
+    from flake8_carrot.analyses import BaseAnalysis
+    from flake8_carrot.traversal import TraversalEngine
 
 __all__: Sequence[str] = ("RuleCAR303",)
 
 
-class RuleCAR303(CarrotRule, ast.NodeVisitor):
+_UPPERCASE_CHARACTER_PATTERN: Final[re.Pattern[str]] = re.compile(r"[A-Z]")
+
+
+class RuleCAR303(CarrotRule):
     """Linting rule to ensure Pycord command and option names are in the correct format."""
 
+    @classproperty
+    @override
+    def REQUIRED_ANALYSES(cls) -> AbstractSet[type[BaseAnalysis[object]]]:
+        return {SlashCommandGroupNamesAnalysis}
+
     class _FunctionType(Enum):
         COMMAND = "slash-command"
         OPTION = "option"
@@ -111,10 +125,8 @@ class RuleCAR303(CarrotRule, ast.NodeVisitor):
         }"
 
     @override
-    def run_check(
-        self, tree: ast.Module, file_tokens: Sequence[TokenInfo], lines: Sequence[str]
-    ) -> None:
-        self.visit(tree)
+    def register_traversal_hooks(self, engine: TraversalEngine) -> None:
+        engine.add_pre_hook(ast.AsyncFunctionDef, self._visit_async_function_def, owner=self)
 
     def _check_single_argument(self, argument: ast.expr, function_type: _FunctionType) -> None:
         if not isinstance(argument, ast.Constant):
@@ -130,7 +142,7 @@ class RuleCAR303(CarrotRule, ast.NodeVisitor):
                     or " " in argument.value[:-1]
                     or "_" in argument.value[:-1]
                 ),
-                requires_lowercasing=bool(re.search(r"[A-Z]", argument.value)),
+                requires_lowercasing=bool(_UPPERCASE_CHARACTER_PATTERN.search(argument.value)),
             )
         )
         if reason is False:
@@ -190,9 +202,7 @@ class RuleCAR303(CarrotRule, ast.NodeVisitor):
                     self._check_all_arguments(decorator_node, self._FunctionType.OPTION)
                     return
 
-    @utils.generic_visit_before_return
-    @override
-    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+    def _visit_async_function_def(self, node: ast.AsyncFunctionDef) -> None:
         decorator_node: ast.expr
         for decorator_node in node.decorator_list:
             self._check_decorator(decorator_node)
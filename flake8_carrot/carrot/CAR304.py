@@ -4,19 +4,30 @@ import ast
 from enum import Enum
 from typing import TYPE_CHECKING, override
 
+from typed_classproperties import classproperty
+
 from flake8_carrot import utils
+from flake8_carrot.analyses import SlashCommandGroupNamesAnalysis
 from flake8_carrot.utils import CarrotRule
 
 if TYPE_CHECKING:
     from collections.abc import Mapping, Sequence
-    from tokenize import TokenInfo
+    from collections.abc import Set as AbstractSet
+
+    from flake8_carrot.analyses import BaseAnalysis
+    from flake8_carrot.traversal import TraversalEngine
 
 __all__: Sequence[str] = ("RuleCAR304",)
 
 
-class RuleCAR304(CarrotRule, ast.NodeVisitor):
+class RuleCAR304(CarrotRule):
     """Linting rule to ensure Pycord command and option names end with a full-stop."""
 
+    @classproperty
+    @override
+    def REQUIRED_ANALYSES(cls) -> AbstractSet[type[BaseAnalysis[object]]]:
+        return {SlashCommandGroupNamesAnalysis}
+
     class _FunctionType(Enum):
         COMMAND = "command"
         OPTION = "option"
@@ -33,10 +44,8 @@ class RuleCAR304(CarrotRule, ast.NodeVisitor):
         } description should end with a full-stop"
 
     @override
-    def run_check(
-        self, tree: ast.Module, file_tokens: Sequence[TokenInfo], lines: Sequence[str]
-    ) -> None:
-        self.visit(tree)
+    def register_traversal_hooks(self, engine: TraversalEngine) -> None:
+        engine.add_pre_hook(ast.AsyncFunctionDef, self._visit_async_function_def, owner=self)
 
     def _check_single_argument(self, argument: ast.expr, function_type: _FunctionType) -> None:  # noqa: PLR0911, PLR0912
         if not isinstance(argument, ast.Constant):
@@ -133,11 +142,7 @@ class RuleCAR304(CarrotRule, ast.NodeVisitor):
                 if (
                     possible_slash_command_group_name
                     in self.plugin.found_slash_command_group_names
-                    and possible_pycord_decorator_name
-                    in (
-                        utils.PYCORD_SLASH_COMMAND_DECORATOR_NAMES
-                        | utils.PYCORD_CONTEXT_COMMAND_DECORATOR_NAMES
-                    )
+                    and possible_pycord_decorator_name in utils.PYCORD_COMMAND_DECORATOR_NAMES
                 ):
                     self._check_all_arguments(decorator_node, self._FunctionType.COMMAND)
                     return
@@ -150,9 +155,7 @@ class RuleCAR304(CarrotRule, ast.NodeVisitor):
                     self._check_all_arguments(decorator_node, self._FunctionType.OPTION)
                     return
 
-    @utils.generic_visit_before_return
-    @override
-    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+    def _visit_async_function_def(self, node: ast.AsyncFunctionDef) -> None:
         decorator_node: ast.expr
         for decorator_node in node.decorator_list:
             self._check_decorator(decorator_node)
@@ -4,14 +4,20 @@ import ast
 from enum import Enum
 from typing import TYPE_CHECKING, override
 
+from typed_classproperties import classproperty
+
 from flake8_carrot import utils
+from flake8_carrot.analyses import SlashCommandGroupNamesAnalysis
 from flake8_carrot.utils import CarrotRule
 
 if TYPE_CHECKING:
     from collections.abc import Mapping, Sequence
-    from tokenize import TokenInfo
+    from collections.abc import Set as AbstractSet
     from typing import Final, Self
 
+    from flake8_carrot.analyses import BaseAnalysis
+    from flake8_carrot.traversal import TraversalEngine
+
 __all__: Sequence[str] = ("RuleCAR305",)
 
 
@@ -38,9 +44,14 @@ class _ContextCommandType(Enum):
         raise ValueError(NON_CONTEXT_COMMAND_MESSAGE)
 
 
-class RuleCAR305(CarrotRule, ast.NodeVisitor):
+class RuleCAR305(CarrotRule):
     """Linting rule to ensure Pycord context command names are capitalised."""
 
+    @classproperty
+    @override
+    def REQUIRED_ANALYSES(cls) -> AbstractSet[type[BaseAnalysis[object]]]:
+        return {SlashCommandGroupNamesAnalysis}
+
     @classmethod
     @override
     def _format_error_message(cls, ctx: Mapping[str, object]) -> str:
@@ -56,10 +67,8 @@ class RuleCAR305(CarrotRule, ast.NodeVisitor):
         )
 
     @override
-    def run_check(
-        self, tree: ast.Module, file_tokens: Sequence[TokenInfo], lines: Sequence[str]
-    ) -> None:
-        self.visit(tree)
+    def register_traversal_hooks(self, engine: TraversalEngine) -> None:
+        engine.add_pre_hook(ast.AsyncFunctionDef, self._visit_async_function_def, owner=self)
 
     def _check_single_argument(
         self, argument: ast.expr, context_command_type: _ContextCommandType
@@ -113,9 +122,7 @@ class RuleCAR305(CarrotRule, ast.NodeVisitor):
                     self._check_all_arguments(decorator_node)
                     return
 
-    @utils.generic_visit_before_return
-    @override
-    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+    def _visit_async_function_def(self, node: ast.AsyncFunctionDef) -> None:
         decorator_node: ast.expr
         for decorator_node in node.decorator_list:
             self._check_decorator(decorator_node)
@@ -3,33 +3,32 @@
 import ast
 from typing import TYPE_CHECKING, override
 
-from flake8_carrot import utils
-from flake8_carrot.utils import CarrotRule
+from flake8_carrot.utils import CarrotRule, RuleScope
 
 if TYPE_CHECKING:
     from collections.abc import Mapping, Sequence
-    from tokenize import TokenInfo
+    from typing import ClassVar
+
+    from flake8_carrot.traversal import TraversalEngine
 
 __all__: Sequence[str] = ("RuleCAR501",)
 
 
-class RuleCAR501(CarrotRule, ast.NodeVisitor):
+class RuleCAR501(CarrotRule):
     """Linting rule to prevent the use of dataclasses."""
 
+    SCOPE: ClassVar[RuleScope] = RuleScope.STATEMENT
+
     @classmethod
     @override
     def _format_error_message(cls, ctx: Mapping[str, object]) -> str:
         return 'Use of dataclass found, declare class manually without "magic" instead'
 
     @override
-    def run_check(
-        self, tree: ast.Module, file_tokens: Sequence[TokenInfo], lines: Sequence[str]
-    ) -> None:
-        self.visit(tree)
+    def register_traversal_hooks(self, engine: TraversalEngine) -> None:
+        engine.add_pre_hook(ast.ClassDef, self._visit_class_def, owner=self)
 
-    @utils.generic_visit_before_return
-    @override
-    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+    def _visit_class_def(self, node: ast.ClassDef) -> None:
         decorator_node: ast.expr
         for decorator_node in node.decorator_list:
             decorator_name: str
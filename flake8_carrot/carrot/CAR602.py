@@ -7,23 +7,26 @@ Only applicable when the regex pattern uses beginning and ending line anchors.
 import ast
 from typing import TYPE_CHECKING, override
 
-from flake8_carrot import utils
-from flake8_carrot.utils import CarrotRule
+from flake8_carrot.utils import CarrotRule, RuleScope
 
 if TYPE_CHECKING:
     from collections.abc import Iterable, Mapping, Sequence
-    from tokenize import TokenInfo
+    from typing import ClassVar
+
+    from flake8_carrot.traversal import TraversalEngine
 
 __all__: Sequence[str] = ("RuleCAR602",)
 
 
-class RuleCAR602(CarrotRule, ast.NodeVisitor):
+class RuleCAR602(CarrotRule):
     """
     Linting rule to ensure `re.fullmatch()` is used over `re.search()`.
 
     Only applicable when the regex pattern uses beginning and ending line anchors.
     """
 
+    SCOPE: ClassVar[RuleScope] = RuleScope.STATEMENT
+
     @classmethod
     @override
     def _format_error_message(cls, ctx: Mapping[str, object]) -> str:
@@ -33,10 +36,8 @@ class RuleCAR602(CarrotRule, ast.NodeVisitor):
         )
 
     @override
-    def run_check(
-        self, tree: ast.Module, file_tokens: Sequence[TokenInfo], lines: Sequence[str]
-    ) -> None:
-        self.visit(tree)
+    def register_traversal_hooks(self, engine: TraversalEngine) -> None:
+        engine.add_pre_hook(ast.Call, self._visit_call, owner=self)
 
     @classmethod
     def _look_for_single_re_multiline(cls, arg: ast.expr) -> bool:
@@ -54,9 +55,7 @@ class RuleCAR602(CarrotRule, ast.NodeVisitor):
 
         return False
 
-    @utils.generic_visit_before_return
-    @override
-    def visit_Call(self, node: ast.Call) -> None:
+    def _visit_call(self, node: ast.Call) -> None:
         regex: str
         remaining_args: Iterable[ast.expr]
         match node:
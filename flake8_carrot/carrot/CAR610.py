@@ -7,26 +7,42 @@ from io import StringIO
 from typing import TYPE_CHECKING, override
 
 from flake8_carrot import utils
-from flake8_carrot.utils import CarrotRule
+from flake8_carrot.utils import CarrotRule, RuleInput, RuleScope
 
 if TYPE_CHECKING:
-    from collections.abc import Collection, Iterable, Mapping, Sequence
+    from collections.abc import Iterable, Mapping, Sequence
+    from collections.abc import Set as AbstractSet
     from tokenize import TokenInfo
-    from typing import Final
+    from typing import ClassVar, Final
 
-    from flake8_carrot.carrot import CarrotPlugin
+    from flake8_carrot.traversal import TraversalEngine
 
 __all__: Sequence[str] = ("RuleCAR610",)
 
 
-class RuleCAR610(CarrotRule, ast.NodeVisitor):
+class RuleCAR610(CarrotRule):
     """Linting rule to ensure regex patterns use raw strings."""
 
-    @override
-    def __init__(self, plugin: CarrotPlugin) -> None:
-        self.source: str | None = None
+    RE_FUNCTION_NAMES: Final[AbstractSet[str]] = frozenset(
+        {
+            "search",
+            "match",
+            "fullmatch",
+            "findall",
+            "finditer",
+            "compile",
+            "split",
+            "sub",
+            "subn",
+        },
+    )
 
-        super().__init__(plugin)
+    RAW_STRING_PREFIX_PATTERN: Final[re.Pattern[str]] = re.compile(r"\A(?:rf?|fr)[\"']")
+
+    REQUIRED_INPUTS: ClassVar[AbstractSet[RuleInput]] = frozenset(
+        {RuleInput.TREE, RuleInput.LINES}
+    )
+    SCOPE: ClassVar[RuleScope] = RuleScope.STATEMENT
 
     @classmethod
     @override
@@ -34,22 +50,15 @@ class RuleCAR610(CarrotRule, ast.NodeVisitor):
         return 'Regex pattern string should use a raw string: `r"..."`'
 
     @override
-    def run_check(
-        self, tree: ast.Module, file_tokens: Sequence[TokenInfo], lines: Sequence[str]
-    ) -> None:
-        self.source = "".join(lines)
-        self.visit(tree)
+    def register_traversal_hooks(self, engine: TraversalEngine) -> None:
+        engine.add_pre_hook(ast.Call, self._visit_call, owner=self)
 
     def _check_node_for_incorrect_string_type(
         self, argument: ast.Constant | ast.JoinedStr
     ) -> None:
         TOKENS: Final[Iterable[TokenInfo]] = tokenize.generate_tokens(
             StringIO(
-                (
-                    ast.get_source_segment(self.source, argument)
-                    if self.source is not None
-                    else ast.unparse(argument)
-                ),
+                utils.get_source_segment(self.plugin.lines, argument) or ast.unparse(argument),
             ).readline,
         )
 
@@ -58,26 +67,12 @@ class RuleCAR610(CarrotRule, ast.NodeVisitor):
             if (
                 (isinstance(argument, ast.Constant) and token.type == tokenize.STRING)
                 or token.type == tokenize.FSTRING_START
-            ) and not re.search(r"\A(?:rf?|fr)[\"']", token.string):
+            ) and not self.RAW_STRING_PREFIX_PATTERN.search(token.string):
                 self.problems.add_without_ctx(
                     (argument.lineno - 1 + token.start[0], token.start[1]),
                 )
 
-    @utils.generic_visit_before_return
-    @override
-    def visit_Call(self, node: ast.Call) -> None:
-        RE_FUNCTION_NAMES: Final[Collection[str]] = (
-            "search",
-            "match",
-            "fullmatch",
-            "findall",
-            "finditer",
-            "compile",
-            "split",
-            "sub",
-            "subn",
-        )
-
+    def _visit_call(self, node: ast.Call) -> None:
         function_name: str
         argument: ast.Constant | ast.JoinedStr
         match node:
@@ -88,7 +83,7 @@ class RuleCAR610(CarrotRule, ast.NodeVisitor):
                 ),
                 args=[(ast.Constant(value=str()) | ast.JoinedStr()) as argument, *_],
             ):
-                if function_name not in RE_FUNCTION_NAMES:
+                if function_name not in self.RE_FUNCTION_NAMES:
                     return
 
                 self._check_node_for_incorrect_string_type(argument)
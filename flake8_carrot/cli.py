@@ -0,0 +1,526 @@
+"""Standalone command-line linter, running the plugins directly rather than through Flake8."""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+import tomllib
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from flake8 import defaults as flake8_defaults
+from flake8 import utils as flake8_utils
+
+from . import batch, daemon, diff, discovery, lsp, pipeline, project, staged, watch
+from .scheduling import DEFAULT_CACHE_DIRECTORY, CostScheduler
+from .session import LintSession
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Mapping, Sequence
+    from typing import Final
+
+    from .batch import FileProblems
+    from .watch import BaseWatcher, WatchReport
+
+__all__: Sequence[str] = ("load_config", "main")
+
+
+_CONFIG_FILE_NAME: Final[str] = "pyproject.toml"
+_STDIN_PATH: Final[str] = "-"
+
+
+def _parse_config_list(value: object) -> Sequence[str]:
+    if isinstance(value, str):
+        return flake8_utils.parse_comma_separated_list(value)
+
+    if isinstance(value, list) and all(isinstance(item, str) for item in value):
+        return [item.strip() for item in value if item.strip()]
+
+    INVALID_CONFIG_VALUE_MESSAGE: Final[str] = (
+        f"Invalid `[tool.flake8]` value {value!r}: must be a string or a list of strings."
+    )
+    raise TypeError(INVALID_CONFIG_VALUE_MESSAGE)
+
+
+def load_config(start_directory: Path) -> Mapping[str, Sequence[str]]:
+    """
+    Read the `[tool.flake8]` options from the nearest `pyproject.toml` file.
+
+    Only the select, ignore & exclude options (& their "extend" variants) are read.
+    Exclude patterns containing a path separator are resolved relative to the config file,
+    as by Flake8.
+    """
+    directory: Path
+    for directory in (start_directory.resolve(), *start_directory.resolve().parents):
+        config_path: Path = directory / _CONFIG_FILE_NAME
+        if not config_path.is_file():
+            continue
+
+        with config_path.open("rb") as config_file:
+            tool_config: object = tomllib.load(config_file).get("tool", {})
+
+        flake8_config: object = (
+            tool_config.get("flake8", None) if isinstance(tool_config, dict) else None
+        )
+        if not isinstance(flake8_config, dict):
+            continue
+
+        config: dict[str, Sequence[str]] = {}
+
+        option_name: str
+        for option_name in (
+            "select",
+            "extend_select",
+            "ignore",
+            "extend_ignore",
+            "exclude",
+            "extend_exclude",
+        ):
+            value: object = flake8_config.get(
+                option_name, flake8_config.get(option_name.replace("_", "-"), None)
+            )
+            if value is None:
+                continue
+
+            config[option_name] = _parse_config_list(value)
+            if option_name.endswith("exclude"):
+                config[option_name] = flake8_utils.normalize_paths(
+                    config[option_name], parent=str(directory)
+                )
+
+        return config
+
+    return {}
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    arg_parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        prog="flake8-carrot",
+        description=(
+            "Lint Python files with only the CAR & TXB rules, "
+            "printing the same output as Flake8."
+        ),
+    )
+    arg_parser.add_argument(
+        "paths",
+        nargs="*",
+        default=["."],
+        help='Python files, or directories of them, or "-" to lint the source from stdin.',
+    )
+    arg_parser.add_argument(
+        "--stdin-display-name",
+        default="stdin",
+        help="The filename to report problems in the source read from stdin as.",
+    )
+    arg_parser.add_argument(
+        "--select",
+        type=flake8_utils.parse_comma_separated_list,
+        help="Comma-separated rule codes to run, overriding the config file.",
+    )
+    arg_parser.add_argument(
+        "--ignore",
+        type=flake8_utils.parse_comma_separated_list,
+        help="Comma-separated rule codes to skip, overriding the config file.",
+    )
+    arg_parser.add_argument(
+        "--exclude",
+        type=flake8_utils.parse_comma_separated_list,
+        help="Comma-separated patterns of paths to skip, overriding the config file.",
+    )
+    arg_parser.add_argument(
+        "--extend-exclude",
+        type=flake8_utils.parse_comma_separated_list,
+        default=[],
+        help="Comma-separated patterns of paths to skip, as well as the excluded paths.",
+    )
+    mode_group: argparse._MutuallyExclusiveGroup = arg_parser.add_mutually_exclusive_group()
+    mode_group.add_argument(
+        "--staged",
+        action="store_true",
+        help=(
+            "Lint the staged version of each changed file within the given paths, "
+            "read from Git's index rather than the working tree."
+        ),
+    )
+    mode_group.add_argument(
+        "--diff",
+        metavar="RANGE",
+        help=(
+            "Report only the problems on lines changed within the given Git revision range, "
+            'E.g. "main...HEAD", or since the given revision within the working tree.'
+        ),
+    )
+    mode_group.add_argument(
+        "--watch",
+        action="store_true",
+        help=(
+            "Keep running, relinting each file as it changes "
+            "& printing the problems that appear (+) or are resolved (-)."
+        ),
+    )
+    mode_group.add_argument(
+        "--preamble-only",
+        action="store_true",
+        help=(
+            "Run only the module-header rules (CAR101, CAR105, CAR110 & CAR111), "
+            "reading just the start of each file, for a quick check of a whole repository."
+        ),
+    )
+    mode_group.add_argument(
+        "--daemon",
+        action="store_true",
+        help=(
+            "Keep running with warm caches, answering JSON-lines lint requests "
+            "on a Unix domain socket, until idle."
+        ),
+    )
+    mode_group.add_argument(
+        "--lsp",
+        action="store_true",
+        help=(
+            "Run as a Language Server Protocol server over stdin & stdout, "
+            "publishing the problems of each open document as it is edited."
+        ),
+    )
+    arg_parser.add_argument(
+        "--socket",
+        type=Path,
+        help=(
+            "With `--daemon`, the Unix domain socket to listen on. "
+            f"(Default: {project.CACHE_DIRECTORY_NAME}/daemon.sock within the project root)"
+        ),
+    )
+    arg_parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=daemon.DEFAULT_IDLE_TIMEOUT,
+        help=(
+            "With `--daemon`, the seconds without any requests after which to exit, "
+            "or 0 to never exit. (Default: %(default)s)"
+        ),
+    )
+    arg_parser.add_argument(
+        "--poll",
+        action="store_true",
+        help=(
+            "With `--watch`, find changes by polling modification times rather than "
+            "with inotify, E.g. on network filesystems."
+        ),
+    )
+    arg_parser.add_argument(
+        "--no-gitignore",
+        action="store_true",
+        help="Lint files even if they are ignored by a `.gitignore` file, as Flake8 does.",
+    )
+    arg_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help="Number of worker processes to lint with, defaulting to the number of CPUs.",
+    )
+    arg_parser.add_argument(
+        "--backend",
+        choices=[backend.value for backend in batch.BatchBackend],
+        default=batch.BatchBackend.PROCESS.value,
+        help="Kind of pool to lint the files across. (Default: %(default)s)",
+    )
+    arg_parser.add_argument(
+        "--prefetch-workers",
+        type=int,
+        default=pipeline.DEFAULT_PREFETCH_WORKERS,
+        help=(
+            "Number of threads in each worker that read upcoming files "
+            "while others are linted. (Default: %(default)s)"
+        ),
+    )
+    arg_parser.add_argument(
+        "--disable-noqa",
+        action="store_true",
+        help="Report problems even on lines with a matching `# noqa` comment.",
+    )
+    arg_parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=DEFAULT_CACHE_DIRECTORY,
+        help=(
+            "Directory to store the cost of linting each file in, "
+            "used to schedule the longest files first, "
+            "& the problems of each staged blob. (Default: %(default)s)"
+        ),
+    )
+    arg_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=(
+            "Neither read nor store the cost of linting each file, "
+            "nor the problems of each staged blob."
+        ),
+    )
+    arg_parser.add_argument(
+        "--critical-path",
+        action="store_true",
+        help="Report the files that the wall time was spent waiting on, to stderr.",
+    )
+    return arg_parser
+
+
+def _lint_working_tree(
+    parsed_args: argparse.Namespace,
+    select: Sequence[str] | None,
+    ignore: Sequence[str] | None,
+    exclude_patterns: Sequence[str],
+) -> Sequence[FileProblems]:
+    stdin_file_problems: Sequence[FileProblems] = ()
+    if _STDIN_PATH in parsed_args.paths:
+        stdin_file_problems = (
+            batch.FileProblems(
+                parsed_args.stdin_display_name,
+                LintSession(
+                    select=select, ignore=ignore, disable_noqa=parsed_args.disable_noqa
+                ).lint_source(
+                    pipeline.decode_source(sys.stdin.buffer.read()),
+                    parsed_args.stdin_display_name,
+                ),
+            ),
+        )
+
+    # NOTE: Sorting is left until printing, as the files are linted in the scheduler's order
+    source_paths: Sequence[str] = list(
+        discovery.find_source_paths(
+            [path for path in parsed_args.paths if path != _STDIN_PATH],
+            exclude_patterns,
+            respect_gitignore=not parsed_args.no_gitignore,
+        ),
+    )
+
+    scheduler: CostScheduler = (
+        CostScheduler() if parsed_args.no_cache else CostScheduler.load(parsed_args.cache_dir)
+    )
+    workers_count: int = (
+        (parsed_args.jobs or os.process_cpu_count() or 1) if len(source_paths) > 1 else 1
+    )
+
+    start: float = time.perf_counter()
+
+    # NOTE: Flake8 reports its results sorted by file path, whatever order they finish in
+    all_file_problems: Sequence[FileProblems] = sorted(
+        (
+            *batch.lint_paths(
+                source_paths,
+                select=select,
+                ignore=ignore,
+                disable_noqa=parsed_args.disable_noqa,
+                max_workers=workers_count,
+                backend=batch.BatchBackend(parsed_args.backend),
+                scheduler=scheduler,
+                prefetch_workers=parsed_args.prefetch_workers,
+            ),
+            *stdin_file_problems,
+        ),
+        key=lambda file_problems: file_problems.path,
+    )
+
+    wall_time: float = time.perf_counter() - start
+    scheduler.save()
+
+    if parsed_args.critical_path:
+        sys.stderr.write(f"{scheduler.report(wall_time, workers_count).format()}\n")
+
+    return all_file_problems
+
+
+def _lint_preambles(
+    parsed_args: argparse.Namespace,
+    select: Sequence[str] | None,
+    ignore: Sequence[str] | None,
+    exclude_patterns: Sequence[str],
+) -> Sequence[FileProblems]:
+    lint_session: LintSession = LintSession(
+        select=select, ignore=ignore, disable_noqa=parsed_args.disable_noqa
+    )
+
+    return sorted(
+        (
+            batch.FileProblems(path, lint_session.lint_preamble_file(path))
+            for path in discovery.find_source_paths(
+                parsed_args.paths,
+                exclude_patterns,
+                respect_gitignore=not parsed_args.no_gitignore,
+            )
+        ),
+        key=lambda file_problems: file_problems.path,
+    )
+
+
+def _watch_working_tree(
+    parsed_args: argparse.Namespace,
+    select: Sequence[str] | None,
+    ignore: Sequence[str] | None,
+    exclude_patterns: Sequence[str],
+) -> int:
+    watcher: BaseWatcher = watch.create_watcher(force_polling=parsed_args.poll)
+    reports: Iterator[WatchReport] = watch.watch_source_files(
+        LintSession(select=select, ignore=ignore, disable_noqa=parsed_args.disable_noqa),
+        parsed_args.paths,
+        exclude_patterns,
+        respect_gitignore=not parsed_args.no_gitignore,
+        watcher=watcher,
+    )
+
+    try:
+        first_report: WatchReport = next(reports)
+        sys.stdout.write(
+            "".join(f"{problem.format()}\n" for problem in first_report.added_problems)
+        )
+        sys.stdout.flush()
+        sys.stderr.write(
+            f"Linted {first_report.linted_files_count} files in {first_report.seconds:.2f}s, "
+            "watching for changes...\n"
+        )
+
+        report: WatchReport
+        for report in reports:
+            sys.stdout.write(
+                "".join(
+                    (
+                        *(f"- {problem.format()}\n" for problem in report.resolved_problems),
+                        *(f"+ {problem.format()}\n" for problem in report.added_problems),
+                    ),
+                ),
+            )
+            sys.stdout.flush()
+            sys.stderr.write(
+                f"Relinted {report.linted_files_count} files in {report.seconds:.3f}s: "
+                f"{len(report.added_problems)} new & "
+                f"{len(report.resolved_problems)} resolved problems.\n"
+            )
+
+    except KeyboardInterrupt:
+        return 0
+
+    finally:
+        watcher.close()
+
+    return 0
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Lint the given paths & print each problem found, returning 1 if there were any."""
+    arg_parser: argparse.ArgumentParser = _build_arg_parser()
+    parsed_args: argparse.Namespace = arg_parser.parse_args(argv)
+
+    config: Mapping[str, Sequence[str]] = load_config(Path.cwd())
+
+    select: Sequence[str] | None = parsed_args.select
+    if select is None and "select" in config:
+        select = [*config["select"], *config.get("extend_select", ())]
+
+    ignore: Sequence[str] | None = parsed_args.ignore
+    if ignore is None and ("ignore" in config or "extend_ignore" in config):
+        ignore = [*config.get("ignore", ()), *config.get("extend_ignore", ())]
+
+    exclude_patterns: Sequence[str] = [
+        *(
+            config.get("exclude", flake8_defaults.EXCLUDE)
+            if parsed_args.exclude is None
+            else flake8_utils.normalize_paths(parsed_args.exclude)
+        ),
+        *config.get("extend_exclude", ()),
+        *flake8_utils.normalize_paths(parsed_args.extend_exclude),
+    ]
+
+    if parsed_args.watch:
+        return _watch_working_tree(parsed_args, select, ignore, exclude_patterns)
+
+    if parsed_args.lsp:
+        try:
+            return asyncio.run(
+                lsp.LanguageServer(
+                    sys.stdin.buffer,
+                    sys.stdout.buffer,
+                    select=select,
+                    ignore=ignore,
+                    disable_noqa=parsed_args.disable_noqa,
+                ).serve(),
+            )
+        except KeyboardInterrupt:
+            return 0
+
+    if parsed_args.daemon:
+        try:
+            asyncio.run(
+                daemon.LintDaemon(
+                    parsed_args.socket,
+                    select=select,
+                    ignore=ignore,
+                    disable_noqa=parsed_args.disable_noqa,
+                    max_workers=parsed_args.jobs or daemon.DEFAULT_MAX_WORKERS,
+                    idle_timeout=parsed_args.idle_timeout or None,
+                ).serve(),
+            )
+        except OSError as error:
+            arg_parser.error(f"Cannot start the lint daemon: {error}")
+        except KeyboardInterrupt:
+            pass
+
+        return 0
+
+    all_file_problems: Sequence[FileProblems]
+    if parsed_args.preamble_only:
+        if _STDIN_PATH in parsed_args.paths:
+            arg_parser.error("Cannot lint the source from stdin with `--preamble-only`.")
+
+        all_file_problems = _lint_preambles(parsed_args, select, ignore, exclude_patterns)
+
+    elif parsed_args.staged or parsed_args.diff is not None:
+        lint_session: LintSession = LintSession(
+            select=select, ignore=ignore, disable_noqa=parsed_args.disable_noqa
+        )
+        try:
+            all_file_problems = sorted(
+                (
+                    staged.lint_staged_files(
+                        lint_session,
+                        parsed_args.paths,
+                        exclude_patterns=exclude_patterns,
+                        blob_cache=(
+                            None
+                            if parsed_args.no_cache
+                            else staged.BlobProblemsCache.load(
+                                lint_session.fingerprint, parsed_args.cache_dir
+                            )
+                        ),
+                    )
+                    if parsed_args.staged
+                    else diff.lint_diff(
+                        lint_session,
+                        parsed_args.diff,
+                        parsed_args.paths,
+                        exclude_patterns=exclude_patterns,
+                    )
+                ),
+                key=lambda file_problems: file_problems.path,
+            )
+        except (OSError, subprocess.CalledProcessError) as error:
+            arg_parser.error(f"Cannot read the changed files from Git: {error}")
+
+    else:
+        all_file_problems = _lint_working_tree(parsed_args, select, ignore, exclude_patterns)
+
+    problems_count: int = 0
+
+    file_problems: FileProblems
+    for file_problems in all_file_problems:
+        if file_problems.problems:
+            problems_count += len(file_problems.problems)
+            sys.stdout.write(
+                "".join(f"{problem.format()}\n" for problem in file_problems.problems)
+            )
+
+    return 1 if problems_count else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,189 @@
+"""Thin client of the lint daemon, importing as little as possible so that it starts fast."""
+
+import io
+import json
+import os
+import socket
+import sys
+from typing import TYPE_CHECKING, NamedTuple
+
+from . import project
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+    from typing import Final
+
+__all__: Sequence[str] = ("main",)
+
+
+_STDIN_PATH: Final[str] = "-"
+_DEFAULT_STDIN_DISPLAY_NAME: Final[str] = "stdin"
+_VALUE_OPTIONS: Final[Sequence[str]] = ("--socket", "--stdin-display-name")
+_DAEMON_UNAVAILABLE_ERRORS: Final[tuple[type[Exception], ...]] = (
+    FileNotFoundError,
+    ConnectionRefusedError,
+)
+_UNDETECTABLE_ENCODING_ERRORS: Final[tuple[type[Exception], ...]] = (SyntaxError, UnicodeError)
+
+
+class _ClientArguments(NamedTuple):
+    """The few arguments understood without falling back to the full command-line linter."""
+
+    paths: Sequence[str]
+    socket_path: str
+    stdin_display_name: str
+
+
+def _parse_arguments(argv: Sequence[str]) -> _ClientArguments | None:
+    paths: list[str] = []
+    options: dict[str, str] = {}
+
+    index: int = 0
+    while index < len(argv):
+        argument: str = argv[index]
+        index += 1
+
+        option_name: str
+        option_value: str
+        option_name, _, option_value = argument.partition("=")
+        if option_name in _VALUE_OPTIONS:
+            if not option_value:
+                if index >= len(argv):
+                    return None
+
+                option_value = argv[index]
+                index += 1
+
+            options[option_name] = option_value
+
+        # NOTE: Any other option, or a directory to walk, is left to the full linter
+        elif argument != _STDIN_PATH and (
+            argument.startswith("-") or os.path.isdir(argument)  # noqa: PTH112
+        ):
+            return None
+
+        else:
+            paths.append(argument)
+
+    if not paths:
+        return None
+
+    return _ClientArguments(
+        paths=paths,
+        socket_path=options.get("--socket", None) or project.get_default_socket_path(),
+        stdin_display_name=options.get("--stdin-display-name", _DEFAULT_STDIN_DISPLAY_NAME),
+    )
+
+
+def _read_stdin_source() -> str:
+    # NOTE: Only imported when linting stdin, so that linting saved files starts faster
+    import tokenize  # noqa: PLC0415
+
+    data: bytes = sys.stdin.buffer.read()
+    try:
+        encoding: str = tokenize.detect_encoding(io.BytesIO(data).readline)[0]
+        source: str = data.decode(encoding)
+    except _UNDETECTABLE_ENCODING_ERRORS:
+        # NOTE: As with Flake8, sources with an undetectable encoding are read as latin-1
+        source = data.decode("latin-1")
+
+    return source.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _request_problems(
+    connection: socket.socket, requests: Sequence[Mapping[str, object]]
+) -> Sequence[Mapping[str, object]]:
+    connection.sendall(
+        b"".join(
+            json.dumps({"id": request_id, **request}).encode() + b"\n"
+            for request_id, request in enumerate(requests)
+        ),
+    )
+
+    # NOTE: The daemon closes the connection once every request has been answered
+    connection.shutdown(socket.SHUT_WR)
+
+    responses: dict[object, Mapping[str, object]] = {}
+    with connection.makefile("rb") as response_lines:
+        response_line: bytes
+        for response_line in response_lines:
+            response: Mapping[str, object] = json.loads(response_line)
+            responses[response.get("id", None)] = response
+
+    return [responses.get(request_id, {}) for request_id in range(len(requests))]
+
+
+def _fall_back_to_linting(argv: Sequence[str]) -> int:
+    from flake8_carrot import cli  # noqa: PLC0415
+
+    return cli.main(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """
+    Lint the given files with the running lint daemon, printing each problem found.
+
+    Source code can be read from stdin by passing "-", E.g. to lint an unsaved editor buffer.
+    If no daemon is running, or any other options are given,
+    the files are instead linted within this process by the full command-line linter.
+    """
+    arguments: Sequence[str] = sys.argv[1:] if argv is None else argv
+    client_arguments: _ClientArguments | None = _parse_arguments(arguments)
+    if client_arguments is None:
+        return _fall_back_to_linting(arguments)
+
+    display_names: Sequence[str] = [
+        client_arguments.stdin_display_name if path == _STDIN_PATH else path
+        for path in client_arguments.paths
+    ]
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        try:
+            connection.connect(client_arguments.socket_path)
+        except _DAEMON_UNAVAILABLE_ERRORS:
+            return _fall_back_to_linting(arguments)
+
+        responses: Sequence[Mapping[str, object]] = _request_problems(
+            connection,
+            [
+                (
+                    {"source": _read_stdin_source(), "filename": display_name}
+                    if path == _STDIN_PATH
+                    else {"path": os.path.abspath(path)}  # noqa: PTH100
+                )
+                for path, display_name in zip(
+                    client_arguments.paths, display_names, strict=True
+                )
+            ],
+        )
+
+    output_lines: list[str] = []
+    exit_code: int = 0
+
+    display_name: str
+    response: Mapping[str, object]
+    for display_name, response in zip(display_names, responses, strict=True):
+        problems: object = response.get("problems", None)
+        if not isinstance(problems, list):
+            sys.stderr.write(
+                f"flake8-carrot: {display_name}: "
+                f"{response.get('error', 'No response from the lint daemon.')}\n"
+            )
+            exit_code = 2
+            continue
+
+        output_lines.extend(
+            f"{display_name}:{problem['line']}:{problem['column']}: "
+            f"{problem['code']} {problem['message']}\n"
+            for problem in problems
+        )
+
+    sys.stdout.write("".join(output_lines))
+    if exit_code:
+        return exit_code
+
+    return 1 if output_lines else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
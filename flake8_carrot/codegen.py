@@ -0,0 +1,417 @@
+"""Generation of traversal functions specialised to a fixed set of registered node hooks."""
+
+import ast
+import functools
+import hashlib
+import importlib.metadata
+import importlib.util
+import marshal
+import os
+import sys
+import threading
+import types
+import typing
+from pathlib import Path
+from typing import TYPE_CHECKING, cast
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Collection, Mapping, MutableMapping, Sequence
+    from typing import Final
+
+__all__: Sequence[str] = ("TraversalFactory", "get_package_version", "get_traversal_factory")
+
+
+if __name__ == "__main__":
+    CANNOT_RUN_AS_SCRIPT_MESSAGE: Final[str] = "This module cannot be run as a script."
+    raise RuntimeError(CANNOT_RUN_AS_SCRIPT_MESSAGE)
+
+
+if TYPE_CHECKING:
+    type _Hook = Callable[[ast.AST], object]
+
+    type TraversalFactory = Callable[
+        [
+            Sequence[_Hook],
+            Sequence[object],
+            Mapping[type[ast.AST], Sequence[tuple[object, _Hook]]],
+            object,
+            Callable[[ast.AST], object],
+            Callable[[type[ast.AST]], Sequence[str]],
+        ],
+        Callable[[ast.AST], None],
+    ]
+
+    type _HookSignature = tuple[tuple[type[ast.AST], tuple[int, ...]], ...]
+
+
+_GENERATED_MODULE_NAME: Final[str] = "flake8_carrot._generated_traversal"
+_FACTORY_NAME: Final[str] = "make_traverse"
+_INDENT: Final[str] = " " * 4
+
+_HOT_NODE_TYPES: Final[Sequence[type[ast.AST]]] = (
+    ast.Name,
+    ast.Load,
+    ast.Constant,
+    ast.Attribute,
+    ast.Call,
+    ast.Expr,
+    ast.Store,
+    ast.keyword,
+    ast.arg,
+    ast.Assign,
+)
+
+_CACHE_FILE_LOAD_ERRORS: Final[tuple[type[Exception], ...]] = (
+    OSError,
+    EOFError,
+    ValueError,
+    TypeError,
+)
+
+_LOADED_TRAVERSAL_FACTORIES: Final[
+    MutableMapping[tuple[_HookSignature, frozenset[type[ast.AST]]], TraversalFactory]
+] = {}
+
+
+def _generate_push_field_lines(node_type: type[ast.AST], field_name: str) -> Sequence[str]:
+    field_type: object = getattr(node_type, "_field_types", {}).get(field_name, None)
+
+    if typing.get_origin(field_type) is list:
+        # NOTE: `None` items (E.g. within `ast.Dict.keys`) are discarded once popped
+        return (f"extend(reversed(node.{field_name}))",)
+
+    if isinstance(field_type, type) and issubclass(field_type, ast.AST):
+        return (f"push(node.{field_name})",)
+
+    field_type_arguments: Sequence[object] = typing.get_args(field_type)
+    if (
+        isinstance(field_type, types.UnionType)
+        and type(None) in field_type_arguments
+        and all(
+            isinstance(field_type_argument, type)
+            and issubclass(field_type_argument, (ast.AST, type(None)))
+            for field_type_argument in field_type_arguments
+        )
+    ):
+        return (
+            f"child = node.{field_name}",
+            "if child is not None:",
+            f"{_INDENT}push(child)",
+        )
+
+    return (f"push_field(getattr(node, {field_name!r}, None), push, extend)",)
+
+
+def _generate_push_children_lines(
+    node_type: type[ast.AST], child_fields: Sequence[str]
+) -> Sequence[str]:
+    return [
+        line
+        for field_name in reversed(child_fields)
+        for line in _generate_push_field_lines(node_type, field_name)
+    ]
+
+
+def _generate_source(
+    pre_hook_signature: _HookSignature,
+    post_hook_node_types: Collection[type[ast.AST]],
+    node_types: Sequence[type[ast.AST]],
+    child_fields: Mapping[type[ast.AST], Sequence[str]],
+) -> str:
+    node_type_names: Mapping[type[ast.AST], str] = {
+        node_type: f"T{index}_{node_type.__name__}"
+        for index, node_type in enumerate(node_types)
+    }
+    lines: list[str] = [
+        f'"""Generated by `{__name__}`. Do not edit."""',
+        "",
+        "",
+        "def push_field(value, push, extend):",
+        f"{_INDENT}if isinstance(value, list):",
+        f"{_INDENT * 2}extend([item for item in reversed(value) if isinstance(item, AST)])",
+        f"{_INDENT}elif isinstance(value, AST):",
+        f"{_INDENT * 2}push(value)",
+        "",
+        "",
+    ]
+
+    lines.extend(
+        f"{node_type_names[node_type]} = NODE_TYPES[{index}]"
+        for index, node_type in enumerate(node_types)
+    )
+
+    lines.append("")
+
+    node_type: type[ast.AST]
+    push_children_lines: Sequence[str]
+    for node_type in node_types:
+        push_children_lines = _generate_push_children_lines(
+            node_type, child_fields.get(node_type, ())
+        )
+        lines.extend(
+            (
+                "",
+                f"def push_children_{node_type_names[node_type]}(node, push, extend):",
+                *(f"{_INDENT}{line}" for line in push_children_lines or ("pass",)),
+                "",
+            )
+        )
+
+    lines.extend(
+        (
+            "",
+            "CHILD_PUSHERS = {",
+            *(
+                f"{_INDENT}{node_type_names[node_type]}: "
+                f"push_children_{node_type_names[node_type]},"
+                for node_type in node_types
+            ),
+            "}",
+            "",
+            "",
+            (
+                f"def {_FACTORY_NAME}(pre_hooks, owners, post_hooks_by_type, "
+                "skip_children, exit_marker_type, get_child_fields):"
+            ),
+        )
+    )
+
+    pre_hook_indices: dict[type[ast.AST], Sequence[tuple[int, int]]] = {}
+    next_pre_hook_index: int = 0
+    owner_indices: Sequence[int]
+    for node_type, owner_indices in pre_hook_signature:
+        pre_hook_indices[node_type] = list(enumerate(owner_indices, start=next_pre_hook_index))
+        next_pre_hook_index += len(owner_indices)
+
+    lines.extend(
+        f"{_INDENT}pre_{pre_hook_index} = pre_hooks[{pre_hook_index}]"
+        for hook_indices in pre_hook_indices.values()
+        for pre_hook_index, _ in hook_indices
+    )
+    lines.extend(
+        f"{_INDENT}owner_{owner_index} = owners[{owner_index}]"
+        for owner_index in sorted(
+            {
+                owner_index
+                for hook_indices in pre_hook_indices.values()
+                for _, owner_index in hook_indices
+            }
+        )
+    )
+
+    hooked_node_types: Collection[type[ast.AST]] = {
+        node_type for node_type, _ in pre_hook_signature
+    } | set(post_hook_node_types)
+    dispatched_node_types: Sequence[type[ast.AST]] = [
+        *(node_type for node_type in _HOT_NODE_TYPES if node_type in node_type_names),
+        *(
+            node_type
+            for node_type in node_types
+            if node_type in hooked_node_types and node_type not in _HOT_NODE_TYPES
+        ),
+    ]
+    lines.extend(
+        f"{_INDENT}dispatch_{node_type_names[node_type]} = {node_type_names[node_type]}"
+        for node_type in dispatched_node_types
+    )
+
+    lines.extend(
+        (
+            f"{_INDENT}child_pushers = CHILD_PUSHERS",
+            f"{_INDENT}ast_node_type = AST",
+            "",
+            f"{_INDENT}def traverse(tree):",
+            f"{_INDENT * 2}stack = [tree]",
+            f"{_INDENT * 2}pop = stack.pop",
+            f"{_INDENT * 2}push = stack.append",
+            f"{_INDENT * 2}extend = stack.extend",
+            f"{_INDENT * 2}skipping = {{}}",
+            "",
+            f"{_INDENT * 2}while stack:",
+            f"{_INDENT * 3}node = pop()",
+            f"{_INDENT * 3}node_type = type(node)",
+            "",
+        )
+    )
+
+    body_indent: str = _INDENT * 4
+    keyword: str = "if"
+    for node_type in dispatched_node_types:
+        lines.append(
+            f"{_INDENT * 3}{keyword} node_type is dispatch_{node_type_names[node_type]}:"
+        )
+        keyword = "elif"
+
+        has_post_hooks: bool = node_type in post_hook_node_types
+        if node_type in pre_hook_indices and not has_post_hooks:
+            lines.append(f"{body_indent}requires_exit = False")
+
+        for pre_hook_index, owner_index in pre_hook_indices.get(node_type, ()):
+            lines.extend(
+                (
+                    (
+                        f"{body_indent}if owner_{owner_index} not in skipping "
+                        f"and pre_{pre_hook_index}(node) is skip_children:"
+                    ),
+                    f"{body_indent}{_INDENT}skipping[owner_{owner_index}] = node",
+                )
+            )
+            if not has_post_hooks:
+                lines.append(f"{body_indent}{_INDENT}requires_exit = True")
+
+        if has_post_hooks:
+            lines.append(f"{body_indent}push(exit_marker_type(node))")
+        elif node_type in pre_hook_indices:
+            lines.extend(
+                (
+                    f"{body_indent}if requires_exit:",
+                    f"{body_indent}{_INDENT}push(exit_marker_type(node))",
+                )
+            )
+
+        push_children_lines = _generate_push_children_lines(
+            node_type, child_fields.get(node_type, ())
+        )
+        lines.extend(f"{body_indent}{line}" for line in push_children_lines or ("pass",))
+
+    lines.extend(
+        (
+            f"{_INDENT * 3}{keyword} node_type is exit_marker_type:",
+            f"{body_indent}exited_node = node.node",
+            (
+                f"{body_indent}for owner, post_hook in "
+                "post_hooks_by_type.get(type(exited_node), ()):"
+            ),
+            f"{body_indent}{_INDENT}if skipping.get(owner, exited_node) is exited_node:",
+            f"{body_indent}{_INDENT * 2}post_hook(exited_node)",
+            f"{body_indent}if skipping:",
+            f"{body_indent}{_INDENT}skipping = {{",
+            f"{body_indent}{_INDENT * 2}owner: skipped_node",
+            f"{body_indent}{_INDENT * 2}for owner, skipped_node in skipping.items()",
+            f"{body_indent}{_INDENT * 2}if skipped_node is not exited_node",
+            f"{body_indent}{_INDENT}}}",
+            f"{_INDENT * 3}else:",
+            f"{body_indent}push_children = child_pushers.get(node_type, None)",
+            f"{body_indent}if push_children is not None:",
+            f"{body_indent}{_INDENT}push_children(node, push, extend)",
+            f"{body_indent}elif isinstance(node, ast_node_type):",
+            f"{body_indent}{_INDENT}for field_name in reversed(get_child_fields(node_type)):",
+            (
+                f"{body_indent}{_INDENT * 2}"
+                "push_field(getattr(node, field_name, None), push, extend)"
+            ),
+            "",
+            f"{_INDENT}return traverse",
+            "",
+        )
+    )
+
+    return "\n".join(lines)
+
+
+@functools.cache
+def get_package_version() -> str:
+    """Get the installed version of this package, which keys every cache stored on disk."""
+    try:
+        return importlib.metadata.version("flake8-carrot")
+    except importlib.metadata.PackageNotFoundError:
+        return "0+unknown"
+
+
+def _get_cache_file_path(cache_key: str) -> Path | None:
+    try:
+        source_cache_path: str = importlib.util.cache_from_source(__file__)
+    except NotImplementedError:
+        return None
+
+    return Path(source_cache_path).with_name(
+        f"traversal-{cache_key}.{sys.implementation.cache_tag}.bin"
+    )
+
+
+def _load_cached_code(cache_file_path: Path | None) -> types.CodeType | None:
+    if cache_file_path is None:
+        return None
+
+    try:
+        code: object = marshal.loads(cache_file_path.read_bytes())  # noqa: S302
+    except _CACHE_FILE_LOAD_ERRORS:
+        return None
+
+    return code if isinstance(code, types.CodeType) else None
+
+
+def _store_cached_code(cache_file_path: Path | None, code: types.CodeType) -> None:
+    if cache_file_path is None or sys.dont_write_bytecode:
+        return
+
+    # NOTE: Subinterpreters share their process ID, so each thread needs its own temporary file
+    temporary_file_path: Path = cache_file_path.with_name(
+        f"{cache_file_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+    )
+    try:
+        cache_file_path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_file_path.write_bytes(marshal.dumps(code))
+        temporary_file_path.replace(cache_file_path)
+    except OSError:
+        temporary_file_path.unlink(missing_ok=True)
+
+
+def get_traversal_factory(
+    pre_hook_signature: _HookSignature,
+    post_hook_node_types: Collection[type[ast.AST]],
+    child_fields: Mapping[type[ast.AST], Sequence[str]],
+) -> TraversalFactory:
+    """
+    Retrieve the factory of traversal functions specialised to the given hook signature.
+
+    The signature lists each hooked node type with the owner indexes of its pre-hooks,
+    in registration order.
+    Generated code is compiled at most once per process,
+    & is cached to disk within `__pycache__`, keyed on the package version & generated source.
+    """
+    memo_key: tuple[_HookSignature, frozenset[type[ast.AST]]] = (
+        pre_hook_signature,
+        frozenset(post_hook_node_types),
+    )
+    traversal_factory: TraversalFactory | None = _LOADED_TRAVERSAL_FACTORIES.get(memo_key)
+    if traversal_factory is not None:
+        return traversal_factory
+
+    node_types: Sequence[type[ast.AST]] = list(
+        dict.fromkeys(
+            (
+                *child_fields,
+                *(node_type for node_type, _ in pre_hook_signature),
+                *post_hook_node_types,
+            )
+        )
+    )
+    source: str = _generate_source(
+        pre_hook_signature,
+        post_hook_node_types,
+        node_types,
+        child_fields,
+    )
+
+    cache_file_path: Path | None = _get_cache_file_path(
+        hashlib.sha256(
+            f"{get_package_version()}\0{source}".encode(),
+            usedforsecurity=False,
+        ).hexdigest()[:32]
+    )
+    code: types.CodeType | None = _load_cached_code(cache_file_path)
+    if code is None:
+        code = compile(source, f"<{_GENERATED_MODULE_NAME}>", "exec")
+        _store_cached_code(cache_file_path, code)
+
+    namespace: dict[str, object] = {
+        "__name__": _GENERATED_MODULE_NAME,
+        "AST": ast.AST,
+        "NODE_TYPES": tuple(node_types),
+    }
+    exec(code, namespace)  # noqa: S102
+
+    traversal_factory = cast("TraversalFactory", namespace[_FACTORY_NAME])
+    _LOADED_TRAVERSAL_FACTORIES[memo_key] = traversal_factory
+    return traversal_factory
@@ -0,0 +1,350 @@
+"""Long-lived lint daemon, answering JSON-lines requests over a Unix domain socket."""
+
+import asyncio
+import concurrent.futures
+import contextlib
+import errno
+import json
+import os
+import socket
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, override
+
+from . import project
+from .session import LintSession
+
+if TYPE_CHECKING:
+    from asyncio import StreamReader, StreamWriter
+    from collections.abc import Callable, Iterable, Mapping, Sequence
+    from typing import Final
+
+    from .session import Problem
+
+__all__: Sequence[str] = (
+    "DEFAULT_IDLE_TIMEOUT",
+    "DEFAULT_MAX_WORKERS",
+    "MAX_REQUEST_BYTES",
+    "LintDaemon",
+)
+
+
+if __name__ == "__main__":
+    CANNOT_RUN_AS_SCRIPT_MESSAGE: Final[str] = "This module cannot be run as a script."
+    raise RuntimeError(CANNOT_RUN_AS_SCRIPT_MESSAGE)
+
+
+DEFAULT_IDLE_TIMEOUT: Final[float] = 15 * 60
+DEFAULT_MAX_WORKERS: Final[int] = 4
+MAX_REQUEST_BYTES: Final[int] = 64 * 1024 * 1024
+
+_SHUTDOWN_COMMAND: Final[str] = "shutdown"
+_SOCKET_UMASK: Final[int] = 0o177
+_STALE_SOCKET_ERRORS: Final[tuple[type[Exception], ...]] = (
+    ConnectionRefusedError,
+    FileNotFoundError,
+)
+
+if TYPE_CHECKING:
+    type _Response = Mapping[str, object]
+
+
+class _InvalidRequestError(ValueError):
+    """A request line that is not a valid lint request."""
+
+
+_INVALID_REQUEST_ERRORS: Final[tuple[type[Exception], ...]] = (
+    _InvalidRequestError,
+    json.JSONDecodeError,
+    UnicodeDecodeError,
+)
+
+
+class LintDaemon:
+    """
+    Daemon that keeps its lint sessions warm, answering lint requests over a Unix socket.
+
+    Each request is one line of JSON, holding either a `"path"` to read & lint,
+    or a `"source"` to lint directly, with an optional `"filename"` to report it as.
+    Each response is one line of JSON, holding the request's `"id"`,
+    & either its `"problems"` or an `"error"`.
+    Responses are written as soon as each request finishes, so may be out of order.
+    Requests are linted on a small thread pool, with one warm session per thread.
+    Concurrent requests for a path that has not started being linted yet share one lint.
+    By default, the socket is kept within the cache directory at the project's root.
+    The daemon exits once no requests have arrived within the idle timeout,
+    or when sent `{"command": "shutdown"}`.
+    """
+
+    @override
+    def __init__(
+        self,
+        socket_path: Path | None = None,
+        *,
+        select: Iterable[str] | None = None,
+        ignore: Iterable[str] | None = None,
+        disable_noqa: bool = False,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        idle_timeout: float | None = DEFAULT_IDLE_TIMEOUT,
+    ) -> None:
+        if max_workers < 1:
+            INVALID_MAX_WORKERS_MESSAGE: Final[str] = "Daemon workers must be at least 1."
+            raise ValueError(INVALID_MAX_WORKERS_MESSAGE)
+
+        self._socket_path: Path = (
+            Path(project.get_default_socket_path()) if socket_path is None else socket_path
+        )
+        self._select: tuple[str, ...] | None = None if select is None else tuple(select)
+        self._ignore: tuple[str, ...] | None = None if ignore is None else tuple(ignore)
+        self._disable_noqa: bool = disable_noqa
+        self._max_workers: int = max_workers
+        self._idle_timeout: float | None = idle_timeout
+
+        self._worker_state: threading.local = threading.local()
+        self._pending_path_lints: dict[str, asyncio.Task[Sequence[Problem]]] = {}
+        self._active_requests_count: int = 0
+        self._last_activity_time: float = 0
+        self._shutdown_event: asyncio.Event | None = None
+        self._worker_slots: asyncio.Semaphore | None = None
+        self._executor: concurrent.futures.ThreadPoolExecutor | None = None
+
+    @property
+    def socket_path(self) -> Path:
+        """The path of the Unix domain socket that this daemon listens on."""
+        return self._socket_path
+
+    def _get_worker_session(self) -> LintSession:
+        lint_session: LintSession | None = getattr(self._worker_state, "lint_session", None)
+        if lint_session is None:
+            lint_session = LintSession(
+                select=self._select, ignore=self._ignore, disable_noqa=self._disable_noqa
+            )
+            self._worker_state.lint_session = lint_session
+
+        return lint_session
+
+    def _remove_stale_socket(self) -> None:
+        if not self._socket_path.exists():
+            return
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe_socket:
+            try:
+                probe_socket.connect(os.fspath(self._socket_path))
+            except _STALE_SOCKET_ERRORS:
+                # NOTE: Left behind by a daemon that did not exit cleanly
+                self._socket_path.unlink(missing_ok=True)
+                return
+
+        DAEMON_RUNNING_MESSAGE: Final[str] = (
+            "A lint daemon is already listening on this socket."
+        )
+        raise OSError(errno.EADDRINUSE, DAEMON_RUNNING_MESSAGE, os.fspath(self._socket_path))
+
+    async def serve(self, on_ready: Callable[[], None] | None = None) -> None:
+        """
+        Listen on the socket & answer requests until idle or shut down.
+
+        The socket is only accessible to the current user, & is removed on exit.
+        """
+        self._shutdown_event = asyncio.Event()
+        self._worker_slots = asyncio.Semaphore(self._max_workers)
+        self._last_activity_time = asyncio.get_running_loop().time()
+
+        self._socket_path.parent.mkdir(parents=True, exist_ok=True)
+        self._remove_stale_socket()
+
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self._max_workers,
+            thread_name_prefix="flake8-carrot-daemon",
+            initializer=self._get_worker_session,
+        )
+        try:
+            previous_umask: int = os.umask(_SOCKET_UMASK)
+            try:
+                server: asyncio.Server = await asyncio.start_unix_server(
+                    self._handle_connection,
+                    path=os.fspath(self._socket_path),
+                    limit=MAX_REQUEST_BYTES,
+                )
+            finally:
+                os.umask(previous_umask)
+
+            try:
+                if on_ready is not None:
+                    on_ready()
+
+                await self._wait_until_finished()
+
+            finally:
+                server.close()
+                server.close_clients()
+                await server.wait_closed()
+
+        finally:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._socket_path.unlink(missing_ok=True)
+
+    def shutdown(self) -> None:
+        """Stop answering requests, so that `serve()` returns."""
+        if self._shutdown_event is not None:
+            self._shutdown_event.set()
+
+    async def _wait_until_finished(self) -> None:
+        if self._shutdown_event is None:
+            return
+
+        if self._idle_timeout is None:
+            await self._shutdown_event.wait()
+            return
+
+        while not self._shutdown_event.is_set():
+            remaining_time: float = (
+                self._last_activity_time
+                + self._idle_timeout
+                - asyncio.get_running_loop().time()
+            )
+            if remaining_time <= 0 and not self._active_requests_count:
+                return
+
+            with contextlib.suppress(TimeoutError):
+                async with asyncio.timeout(
+                    remaining_time if remaining_time > 0 else self._idle_timeout
+                ):
+                    await self._shutdown_event.wait()
+
+    async def _handle_connection(self, reader: StreamReader, writer: StreamWriter) -> None:
+        request_tasks: set[asyncio.Task[None]] = set()
+
+        try:
+            while True:
+                try:
+                    request_line: bytes = await reader.readline()
+                except ValueError:
+                    # NOTE: The request was longer than the stream's limit
+                    writer.write(
+                        self._encode_response({"id": None, "error": "Request is too long."})
+                    )
+                    break
+
+                if not request_line:
+                    break
+
+                if not request_line.strip():
+                    continue
+
+                request_task: asyncio.Task[None] = asyncio.create_task(
+                    self._answer_request(request_line, writer)
+                )
+                request_tasks.add(request_task)
+                request_task.add_done_callback(request_tasks.discard)
+
+            if request_tasks:
+                await asyncio.wait(request_tasks)
+
+        except ConnectionError:
+            pass
+
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    @staticmethod
+    def _encode_response(response: _Response) -> bytes:
+        return json.dumps(response, ensure_ascii=False).encode() + b"\n"
+
+    async def _answer_request(self, request_line: bytes, writer: StreamWriter) -> None:
+        self._active_requests_count += 1
+        request_id: object = None
+
+        try:
+            request: object = json.loads(request_line)
+            if isinstance(request, dict):
+                request_id = request.get("id", None)
+
+            response: _Response = {"id": request_id, **await self._run_request(request)}
+
+        except _INVALID_REQUEST_ERRORS as error:
+            response = {"id": request_id, "error": str(error)}
+
+        # NOTE: Every request is answered, even if linting it failed unexpectedly
+        except Exception as error:  # noqa: BLE001
+            response = {"id": request_id, "error": f"{type(error).__name__}: {error}"}
+
+        finally:
+            self._active_requests_count -= 1
+            self._last_activity_time = asyncio.get_running_loop().time()
+
+        if not writer.is_closing():
+            writer.write(self._encode_response(response))
+            with contextlib.suppress(ConnectionError):
+                await writer.drain()
+
+    async def _run_request(self, request: object) -> _Response:
+        if not isinstance(request, dict):
+            NOT_AN_OBJECT_MESSAGE: Final[str] = "Each request must be a JSON object."
+            raise _InvalidRequestError(NOT_AN_OBJECT_MESSAGE)
+
+        command: object = request.get("command", None)
+        if command == _SHUTDOWN_COMMAND:
+            self.shutdown()
+            return {"shutdown": True}
+
+        if command is not None:
+            UNKNOWN_COMMAND_MESSAGE: Final[str] = f"Unknown command {command!r}."
+            raise _InvalidRequestError(UNKNOWN_COMMAND_MESSAGE)
+
+        source: object = request.get("source", None)
+        path: object = request.get("path", None)
+        filename: object = request.get("filename", "<unknown>" if path is None else path)
+
+        problems: Sequence[Problem]
+        if isinstance(source, str) and isinstance(filename, str):
+            problems = await self._run_in_worker(
+                lambda lint_session: lint_session.lint_source(source, filename)
+            )
+        elif source is None and isinstance(path, str):
+            problems = await self._lint_path(path)
+        else:
+            INVALID_REQUEST_MESSAGE: Final[str] = (
+                'Each request must hold either a "path" string, or a "source" string '
+                'with an optional "filename" string.'
+            )
+            raise _InvalidRequestError(INVALID_REQUEST_MESSAGE)
+
+        return {"problems": [problem._asdict() for problem in problems]}
+
+    async def _run_in_worker(
+        self,
+        lint: Callable[[LintSession], Sequence[Problem]],
+        on_start: Callable[[], object] | None = None,
+    ) -> Sequence[Problem]:
+        if self._worker_slots is None or self._executor is None:
+            NOT_SERVING_MESSAGE: Final[str] = "The daemon is not serving requests."
+            raise RuntimeError(NOT_SERVING_MESSAGE)
+
+        executor: concurrent.futures.ThreadPoolExecutor = self._executor
+        async with self._worker_slots:
+            if on_start is not None:
+                on_start()
+
+            return await asyncio.get_running_loop().run_in_executor(
+                executor, lambda: lint(self._get_worker_session())
+            )
+
+    async def _lint_path(self, path: str) -> Sequence[Problem]:
+        pending_lint: asyncio.Task[Sequence[Problem]] | None = self._pending_path_lints.get(
+            path, None
+        )
+        if pending_lint is None:
+            # NOTE: Once started, the lint is no longer shared, as the file may change again
+            pending_lint = asyncio.create_task(
+                self._run_in_worker(
+                    lambda lint_session: lint_session.lint_file(path),
+                    on_start=lambda: self._pending_path_lints.pop(path, None),
+                ),
+            )
+            self._pending_path_lints[path] = pending_lint
+
+        # NOTE: Shielded, so one cancelled request does not cancel the others sharing it
+        return await asyncio.shield(pending_lint)
@@ -0,0 +1,279 @@
+"""Linting of only the lines changed within a Git revision range, skipping unaffected rules."""
+
+import io
+import re
+import subprocess
+import tokenize
+from typing import TYPE_CHECKING, NamedTuple
+
+from . import discovery, pipeline, preamble
+from .batch import FileProblems
+from .staged import BlobReader
+from .utils import RuleScope
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Mapping, Sequence
+    from collections.abc import Set as AbstractSet
+    from typing import Final
+
+    from .pipeline import SourceFile
+    from .session import LintSession, Problem
+
+__all__: Sequence[str] = ("ChangedFile", "lint_diff", "list_changed_files", "select_scopes")
+
+
+if __name__ == "__main__":
+    CANNOT_RUN_AS_SCRIPT_MESSAGE: Final[str] = "This module cannot be run as a script."
+    raise RuntimeError(CANNOT_RUN_AS_SCRIPT_MESSAGE)
+
+
+_GIT_EXECUTABLE: Final[str] = "git"
+_NEW_FILE_HEADER_PREFIX: Final[str] = "+++ "
+_NEW_FILE_PATH_PREFIX: Final[str] = "b/"
+_DELETED_FILE_PATH: Final[str] = "/dev/null"
+_HEADER_PATH_TERMINATOR: Final[str] = "\t"
+_NO_NEWLINE_MARKER: Final[str] = "\\"
+_HUNK_HEADER_PATTERN: Final[re.Pattern[str]] = re.compile(
+    r"@@ -\d+(?:,(?P<old_count>\d+))? \+(?P<new_start>\d+)(?:,(?P<new_count>\d+))? @@"
+)
+_QUOTED_PATH_ESCAPE_PATTERN: Final[re.Pattern[str]] = re.compile(r"\\([0-7]{3}|.)")
+_QUOTED_PATH_ESCAPES: Final[Mapping[str, str]] = {
+    "a": "\a",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+    "v": "\v",
+}
+_REVISION_RANGE_SEPARATORS: Final[Sequence[str]] = ("...", "..")
+_DEFAULT_END_REVISION: Final[str] = "HEAD"
+
+# NOTE: The preamble rules also see the first few lines of the statement that ends it
+_PREAMBLE_END_MARGIN: Final[int] = 3
+
+_UNFILTERED_ERROR_CODES: Final[AbstractSet[str]] = frozenset({"E902", "E999"})
+_INVALID_PREAMBLE_ERRORS: Final[tuple[type[Exception], ...]] = (
+    SyntaxError,
+    tokenize.TokenError,
+)
+
+
+class ChangedFile(NamedTuple):
+    """A file changed within a revision range, with the lines changed on its new side."""
+
+    path: str
+    changed_lines: AbstractSet[int]
+    touched_lines: AbstractSet[int]
+    """The changed lines, as well as the lines either side of each deletion."""
+
+
+def _unquote_path(path: str) -> str:
+    if not path.startswith('"'):
+        return path
+
+    # NOTE: Git quotes unusual paths as C strings, with each non-ASCII byte in octal
+    return (
+        _QUOTED_PATH_ESCAPE_PATTERN.sub(
+            lambda match: (
+                chr(int(match[1], 8))
+                if len(match[1]) == 3
+                else _QUOTED_PATH_ESCAPES.get(match[1], match[1])
+            ),
+            path[1:-1],
+        )
+        .encode("latin-1")
+        .decode(errors="surrogateescape")
+    )
+
+
+def _parse_unified_diff(diff_lines: Sequence[str]) -> Sequence[ChangedFile]:
+    changed_files: list[ChangedFile] = []
+    path: str | None = None
+    changed_lines: set[int] = set()
+    touched_lines: set[int] = set()
+
+    index: int = 0
+    while index < len(diff_lines):
+        diff_line: str = diff_lines[index]
+        index += 1
+
+        if diff_line.startswith(_NEW_FILE_HEADER_PREFIX):
+            if path is not None:
+                changed_files.append(ChangedFile(path, changed_lines, touched_lines))
+
+            # NOTE: Git ends the header with a tab if the unquoted path contains a space
+            new_path: str = _unquote_path(
+                diff_line.removeprefix(_NEW_FILE_HEADER_PREFIX).removesuffix(
+                    _HEADER_PATH_TERMINATOR
+                ),
+            )
+            path = (
+                None
+                if new_path == _DELETED_FILE_PATH
+                else new_path.removeprefix(_NEW_FILE_PATH_PREFIX)
+            )
+            changed_lines = set()
+            touched_lines = set()
+            continue
+
+        hunk_header_match: re.Match[str] | None = _HUNK_HEADER_PATTERN.match(diff_line)
+        if hunk_header_match is None or path is None:
+            continue
+
+        new_start: int = int(hunk_header_match["new_start"])
+        new_count: int = int(hunk_header_match["new_count"] or 1)
+        if new_count:
+            changed_lines.update(range(new_start, new_start + new_count))
+            touched_lines.update(range(new_start, new_start + new_count))
+        else:
+            # NOTE: A pure deletion is positioned at the line before the deleted lines
+            touched_lines.update((new_start, new_start + 1))
+
+        # NOTE: The hunk's own lines are skipped, as added lines can look like file headers
+        remaining_lines_count: int = int(hunk_header_match["old_count"] or 1) + new_count
+        while remaining_lines_count and index < len(diff_lines):
+            if not diff_lines[index].startswith(_NO_NEWLINE_MARKER):
+                remaining_lines_count -= 1
+            index += 1
+
+    if path is not None:
+        changed_files.append(ChangedFile(path, changed_lines, touched_lines))
+
+    return changed_files
+
+
+def list_changed_files(
+    revision_range: str, pathspecs: Sequence[str] = ()
+) -> Sequence[ChangedFile]:
+    """
+    List the files added, copied, modified or renamed within the given revision range.
+
+    The range is any accepted by `git diff`, E.g. "main...HEAD", or a single revision
+    to compare with the working tree.
+    The paths are relative to the working directory, & only the files within it are listed.
+    """
+    return _parse_unified_diff(
+        subprocess.run(
+            (
+                _GIT_EXECUTABLE,
+                "diff",
+                "--unified=0",
+                "--no-color",
+                "--no-ext-diff",
+                "--relative",
+                "--find-renames",
+                "--diff-filter=ACMR",
+                "--src-prefix=a/",
+                "--dst-prefix=b/",
+                revision_range,
+                "--",
+                *pathspecs,
+            ),
+            capture_output=True,
+            check=True,
+        )
+        .stdout.decode(errors="surrogateescape")
+        .splitlines(),
+    )
+
+
+def _get_end_revision(revision_range: str) -> str | None:
+    separator: str
+    for separator in _REVISION_RANGE_SEPARATORS:
+        if separator in revision_range:
+            return revision_range.partition(separator)[2] or _DEFAULT_END_REVISION
+
+    return None
+
+
+def select_scopes(source: str, changed_file: ChangedFile) -> AbstractSet[RuleScope]:
+    """
+    Select the scopes of the rules that could report problems on the file's changed lines.
+
+    The comment rules are only needed if a changed line could hold a comment,
+    & the preamble rules only if a line within the module's preamble was touched.
+    """
+    if not changed_file.changed_lines:
+        return frozenset()
+
+    scopes: set[RuleScope] = {RuleScope.MODULE, RuleScope.STATEMENT}
+    lines: Sequence[str] = io.StringIO(source).readlines()
+
+    if any(
+        "#" in lines[line - 1] for line in changed_file.changed_lines if line <= len(lines)
+    ):
+        scopes.add(RuleScope.COMMENTS)
+
+    try:
+        next_statement_line_number: int | None = preamble.read_preamble(
+            io.StringIO(source).readline
+        ).next_statement_line_number
+    except _INVALID_PREAMBLE_ERRORS:
+        next_statement_line_number = None
+
+    if next_statement_line_number is None or any(
+        line <= next_statement_line_number + _PREAMBLE_END_MARGIN
+        for line in changed_file.touched_lines
+    ):
+        scopes.add(RuleScope.PREAMBLE)
+
+    return scopes
+
+
+def lint_diff(
+    lint_session: LintSession,
+    revision_range: str,
+    pathspecs: Sequence[str] = (),
+    *,
+    exclude_patterns: Iterable[str] = (),
+) -> Iterator[FileProblems]:
+    """
+    Lint each Python file changed within the given revision range, on only its changed lines.
+
+    If the range has an end revision, each file's contents are read from that revision,
+    otherwise they are read from the working tree.
+    Rules whose scope was not touched by the diff are not run at all.
+    Problems that stop a file being linted, E.g. syntax errors, are always reported.
+    """
+    changed_files: Mapping[str, ChangedFile] = {
+        changed_file.path: changed_file
+        for changed_file in list_changed_files(revision_range, pathspecs)
+        if changed_file.changed_lines
+    }
+    if not changed_files:
+        return
+
+    end_revision: str | None = _get_end_revision(revision_range)
+    blob_reader: BlobReader | None = None if end_revision is None else BlobReader()
+
+    try:
+        path: str
+        for path in discovery.filter_source_paths(changed_files, exclude_patterns):
+            source: str
+            if blob_reader is None:
+                source_file: SourceFile = pipeline.read_source_file(path)
+                if source_file.source is None:
+                    yield FileProblems(path, lint_session.lint_source_file(source_file))
+                    continue
+
+                source = source_file.source
+            else:
+                source = pipeline.decode_source(blob_reader.read(f"{end_revision}:./{path}"))
+
+            problems: Sequence[Problem] = lint_session.lint_source(
+                source, path, scopes=select_scopes(source, changed_files[path])
+            )
+            yield FileProblems(
+                path,
+                [
+                    problem
+                    for problem in problems
+                    if problem.line in changed_files[path].changed_lines
+                    or problem.code in _UNFILTERED_ERROR_CODES
+                ],
+            )
+
+    finally:
+        if blob_reader is not None:
+            blob_reader.close()
@@ -0,0 +1,437 @@
+"""Parallel discovery of the Python source files to lint, honouring excludes & `.gitignore`."""
+
+import concurrent.futures
+import fnmatch
+import os
+import re
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+    from concurrent.futures import Future
+    from typing import Final
+
+__all__: Sequence[str] = ("filter_source_paths", "find_source_paths")
+
+
+if __name__ == "__main__":
+    CANNOT_RUN_AS_SCRIPT_MESSAGE: Final[str] = "This module cannot be run as a script."
+    raise RuntimeError(CANNOT_RUN_AS_SCRIPT_MESSAGE)
+
+
+_SOURCE_FILE_PATTERN: Final[str] = "*.py"
+_GITIGNORE_FILE_NAME: Final[str] = ".gitignore"
+_GIT_DIRECTORY_NAME: Final[str] = ".git"
+_NEVER_MATCHING_REGEX: Final[re.Pattern[str]] = re.compile(r"(?!)")
+
+
+class _GitignorePattern(NamedTuple):
+    regex: re.Pattern[str]
+    negated: bool
+    directory_only: bool
+
+
+class _GitignoreRules(NamedTuple):
+    """The compiled patterns of every `.gitignore` file that applies to a directory."""
+
+    patterns: tuple[_GitignorePattern, ...]
+    any_pattern_regex: re.Pattern[str]
+    has_negated_patterns: bool
+
+    def extend(self, patterns: Sequence[_GitignorePattern]) -> _GitignoreRules:
+        """Create the rules of a subdirectory, with its own `.gitignore` patterns added."""
+        if not patterns:
+            return self
+
+        all_patterns: tuple[_GitignorePattern, ...] = (*self.patterns, *patterns)
+        return _GitignoreRules(
+            patterns=all_patterns,
+            any_pattern_regex=re.compile(
+                "|".join(f"(?:{pattern.regex.pattern})" for pattern in all_patterns)
+            ),
+            has_negated_patterns=any(pattern.negated for pattern in all_patterns),
+        )
+
+    def is_ignored(self, relative_path: str, *, is_directory: bool) -> bool:
+        """Whether the given path, relative to the repository's root, is ignored by Git."""
+        # NOTE: Most paths match no pattern at all, so one combined regex rules them out
+        if not self.any_pattern_regex.match(relative_path):
+            return False
+
+        if not self.has_negated_patterns:
+            return is_directory or any(
+                not pattern.directory_only and pattern.regex.match(relative_path)
+                for pattern in self.patterns
+            )
+
+        # NOTE: As with Git, the last matching pattern decides whether the path is ignored
+        pattern: _GitignorePattern
+        for pattern in reversed(self.patterns):
+            if pattern.directory_only and not is_directory:
+                continue
+
+            if pattern.regex.match(relative_path):
+                return not pattern.negated
+
+        return False
+
+
+_EMPTY_GITIGNORE_RULES: Final[_GitignoreRules] = _GitignoreRules(
+    patterns=(), any_pattern_regex=_NEVER_MATCHING_REGEX, has_negated_patterns=False
+)
+
+
+def _translate_gitignore_glob(glob: str) -> str:
+    regex_parts: list[str] = []
+    index: int = 0
+
+    while index < len(glob):
+        if glob.startswith("**/", index) and (index == 0 or glob[index - 1] == "/"):
+            regex_parts.append("(?:.*/)?")
+            index += 3
+        elif (
+            glob.startswith("**", index) and index + 2 == len(glob) and glob[index - 1] == "/"
+        ):
+            regex_parts.append(".*")
+            index += 2
+        elif glob[index] == "*":
+            regex_parts.append("[^/]*")
+            index += 1
+        elif glob[index] == "?":
+            regex_parts.append("[^/]")
+            index += 1
+        elif glob[index] == "[" and "]" in glob[index + 2 :]:
+            class_end: int = glob.index("]", index + 2)
+            class_contents: str = glob[index + 1 : class_end].replace("\\", "\\\\")
+            if class_contents.startswith("!"):
+                class_contents = f"^{class_contents[1:]}"
+            regex_parts.append(f"[{class_contents}]")
+            index = class_end + 1
+        elif glob[index] == "\\" and index + 1 < len(glob):
+            regex_parts.append(re.escape(glob[index + 1]))
+            index += 2
+        else:
+            regex_parts.append(re.escape(glob[index]))
+            index += 1
+
+    return "".join(regex_parts)
+
+
+def _compile_gitignore(
+    lines: Iterable[str], relative_directory: str
+) -> list[_GitignorePattern]:
+    patterns: list[_GitignorePattern] = []
+    directory_prefix: str = re.escape(f"{relative_directory}/") if relative_directory else ""
+
+    line: str
+    for line in lines:
+        glob: str = line.rstrip("\n")
+        while glob.endswith(" ") and not glob.endswith("\\ "):
+            glob = glob[:-1]
+
+        if not glob or glob.startswith("#"):
+            continue
+
+        negated: bool = glob.startswith("!")
+        if negated or glob.startswith(("\\#", "\\!")):
+            glob = glob[1:]
+
+        directory_only: bool = glob.endswith("/")
+        glob = glob.rstrip("/")
+        if not glob:
+            continue
+
+        # NOTE: Patterns containing a slash only match relative to their `.gitignore` file
+        anchored: bool = "/" in glob
+        body: str = _translate_gitignore_glob(glob.removeprefix("/"))
+        patterns.append(
+            _GitignorePattern(
+                regex=re.compile(
+                    f"{directory_prefix}{body}\\Z"
+                    if anchored
+                    else f"{directory_prefix}(?:.*/)?{body}\\Z"
+                ),
+                negated=negated,
+                directory_only=directory_only,
+            ),
+        )
+
+    return patterns
+
+
+def _read_gitignore(directory: str, relative_directory: str) -> list[_GitignorePattern]:
+    try:
+        with open(  # noqa: PTH123
+            os.path.join(directory, _GITIGNORE_FILE_NAME),  # noqa: PTH118
+            encoding="utf-8",
+            errors="surrogateescape",
+        ) as gitignore_file:
+            return _compile_gitignore(gitignore_file, relative_directory)
+    except OSError:
+        return []
+
+
+def _find_repository_rules(absolute_directory: str) -> tuple[str, _GitignoreRules] | None:
+    ancestors: list[str] = []
+    directory: str = absolute_directory
+
+    while True:
+        ancestors.append(directory)
+        if os.path.exists(os.path.join(directory, _GIT_DIRECTORY_NAME)):  # noqa: PTH110, PTH118
+            break
+
+        parent_directory: str = os.path.dirname(directory)  # noqa: PTH120
+        if parent_directory == directory:
+            return None
+
+        directory = parent_directory
+
+    repository_root: str = directory
+    rules: _GitignoreRules = _EMPTY_GITIGNORE_RULES
+
+    # NOTE: The given directory's own `.gitignore` file is read once it is listed
+    ancestor: str
+    for ancestor in reversed(ancestors[1:]):
+        rules = rules.extend(
+            _read_gitignore(ancestor, _get_relative_path(ancestor, repository_root))
+        )
+
+    return repository_root, rules
+
+
+def _get_relative_path(absolute_path: str, repository_root: str) -> str:
+    relative_path: str = os.path.relpath(absolute_path, repository_root)
+    if relative_path == os.curdir:
+        return ""
+
+    return relative_path.replace(os.sep, "/")
+
+
+class _Matcher(NamedTuple):
+    exclude_regex: re.Pattern[str]
+    source_file_regex: re.Pattern[str]
+
+    def is_excluded(self, name: str, absolute_path: str) -> bool:
+        return bool(
+            (name not in {os.curdir, os.pardir} and self.exclude_regex.match(name))
+            or self.exclude_regex.match(absolute_path)
+        )
+
+
+class _Directory(NamedTuple):
+    path: str
+    absolute_path: str
+    relative_path: str | None
+    gitignore_rules: _GitignoreRules
+
+
+def _list_directory(
+    directory: _Directory, matcher: _Matcher
+) -> tuple[list[str], list[_Directory]]:
+    source_paths: list[str] = []
+    subdirectories: list[_Directory] = []
+
+    try:
+        entries: list[os.DirEntry[str]] = list(os.scandir(directory.path))
+    except OSError:
+        return source_paths, subdirectories
+
+    gitignore_rules: _GitignoreRules = directory.gitignore_rules
+    if directory.relative_path is not None and any(
+        entry.name == _GITIGNORE_FILE_NAME for entry in entries
+    ):
+        gitignore_rules = gitignore_rules.extend(
+            _read_gitignore(directory.path, directory.relative_path)
+        )
+
+    entry: os.DirEntry[str]
+    for entry in entries:
+        try:
+            is_directory: bool = entry.is_dir()
+        except OSError:
+            is_directory = False
+
+        if not is_directory and not matcher.source_file_regex.match(
+            os.path.normcase(entry.name)
+        ):
+            continue
+
+        absolute_path: str = os.path.join(directory.absolute_path, entry.name)  # noqa: PTH118
+        if matcher.is_excluded(os.path.normcase(entry.name), os.path.normcase(absolute_path)):
+            continue
+
+        relative_path: str | None = None
+        if directory.relative_path is not None:
+            relative_path = (
+                f"{directory.relative_path}/{entry.name}"
+                if directory.relative_path
+                else entry.name
+            )
+            if gitignore_rules.is_ignored(relative_path, is_directory=is_directory):
+                continue
+
+        if not is_directory:
+            source_paths.append(entry.path)
+
+        # NOTE: As with `os.walk()`, symbolic links to directories are not followed
+        elif not entry.is_symlink():
+            subdirectories.append(
+                _Directory(entry.path, absolute_path, relative_path, gitignore_rules),
+            )
+
+    return source_paths, subdirectories
+
+
+def _walk_directory(
+    directory: _Directory,
+    matcher: _Matcher,
+    executor: concurrent.futures.ThreadPoolExecutor,
+    walked_directories: set[str] | None,
+) -> Iterator[str]:
+    pending_listings: set[Future[tuple[list[str], list[_Directory]]]] = {
+        executor.submit(_list_directory, directory, matcher),
+    }
+
+    try:
+        while pending_listings:
+            done_listings: set[Future[tuple[list[str], list[_Directory]]]]
+            done_listings, pending_listings = concurrent.futures.wait(
+                pending_listings, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+
+            done_listing: Future[tuple[list[str], list[_Directory]]]
+            for done_listing in done_listings:
+                source_paths, subdirectories = done_listing.result()
+                pending_listings.update(
+                    executor.submit(_list_directory, subdirectory, matcher)
+                    for subdirectory in subdirectories
+                )
+                if walked_directories is not None:
+                    walked_directories.update(
+                        subdirectory.path for subdirectory in subdirectories
+                    )
+
+                yield from source_paths
+
+    finally:
+        pending_listing: Future[tuple[list[str], list[_Directory]]]
+        for pending_listing in pending_listings:
+            pending_listing.cancel()
+
+
+def _compile_fnmatch_patterns(patterns: Iterable[str]) -> re.Pattern[str]:
+    translated_patterns: Sequence[str] = [
+        fnmatch.translate(os.path.normcase(pattern)) for pattern in patterns
+    ]
+    if not translated_patterns:
+        return _NEVER_MATCHING_REGEX
+
+    return re.compile("|".join(translated_patterns))
+
+
+def find_source_paths(
+    paths: Iterable[str],
+    exclude_patterns: Iterable[str],
+    *,
+    respect_gitignore: bool = True,
+    max_workers: int | None = None,
+    walked_directories: set[str] | None = None,
+) -> Iterator[str]:
+    """
+    Find the Python source files within the given paths, skipping any that are excluded.
+
+    Directories are listed across a thread pool, & excluded or Git-ignored directories are
+    never descended into.
+    All the exclude patterns are compiled together, so each entry is matched only once,
+    with the same result as matching each pattern in turn, as by Flake8.
+    Files given directly are always linted, as by Flake8.
+    The files are yielded in the order that their directories finish being listed.
+    If `walked_directories` is given, the path of each directory walked is added to it,
+    E.g. so that those directories can be watched for changes.
+    """
+    matcher: _Matcher = _Matcher(
+        exclude_regex=_compile_fnmatch_patterns(exclude_patterns),
+        source_file_regex=_compile_fnmatch_patterns((_SOURCE_FILE_PATTERN,)),
+    )
+
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="flake8-carrot-discovery"
+    ) as executor:
+        path: str
+        for path in paths:
+            absolute_path: str = os.path.abspath(path)  # noqa: PTH100
+            if matcher.is_excluded(
+                os.path.normcase(os.path.basename(path)),  # noqa: PTH119
+                os.path.normcase(absolute_path),
+            ):
+                continue
+
+            if not os.path.isdir(path):  # noqa: PTH112
+                yield path
+                continue
+
+            if walked_directories is not None:
+                walked_directories.add(path)
+
+            repository_rules: tuple[str, _GitignoreRules] | None = (
+                _find_repository_rules(absolute_path) if respect_gitignore else None
+            )
+            yield from _walk_directory(
+                (
+                    _Directory(path, absolute_path, None, _EMPTY_GITIGNORE_RULES)
+                    if repository_rules is None
+                    else _Directory(
+                        path,
+                        absolute_path,
+                        _get_relative_path(absolute_path, repository_rules[0]),
+                        repository_rules[1],
+                    )
+                ),
+                matcher,
+                executor,
+                walked_directories,
+            )
+
+
+def filter_source_paths(
+    paths: Iterable[str], exclude_patterns: Iterable[str]
+) -> Iterator[str]:
+    """
+    Filter the given file paths, E.g. changed files listed by Git, to those that are linted.
+
+    Each path is kept only if it is a Python source file, & neither it nor any of the
+    directories within its path are excluded, as if it had been found by walking ".".
+    """
+    matcher: _Matcher = _Matcher(
+        exclude_regex=_compile_fnmatch_patterns(exclude_patterns),
+        source_file_regex=_compile_fnmatch_patterns((_SOURCE_FILE_PATTERN,)),
+    )
+    excluded_directories: dict[str, bool] = {}
+
+    def _is_directory_excluded(directory: str) -> bool:
+        if not directory or directory == os.curdir:
+            return False
+
+        is_excluded: bool | None = excluded_directories.get(directory, None)
+        if is_excluded is None:
+            is_excluded = _is_directory_excluded(
+                os.path.dirname(directory)  # noqa: PTH120
+            ) or matcher.is_excluded(
+                os.path.normcase(os.path.basename(directory)),  # noqa: PTH119
+                os.path.normcase(os.path.abspath(directory)),  # noqa: PTH100
+            )
+            excluded_directories[directory] = is_excluded
+
+        return is_excluded
+
+    path: str
+    for path in paths:
+        name: str = os.path.normcase(os.path.basename(path))  # noqa: PTH119
+        if all(
+            (
+                matcher.source_file_regex.match(name),
+                not _is_directory_excluded(os.path.dirname(os.path.normpath(path))),  # noqa: PTH120
+                not matcher.is_excluded(name, os.path.normcase(os.path.abspath(path))),  # noqa: PTH100
+            ),
+        ):
+            yield path
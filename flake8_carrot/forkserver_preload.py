@@ -0,0 +1,19 @@
+"""Freeze every object a multiprocessing forkserver has preloaded, once imported by it."""
+
+import gc
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from typing import Final
+
+__all__: Sequence[str] = ()
+
+
+if __name__ == "__main__":
+    CANNOT_RUN_AS_SCRIPT_MESSAGE: Final[str] = "This module cannot be run as a script."
+    raise RuntimeError(CANNOT_RUN_AS_SCRIPT_MESSAGE)
+
+
+# NOTE: Never unfrozen, as the forkserver only forks workers after preloading its modules
+gc.freeze()
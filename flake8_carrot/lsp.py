@@ -0,0 +1,514 @@
+"""Language Server Protocol front-end, publishing problems as open documents are edited."""
+
+import asyncio
+import concurrent.futures
+import contextlib
+import json
+import re
+from typing import TYPE_CHECKING, override
+from urllib.parse import unquote, urlsplit
+
+from .session import LintCancelledError, LintSession, StatementProblemsCache
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Mapping, Sequence
+    from typing import BinaryIO, Final
+    from urllib.parse import SplitResult
+
+    from .session import Problem
+
+__all__: Sequence[str] = (
+    "DEFAULT_DEBOUNCE_SECONDS",
+    "LanguageServer",
+    "apply_content_change",
+    "read_message",
+    "write_message",
+)
+
+
+if __name__ == "__main__":
+    CANNOT_RUN_AS_SCRIPT_MESSAGE: Final[str] = "This module cannot be run as a script."
+    raise RuntimeError(CANNOT_RUN_AS_SCRIPT_MESSAGE)
+
+
+DEFAULT_DEBOUNCE_SECONDS: Final[float] = 0.25
+
+_SERVER_NAME: Final[str] = "flake8-carrot"
+_CONTENT_LENGTH_HEADER: Final[bytes] = b"content-length"
+_LINE_BREAK_PATTERN: Final[re.Pattern[str]] = re.compile(r"\r\n|\r|\n")
+_FILE_URI_SCHEME: Final[str] = "file"
+
+_TEXT_DOCUMENT_SYNC_INCREMENTAL: Final[int] = 2
+_SEVERITY_ERROR: Final[int] = 1
+_SEVERITY_WARNING: Final[int] = 2
+_MESSAGE_TYPE_ERROR: Final[int] = 1
+_ERROR_SEVERITY_CODES: Final[Sequence[str]] = ("E902", "E999")
+
+_PARSE_ERROR: Final[int] = -32700
+_INVALID_REQUEST: Final[int] = -32600
+_METHOD_NOT_FOUND: Final[int] = -32601
+_INVALID_PARAMS: Final[int] = -32602
+_SERVER_NOT_INITIALIZED: Final[int] = -32002
+
+if TYPE_CHECKING:
+    type _Message = Mapping[str, object]
+
+
+class _InvalidMessageError(ValueError):
+    """A message that is not a valid JSON-RPC message, or has invalid parameters."""
+
+
+_INVALID_MESSAGE_ERRORS: Final[tuple[type[Exception], ...]] = (
+    _InvalidMessageError,
+    json.JSONDecodeError,
+    UnicodeDecodeError,
+)
+
+
+def read_message(input_stream: BinaryIO) -> _Message | None:
+    """
+    Read the next JSON-RPC message, framed by its `Content-Length` header.
+
+    Returns None once the stream has ended.
+    """
+    content_length: int | None = None
+
+    while True:
+        header_line: bytes = input_stream.readline()
+        if not header_line:
+            return None
+
+        if not header_line.strip():
+            break
+
+        header_name: bytes
+        header_value: bytes
+        header_name, _, header_value = header_line.partition(b":")
+        if header_name.strip().lower() == _CONTENT_LENGTH_HEADER:
+            try:
+                content_length = int(header_value)
+            except ValueError:
+                content_length = None
+
+    if content_length is None:
+        MISSING_CONTENT_LENGTH_MESSAGE: Final[str] = (
+            "Each message must have a valid Content-Length header."
+        )
+        raise _InvalidMessageError(MISSING_CONTENT_LENGTH_MESSAGE)
+
+    content: bytes = input_stream.read(content_length)
+    if len(content) < content_length:
+        return None
+
+    message: object = json.loads(content)
+    if not isinstance(message, dict):
+        NOT_AN_OBJECT_MESSAGE: Final[str] = "Each message must be a JSON object."
+        raise _InvalidMessageError(NOT_AN_OBJECT_MESSAGE)
+
+    return message
+
+
+def write_message(output_stream: BinaryIO, message: _Message) -> None:
+    """Write the given JSON-RPC message, framed by its `Content-Length` header."""
+    content: bytes = json.dumps({"jsonrpc": "2.0", **message}, ensure_ascii=False).encode()
+    output_stream.write(b"Content-Length: %d\r\n\r\n%b" % (len(content), content))
+    output_stream.flush()
+
+
+def _get_field[T](container: object, key: str, field_type: type[T]) -> T:
+    value: object = container.get(key, None) if isinstance(container, dict) else None
+    if not isinstance(value, field_type):
+        INVALID_FIELD_MESSAGE: Final[str] = f"Missing or invalid field {key!r}."
+        raise _InvalidMessageError(INVALID_FIELD_MESSAGE)
+
+    return value
+
+
+def _position_to_offset(text: str, position: object) -> int:
+    """Find the index of an LSP position within the text, counting UTF-16 code units."""
+    line: int = _get_field(position, "line", int)
+    character: int = _get_field(position, "character", int)
+
+    line_breaks: Sequence[re.Match[str]] = list(_LINE_BREAK_PATTERN.finditer(text))
+    if line > len(line_breaks):
+        return len(text)
+
+    line_start: int = line_breaks[line - 1].end() if line else 0
+    line_end: int = line_breaks[line].start() if line < len(line_breaks) else len(text)
+
+    line_text: str = text[line_start:line_end]
+    if line_text.isascii():
+        return line_start + min(character, len(line_text))
+
+    utf16_units: int = 0
+    index: int
+    char: str
+    for index, char in enumerate(line_text):
+        if utf16_units >= character:
+            return line_start + index
+
+        utf16_units += 2 if ord(char) > 0xFFFF else 1
+
+    return line_end
+
+
+def apply_content_change(text: str, change: Mapping[str, object]) -> str:
+    """
+    Apply one change of a `textDocument/didChange` notification to the document's text.
+
+    A change with a range replaces only that range, otherwise it replaces the whole text.
+    """
+    new_text: str = _get_field(change, "text", str)
+
+    change_range: object = change.get("range", None)
+    if change_range is None:
+        return new_text
+
+    return (
+        text[: _position_to_offset(text, _get_field(change_range, "start", dict))]
+        + new_text
+        + text[_position_to_offset(text, _get_field(change_range, "end", dict)) :]
+    )
+
+
+def _make_diagnostic(problem: Problem, lines: Sequence[str]) -> _Message:
+    line_index: int = max(problem.line - 1, 0)
+    line_text: str = lines[line_index] if line_index < len(lines) else ""
+
+    # NOTE: LSP positions count UTF-16 code units, rather than code points
+    character: int = len(line_text[: max(problem.column - 1, 0)].encode("utf-16-le")) // 2
+
+    return {
+        "range": {
+            "start": {"line": line_index, "character": character},
+            "end": {"line": line_index, "character": character},
+        },
+        "severity": (
+            _SEVERITY_ERROR if problem.code in _ERROR_SEVERITY_CODES else _SEVERITY_WARNING
+        ),
+        "code": problem.code,
+        "source": _SERVER_NAME,
+        "message": problem.message,
+    }
+
+
+def _get_document_path(uri: str) -> str:
+    split_uri: SplitResult = urlsplit(uri)
+    if split_uri.scheme != _FILE_URI_SCHEME:
+        return uri
+
+    return unquote(split_uri.path)
+
+
+class _OpenDocument:
+    """The latest text of a document open within the editor, & its cached problems."""
+
+    @override
+    def __init__(self, uri: str, text: str, version: int) -> None:
+        self.uri: str = uri
+        self.path: str = _get_document_path(uri)
+        self.text: str = text
+        self.version: int = version
+        self.statement_cache: StatementProblemsCache = StatementProblemsCache()
+
+
+class LanguageServer:
+    """
+    Language server, publishing the problems of each document open within an editor.
+
+    Messages are read from & written to the given streams, E.g. stdin & stdout.
+    Documents are synchronised incrementally, & each is linted once no further changes
+    have arrived within the debounce delay.
+    A lint is abandoned if its document changes again before it finishes,
+    & only the top-level statements that changed are linted again by the statement rules.
+    """
+
+    @override
+    def __init__(
+        self,
+        input_stream: BinaryIO,
+        output_stream: BinaryIO,
+        *,
+        select: Iterable[str] | None = None,
+        ignore: Iterable[str] | None = None,
+        disable_noqa: bool = False,
+        debounce_seconds: float = DEFAULT_DEBOUNCE_SECONDS,
+    ) -> None:
+        self._input_stream: BinaryIO = input_stream
+        self._output_stream: BinaryIO = output_stream
+        self._debounce_seconds: float = debounce_seconds
+
+        # NOTE: Only ever used by the single lint thread, as sessions are not thread-safe
+        self._lint_session: LintSession = LintSession(
+            select=select, ignore=ignore, disable_noqa=disable_noqa
+        )
+
+        self._documents: dict[str, _OpenDocument] = {}
+        self._pending_lints: dict[str, asyncio.TimerHandle] = {}
+        self._lint_tasks: set[asyncio.Task[None]] = set()
+        self._is_initialized: bool = False
+        self._is_shut_down: bool = False
+        self._has_exited: bool = False
+        self._executor: concurrent.futures.ThreadPoolExecutor | None = None
+
+        self._request_handlers: Mapping[str, Callable[[object], object]] = {
+            "initialize": self._initialize,
+            "shutdown": self._shutdown,
+        }
+        self._notification_handlers: Mapping[str, Callable[[object], None]] = {
+            "initialized": lambda _: None,
+            "exit": self._exit,
+            "textDocument/didOpen": self._open_document,
+            "textDocument/didChange": self._change_document,
+            "textDocument/didClose": self._close_document,
+        }
+
+    async def serve(self) -> int:
+        """
+        Answer messages until told to exit, or the input stream ends.
+
+        Returns the exit code of the server, which is 1 if it was not shut down first.
+        """
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="flake8-carrot-lsp"
+        )
+        try:
+            while not self._has_exited:
+                try:
+                    message: _Message | None = await asyncio.to_thread(
+                        read_message, self._input_stream
+                    )
+                except _INVALID_MESSAGE_ERRORS as error:
+                    self._write_error(None, _PARSE_ERROR, str(error))
+                    continue
+
+                if message is None:
+                    break
+
+                self._handle_message(message)
+
+        finally:
+            self._has_exited = True
+
+            pending_lint: asyncio.TimerHandle
+            for pending_lint in self._pending_lints.values():
+                pending_lint.cancel()
+
+            if self._lint_tasks:
+                await asyncio.wait(self._lint_tasks)
+
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+        return 0 if self._is_shut_down else 1
+
+    def _handle_message(self, message: _Message) -> None:
+        method: object = message.get("method", None)
+        if not isinstance(method, str):
+            # NOTE: A response, yet no requests are ever sent to the client
+            return
+
+        params: object = message.get("params", None)
+
+        if "id" not in message:
+            notification_handler: Callable[[object], None] | None = (
+                self._notification_handlers.get(method, None)
+            )
+            if notification_handler is None or not (self._is_initialized or method == "exit"):
+                return
+
+            # NOTE: Notifications cannot be answered, so invalid ones are dropped
+            with contextlib.suppress(_InvalidMessageError):
+                notification_handler(params)
+
+            return
+
+        message_id: object = message["id"]
+
+        request_handler: Callable[[object], object] | None = self._request_handlers.get(
+            method, None
+        )
+        if request_handler is None:
+            self._write_error(message_id, _METHOD_NOT_FOUND, f"Unknown method {method!r}.")
+            return
+
+        if not self._is_initialized and method != "initialize":
+            self._write_error(
+                message_id, _SERVER_NOT_INITIALIZED, "The server has not been initialized."
+            )
+            return
+
+        if self._is_shut_down:
+            self._write_error(message_id, _INVALID_REQUEST, "The server has been shut down.")
+            return
+
+        try:
+            result: object = request_handler(params)
+        except _InvalidMessageError as error:
+            self._write_error(message_id, _INVALID_PARAMS, str(error))
+            return
+
+        write_message(self._output_stream, {"id": message_id, "result": result})
+
+    def _write_error(self, message_id: object, code: int, message: str) -> None:
+        write_message(
+            self._output_stream,
+            {"id": message_id, "error": {"code": code, "message": message}},
+        )
+
+    def _initialize(self, _params: object) -> object:
+        self._is_initialized = True
+        return {
+            "capabilities": {
+                "positionEncoding": "utf-16",
+                "textDocumentSync": {
+                    "openClose": True,
+                    "change": _TEXT_DOCUMENT_SYNC_INCREMENTAL,
+                },
+            },
+            "serverInfo": {"name": _SERVER_NAME},
+        }
+
+    def _shutdown(self, _params: object) -> object:
+        self._is_shut_down = True
+        return None
+
+    def _exit(self, _params: object) -> None:
+        self._has_exited = True
+
+    def _open_document(self, params: object) -> None:
+        text_document: object = _get_field(params, "textDocument", dict)
+        document: _OpenDocument = _OpenDocument(
+            _get_field(text_document, "uri", str),
+            _get_field(text_document, "text", str),
+            _get_field(text_document, "version", int),
+        )
+        self._documents[document.uri] = document
+        self._schedule_lint(document)
+
+    def _change_document(self, params: object) -> None:
+        text_document: object = _get_field(params, "textDocument", dict)
+        document: _OpenDocument | None = self._documents.get(
+            _get_field(text_document, "uri", str), None
+        )
+        if document is None:
+            return
+
+        text: str = document.text
+
+        raw_changes: list[object] = _get_field(params, "contentChanges", list)
+        changes: Sequence[Mapping[str, object]] = [
+            change for change in raw_changes if isinstance(change, dict)
+        ]
+        if len(changes) != len(raw_changes):
+            INVALID_CHANGE_MESSAGE: Final[str] = "Each content change must be an object."
+            raise _InvalidMessageError(INVALID_CHANGE_MESSAGE)
+
+        change: Mapping[str, object]
+        for change in changes:
+            text = apply_content_change(text, change)
+
+        document.text = text
+        document.version = _get_field(text_document, "version", int)
+        self._schedule_lint(document)
+
+    def _close_document(self, params: object) -> None:
+        uri: str = _get_field(_get_field(params, "textDocument", dict), "uri", str)
+
+        pending_lint: asyncio.TimerHandle | None = self._pending_lints.pop(uri, None)
+        if pending_lint is not None:
+            pending_lint.cancel()
+
+        if self._documents.pop(uri, None) is not None:
+            self._publish_diagnostics(uri, None, [])
+
+    def _schedule_lint(self, document: _OpenDocument) -> None:
+        pending_lint: asyncio.TimerHandle | None = self._pending_lints.pop(document.uri, None)
+        if pending_lint is not None:
+            pending_lint.cancel()
+
+        self._pending_lints[document.uri] = asyncio.get_running_loop().call_later(
+            self._debounce_seconds, self._start_lint, document
+        )
+
+    def _start_lint(self, document: _OpenDocument) -> None:
+        self._pending_lints.pop(document.uri, None)
+
+        lint_task: asyncio.Task[None] = asyncio.create_task(
+            self._lint_document(document, document.version, document.text)
+        )
+        self._lint_tasks.add(lint_task)
+        lint_task.add_done_callback(self._lint_tasks.discard)
+
+    async def _lint_document(self, document: _OpenDocument, version: int, text: str) -> None:
+        if self._executor is None:
+            return
+
+        def is_stale() -> bool:
+            return any(
+                (
+                    self._has_exited,
+                    document.version != version,
+                    self._documents.get(document.uri, None) is not document,
+                ),
+            )
+
+        # NOTE: Line numbers are unchanged, as each line break is still a single line break
+        source: str = text.replace("\r\n", "\n").replace("\r", "\n")
+
+        try:
+            problems: Sequence[Problem] = await asyncio.get_running_loop().run_in_executor(
+                self._executor,
+                lambda: self._lint_session.lint_source(
+                    source,
+                    document.path,
+                    statement_cache=document.statement_cache,
+                    is_cancelled=is_stale,
+                ),
+            )
+        except LintCancelledError:
+            return
+
+        # NOTE: The old problems are cleared, rather than left in place for a newer version
+        except Exception as error:  # noqa: BLE001
+            if is_stale():
+                return
+
+            self._log_message(
+                _MESSAGE_TYPE_ERROR,
+                f"Cannot lint {document.path}: {type(error).__name__}: {error}",
+            )
+            self._publish_diagnostics(document.uri, version, [])
+            return
+
+        if is_stale():
+            return
+
+        self._publish_diagnostics(document.uri, version, problems, source.split("\n"))
+
+    def _log_message(self, message_type: int, message: str) -> None:
+        write_message(
+            self._output_stream,
+            {
+                "method": "window/logMessage",
+                "params": {"type": message_type, "message": message},
+            },
+        )
+
+    def _publish_diagnostics(
+        self,
+        uri: str,
+        version: int | None,
+        problems: Sequence[Problem],
+        lines: Sequence[str] = (),
+    ) -> None:
+        write_message(
+            self._output_stream,
+            {
+                "method": "textDocument/publishDiagnostics",
+                "params": {
+                    "uri": uri,
+                    **({} if version is None else {"version": version}),
+                    "diagnostics": [_make_diagnostic(problem, lines) for problem in problems],
+                },
+            },
+        )
@@ -0,0 +1,115 @@
+"""Declarative AST patterns, compiled into hash-keyed lookup tables for fast matching."""
+
+import ast
+from typing import TYPE_CHECKING, final, override
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+    from collections.abc import Set as AbstractSet
+    from typing import Final
+
+__all__: Sequence[str] = ("DottedNamePattern", "ImportPattern", "resolve_dotted_name")
+
+
+if __name__ == "__main__":
+    CANNOT_RUN_AS_SCRIPT_MESSAGE: Final[str] = "This module cannot be run as a script."
+    raise RuntimeError(CANNOT_RUN_AS_SCRIPT_MESSAGE)
+
+
+def resolve_dotted_name(node: ast.expr, *, max_parts: int | None = None) -> str | None:
+    """
+    Retrieve the dotted name (E.g. `abc.abstractmethod`) referred to by the given expression.
+
+    `None` is returned if the expression is not a plain chain of attribute lookups on a name,
+    or if the dotted name would contain more than `max_parts` parts.
+    """
+    if isinstance(node, ast.Name):
+        return node.id
+
+    parts: list[str] = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        if max_parts is not None and len(parts) >= max_parts:
+            return None
+
+        node = node.value
+
+    if not isinstance(node, ast.Name):
+        return None
+
+    parts.append(node.id)
+    return ".".join(reversed(parts))
+
+
+@final
+class DottedNamePattern:
+    """
+    Pattern matching expressions that resolve to any one of a collection of dotted names.
+
+    If `match_calls` is set, the given names being called (E.g. `@property()`)
+    will also be matched.
+    """
+
+    __slots__ = ("_dotted_names", "_match_calls", "_max_parts")
+
+    @override
+    def __init__(self, dotted_names: Iterable[str], *, match_calls: bool = False) -> None:
+        self._dotted_names: AbstractSet[str] = frozenset(dotted_names)
+        self._match_calls: bool = match_calls
+        self._max_parts: int = max(
+            (dotted_name.count(".") + 1 for dotted_name in self._dotted_names), default=0
+        )
+
+    @property
+    def dotted_names(self) -> AbstractSet[str]:
+        """The complete set of dotted names that this pattern matches."""
+        return self._dotted_names
+
+    def matches(self, node: ast.expr) -> bool:
+        """Check whether the given expression resolves to any of this pattern's names."""
+        if self._match_calls and isinstance(node, ast.Call):
+            node = node.func
+
+        return resolve_dotted_name(node, max_parts=self._max_parts) in self._dotted_names
+
+    def matches_any(self, nodes: Iterable[ast.expr]) -> bool:
+        """Check whether any of the given expressions match this pattern (E.g. decorators)."""
+        return any(self.matches(node) for node in nodes)
+
+
+@final
+class ImportPattern:
+    """
+    Pattern matching import statements of any one of a collection of names.
+
+    `from` imports are matched by their `(module, name)` pair, & plain imports by name.
+    If `allow_trailing_names` is set, `from` imports are matched by their first name,
+    regardless of any further names being imported in the same statement.
+    """
+
+    __slots__ = ("_allow_trailing_names", "_import_from_names", "_import_names")
+
+    @override
+    def __init__(
+        self,
+        *,
+        import_from_names: Iterable[tuple[str, str]] = (),
+        import_names: Iterable[str] = (),
+        allow_trailing_names: bool = False,
+    ) -> None:
+        self._import_from_names: AbstractSet[tuple[str, str]] = frozenset(import_from_names)
+        self._import_names: AbstractSet[str] = frozenset(import_names)
+        self._allow_trailing_names: bool = allow_trailing_names
+
+    def matches(self, node: ast.stmt) -> bool:
+        """Check whether the given statement imports any of this pattern's names."""
+        if isinstance(node, ast.ImportFrom):
+            if not node.names or (len(node.names) > 1 and not self._allow_trailing_names):
+                return False
+
+            return (node.module, node.names[0].name) in self._import_from_names
+
+        if isinstance(node, ast.Import):
+            return len(node.names) == 1 and node.names[0].name in self._import_names
+
+        return False
@@ -0,0 +1,130 @@
+"""Prefetching of upcoming source files on a small thread pool, while others are linted."""
+
+import collections
+import concurrent.futures
+import io
+import mmap
+import os
+import tokenize
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator, Sequence
+    from concurrent.futures import Future
+    from os import PathLike
+    from typing import Final
+
+__all__: Sequence[str] = (
+    "DEFAULT_PREFETCH_WORKERS",
+    "SourceFile",
+    "decode_source",
+    "prefetch_source_files",
+    "read_source_file",
+)
+
+
+if __name__ == "__main__":
+    CANNOT_RUN_AS_SCRIPT_MESSAGE: Final[str] = "This module cannot be run as a script."
+    raise RuntimeError(CANNOT_RUN_AS_SCRIPT_MESSAGE)
+
+
+DEFAULT_PREFETCH_WORKERS: Final[int] = 2
+
+_MMAP_THRESHOLD: Final[int] = 1024 * 1024
+_PENDING_FILES_PER_WORKER: Final[int] = 4
+_UNREADABLE_FILE_ERRORS: Final[tuple[type[Exception], ...]] = (SyntaxError, UnicodeError)
+
+
+class SourceFile(NamedTuple):
+    """The decoded source code of a file, or the error raised while reading it."""
+
+    path: str
+    source: str | None
+    error: OSError | None
+
+
+def _decode_source(data: bytes | mmap.mmap, readline: Callable[[], bytes]) -> str:
+    try:
+        encoding: str = tokenize.detect_encoding(readline)[0]
+        source: str = str(data, encoding)
+    except _UNREADABLE_FILE_ERRORS:
+        # NOTE: As with Flake8, files with an undetectable encoding are read as latin-1
+        source = str(data, "latin-1")
+
+    # NOTE: Newlines are translated in the same way as reading the file in text mode
+    if "\r" in source:
+        return source.replace("\r\n", "\n").replace("\r", "\n")
+
+    return source
+
+
+def decode_source(data: bytes) -> str:
+    """Decode the raw bytes of a source file, in the same way as Flake8 reads the file."""
+    return _decode_source(data, io.BytesIO(data).readline)
+
+
+def read_source_file(path: str | PathLike[str]) -> SourceFile:
+    """
+    Read & decode the source code of the given file, in the same way as Flake8.
+
+    Files of at least 1 MiB are memory-mapped, so they are decoded without first being
+    copied into a separate buffer.
+    """
+    file_path: str = os.fspath(path)
+
+    try:
+        with open(file_path, "rb") as file:  # noqa: PTH123
+            if os.fstat(file.fileno()).st_size < _MMAP_THRESHOLD:
+                return SourceFile(file_path, decode_source(file.read()), None)
+
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+                return SourceFile(
+                    file_path, _decode_source(mapped_file, mapped_file.readline), None
+                )
+
+    except OSError as error:
+        return SourceFile(file_path, None, error)
+
+
+def prefetch_source_files(
+    paths: Iterable[str | PathLike[str]], *, max_workers: int = DEFAULT_PREFETCH_WORKERS
+) -> Iterator[SourceFile]:
+    """
+    Read the given files on a small thread pool, yielding them in the same order as given.
+
+    Only a few files per thread are read ahead of the one last yielded,
+    so the memory held by the prefetched sources stays bounded.
+    If `max_workers` is 0, each file is instead read only once it is needed.
+    """
+    if max_workers < 0:
+        INVALID_MAX_WORKERS_MESSAGE: Final[str] = "Prefetch workers must be at least 0."
+        raise ValueError(INVALID_MAX_WORKERS_MESSAGE)
+
+    if max_workers == 0:
+        yield from map(read_source_file, paths)
+        return
+
+    paths_iterator: Iterator[str | PathLike[str]] = iter(paths)
+    pending_files: collections.deque[Future[SourceFile]] = collections.deque()
+
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="flake8-carrot-prefetch"
+    ) as executor:
+        try:
+            while True:
+                while len(pending_files) < max_workers * _PENDING_FILES_PER_WORKER:
+                    path: str | PathLike[str] | None = next(paths_iterator, None)
+                    if path is None:
+                        break
+
+                    pending_files.append(executor.submit(read_source_file, path))
+
+                if not pending_files:
+                    return
+
+                yield pending_files.popleft().result()
+
+        finally:
+            pending_file: Future[SourceFile]
+            for pending_file in pending_files:
+                pending_file.cancel()
@@ -0,0 +1,386 @@
+"""Fast linting of only the module-header rules, from a streamed prefix of each file."""
+
+import ast
+import io
+import os
+import tokenize
+from typing import TYPE_CHECKING, NamedTuple
+
+from . import utils
+from .carrot import CarrotPlugin, RuleCAR101, RuleCAR105, RuleCAR110, RuleCAR111
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Collection, Iterator, Sequence
+    from collections.abc import Set as AbstractSet
+    from os import PathLike
+    from tokenize import TokenInfo
+    from typing import BinaryIO, Final
+
+    from .utils import CarrotRule
+
+__all__: Sequence[str] = (
+    "PREAMBLE_RULES",
+    "Preamble",
+    "lint_preamble",
+    "lint_preamble_file",
+    "read_preamble",
+    "read_preamble_file",
+    "run_preamble_rules",
+)
+
+
+if __name__ == "__main__":
+    CANNOT_RUN_AS_SCRIPT_MESSAGE: Final[str] = "This module cannot be run as a script."
+    raise RuntimeError(CANNOT_RUN_AS_SCRIPT_MESSAGE)
+
+
+PREAMBLE_RULES: Final[AbstractSet[type[CarrotRule]]] = frozenset(
+    {RuleCAR101, RuleCAR105, RuleCAR110, RuleCAR111},
+)
+
+_PREAMBLE_STATEMENT_KEYWORDS: Final[AbstractSet[str]] = frozenset(
+    {"import", "from", "__all__", "if", "elif", "else"},
+)
+_ALL_EXPORT_STATEMENT_KEYWORDS: Final[AbstractSet[str]] = frozenset({"__all__"})
+_CONTINUATION_KEYWORDS: Final[AbstractSet[str]] = frozenset(
+    {"elif", "else", "except", "finally"},
+)
+_MAX_MEASURED_STATEMENT_LINES: Final[int] = 3
+_IGNORED_TOKEN_TYPES: Final[AbstractSet[int]] = frozenset(
+    {tokenize.COMMENT, tokenize.NL, tokenize.ENCODING},
+)
+_INVALID_PREFIX_ERRORS: Final[tuple[type[Exception], ...]] = (
+    SyntaxError,
+    tokenize.TokenError,
+)
+_UNDETECTABLE_ENCODING_ERRORS: Final[tuple[type[Exception], ...]] = (SyntaxError, UnicodeError)
+_FALLBACK_ENCODING: Final[str] = "latin-1"
+_IO_ERROR_CODE: Final[str] = "E902"
+
+if TYPE_CHECKING:
+    type _TokenPosition = tuple[int, int]
+
+
+class Preamble(NamedTuple):
+    """The leading statements of a module, read without parsing the rest of its file."""
+
+    tree: ast.Module
+    lines: Sequence[str]
+    next_statement_line_number: int | None
+
+
+def _find_next_statement(
+    file_tokens: Iterator[TokenInfo],
+    *,
+    statement_keywords: AbstractSet[str],
+    allow_docstring: bool,
+) -> TokenInfo | None:
+    indentation_depth: int = 0
+    at_statement_start: bool = True
+
+    token: TokenInfo
+    for token in file_tokens:
+        if token.type in _IGNORED_TOKEN_TYPES:
+            continue
+
+        if token.type == tokenize.INDENT:
+            indentation_depth += 1
+            continue
+
+        if token.type == tokenize.DEDENT:
+            indentation_depth -= 1
+            continue
+
+        if token.type == tokenize.NEWLINE:
+            at_statement_start = True
+            continue
+
+        if token.type == tokenize.ENDMARKER:
+            return None
+
+        if not at_statement_start:
+            continue
+
+        at_statement_start = False
+        if indentation_depth > 0:
+            continue
+
+        if token.type == tokenize.STRING and allow_docstring:
+            allow_docstring = False
+            continue
+
+        allow_docstring = False
+        if token.type != tokenize.NAME or token.string not in statement_keywords:
+            return token
+
+    return None
+
+
+def _find_statement_end(
+    file_tokens: Iterator[TokenInfo], statement_start: TokenInfo
+) -> _TokenPosition:
+    max_line_number: int = statement_start.start[0] + _MAX_MEASURED_STATEMENT_LINES
+    statement_end: _TokenPosition = statement_start.end
+    indentation_depth: int = 0
+    at_statement_start: bool = False
+
+    token: TokenInfo
+    for token in file_tokens:
+        if token.type in _IGNORED_TOKEN_TYPES:
+            continue
+
+        if token.type == tokenize.DEDENT:
+            indentation_depth -= 1
+            continue
+
+        if token.type == tokenize.ENDMARKER or all(
+            (
+                at_statement_start,
+                indentation_depth <= 0,
+                token.type != tokenize.INDENT,
+                token.string not in _CONTINUATION_KEYWORDS,
+            ),
+        ):
+            return statement_end
+
+        if token.start[0] > max_line_number:
+            # NOTE: The rules only distinguish statement lengths up to this many lines
+            return max_line_number, 0
+
+        if token.type == tokenize.INDENT:
+            indentation_depth += 1
+            continue
+
+        if token.type == tokenize.NEWLINE:
+            at_statement_start = True
+            continue
+
+        at_statement_start = False
+        statement_end = token.end
+
+    return statement_end
+
+
+def _read_next_statement(
+    file_tokens: Iterator[TokenInfo],
+    *,
+    statement_keywords: AbstractSet[str],
+    allow_docstring: bool,
+) -> tuple[_TokenPosition, _TokenPosition] | None:
+    next_statement: TokenInfo | None = _find_next_statement(
+        file_tokens, statement_keywords=statement_keywords, allow_docstring=allow_docstring
+    )
+    if next_statement is None:
+        return None
+
+    return next_statement.start, _find_statement_end(file_tokens, next_statement)
+
+
+def _make_preamble(
+    lines: Sequence[str],
+    next_statement_position: tuple[_TokenPosition, _TokenPosition] | None,
+    *,
+    line_offset: int = 0,
+) -> Preamble:
+    if next_statement_position is None:
+        return Preamble(
+            tree=ast.parse("".join(lines)), lines=lines, next_statement_line_number=None
+        )
+
+    (start_line_number, start_column), (end_line_number, end_column) = next_statement_position
+    start_line_number += line_offset
+    end_line_number += line_offset
+
+    tree: ast.Module = ast.parse("".join(lines[: start_line_number - 1]))
+    tree.body.append(
+        ast.Pass(
+            lineno=start_line_number,
+            col_offset=len(lines[start_line_number - 1][:start_column].encode()),
+            end_lineno=end_line_number,
+            end_col_offset=len(lines[end_line_number - 1][:end_column].encode()),
+        ),
+    )
+
+    return Preamble(
+        tree=tree,
+        lines=lines[: end_line_number + 1],
+        next_statement_line_number=start_line_number,
+    )
+
+
+def _find_later_all_export_index(
+    lines: list[str], readline: Callable[[], str], start_index: int
+) -> int | None:
+    index: int = start_index
+    while index < len(lines) or readline():
+        if lines[index].startswith("__all__"):
+            return index
+
+        index += 1
+
+    return None
+
+
+def read_preamble(readline: Callable[[], str]) -> Preamble:
+    """
+    Parse only the leading preamble statements of a module, streamed from the given readline.
+
+    The preamble is the module docstring, imports, `if` blocks & the `__all__` export,
+    up to the first other top-level statement.
+    If the preamble has no `__all__` export, but a top-level one appears later,
+    the preamble is extended to include it.
+    The remaining lines are scanned for it as plain text, rather than being tokenized.
+    The statement that ends the preamble is represented by an empty `pass` statement
+    spanning its first few lines, so the rules can still see where the preamble ends.
+    A preamble that cannot be parsed raises `SyntaxError` or `tokenize.TokenError`.
+    """
+    lines: list[str] = []
+
+    def _recording_readline() -> str:
+        line: str = readline()
+        if line:
+            lines.append(line)
+
+        return line
+
+    next_statement_position: tuple[_TokenPosition, _TokenPosition] | None
+    try:
+        next_statement_position = _read_next_statement(
+            tokenize.generate_tokens(_recording_readline),
+            statement_keywords=_PREAMBLE_STATEMENT_KEYWORDS,
+            allow_docstring=True,
+        )
+    except tokenize.TokenError:
+        # NOTE: Only raised once the whole file has been read, so it is parsed to raise
+        # the same syntax error as Flake8 reports
+        ast.parse("".join(lines))
+        raise
+    if next_statement_position is None:
+        return _make_preamble(lines, None)
+
+    if any(line.startswith("__all__") for line in lines[: next_statement_position[0][0]]):
+        return _make_preamble(lines, next_statement_position)
+
+    all_export_index: int | None = _find_later_all_export_index(
+        lines, _recording_readline, next_statement_position[0][0]
+    )
+    if all_export_index is None:
+        return _make_preamble(lines, next_statement_position)
+
+    remaining_lines: Iterator[str] = iter(lines[all_export_index:])
+    try:
+        return _make_preamble(
+            lines,
+            _read_next_statement(
+                tokenize.generate_tokens(
+                    lambda: next(remaining_lines, "") or _recording_readline()
+                ),
+                statement_keywords=_ALL_EXPORT_STATEMENT_KEYWORDS,
+                allow_docstring=False,
+            ),
+            line_offset=all_export_index,
+        )
+    except _INVALID_PREFIX_ERRORS:
+        # NOTE: The matched line was not a real export, E.g. it was within a multi-line string
+        return _make_preamble(lines, next_statement_position)
+
+
+def _read_decoded_preamble(file: BinaryIO, encoding: str) -> Preamble:
+    file.seek(0)
+    text_file: io.TextIOWrapper = io.TextIOWrapper(file, encoding)
+    try:
+        return read_preamble(text_file.readline)
+    finally:
+        # NOTE: Detached, so the binary file stays open to be read again if decoding failed
+        text_file.detach()
+
+
+def read_preamble_file(path: str | PathLike[str]) -> Preamble:
+    """
+    Parse only the leading preamble statements of the given file.
+
+    The file is decoded in the same way as by Flake8,
+    so files that cannot be decoded with their declared encoding are read as latin-1.
+    """
+    with open(os.fspath(path), "rb") as file:  # noqa: PTH123
+        encoding: str
+        try:
+            encoding = tokenize.detect_encoding(file.readline)[0]
+        except _UNDETECTABLE_ENCODING_ERRORS:
+            encoding = _FALLBACK_ENCODING
+
+        try:
+            return _read_decoded_preamble(file, encoding)
+        except UnicodeDecodeError:
+            return _read_decoded_preamble(file, _FALLBACK_ENCODING)
+
+
+def run_preamble_rules(
+    preamble: Preamble, rule_classes: Collection[type[CarrotRule]] | None = None
+) -> Sequence[tuple[int, int, str, type[CarrotPlugin]]]:
+    """
+    Run only the module-header rules among the given rules over an already read preamble.
+
+    If no rules are given, the module-header rules enabled by Flake8's options are run.
+    The problems match those of a full run, except that an `__all__` export
+    nested within a top-level block is reported as missing by CAR101,
+    rather than each statement above it being reported by CAR105.
+    """
+    plugin: CarrotPlugin = CarrotPlugin(
+        tree=preamble.tree, file_tokens=(), lines=preamble.lines
+    )
+
+    return list(
+        plugin.run_rules(
+            [
+                RuleClass
+                for RuleClass in (
+                    plugin.ENABLED_RULES if rule_classes is None else rule_classes
+                )
+                if RuleClass in PREAMBLE_RULES
+            ],
+        ),
+    )
+
+
+def _make_invalid_preamble_problems(
+    error: Exception,
+) -> Sequence[tuple[int, int, str, type[CarrotPlugin]]]:
+    line, column, error_code, message = utils.describe_invalid_source(error)
+    return [(line, column, f"{error_code} {message}", CarrotPlugin)]
+
+
+def lint_preamble(
+    readline: Callable[[], str], rule_classes: Collection[type[CarrotRule]] | None = None
+) -> Sequence[tuple[int, int, str, type[CarrotPlugin]]]:
+    """
+    Run only the module-header rules over the preamble streamed from the readline.
+
+    As with Flake8, a preamble that cannot be parsed is reported as a single E999 problem,
+    or E902 if it cannot be tokenized, rather than raising.
+    """
+    try:
+        preamble: Preamble = read_preamble(readline)
+    except _INVALID_PREFIX_ERRORS as error:
+        return _make_invalid_preamble_problems(error)
+
+    return run_preamble_rules(preamble, rule_classes)
+
+
+def lint_preamble_file(
+    path: str | PathLike[str], rule_classes: Collection[type[CarrotRule]] | None = None
+) -> Sequence[tuple[int, int, str, type[CarrotPlugin]]]:
+    """
+    Run only the module-header rules over the preamble of the given file.
+
+    As with Flake8, a file that cannot be read is reported as a single E902 problem,
+    so that checking many files never stops at the first invalid one.
+    """
+    try:
+        preamble: Preamble = read_preamble_file(path)
+    except OSError as error:
+        return [(0, 0, f"{_IO_ERROR_CODE} {type(error).__name__}: {error}", CarrotPlugin)]
+    except _INVALID_PREFIX_ERRORS as error:
+        return _make_invalid_preamble_problems(error)
+
+    return run_preamble_rules(preamble, rule_classes)
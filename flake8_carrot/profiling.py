@@ -0,0 +1,270 @@
+"""Garbage-collection control & allocation auditing for running a plugin's rules."""
+
+import contextlib
+import functools
+import gc
+import multiprocessing
+import os
+import tracemalloc
+from enum import Enum
+from typing import TYPE_CHECKING, NamedTuple
+
+from .traversal import TraversalEngine
+
+if TYPE_CHECKING:
+    import ast
+    from collections.abc import Collection, Iterable, Iterator, Mapping, Sequence
+    from tokenize import TokenInfo
+    from typing import Final
+
+    from .utils import BasePlugin, BaseRule
+
+__all__: Sequence[str] = (
+    "TUNED_GC_THRESHOLD",
+    "GCMode",
+    "RuleAllocations",
+    "audit_rule_allocations",
+    "format_allocation_report",
+    "gc_execution_mode",
+    "register_gc_freeze_at_fork",
+)
+
+
+if __name__ == "__main__":
+    CANNOT_RUN_AS_SCRIPT_MESSAGE: Final[str] = "This module cannot be run as a script."
+    raise RuntimeError(CANNOT_RUN_AS_SCRIPT_MESSAGE)
+
+
+TUNED_GC_THRESHOLD: Final[int] = 50_000
+
+# NOTE: Imported in order by a forkserver, so the freezing module must be last
+_FORKSERVER_PRELOAD_MODULES: Final[Sequence[str]] = (
+    "flake8.checker",
+    "flake8.main.application",
+    "flake8.plugins.pycodestyle",
+    "flake8.plugins.pyflakes",
+    "flake8_carrot.carrot",
+    "flake8_carrot.tex_bot",
+    "flake8_carrot.forkserver_preload",
+)
+
+
+class GCMode(Enum):
+    """How the garbage collector is configured while a plugin's rules are being run."""
+
+    DEFAULT = "default"
+    """Leave the garbage collector's configuration unchanged."""
+
+    PAUSE = "pause"
+    """Disable automatic garbage collection until the file has been linted."""
+
+    TUNE = "tune"
+    """Raise the youngest generation's threshold, so that collections happen far less often."""
+
+
+@contextlib.contextmanager
+def gc_execution_mode(gc_mode: GCMode) -> Iterator[None]:
+    """
+    Configure the garbage collector as requested, restoring its configuration on exit.
+
+    The garbage collector is shared by the whole process,
+    so this must only be used from single-threaded entry points.
+    """
+    match gc_mode:
+        case GCMode.DEFAULT:
+            yield
+
+        case GCMode.PAUSE:
+            gc_was_enabled: bool = gc.isenabled()
+            gc.disable()
+            try:
+                yield
+            finally:
+                if gc_was_enabled:
+                    gc.enable()
+
+        case GCMode.TUNE:
+            original_thresholds: tuple[int, int, int] = gc.get_threshold()
+            gc.set_threshold(
+                max(original_thresholds[0], TUNED_GC_THRESHOLD), *original_thresholds[1:]
+            )
+            try:
+                yield
+            finally:
+                gc.set_threshold(*original_thresholds)
+
+
+@functools.cache
+def register_gc_freeze_at_fork() -> None:
+    """
+    Freeze all objects tracked by the garbage collector before worker processes are forked.
+
+    Frozen objects are never examined by the collector within the forked worker processes,
+    so the memory pages holding the imported rules & their tables stay shared between
+    the workers, rather than being copied into every one of them.
+    With the "fork" start method, the objects are frozen just before this process is forked
+    & unfrozen again in this process afterwards.
+    With the "forkserver" start method (the default on Linux), the forkserver imports
+    Flake8 & the rules then freezes them, before any worker is forked from it.
+    This has no effect on workers started with the "spawn" start method,
+    nor once the forkserver is already running.
+    Registering more than once has no further effect.
+    """
+    os.register_at_fork(before=gc.freeze, after_in_parent=gc.unfreeze)
+    multiprocessing.set_forkserver_preload(list(_FORKSERVER_PRELOAD_MODULES))
+
+
+class RuleAllocations(NamedTuple):
+    """The memory allocated by a single rule, totalled over every file that it linted."""
+
+    code: str
+    files_count: int
+    peak_bytes: int
+    retained_bytes: int
+    retained_blocks: int
+
+    @property
+    def mean_peak_bytes(self) -> float:
+        """The average peak memory allocated by this rule while linting a single file."""
+        return self.peak_bytes / self.files_count if self.files_count else 0.0
+
+    @property
+    def mean_retained_blocks(self) -> float:
+        """The average number of memory blocks still held by this rule after each file."""
+        return self.retained_blocks / self.files_count if self.files_count else 0.0
+
+
+def _run_rule[T_plugin: BasePlugin](
+    RuleClass: type[BaseRule[T_plugin]],  # noqa: N803
+    plugin: T_plugin,
+    tree: ast.Module,
+    file_tokens: Sequence[TokenInfo],
+    lines: Sequence[str],
+) -> Sequence[str]:
+    rule: BaseRule[T_plugin] = RuleClass(plugin=plugin)
+    rule.run_check(tree=tree, file_tokens=file_tokens, lines=lines)
+
+    traversal_engine: TraversalEngine = TraversalEngine()
+    rule.register_traversal_hooks(traversal_engine)
+    traversal_engine.traverse(tree)
+
+    return [rule.format_error_message(ctx) for ctx in rule.problems.values()]
+
+
+def _measure_rule[T_plugin: BasePlugin](
+    RuleClass: type[BaseRule[T_plugin]],  # noqa: N803
+    plugin: T_plugin,
+    tree: ast.Module,
+    file_tokens: Sequence[TokenInfo],
+    lines: Sequence[str],
+) -> tuple[int, int, int]:
+    before_snapshot: tracemalloc.Snapshot = tracemalloc.take_snapshot()
+    baseline_bytes: int = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+
+    messages: Sequence[str] = _run_rule(RuleClass, plugin, tree, file_tokens, lines)
+
+    peak_bytes: int = tracemalloc.get_traced_memory()[1] - baseline_bytes
+    statistic_differences: Sequence[tracemalloc.StatisticDiff] = [
+        difference
+        for difference in tracemalloc.take_snapshot().compare_to(before_snapshot, "filename")
+        if difference.traceback[0].filename != tracemalloc.__file__
+    ]
+    del messages
+
+    return (
+        max(peak_bytes, 0),
+        sum(max(difference.size_diff, 0) for difference in statistic_differences),
+        sum(max(difference.count_diff, 0) for difference in statistic_differences),
+    )
+
+
+def audit_rule_allocations(
+    plugin_class: type[BasePlugin],
+    parsed_sources: Iterable[tuple[ast.Module, Sequence[TokenInfo], Sequence[str]]],
+) -> Sequence[RuleAllocations]:
+    """
+    Measure the memory allocated by each of the plugin's enabled rules, using tracemalloc.
+
+    Every rule is run on its own over each of the given files, so that its allocations
+    can be attributed to it alone. The shared analyses are computed, & each rule is run once
+    unmeasured, before measuring begins.
+    The results are ordered with the rules that allocate the most per file first.
+    """
+    totals: dict[str, tuple[int, int, int, int]] = {}
+
+    tracemalloc_was_tracing: bool = tracemalloc.is_tracing()
+    if not tracemalloc_was_tracing:
+        tracemalloc.start()
+
+    try:
+        tree: ast.Module
+        file_tokens: Sequence[TokenInfo]
+        lines: Sequence[str]
+        for tree, file_tokens, lines in parsed_sources:
+            plugin: BasePlugin = plugin_class(tree=tree, file_tokens=file_tokens, lines=lines)
+            enabled_rules: Collection[type[BaseRule[BasePlugin]]] = plugin.ENABLED_RULES
+            plugin.analysis_cache.prepare(
+                analysis_class
+                for RuleClass in enabled_rules
+                for analysis_class in RuleClass.REQUIRED_ANALYSES
+            )
+
+            RuleClass: type[BaseRule[BasePlugin]]
+            for RuleClass in enabled_rules:
+                if RuleClass.CODE not in totals:
+                    # NOTE: Warm up each rule first, so that one-off setup costs are not measured
+                    _run_rule(RuleClass, plugin, tree, file_tokens, lines)
+
+                files_count, peak_bytes, retained_bytes, retained_blocks = totals.get(
+                    RuleClass.CODE, (0, 0, 0, 0)
+                )
+                measured: tuple[int, int, int] = _measure_rule(
+                    RuleClass, plugin, tree, file_tokens, lines
+                )
+                totals[RuleClass.CODE] = (
+                    files_count + 1,
+                    peak_bytes + measured[0],
+                    retained_bytes + measured[1],
+                    retained_blocks + measured[2],
+                )
+
+    finally:
+        if not tracemalloc_was_tracing:
+            tracemalloc.stop()
+
+    return sorted(
+        (RuleAllocations(code, *rule_totals) for code, rule_totals in totals.items()),
+        key=lambda rule_allocations: rule_allocations.mean_peak_bytes,
+        reverse=True,
+    )
+
+
+def format_allocation_report(
+    allocations: Iterable[RuleAllocations], *, limit: int | None = None
+) -> str:
+    """Render the measured allocations of each rule as a plain-text table."""
+    HEADINGS: Final[Mapping[str, int]] = {
+        "rule": 8,
+        "files": 7,
+        "mean peak (KiB)": 17,
+        "total peak (KiB)": 18,
+        "mean retained blocks": 22,
+    }
+
+    rows: list[str] = ["".join(f"{heading:>{width}}" for heading, width in HEADINGS.items())]
+
+    rule_allocations: RuleAllocations
+    for index, rule_allocations in enumerate(allocations):
+        if limit is not None and index >= limit:
+            break
+
+        rows.append(
+            f"{rule_allocations.code:>8}"
+            f"{rule_allocations.files_count:>7}"
+            f"{rule_allocations.mean_peak_bytes / 1024:>17.2f}"
+            f"{rule_allocations.peak_bytes / 1024:>18.2f}"
+            f"{rule_allocations.mean_retained_blocks:>22.2f}"
+        )
+
+    return "\n".join(rows)
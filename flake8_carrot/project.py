@@ -0,0 +1,63 @@
+"""Locating the project root & the files kept within it, importing nothing beyond `os`."""
+
+import os
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from typing import Final
+
+__all__: Sequence[str] = (
+    "CACHE_DIRECTORY_NAME",
+    "PROJECT_ROOT_MARKERS",
+    "find_project_root",
+    "get_default_socket_path",
+)
+
+
+if __name__ == "__main__":
+    CANNOT_RUN_AS_SCRIPT_MESSAGE: Final[str] = "This module cannot be run as a script."
+    raise RuntimeError(CANNOT_RUN_AS_SCRIPT_MESSAGE)
+
+
+CACHE_DIRECTORY_NAME: Final[str] = ".flake8_carrot_cache"
+PROJECT_ROOT_MARKERS: Final[Sequence[str]] = ("pyproject.toml", ".git")
+
+_SOCKET_FILE_NAME: Final[str] = "daemon.sock"
+
+
+def find_project_root(start_directory: str | None = None) -> str:
+    """
+    Find the nearest directory holding a `pyproject.toml` file or a `.git` directory.
+
+    The search starts from the given directory, or the current directory if none is given.
+    If no parent directory is a project root, the starting directory is returned.
+    """
+    first_directory: str = os.path.abspath(  # noqa: PTH100
+        os.getcwd() if start_directory is None else start_directory  # noqa: PTH109
+    )
+
+    directory: str = first_directory
+    while True:
+        if any(
+            os.path.exists(os.path.join(directory, marker))  # noqa: PTH110, PTH118
+            for marker in PROJECT_ROOT_MARKERS
+        ):
+            return directory
+
+        parent_directory: str = os.path.dirname(directory)  # noqa: PTH120
+        if parent_directory == directory:
+            return first_directory
+
+        directory = parent_directory
+
+
+def get_default_socket_path(start_directory: str | None = None) -> str:
+    """
+    Get the path of the lint daemon's socket, within the project root's cache directory.
+
+    The daemon is therefore found by clients run from any subdirectory of the project.
+    """
+    return os.path.join(  # noqa: PTH118
+        find_project_root(start_directory), CACHE_DIRECTORY_NAME, _SOCKET_FILE_NAME
+    )
@@ -0,0 +1,229 @@
+"""Longest-first scheduling of batch linting, using each file's size & historical cost."""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple, override
+
+from .project import CACHE_DIRECTORY_NAME
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Mapping, Sequence
+    from os import PathLike
+    from typing import Final, Self
+
+__all__: Sequence[str] = ("DEFAULT_CACHE_DIRECTORY", "CostScheduler", "CriticalPathReport")
+
+
+if __name__ == "__main__":
+    CANNOT_RUN_AS_SCRIPT_MESSAGE: Final[str] = "This module cannot be run as a script."
+    raise RuntimeError(CANNOT_RUN_AS_SCRIPT_MESSAGE)
+
+
+DEFAULT_CACHE_DIRECTORY: Final[Path] = Path(CACHE_DIRECTORY_NAME)
+
+_COSTS_FILE_NAME: Final[str] = "costs.json"
+_COSTS_FILE_VERSION: Final[int] = 1
+_DEFAULT_SECONDS_PER_BYTE: Final[float] = 1e-6
+_CHUNKS_PER_WORKER: Final[int] = 16
+_MAX_REPORTED_PATHS: Final[int] = 5
+_INVALID_COSTS_FILE_ERRORS: Final[tuple[type[Exception], ...]] = (
+    OSError,
+    ValueError,
+    TypeError,
+)
+
+if TYPE_CHECKING:
+    type _FileCost = tuple[int, float]
+
+
+class CriticalPathReport(NamedTuple):
+    """Which files determined the wall time of a scheduled batch run."""
+
+    wall_time: float
+    total_cost: float
+    workers_count: int
+    critical_worker_cost: float
+    critical_paths: Sequence[tuple[str, float]]
+
+    @property
+    def dominated(self) -> bool:
+        """Whether a single file took longer than an even share of all the work."""
+        return bool(self.critical_paths) and self.critical_paths[0][1] > (
+            self.total_cost / max(self.workers_count, 1)
+        )
+
+    def format(self) -> str:
+        """Format this report as a short human-readable summary."""
+        lines: list[str] = [
+            (
+                f"Wall time {self.wall_time:.2f}s, "
+                f"{self.total_cost:.2f}s of linting across {self.workers_count} "
+                f"worker{'' if self.workers_count == 1 else 's'} "
+                f"(ideal {self.total_cost / max(self.workers_count, 1):.2f}s)."
+            ),
+            f"Busiest worker spent {self.critical_worker_cost:.2f}s on:",
+        ]
+        lines.extend(f"    {cost:8.3f}s {path}" for path, cost in self.critical_paths)
+        if self.dominated:
+            lines.append("A single file takes longer than an even share of all the work.")
+
+        return "\n".join(lines)
+
+
+class CostScheduler:
+    """
+    Orders files longest-first, from the cost of linting each file in previous runs.
+
+    Files without a recorded cost are estimated from their size,
+    at the average rate of the recorded files.
+    The costs are stored within the cache directory, so they carry across runs.
+    """
+
+    @override
+    def __init__(
+        self,
+        costs: Mapping[str, _FileCost] | None = None,
+        *,
+        cache_directory: Path | None = None,
+    ) -> None:
+        self._costs: dict[str, _FileCost] = dict(costs or {})
+        self._cache_directory: Path | None = cache_directory
+        self._scheduled_sizes: dict[str, int] = {}
+        self._worker_costs: dict[str, list[tuple[str, float]]] = {}
+
+    @classmethod
+    def load(cls, cache_directory: Path = DEFAULT_CACHE_DIRECTORY) -> Self:
+        """Create a scheduler with the costs stored in the given cache directory, if any."""
+        costs: dict[str, _FileCost] = {}
+
+        try:
+            costs_data: object = json.loads(
+                (cache_directory / _COSTS_FILE_NAME).read_text(encoding="utf-8")
+            )
+            if (
+                isinstance(costs_data, dict)
+                and costs_data.get("version") == _COSTS_FILE_VERSION
+            ):
+                costs = {
+                    str(path): (int(file_cost[0]), float(file_cost[1]))
+                    for path, file_cost in costs_data["costs"].items()
+                }
+        except _INVALID_COSTS_FILE_ERRORS:
+            costs = {}
+
+        return cls(costs, cache_directory=cache_directory)
+
+    def save(self) -> None:
+        """Store the recorded costs within the cache directory, replacing any older costs."""
+        if self._cache_directory is None:
+            return
+
+        costs_file_path: Path = self._cache_directory / _COSTS_FILE_NAME
+        temporary_file_path: Path = costs_file_path.with_name(
+            f"{costs_file_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        try:
+            self._cache_directory.mkdir(parents=True, exist_ok=True)
+            (self._cache_directory / ".gitignore").write_text("*\n", encoding="utf-8")
+            temporary_file_path.write_text(
+                json.dumps({"version": _COSTS_FILE_VERSION, "costs": self._costs}),
+                encoding="utf-8",
+            )
+            temporary_file_path.replace(costs_file_path)
+        except OSError:
+            temporary_file_path.unlink(missing_ok=True)
+
+    def _estimate(self, path: str, size: int, seconds_per_byte: float) -> float:
+        recorded_cost: _FileCost | None = self._costs.get(path, None)
+        if recorded_cost is None:
+            return size * seconds_per_byte
+
+        recorded_size, recorded_seconds = recorded_cost
+        return recorded_seconds * (size / recorded_size if recorded_size else 1)
+
+    def record(self, path: str, seconds: float, worker_id: str) -> None:
+        """Record the seconds taken by the given worker to lint the given scheduled file."""
+        size: int | None = self._scheduled_sizes.pop(path, None)
+        if size is not None:
+            self._costs[os.path.abspath(path)] = (size, seconds)  # noqa: PTH100
+
+        self._worker_costs.setdefault(worker_id, []).append((path, seconds))
+
+    def make_chunks(
+        self, paths: Iterable[str | PathLike[str]], workers_count: int
+    ) -> Iterator[Sequence[str]]:
+        """
+        Split the given files into chunks, ordered from the longest to the shortest.
+
+        Each file estimated to take longer than an even share of a worker's chunks
+        is given its own chunk, while the remaining short files are grouped together.
+        """
+        total_recorded_size: int = sum(size for size, _ in self._costs.values())
+        seconds_per_byte: float = (
+            sum(seconds for _, seconds in self._costs.values()) / total_recorded_size
+            if total_recorded_size
+            else _DEFAULT_SECONDS_PER_BYTE
+        )
+
+        estimated_costs: list[tuple[float, str]] = []
+
+        path: str | PathLike[str]
+        for path in paths:
+            file_path: str = os.fspath(path)
+            try:
+                size: int = os.stat(file_path).st_size  # noqa: PTH116
+            except OSError:
+                size = 0
+
+            self._scheduled_sizes[file_path] = size
+            estimated_costs.append(
+                (
+                    self._estimate(
+                        os.path.abspath(file_path),  # noqa: PTH100
+                        size,
+                        seconds_per_byte,
+                    ),
+                    file_path,
+                ),
+            )
+
+        estimated_costs.sort(reverse=True)
+
+        target_chunk_cost: float = sum(cost for cost, _ in estimated_costs) / max(
+            workers_count * _CHUNKS_PER_WORKER, 1
+        )
+
+        chunk: list[str] = []
+        chunk_cost: float = 0
+
+        estimated_cost: float
+        for estimated_cost, file_path in estimated_costs:
+            chunk.append(file_path)
+            chunk_cost += estimated_cost
+
+            if chunk_cost >= target_chunk_cost:
+                yield chunk
+                chunk = []
+                chunk_cost = 0
+
+        if chunk:
+            yield chunk
+
+    def report(self, wall_time: float, workers_count: int) -> CriticalPathReport:
+        """Report the files linted by the busiest worker since this scheduler was created."""
+        worker_costs: Sequence[Sequence[tuple[str, float]]] = list(self._worker_costs.values())
+        critical_worker_costs: Sequence[tuple[str, float]] = max(
+            worker_costs, key=lambda costs: sum(seconds for _, seconds in costs), default=()
+        )
+
+        return CriticalPathReport(
+            wall_time=wall_time,
+            total_cost=sum(seconds for costs in worker_costs for _, seconds in costs),
+            workers_count=workers_count,
+            critical_worker_cost=sum(seconds for _, seconds in critical_worker_costs),
+            critical_paths=sorted(critical_worker_costs, key=lambda cost: -cost[1])[
+                :_MAX_REPORTED_PATHS
+            ],
+        )
@@ -0,0 +1,598 @@
+"""Stable API for linting many sources in one process, outside of Flake8."""
+
+import argparse
+import ast
+import bisect
+import collections
+import hashlib
+import io
+import os
+import tokenize
+from typing import TYPE_CHECKING, NamedTuple, cast, override
+
+from flake8 import defaults as flake8_defaults
+from flake8 import utils as flake8_utils
+from flake8.style_guide import Decision, DecisionEngine
+
+from . import codegen, pipeline, preamble, utils
+from .carrot import CarrotPlugin
+from .tex_bot import TeXBotPlugin
+
+if TYPE_CHECKING:
+    import re
+    from collections.abc import Callable, Collection, Iterable, Mapping, Sequence
+    from collections.abc import Set as AbstractSet
+    from os import PathLike
+    from typing import Final
+
+    from .pipeline import SourceFile
+    from .preamble import Preamble
+    from .utils import BasePlugin, BaseRule, CarrotRule, RuleScope
+
+__all__: Sequence[str] = (
+    "LintCancelledError",
+    "LintSession",
+    "Problem",
+    "StatementProblemsCache",
+)
+
+
+if __name__ == "__main__":
+    CANNOT_RUN_AS_SCRIPT_MESSAGE: Final[str] = "This module cannot be run as a script."
+    raise RuntimeError(CANNOT_RUN_AS_SCRIPT_MESSAGE)
+
+
+_DEFAULT_PLUGIN_CLASSES: Final[Sequence[type[BasePlugin]]] = (CarrotPlugin, TeXBotPlugin)
+_WARM_UP_SOURCE: Final[str] = (
+    '"""Warm-up."""\n\nimport os  # noqa: F401\n\n__all__ = ()\n\n\nvalue = os.sep\n'
+)
+_INVALID_SOURCE_ERRORS: Final[tuple[type[Exception], ...]] = (
+    SyntaxError,
+    tokenize.TokenError,
+)
+_SYNTAX_ERROR_CODE: Final[str] = "E999"
+_IO_ERROR_CODE: Final[str] = "E902"
+
+if TYPE_CHECKING:
+    type _CachedProblem = tuple[int, int, str, str]
+
+
+class Problem(NamedTuple):
+    """A single problem found while linting a source, with a 1-based line & column."""
+
+    filename: str
+    line: int
+    column: int
+    code: str
+    message: str
+
+    def format(self) -> str:
+        """Format this problem in the same way as Flake8's default output."""
+        return f"{self.filename}:{self.line}:{self.column}: {self.code} {self.message}"
+
+
+class LintCancelledError(Exception):
+    """Linting of a source was abandoned, as it was cancelled before finishing."""
+
+
+class StatementProblemsCache:
+    """
+    Problems of the statement-scoped rules, for each top-level statement of one document.
+
+    Kept across the edits of a single document, E.g. one open within an editor,
+    so that the statement-scoped rules are only run again on the statements that changed.
+    Each statement's problems are stored relative to its first line,
+    so they are still reused once lines are inserted or removed above it.
+    """
+
+    @override
+    def __init__(self) -> None:
+        self._statement_problems: dict[bytes, Sequence[_CachedProblem]] = {}
+        self._linted_statements_count: int = 0
+
+    @property
+    def linted_statements_count(self) -> int:
+        """The number of top-level statements that the last lint had to run the rules on."""
+        return self._linted_statements_count
+
+    def lint_changed_statements(
+        self,
+        tree: ast.Module,
+        lines: Sequence[str],
+        statement_rules: Mapping[type[BasePlugin], Collection[type[BaseRule[BasePlugin]]]],
+    ) -> Sequence[_CachedProblem]:
+        """
+        Run the given statement-scoped rules on only the statements not seen before.
+
+        The given tree & lines must both be of the same source.
+        The changed statements are all linted together, within a copy of the source
+        that has every other line blanked, so their line numbers are unchanged.
+        """
+        statement_spans: Sequence[tuple[int, int]] = _find_statement_spans(tree)
+        statement_keys: Sequence[bytes] = [
+            hashlib.blake2b(
+                "".join(lines[start - 1 : end]).encode(errors="surrogatepass"), digest_size=16
+            ).digest()
+            for start, end in statement_spans
+        ]
+        changed_spans: Sequence[tuple[int, int]] = [
+            statement_span
+            for statement_span, statement_key in zip(
+                statement_spans, statement_keys, strict=True
+            )
+            if statement_key not in self._statement_problems
+        ]
+
+        changed_problems: dict[int, list[_CachedProblem]] = {
+            start: [] for start, _ in changed_spans
+        }
+        if changed_spans:
+            masked_lines: list[str] = ["\n"] * len(lines)
+
+            start: int
+            end: int
+            for start, end in changed_spans:
+                masked_lines[start - 1 : end] = lines[start - 1 : end]
+
+            masked_source: str = "".join(masked_lines)
+            changed_starts: Sequence[int] = [start for start, _ in changed_spans]
+
+            PluginClass: type[BasePlugin]
+            rule_classes: Collection[type[BaseRule[BasePlugin]]]
+            for PluginClass, rule_classes in statement_rules.items():
+                line: int
+                column: int
+                code: str
+                message: str
+                for line, column, code, message in _convert_plugin_problems(
+                    PluginClass.from_source(masked_source).run_rules(rule_classes)
+                ):
+                    statement_start: int = changed_starts[
+                        max(bisect.bisect_right(changed_starts, line) - 1, 0)
+                    ]
+                    changed_problems[statement_start].append(
+                        (line - statement_start + 1, column, code, message)
+                    )
+
+        # NOTE: Only the current statements are kept, so the cache does not grow with each edit
+        self._statement_problems = {
+            statement_key: (
+                changed_problems[start]
+                if start in changed_problems
+                else self._statement_problems[statement_key]
+            )
+            for (start, _), statement_key in zip(statement_spans, statement_keys, strict=True)
+        }
+        self._linted_statements_count = len(changed_spans)
+
+        return [
+            (start + relative_line - 1, column, code, message)
+            for (start, _), statement_key in zip(statement_spans, statement_keys, strict=True)
+            for relative_line, column, code, message in self._statement_problems[statement_key]
+        ]
+
+    def clear(self) -> None:
+        """Discard the problems of every statement, so they are all linted again."""
+        self._statement_problems.clear()
+
+
+class LintSession:
+    """
+    Long-lived linter, that keeps its warm caches across many calls to `lint_source()`.
+
+    The selected rules are resolved once, & every rule instance, traversal dispatcher
+    & comment-parse result built while linting is kept for the following sources.
+    The problems of recently linted sources are cached by the hash of their contents,
+    so unchanged sources are not linted again.
+    Sessions are not thread-safe, so each thread should create its own session.
+    """
+
+    @override
+    def __init__(
+        self,
+        plugin_classes: Iterable[type[BasePlugin]] = _DEFAULT_PLUGIN_CLASSES,
+        *,
+        select: Iterable[str] | None = None,
+        ignore: Iterable[str] | None = None,
+        disable_noqa: bool = False,
+        result_cache_size: int = 1024,
+    ) -> None:
+        if result_cache_size < 0:
+            INVALID_RESULT_CACHE_SIZE_MESSAGE: Final[str] = (
+                "The result cache size cannot be negative."
+            )
+            raise ValueError(INVALID_RESULT_CACHE_SIZE_MESSAGE)
+
+        all_rules: Mapping[type[BasePlugin], Collection[type[BaseRule[BasePlugin]]]] = {
+            PluginClass: cast("Collection[type[BaseRule[BasePlugin]]]", PluginClass.RULES)
+            for PluginClass in plugin_classes
+        }
+        decision_engine: DecisionEngine = DecisionEngine(
+            argparse.Namespace(
+                select=None if select is None else list(select),
+                extend_select=None,
+                extended_default_select=[
+                    _SYNTAX_ERROR_CODE,
+                    _IO_ERROR_CODE,
+                    *(
+                        RuleClass.CODE
+                        for plugin_rules in all_rules.values()
+                        for RuleClass in plugin_rules
+                    ),
+                ],
+                ignore=None if ignore is None else list(ignore),
+                extend_ignore=None,
+                extended_default_ignore=[],
+            ),
+        )
+
+        self._rules: Mapping[type[BasePlugin], Collection[type[BaseRule[BasePlugin]]]] = {
+            PluginClass: tuple(
+                RuleClass
+                for RuleClass in plugin_rules
+                if decision_engine.decision_for(RuleClass.CODE) is Decision.Selected
+            )
+            for PluginClass, plugin_rules in all_rules.items()
+        }
+        self._selected_error_codes: AbstractSet[str] = frozenset(
+            error_code
+            for error_code in (_SYNTAX_ERROR_CODE, _IO_ERROR_CODE)
+            if decision_engine.decision_for(error_code) is Decision.Selected
+        )
+        self._disable_noqa: bool = disable_noqa
+        self._result_cache_size: int = result_cache_size
+        self._result_cache: collections.OrderedDict[bytes, Sequence[_CachedProblem]] = (
+            collections.OrderedDict()
+        )
+
+        # NOTE: Fills the rule pool & builds the traversal dispatchers before the first source
+        self._lint_uncached(_WARM_UP_SOURCE)
+
+    @property
+    def rules(self) -> Mapping[type[BasePlugin], Collection[type[BaseRule[BasePlugin]]]]:
+        """The rules selected to run, for each plugin of this session."""
+        return self._rules
+
+    def lint_source(
+        self,
+        source: str,
+        filename: str = "<unknown>",
+        *,
+        cache_key: bytes | None = None,
+        scopes: AbstractSet[RuleScope] | None = None,
+        statement_cache: StatementProblemsCache | None = None,
+        is_cancelled: Callable[[], bool] | None = None,
+    ) -> Sequence[Problem]:
+        """
+        Lint the given source code with every selected rule.
+
+        The filename is only used to label the returned problems.
+        As with Flake8, problems on lines with a matching `# noqa` comment are skipped,
+        & a source that cannot be parsed is reported as a single E999 problem.
+        The problems are cached by the given key, E.g. a Git blob ID,
+        or by the hash of the source if no key is given.
+        If scopes are given, only the selected rules within those scopes are run.
+        If a statement cache is given, the statement-scoped rules are only run
+        on the top-level statements that have changed since it was last used.
+        If the given callback reports that the lint was cancelled,
+        `LintCancelledError` is raised before the next group of rules is run.
+        """
+        if cache_key is None:
+            cache_key = hashlib.blake2b(
+                source.encode(errors="surrogatepass"), digest_size=16
+            ).digest()
+
+        if scopes is not None:
+            cache_key += f":{','.join(sorted(scope.value for scope in scopes))}".encode()
+
+        cached_problems: Sequence[Problem] | None = self.get_cached_problems(
+            cache_key, filename
+        )
+        if cached_problems is not None:
+            return cached_problems
+
+        uncached_problems: Sequence[_CachedProblem] = self._lint_uncached(
+            source, scopes, statement_cache, is_cancelled
+        )
+
+        if self._result_cache_size:
+            self._result_cache[cache_key] = uncached_problems
+            if len(self._result_cache) > self._result_cache_size:
+                self._result_cache.popitem(last=False)
+
+        return [
+            Problem(filename, line, column, code, message)
+            for line, column, code, message in uncached_problems
+        ]
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        Digest of this session's selected rules & options, & of this package's version.
+
+        Problems stored outside of the session, E.g. on disk,
+        can only be reused by a session with the same fingerprint.
+        """
+        return hashlib.blake2b(
+            "\0".join(
+                (
+                    codegen.get_package_version(),
+                    *sorted(
+                        RuleClass.CODE
+                        for plugin_rules in self._rules.values()
+                        for RuleClass in plugin_rules
+                    ),
+                    *sorted(self._selected_error_codes),
+                    str(self._disable_noqa),
+                ),
+            ).encode(),
+            digest_size=16,
+        ).hexdigest()
+
+    def get_cached_problems(self, cache_key: bytes, filename: str) -> Sequence[Problem] | None:
+        """Return the cached problems of the source with the given key, if still cached."""
+        cached_problems: Sequence[_CachedProblem] | None = self._result_cache.get(
+            cache_key, None
+        )
+        if cached_problems is None:
+            return None
+
+        self._result_cache.move_to_end(cache_key)
+
+        return [
+            Problem(filename, line, column, code, message)
+            for line, column, code, message in cached_problems
+        ]
+
+    def lint_file(self, path: str | PathLike[str]) -> Sequence[Problem]:
+        """Lint the source code of the given file, labelling its problems with its path."""
+        return self.lint_source_file(pipeline.read_source_file(path))
+
+    def lint_source_file(self, source_file: SourceFile) -> Sequence[Problem]:
+        """Lint an already read source file, E.g. one from `prefetch_source_files()`."""
+        if source_file.source is None:
+            return self._make_io_error_problems(source_file.path, source_file.error)
+
+        return self.lint_source(source_file.source, source_file.path)
+
+    def lint_preamble_file(self, path: str | PathLike[str]) -> Sequence[Problem]:
+        """
+        Lint the given file with only the selected module-header rules, over only its preamble.
+
+        Only the start of the file is read & parsed, so this is far faster than `lint_file()`
+        for a quick check of a whole repository.
+        Problems are skipped by `# noqa` comments as with `lint_file()`,
+        but a file-wide `# flake8: noqa` comment is only found within the lines read.
+        """
+        filename: str = os.fspath(path)
+
+        try:
+            file_preamble: Preamble = preamble.read_preamble_file(filename)
+        except OSError as error:
+            return self._make_io_error_problems(filename, error)
+        except _INVALID_SOURCE_ERRORS as error:
+            return [
+                Problem(filename, *problem)
+                for problem in self._make_syntax_error_problems(error)
+            ]
+
+        if not self._disable_noqa and any(
+            flake8_defaults.NOQA_FILE.match(line) for line in file_preamble.lines
+        ):
+            return []
+
+        return [
+            Problem(filename, *problem)
+            for problem in self._remove_inline_ignored(
+                _convert_plugin_problems(
+                    preamble.run_preamble_rules(
+                        file_preamble,
+                        cast(
+                            "Collection[type[CarrotRule]]", self._rules.get(CarrotPlugin, ())
+                        ),
+                    ),
+                ),
+                file_preamble.lines,
+            )
+        ]
+
+    def clear_caches(self) -> None:
+        """Discard the cached problems & comment-parse results, E.g. after a rule change."""
+        self._result_cache.clear()
+        utils.clear_comment_parse_memos()
+
+    def _lint_uncached(
+        self,
+        source: str,
+        scopes: AbstractSet[RuleScope] | None = None,
+        statement_cache: StatementProblemsCache | None = None,
+        is_cancelled: Callable[[], bool] | None = None,
+    ) -> Sequence[_CachedProblem]:
+        lines: Sequence[str] = io.StringIO(source).readlines()
+        if not self._disable_noqa and any(
+            flake8_defaults.NOQA_FILE.match(line) for line in lines
+        ):
+            return []
+
+        problems: list[_CachedProblem] = []
+        statement_rules: dict[type[BasePlugin], Collection[type[BaseRule[BasePlugin]]]] = {}
+
+        try:
+            # NOTE: Parsed once up front, as the statements are also found from the same tree
+            tree: ast.Module | None = None if statement_cache is None else ast.parse(source)
+
+            PluginClass: type[BasePlugin]
+            rule_classes: Collection[type[BaseRule[BasePlugin]]]
+            for PluginClass, rule_classes in self._rules.items():
+                scoped_rule_classes: Collection[type[BaseRule[BasePlugin]]] = (
+                    rule_classes
+                    if scopes is None
+                    else [RuleClass for RuleClass in rule_classes if RuleClass.SCOPE in scopes]
+                )
+                if statement_cache is not None:
+                    statement_rules[PluginClass] = [
+                        RuleClass
+                        for RuleClass in scoped_rule_classes
+                        if RuleClass.SCOPE is utils.RuleScope.STATEMENT
+                    ]
+                    scoped_rule_classes = [
+                        RuleClass
+                        for RuleClass in scoped_rule_classes
+                        if RuleClass.SCOPE is not utils.RuleScope.STATEMENT
+                    ]
+
+                _raise_if_cancelled(is_cancelled)
+                problems.extend(
+                    _convert_plugin_problems(
+                        (
+                            PluginClass.from_source(source)
+                            if tree is None
+                            else PluginClass(
+                                tree=tree, file_tokens=None, lines=None, source=source
+                            )
+                        ).run_rules(scoped_rule_classes),
+                    ),
+                )
+
+            if (
+                statement_cache is not None
+                and tree is not None
+                and any(statement_rules.values())
+            ):
+                _raise_if_cancelled(is_cancelled)
+                problems.extend(
+                    statement_cache.lint_changed_statements(tree, lines, statement_rules)
+                )
+
+        except _INVALID_SOURCE_ERRORS as error:
+            return self._make_syntax_error_problems(error)
+
+        return self._remove_inline_ignored(problems, lines)
+
+    def _remove_inline_ignored(
+        self, problems: Sequence[_CachedProblem], lines: Sequence[str]
+    ) -> Sequence[_CachedProblem]:
+        if not problems or self._disable_noqa:
+            return sorted(problems)
+
+        noqa_lines: Mapping[int, str] = _get_noqa_lines(lines)
+        return sorted(
+            problem
+            for problem in problems
+            if not _is_inline_ignored(
+                problem[2],
+                noqa_lines.get(problem[0])
+                or (lines[problem[0] - 1] if 0 < problem[0] <= len(lines) else ""),
+            )
+        )
+
+    def _make_io_error_problems(
+        self, filename: str, error: OSError | None
+    ) -> Sequence[Problem]:
+        if _IO_ERROR_CODE not in self._selected_error_codes:
+            return []
+
+        return [Problem(filename, 0, 1, _IO_ERROR_CODE, f"{type(error).__name__}: {error}")]
+
+    def _make_syntax_error_problems(self, error: Exception) -> Sequence[_CachedProblem]:
+        # NOTE: Matches the positions reported by Flake8, which treats the offset as 0-based
+        line, column, error_code, message = utils.describe_invalid_source(error)
+        if error_code not in self._selected_error_codes:
+            return []
+
+        return [(line, column + 1, error_code, message)]
+
+
+def _raise_if_cancelled(is_cancelled: Callable[[], bool] | None) -> None:
+    if is_cancelled is not None and is_cancelled():
+        LINT_CANCELLED_MESSAGE: Final[str] = "The lint was cancelled."
+        raise LintCancelledError(LINT_CANCELLED_MESSAGE)
+
+
+def _convert_plugin_problems(
+    plugin_problems: Iterable[tuple[int, int, str, type[BasePlugin]]],
+) -> Sequence[_CachedProblem]:
+    converted_problems: list[_CachedProblem] = []
+
+    line: int
+    column: int
+    text: str
+    for line, column, text, _ in plugin_problems:
+        code, _, message = text.partition(" ")
+        converted_problems.append((line, column + 1, code, message))
+
+    return converted_problems
+
+
+def _find_statement_spans(tree: ast.Module) -> Sequence[tuple[int, int]]:
+    """Find the first & last lines of each top-level statement, merging any sharing a line."""
+    statement_spans: list[tuple[int, int]] = []
+
+    statement: ast.stmt
+    for statement in tree.body:
+        start: int = min(
+            (
+                statement.lineno,
+                *(
+                    decorator.lineno
+                    for decorator in (
+                        statement.decorator_list
+                        if isinstance(
+                            statement, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+                        )
+                        else ()
+                    )
+                ),
+            ),
+        )
+        end: int = statement.end_lineno or statement.lineno
+
+        if statement_spans and start <= statement_spans[-1][1]:
+            statement_spans[-1] = (statement_spans[-1][0], max(end, statement_spans[-1][1]))
+            continue
+
+        statement_spans.append((start, end))
+
+    return statement_spans
+
+
+def _get_noqa_lines(lines: Sequence[str]) -> Mapping[int, str]:
+    """Map each line number to the text of its whole logical line, as searched by Flake8."""
+    noqa_lines: dict[int, str] = {}
+
+    try:
+        first_line_number: int = len(lines) + 2
+        last_line_number: int = -1
+
+        file_token: tokenize.TokenInfo
+        for file_token in tokenize.generate_tokens(iter(lines).__next__):
+            if file_token.type in (tokenize.ENDMARKER, tokenize.DEDENT):
+                continue
+
+            first_line_number = min(first_line_number, file_token.start[0])
+            last_line_number = max(last_line_number, file_token.end[0])
+
+            if file_token.type in (tokenize.NL, tokenize.NEWLINE):
+                logical_line: str = "".join(lines[first_line_number - 1 : last_line_number])
+                noqa_lines.update(
+                    dict.fromkeys(range(first_line_number, last_line_number + 1), logical_line)
+                )
+                first_line_number = len(lines) + 2
+                last_line_number = -1
+
+    except _INVALID_SOURCE_ERRORS:
+        return {}
+
+    return noqa_lines
+
+
+def _is_inline_ignored(code: str, line: str) -> bool:
+    noqa_match: re.Match[str] | None = flake8_defaults.NOQA_INLINE_REGEXP.search(line)
+    if noqa_match is None:
+        return False
+
+    codes: str | None = noqa_match.group("codes")
+    if codes is None:
+        return True
+
+    return code.startswith(tuple(flake8_utils.parse_comma_separated_list(codes)))
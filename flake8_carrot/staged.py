@@ -0,0 +1,337 @@
+"""Linting of the staged versions of changed files, read straight from Git's object store."""
+
+import json
+import os
+import subprocess
+import threading
+from typing import TYPE_CHECKING, NamedTuple, override
+
+from . import discovery, pipeline
+from .batch import FileProblems
+from .scheduling import DEFAULT_CACHE_DIRECTORY
+from .session import Problem
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Mapping, Sequence
+    from pathlib import Path
+    from typing import IO, Final, Self
+
+    from .session import LintSession
+
+__all__: Sequence[str] = (
+    "BlobProblemsCache",
+    "BlobReader",
+    "StagedFile",
+    "lint_staged_files",
+    "list_staged_files",
+)
+
+
+if __name__ == "__main__":
+    CANNOT_RUN_AS_SCRIPT_MESSAGE: Final[str] = "This module cannot be run as a script."
+    raise RuntimeError(CANNOT_RUN_AS_SCRIPT_MESSAGE)
+
+
+_GIT_EXECUTABLE: Final[str] = "git"
+_REGULAR_FILE_MODES: Final[frozenset[str]] = frozenset({"100644", "100755"})
+_BLOB_CACHE_KEY_PREFIX: Final[bytes] = b"git-blob:"
+_BLOB_PROBLEMS_FILE_NAME: Final[str] = "staged.json"
+_BLOB_PROBLEMS_FILE_VERSION: Final[int] = 1
+_MAX_STORED_BLOBS: Final[int] = 4096
+_INVALID_BLOB_PROBLEMS_FILE_ERRORS: Final[tuple[type[Exception], ...]] = (
+    OSError,
+    ValueError,
+    TypeError,
+)
+
+if TYPE_CHECKING:
+    type _CompactProblem = tuple[int, int, str, str]
+
+
+class StagedFile(NamedTuple):
+    """A changed file within Git's index, with the ID of its staged blob."""
+
+    path: str
+    blob_id: str
+
+
+def _run_git(arguments: Sequence[str], cwd: str | None, stdin: bytes = b"") -> bytes:
+    return subprocess.run(
+        (_GIT_EXECUTABLE, *arguments),
+        input=stdin,
+        capture_output=True,
+        check=True,
+        cwd=cwd,
+    ).stdout
+
+
+def list_staged_files(
+    pathspecs: Sequence[str] = (), *, cwd: str | None = None
+) -> Sequence[StagedFile]:
+    """
+    List the files that are added, copied or modified within Git's index.
+
+    The paths are relative to the working directory, & only the files within it are listed.
+    Symbolic links & submodules are skipped, as they have no source code to lint.
+    """
+    base_tree: str = "HEAD"
+    try:
+        _run_git(("rev-parse", "--verify", "--quiet", "HEAD"), cwd)
+    except subprocess.CalledProcessError:
+        # NOTE: Before the first commit, every staged file is compared with the empty tree
+        base_tree = _run_git(("hash-object", "-t", "tree", "--stdin"), cwd).decode().strip()
+
+    diff_output: Sequence[str] = (
+        _run_git(
+            (
+                "diff-index",
+                "--cached",
+                "--relative",
+                "--no-renames",
+                "--diff-filter=ACM",
+                "-z",
+                base_tree,
+                "--",
+                *pathspecs,
+            ),
+            cwd,
+        )
+        .decode(errors="surrogateescape")
+        .split("\0")
+    )
+
+    staged_files: list[StagedFile] = []
+
+    # NOTE: Each entry is a ":<old mode> <new mode> <old ID> <new ID> <status>" header & a path
+    header: str
+    path: str
+    for header, path in zip(diff_output[0:-1:2], diff_output[1::2], strict=True):
+        new_mode: str
+        new_blob_id: str
+        _, new_mode, _, new_blob_id, _ = header.removeprefix(":").split(" ")
+        if new_mode in _REGULAR_FILE_MODES:
+            staged_files.append(StagedFile(path, new_blob_id))
+
+    return staged_files
+
+
+class BlobReader:
+    """
+    Reader of blobs from Git's object store, through one long-lived `git cat-file` process.
+
+    Each blob is requested & read in turn, so no temporary files or stashing are needed,
+    & no new process is started per file.
+    """
+
+    @override
+    def __init__(self, *, cwd: str | None = None) -> None:
+        self._process: subprocess.Popen[bytes] = subprocess.Popen(
+            (_GIT_EXECUTABLE, "cat-file", "--batch"),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            cwd=cwd,
+        )
+
+    def read(self, blob_id: str) -> bytes:
+        """Read the contents of the blob with the given ID."""
+        stdin: IO[bytes] | None = self._process.stdin
+        stdout: IO[bytes] | None = self._process.stdout
+        if stdin is None or stdout is None or stdin.closed:
+            CLOSED_READER_MESSAGE: Final[str] = "Cannot read blobs from a closed reader."
+            raise ValueError(CLOSED_READER_MESSAGE)
+
+        stdin.write(f"{blob_id}\n".encode())
+        stdin.flush()
+
+        header: Sequence[str] = stdout.readline().decode().split()
+        if len(header) != 3 or header[1] != "blob":
+            MISSING_BLOB_MESSAGE: Final[str] = f"Git has no blob with the ID {blob_id!r}."
+            raise FileNotFoundError(MISSING_BLOB_MESSAGE)
+
+        contents: bytes = stdout.read(int(header[2]))
+
+        # NOTE: Each blob's contents are followed by a single newline
+        stdout.read(1)
+
+        return contents
+
+    def close(self) -> None:
+        """Stop the `git cat-file` process."""
+        if self._process.stdin is not None and not self._process.stdin.closed:
+            self._process.stdin.close()
+
+        self._process.wait()
+
+        if self._process.stdout is not None:
+            self._process.stdout.close()
+
+
+class BlobProblemsCache:
+    """
+    The problems of previously linted staged blobs, keyed by each blob's ID.
+
+    The problems are stored within the cache directory, alongside the scheduler's costs,
+    so a blob that is still staged in a later run is neither read nor linted again.
+    They are only reused by sessions with the fingerprint that they were linted by.
+    """
+
+    @override
+    def __init__(
+        self,
+        fingerprint: str,
+        blob_problems: Mapping[str, Sequence[_CompactProblem]] | None = None,
+        *,
+        cache_directory: Path | None = None,
+    ) -> None:
+        self._fingerprint: str = fingerprint
+        self._blob_problems: dict[str, Sequence[_CompactProblem]] = dict(blob_problems or {})
+        self._cache_directory: Path | None = cache_directory
+        self._changed: bool = False
+
+    @property
+    def fingerprint(self) -> str:
+        """The fingerprint of the sessions whose problems this cache holds."""
+        return self._fingerprint
+
+    @classmethod
+    def load(cls, fingerprint: str, cache_directory: Path = DEFAULT_CACHE_DIRECTORY) -> Self:
+        """Create a cache with the problems stored in the given cache directory, if any."""
+        blob_problems: dict[str, Sequence[_CompactProblem]] = {}
+
+        try:
+            blob_problems_data: object = json.loads(
+                (cache_directory / _BLOB_PROBLEMS_FILE_NAME).read_text(encoding="utf-8")
+            )
+            if (
+                isinstance(blob_problems_data, dict)
+                and blob_problems_data.get("version") == _BLOB_PROBLEMS_FILE_VERSION
+                and blob_problems_data.get("fingerprint") == fingerprint
+            ):
+                blob_problems = {
+                    str(blob_id): [
+                        (int(line), int(column), str(code), str(message))
+                        for line, column, code, message in problems
+                    ]
+                    for blob_id, problems in blob_problems_data["problems"].items()
+                }
+        except _INVALID_BLOB_PROBLEMS_FILE_ERRORS:
+            blob_problems = {}
+
+        return cls(fingerprint, blob_problems, cache_directory=cache_directory)
+
+    def get(self, blob_id: str, filename: str) -> Sequence[Problem] | None:
+        """Return the stored problems of the blob with the given ID, if linted before."""
+        compact_problems: Sequence[_CompactProblem] | None = self._blob_problems.pop(
+            blob_id, None
+        )
+        if compact_problems is None:
+            return None
+
+        # NOTE: Reinserted, so the most recently used blobs are the last to be dropped
+        self._blob_problems[blob_id] = compact_problems
+        self._changed = True
+
+        return [Problem(filename, *compact_problem) for compact_problem in compact_problems]
+
+    def record(self, blob_id: str, problems: Iterable[Problem]) -> None:
+        """Store the problems of the blob with the given ID, to be reused by later runs."""
+        self._blob_problems.pop(blob_id, None)
+        self._blob_problems[blob_id] = [
+            (problem.line, problem.column, problem.code, problem.message)
+            for problem in problems
+        ]
+        self._changed = True
+
+    def save(self) -> None:
+        """Store the most recently used blobs' problems within the cache directory."""
+        if self._cache_directory is None or not self._changed:
+            return
+
+        blob_problems: Mapping[str, Sequence[_CompactProblem]] = dict(
+            list(self._blob_problems.items())[-_MAX_STORED_BLOBS:]
+        )
+        blob_problems_file_path: Path = self._cache_directory / _BLOB_PROBLEMS_FILE_NAME
+        temporary_file_path: Path = blob_problems_file_path.with_name(
+            f"{blob_problems_file_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        try:
+            self._cache_directory.mkdir(parents=True, exist_ok=True)
+            (self._cache_directory / ".gitignore").write_text("*\n", encoding="utf-8")
+            temporary_file_path.write_text(
+                json.dumps(
+                    {
+                        "version": _BLOB_PROBLEMS_FILE_VERSION,
+                        "fingerprint": self._fingerprint,
+                        "problems": blob_problems,
+                    },
+                ),
+                encoding="utf-8",
+            )
+            temporary_file_path.replace(blob_problems_file_path)
+        except OSError:
+            temporary_file_path.unlink(missing_ok=True)
+
+
+def lint_staged_files(
+    lint_session: LintSession,
+    pathspecs: Sequence[str] = (),
+    *,
+    exclude_patterns: Iterable[str] = (),
+    blob_cache: BlobProblemsCache | None = None,
+) -> Iterator[FileProblems]:
+    """
+    Lint the staged version of each changed Python file, ignoring any unstaged changes.
+
+    Only the files within the working directory are linted, labelled relative to it.
+    The problems of each blob are cached within the session by the blob's ID,
+    so a blob that was already linted is neither read nor linted again.
+    If a blob cache is given, the problems are also reused from & stored to it,
+    so that they carry across runs, E.g. of a pre-commit hook.
+    """
+    if blob_cache is not None and blob_cache.fingerprint != lint_session.fingerprint:
+        MISMATCHED_BLOB_CACHE_MESSAGE: Final[str] = (
+            "The blob cache was not created for this session's fingerprint."
+        )
+        raise ValueError(MISMATCHED_BLOB_CACHE_MESSAGE)
+
+    staged_blob_ids: dict[str, str] = {
+        staged_file.path: staged_file.blob_id for staged_file in list_staged_files(pathspecs)
+    }
+    if not staged_blob_ids:
+        return
+
+    # NOTE: Only started once a blob is not cached, so fully cached runs start no process
+    blob_reader: BlobReader | None = None
+
+    try:
+        path: str
+        for path in discovery.filter_source_paths(staged_blob_ids, exclude_patterns):
+            blob_id: str = staged_blob_ids[path]
+            cache_key: bytes = _BLOB_CACHE_KEY_PREFIX + blob_id.encode()
+
+            problems: Sequence[Problem] | None = lint_session.get_cached_problems(
+                cache_key, path
+            )
+            if problems is None and blob_cache is not None:
+                problems = blob_cache.get(blob_id, path)
+
+            if problems is None:
+                if blob_reader is None:
+                    blob_reader = BlobReader()
+
+                problems = lint_session.lint_source(
+                    pipeline.decode_source(blob_reader.read(blob_id)),
+                    path,
+                    cache_key=cache_key,
+                )
+                if blob_cache is not None:
+                    blob_cache.record(blob_id, problems)
+
+            yield FileProblems(path, problems)
+
+    finally:
+        if blob_reader is not None:
+            blob_reader.close()
+
+        if blob_cache is not None:
+            blob_cache.save()
@@ -8,14 +8,19 @@ from flake8_carrot.utils import BasePlugin, TeXBotRule
 
 if TYPE_CHECKING:
     from collections.abc import Collection, Sequence
+    from collections.abc import Set as AbstractSet
+    from typing import Final
 
 __all__: Sequence[str] = ("TeXBotPlugin", "TeXBotRule")
 
 
+_RULES: Final[AbstractSet[type[TeXBotRule]]] = frozenset()
+
+
 class TeXBotPlugin(BasePlugin):
     """Plugin class holding all "TXB" rules to be run on some code provided by Flake8."""
 
     @classproperty
     @override
     def RULES(cls) -> Collection[type[TeXBotRule]]:
-        return frozenset()
+        return _RULES
@@ -0,0 +1,240 @@
+"""Iterative (non-recursive) AST traversal engine shared by all the rules of a plugin."""
+
+import ast
+import typing
+from enum import Enum
+from typing import TYPE_CHECKING, cast, final, override
+
+from . import codegen
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping, Sequence
+    from collections.abc import Set as AbstractSet
+    from typing import Final
+
+__all__: Sequence[str] = (
+    "CHILD_FIELDS",
+    "TraversalEngine",
+    "TraversalSignal",
+    "get_child_fields",
+)
+
+
+if __name__ == "__main__":
+    CANNOT_RUN_AS_SCRIPT_MESSAGE: Final[str] = "This module cannot be run as a script."
+    raise RuntimeError(CANNOT_RUN_AS_SCRIPT_MESSAGE)
+
+
+if TYPE_CHECKING:
+    type _PreHook = Callable[[ast.AST], TraversalSignal | None]
+    type _PostHook = Callable[[ast.AST], None]
+
+
+class TraversalSignal(Enum):
+    """Signals that a pre-hook can return to alter how the traversal continues."""
+
+    SKIP_CHILDREN = "skip_children"
+    """Do not call any more of this hook's owner's hooks for the current node's children."""
+
+
+def _field_type_may_contain_nodes(field_type: object) -> bool:
+    if isinstance(field_type, type):
+        return issubclass(field_type, ast.AST)
+
+    return any(
+        _field_type_may_contain_nodes(field_type_argument)
+        for field_type_argument in typing.get_args(field_type)
+    )
+
+
+def _compute_child_fields(node_type: type[ast.AST]) -> tuple[str, ...]:
+    field_types: Mapping[str, object] | None = getattr(node_type, "_field_types", None)
+    if field_types is None:
+        return tuple(node_type._fields)
+
+    return tuple(
+        field_name
+        for field_name in node_type._fields
+        if _field_type_may_contain_nodes(field_types.get(field_name, ast.AST))
+    )
+
+
+CHILD_FIELDS: Final[dict[type[ast.AST], tuple[str, ...]]] = {
+    node_type: _compute_child_fields(node_type)
+    for node_type in vars(ast).values()
+    if isinstance(node_type, type) and issubclass(node_type, ast.AST)
+}
+_REVERSED_CHILD_FIELDS: Final[dict[type[ast.AST], tuple[str, ...]]] = {
+    node_type: child_fields[::-1] for node_type, child_fields in CHILD_FIELDS.items()
+}
+
+
+def get_child_fields(node_type: type[ast.AST]) -> tuple[str, ...]:
+    """Retrieve the names of the fields of the given node type that can hold child nodes."""
+    child_fields: tuple[str, ...] | None = CHILD_FIELDS.get(node_type, None)
+    if child_fields is None:
+        child_fields = _compute_child_fields(node_type)
+        CHILD_FIELDS[node_type] = child_fields
+        _REVERSED_CHILD_FIELDS[node_type] = child_fields[::-1]
+
+    return child_fields
+
+
+@final
+class _ExitMarker:
+    __slots__ = ("node",)
+
+    @override
+    def __init__(self, node: ast.AST) -> None:
+        self.node: ast.AST = node
+
+
+@final
+class TraversalEngine:
+    """
+    Explicit-stack AST traversal engine, calling registered hooks for each visited node.
+
+    Nodes are visited in the same depth-first pre-order as `ast.NodeVisitor`,
+    however, no Python-level recursion is used,
+    so arbitrarily deep trees (E.g. long `elif` chains) cannot raise a `RecursionError`.
+    Hooks are dispatched on the exact type of each node.
+
+    By default, each traversal runs a generated function specialised to the registered hooks,
+    with the visit order & hook calls hard-coded for each node type.
+    """
+
+    @override
+    def __init__(self, *, compiled: bool = True) -> None:
+        self._compiled: bool = compiled
+        self._pre_hooks: dict[type[ast.AST], list[tuple[object, _PreHook]]] = {}
+        self._post_hooks: dict[type[ast.AST], list[tuple[object, _PostHook]]] = {}
+
+    def add_pre_hook[T_Node: ast.AST](
+        self,
+        node_type: type[T_Node],
+        hook: Callable[[T_Node], TraversalSignal | None],
+        *,
+        owner: object,
+    ) -> None:
+        """Call the given hook whenever a node of the given type is entered."""
+        self._pre_hooks.setdefault(node_type, []).append(
+            (owner, cast("_PreHook", hook)),
+        )
+
+    def add_post_hook[T_Node: ast.AST](
+        self,
+        node_type: type[T_Node],
+        hook: Callable[[T_Node], None],
+        *,
+        owner: object,
+    ) -> None:
+        """Call the given hook whenever a node of the given type is exited."""
+        self._post_hooks.setdefault(node_type, []).append(
+            (owner, cast("_PostHook", hook)),
+        )
+
+    @property
+    def has_hooks(self) -> bool:
+        """Whether any hooks have been registered, so traversing would have any effect."""
+        return bool(self._pre_hooks or self._post_hooks)
+
+    @property
+    def hook_owners(self) -> AbstractSet[object]:
+        """The owners of every hook that has been registered."""
+        return {owner for hooks in self._pre_hooks.values() for owner, _ in hooks} | {
+            owner for hooks in self._post_hooks.values() for owner, _ in hooks
+        }
+
+    def traverse(self, tree: ast.AST) -> None:
+        """Visit every node within the given tree, calling all the registered hooks."""
+        if not self.has_hooks:
+            return
+
+        if self._compiled:
+            self._traverse_compiled(tree)
+        else:
+            self._traverse_interpreted(tree)
+
+    def _traverse_compiled(self, tree: ast.AST) -> None:
+        owner_indices: dict[object, int] = {}
+        pre_hook_signature: tuple[tuple[type[ast.AST], tuple[int, ...]], ...] = tuple(
+            (
+                node_type,
+                tuple(
+                    owner_indices.setdefault(owner, len(owner_indices)) for owner, _ in hooks
+                ),
+            )
+            for node_type, hooks in self._pre_hooks.items()
+        )
+
+        traversal_factory: codegen.TraversalFactory = codegen.get_traversal_factory(
+            pre_hook_signature, self._post_hooks.keys(), CHILD_FIELDS
+        )
+        traversal_factory(
+            [pre_hook for hooks in self._pre_hooks.values() for _, pre_hook in hooks],
+            list(owner_indices),
+            self._post_hooks,
+            TraversalSignal.SKIP_CHILDREN,
+            _ExitMarker,
+            get_child_fields,
+        )(tree)
+
+    def _traverse_interpreted(self, tree: ast.AST) -> None:
+        pre_hooks: Mapping[type[ast.AST], Sequence[tuple[object, _PreHook]]] = self._pre_hooks
+        post_hooks: Mapping[type[ast.AST], Sequence[tuple[object, _PostHook]]] = (
+            self._post_hooks
+        )
+        skipping_owners: dict[object, ast.AST] = {}
+        stack: list[ast.AST | _ExitMarker] = [tree]
+
+        while stack:
+            node: ast.AST | _ExitMarker = stack.pop()
+
+            owner: object
+            if isinstance(node, _ExitMarker):
+                exited_node: ast.AST = node.node
+
+                post_hook: _PostHook
+                for owner, post_hook in post_hooks.get(type(exited_node), ()):
+                    if skipping_owners.get(owner, exited_node) is exited_node:
+                        post_hook(exited_node)
+
+                if skipping_owners:
+                    skipping_owners = {
+                        owner: skipped_node
+                        for owner, skipped_node in skipping_owners.items()
+                        if skipped_node is not exited_node
+                    }
+
+                continue
+
+            node_type: type[ast.AST] = type(node)
+            requires_exit: bool = node_type in post_hooks
+
+            pre_hook: _PreHook
+            for owner, pre_hook in pre_hooks.get(node_type, ()):
+                if owner in skipping_owners:
+                    continue
+
+                if pre_hook(node) is TraversalSignal.SKIP_CHILDREN:
+                    skipping_owners[owner] = node
+                    requires_exit = True
+
+            if requires_exit:
+                stack.append(_ExitMarker(node))
+
+            reversed_child_fields: tuple[str, ...] | None = _REVERSED_CHILD_FIELDS.get(
+                node_type, None
+            )
+            if reversed_child_fields is None:
+                reversed_child_fields = get_child_fields(node_type)[::-1]
+
+            field_name: str
+            for field_name in reversed_child_fields:
+                value: object = getattr(node, field_name, None)
+
+                if isinstance(value, list):
+                    stack.extend(item for item in reversed(value) if isinstance(item, ast.AST))
+
+                elif isinstance(value, ast.AST):
+                    stack.append(value)
@@ -3,24 +3,36 @@
 import abc
 import ast
 import functools
+import io
 import re
+import tokenize
 from collections.abc import Mapping
+from enum import Enum
 from typing import TYPE_CHECKING, cast, final, override
 
+from flake8.style_guide import Decision, DecisionEngine
 from typed_classproperties import classproperty
 
+from . import analyses, profiling
+from .patterns import DottedNamePattern
+from .traversal import TraversalEngine
+
 if TYPE_CHECKING:
+    import argparse
     from collections.abc import Callable, Collection, Generator, Iterable, Sequence
     from collections.abc import Set as AbstractSet
     from tokenize import TokenInfo
     from types import EllipsisType
-    from typing import Final, Self
+    from typing import ClassVar, Final, Self
 
     from flake8_carrot.carrot import CarrotPlugin
     from flake8_carrot.tex_bot import TeXBotPlugin
 
+    from .analyses import AnalysisCache, BaseAnalysis
+
 __all__: Sequence[str] = (
     "ALL_PYCORD_FUNCTION_NAMES",
+    "PYCORD_COMMAND_DECORATOR_NAMES",
     "PYCORD_CONTEXT_COMMAND_DECORATOR_NAMES",
     "PYCORD_EVENT_LISTENER_DECORATOR_NAMES",
     "PYCORD_OPTION_DECORATOR_NAMES",
@@ -31,14 +43,20 @@ __all__: Sequence[str] = (
     "BaseRule",
     "CarrotRule",
     "ProblemsContainer",
+    "RuleInput",
+    "RulePool",
+    "RuleScope",
     "TeXBotRule",
+    "clear_comment_parse_memos",
+    "describe_invalid_source",
     "function_call_is_any_pycord_decorator",
     "function_call_is_pycord_context_command_decorator",
     "function_call_is_pycord_event_listener_decorator",
     "function_call_is_pycord_option_decorator",
     "function_call_is_pycord_slash_command_decorator",
     "function_call_is_pycord_task_decorator",
-    "generic_visit_before_return",
+    "get_source_segment",
+    "memoise_comment_parser",
 )
 
 
@@ -58,54 +76,161 @@ if TYPE_CHECKING:
     ]
 
 
-PPRINT_MODULES: Final[AbstractSet[str]] = {"astpretty"}
-PYCORD_SLASH_COMMAND_DECORATOR_NAMES: Final[AbstractSet[str]] = {
-    "application_command",
-    "command",
-    "slash_command",
-    "ApplicationCommand",
-    "SlashCommand",
-    "SlashCommandGroup",
-}
-PYCORD_CONTEXT_COMMAND_DECORATOR_NAMES: Final[AbstractSet[str]] = {
-    "user_command",
-    "message_command",
-    "UserCommand",
-    "MessageCommand",
-}
-PYCORD_OPTION_DECORATOR_NAMES: Final[AbstractSet[str]] = {
-    "option",
-    "Option",
-    "ThreadOption",
-    "OptionChoice",
-}
-PYCORD_TASK_DECORATOR_NAMES: Final[AbstractSet[str]] = {"loop", "Loop", "SleepHandle"}
-PYCORD_EVENT_LISTENER_DECORATOR_NAMES: Final[AbstractSet[str]] = {"listen", "listener"}
+PPRINT_MODULES: Final[AbstractSet[str]] = frozenset({"astpretty"})
+PYCORD_SLASH_COMMAND_DECORATOR_NAMES: Final[AbstractSet[str]] = frozenset(
+    {
+        "application_command",
+        "command",
+        "slash_command",
+        "ApplicationCommand",
+        "SlashCommand",
+        "SlashCommandGroup",
+    },
+)
+PYCORD_CONTEXT_COMMAND_DECORATOR_NAMES: Final[AbstractSet[str]] = frozenset(
+    {
+        "user_command",
+        "message_command",
+        "UserCommand",
+        "MessageCommand",
+    },
+)
+PYCORD_OPTION_DECORATOR_NAMES: Final[AbstractSet[str]] = frozenset(
+    {
+        "option",
+        "Option",
+        "ThreadOption",
+        "OptionChoice",
+    },
+)
+PYCORD_COMMAND_DECORATOR_NAMES: Final[AbstractSet[str]] = (
+    PYCORD_SLASH_COMMAND_DECORATOR_NAMES | PYCORD_CONTEXT_COMMAND_DECORATOR_NAMES
+)
+PYCORD_TASK_DECORATOR_NAMES: Final[AbstractSet[str]] = frozenset(
+    {"loop", "Loop", "SleepHandle"}
+)
+PYCORD_EVENT_LISTENER_DECORATOR_NAMES: Final[AbstractSet[str]] = frozenset(
+    {"listen", "listener"}
+)
 ALL_PYCORD_FUNCTION_NAMES: Final[AbstractSet[str]] = (
-    PYCORD_SLASH_COMMAND_DECORATOR_NAMES
-    | PYCORD_CONTEXT_COMMAND_DECORATOR_NAMES
+    PYCORD_COMMAND_DECORATOR_NAMES
     | PYCORD_OPTION_DECORATOR_NAMES
     | PYCORD_TASK_DECORATOR_NAMES
     | PYCORD_EVENT_LISTENER_DECORATOR_NAMES
 )
 
 
+def _compile_pycord_commands_module_pattern(
+    function_names: Iterable[str],
+) -> DottedNamePattern:
+    return DottedNamePattern(
+        f"{module_name}.{function_name}" if module_name else function_name
+        for module_name in (
+            "",
+            "discord",
+            "discord.commands",
+            "discord.commands.core",
+            "discord.commands.options",
+        )
+        for function_name in function_names
+    )
+
+
+_PYCORD_SLASH_COMMAND_DECORATOR_PATTERN: Final[DottedNamePattern] = (
+    _compile_pycord_commands_module_pattern(PYCORD_SLASH_COMMAND_DECORATOR_NAMES)
+)
+_PYCORD_CONTEXT_COMMAND_DECORATOR_PATTERN: Final[DottedNamePattern] = (
+    _compile_pycord_commands_module_pattern(PYCORD_CONTEXT_COMMAND_DECORATOR_NAMES)
+)
+_PYCORD_OPTION_DECORATOR_PATTERN: Final[DottedNamePattern] = (
+    _compile_pycord_commands_module_pattern(PYCORD_OPTION_DECORATOR_NAMES)
+)
+
+
+_PROBLEM_LOCATION_PATTERN: Final[re.Pattern[str]] = re.compile(
+    r"\A(?P<line_number>\d+),(?P<column_number>\d+)\Z"
+)
+
+_EMPTY_TREE: Final[ast.Module] = ast.Module(body=[], type_ignores=[])
+
+_SYNTAX_ERROR_CODE: Final[str] = "E999"
+_TOKENIZE_ERROR_CODE: Final[str] = "E902"
+
+_COMMENT_PARSE_MEMO_SIZE: Final[int] = 4096
+_COMMENT_PARSE_MEMO_CLEARERS: Final[list[Callable[[], None]]] = []
+
+
+class RuleInput(Enum):
+    """The inputs from the file being linted that a rule can require."""
+
+    TREE = "tree"
+    FILE_TOKENS = "file_tokens"
+    LINES = "lines"
+
+
+class RuleScope(Enum):
+    """The part of a module whose changes can alter a rule's problems on changed lines."""
+
+    PREAMBLE = "preamble"
+    """The module docstring, imports & `__all__` export, up to the first other statement."""
+
+    COMMENTS = "comments"
+    """Only the comments, as each problem is reported at the comment it was found in."""
+
+    STATEMENT = "statement"
+    """Only the top-level statement that each problem is reported within."""
+
+    MODULE = "module"
+    """Any part of the module."""
+
+
 class BasePlugin(abc.ABC):
     """Base plugin class to hold a selection of linting rules."""
 
+    _enabled_rules: ClassVar[Collection[type[object]] | None] = None
+    _gc_mode: ClassVar[profiling.GCMode] = profiling.GCMode.DEFAULT
+
     @classproperty
     @abc.abstractmethod
     def RULES(cls) -> Collection[type[BaseRule[Self]]]:  # noqa: D102, N802
         pass
 
+    @classproperty
+    def ENABLED_RULES(cls) -> Collection[type[BaseRule[Self]]]:  # noqa: N802
+        """The rules selected by Flake8's options, or all the rules if none were parsed."""
+        if cls._enabled_rules is None:
+            return cls.RULES
+
+        return cast("Collection[type[BaseRule[Self]]]", cls._enabled_rules)
+
+    @classmethod
+    def parse_options(cls, options: argparse.Namespace) -> None:
+        """Store which of this plugin's rules have been selected by Flake8's options."""
+        cls._gc_mode = profiling.GCMode(
+            getattr(options, "carrot_gc_mode", None) or profiling.GCMode.DEFAULT
+        )
+        if getattr(options, "carrot_gc_freeze", False):
+            profiling.register_gc_freeze_at_fork()
+
+        decision_engine: DecisionEngine = DecisionEngine(options)
+
+        # NOTE: Precomputed once per process, rather than filtered again for every file
+        cls._enabled_rules = tuple(
+            RuleClass
+            for RuleClass in cls.RULES
+            if decision_engine.decision_for(RuleClass.CODE) is Decision.Selected
+        )
+
     @override
     def __init__(
         self,
-        tree: ast.AST,
-        file_tokens: "Sequence[TokenInfo]",  # noqa: UP037
-        lines: "Sequence[str]",  # noqa: UP037
+        tree: ast.AST | None,
+        file_tokens: "Sequence[TokenInfo] | None",  # noqa: UP037
+        lines: "Sequence[str] | None",  # noqa: UP037
+        *,
+        source: str | None = None,
     ) -> None:
-        if isinstance(tree, ast.Module):
+        if tree is None or isinstance(tree, ast.Module):
             pass
         elif isinstance(tree, ast.Interactive):
             tree = ast.Module(body=tree.body, type_ignores=[])
@@ -117,22 +242,181 @@ class BasePlugin(abc.ABC):
             )
             raise TypeError(CANNOT_RUN_WITH_NON_MODULE_MESSAGE)
 
-        self._tree: ast.Module = tree
-        self._file_tokens: Sequence[TokenInfo] = file_tokens
-        self._lines: Sequence[str] = lines
+        if source is None and (tree is None or file_tokens is None or lines is None):
+            MISSING_INPUTS_MESSAGE: Final[str] = (
+                "Cannot run flake8-carrot plugin without either all its inputs or the source."
+            )
+            raise TypeError(MISSING_INPUTS_MESSAGE)
+
+        self._source: str | None = source
+        self._tree: ast.Module | None = tree
+        self._file_tokens: Sequence[TokenInfo] | None = file_tokens
+        self._lines: Sequence[str] | None = lines
+        self._analysis_cache: AnalysisCache | None = None
+
+    @classmethod
+    def from_source(cls, source: str) -> Self:
+        """
+        Create a plugin to lint the given source code, outside of Flake8.
+
+        The tree, tokens & lines are each only built from the source
+        if one of the enabled rules requires them.
+        """
+        return cls(tree=None, file_tokens=None, lines=None, source=source)
+
+    @property
+    def tree(self) -> ast.Module:
+        """The AST of the file being linted, until the traversal of it has completed."""
+        if self._tree is None and self._source is not None:
+            self._tree = ast.parse(self._source)
+
+        if self._tree is None:
+            TREE_RELEASED_MESSAGE: Final[str] = (
+                "The AST of this plugin's file has already been released."
+            )
+            raise RuntimeError(TREE_RELEASED_MESSAGE)
+
+        return self._tree
+
+    @property
+    def file_tokens(self) -> Sequence[TokenInfo]:
+        """The tokens of the file being linted, until no remaining rule requires them."""
+        if self._file_tokens is None and self._source is not None:
+            self._file_tokens = list(
+                tokenize.generate_tokens(io.StringIO(self._source).readline)
+            )
+
+        if self._file_tokens is None:
+            FILE_TOKENS_RELEASED_MESSAGE: Final[str] = (
+                "The tokens of this plugin's file have already been released."
+            )
+            raise RuntimeError(FILE_TOKENS_RELEASED_MESSAGE)
+
+        return self._file_tokens
+
+    @property
+    def lines(self) -> Sequence[str]:
+        """The lines of the file being linted, until no remaining rule requires them."""
+        if self._lines is None and self._source is not None:
+            self._lines = io.StringIO(self._source).readlines()
+
+        if self._lines is None:
+            LINES_RELEASED_MESSAGE: Final[str] = (
+                "The lines of this plugin's file have already been released."
+            )
+            raise RuntimeError(LINES_RELEASED_MESSAGE)
+
+        return self._lines
+
+    @property
+    def analysis_cache(self) -> AnalysisCache:
+        """The lazily computed analyses of the stored AST, shared with all other plugins."""
+        if self._analysis_cache is None:
+            self._analysis_cache = analyses.get_shared_analysis_cache(self.tree)
+
+        return self._analysis_cache
+
+    @property
+    def found_slash_command_group_names(self) -> AbstractSet[str]:  # noqa: D102
+        return self.analysis_cache.get(analyses.SlashCommandGroupNamesAnalysis)
+
+    @property
+    def first_all_export_line_numbers(self) -> tuple[int, int] | None:  # noqa: D102
+        return self.analysis_cache.get(analyses.FirstAllExportLineNumbersAnalysis)
+
+    @property
+    def pprint_imported_for_debugging(self) -> bool:  # noqa: D102
+        return self.analysis_cache.get(analyses.PprintImportedForDebuggingAnalysis)
+
+    @property
+    def found_loggers(self) -> AbstractSet[ast.Assign | ast.AnnAssign]:  # noqa: D102
+        return self.analysis_cache.get(analyses.LoggersAnalysis)
 
     def run(self) -> Generator[tuple[int, int, str, type[Self]]]:
-        """Perform complete linting over the stored Flake8 code context."""
-        RuleClass: type[BaseRule[Self]]
-        for RuleClass in self.RULES:
-            rule: BaseRule[Self] = RuleClass(plugin=self)
-            rule.run_check(tree=self._tree, file_tokens=self._file_tokens, lines=self._lines)
+        """
+        Perform complete linting over the stored Flake8 code context.
+
+        The stored tree, tokens & lines are released as soon as no remaining rule
+        requires them, so each plugin instance can only be run once.
+        The garbage collector is only configured here, as each Flake8 worker lints
+        on a single thread, whereas `run_rules()` may be called from many threads at once.
+        """
+        with profiling.gc_execution_mode(self._gc_mode):
+            problems: Sequence[tuple[int, int, str, type[Self]]] = list(
+                self.run_rules(self.ENABLED_RULES)
+            )
+
+        yield from problems
+
+    def run_rules(
+        self, rule_classes: Collection[type[BaseRule[Self]]]
+    ) -> Generator[tuple[int, int, str, type[Self]]]:
+        """Perform linting over the stored code context, with only the given rules."""
+        if not rule_classes:
+            return
+
+        yield from self._run_rules(rule_classes)
+
+    def _run_rules(
+        self, enabled_rules: Collection[type[BaseRule[Self]]]
+    ) -> Sequence[tuple[int, int, str, type[Self]]]:
+        required_analyses: AbstractSet[type[BaseAnalysis[object]]] = {
+            analysis_class
+            for RuleClass in enabled_rules
+            for analysis_class in RuleClass.REQUIRED_ANALYSES
+        }
+        if required_analyses:
+            self.analysis_cache.prepare(required_analyses)
+
+        rules: Sequence[BaseRule[Self]] = [
+            _RULE_POOL.acquire(RuleClass, plugin=self) for RuleClass in enabled_rules
+        ]
+        try:
+            traversal_engine: TraversalEngine = TraversalEngine()
+
+            rule: BaseRule[Self]
+            for rule in rules:
+                required_inputs: AbstractSet[RuleInput] = rule.REQUIRED_INPUTS
+                rule.run_check(
+                    tree=self.tree if RuleInput.TREE in required_inputs else _EMPTY_TREE,
+                    file_tokens=(
+                        self.file_tokens if RuleInput.FILE_TOKENS in required_inputs else ()
+                    ),
+                    lines=self.lines if RuleInput.LINES in required_inputs else (),
+                )
+                rule.register_traversal_hooks(traversal_engine)
 
-            line_number: int
-            column_number: int
-            ctx: Mapping[str, object]
-            for (line_number, column_number), ctx in rule.problems.items():
-                yield line_number, column_number, rule.format_error_message(ctx), type(self)
+            # NOTE: Built even if undeclared, as any rule that registered hooks traverses it
+            traversed_tree: ast.Module | None = (
+                self.tree if traversal_engine.has_hooks else None
+            )
+
+            # NOTE: All required inputs are now built, & tokens are only read by `run_check()`
+            self._source = None
+            self._file_tokens = None
+            hook_owners: AbstractSet[object] = traversal_engine.hook_owners
+            if all(
+                RuleInput.LINES not in rule.REQUIRED_INPUTS
+                for rule in rules
+                if rule in hook_owners
+            ):
+                self._lines = None
+
+            if traversed_tree is not None:
+                traversal_engine.traverse(traversed_tree)
+
+            return [
+                (line_number, column_number, rule.format_error_message(ctx), type(self))
+                for rule in rules
+                for (line_number, column_number), ctx in rule.problems.items()
+            ]
+
+        finally:
+            self._source = None
+            self._tree = None
+            self._file_tokens = None
+            self._lines = None
+            _RULE_POOL.release(rules)
 
 
 class ProblemsContainer(dict["_ProblemsContainerKey", "_ProblemsContainerValue"]):
@@ -142,10 +426,7 @@ class ProblemsContainer(dict["_ProblemsContainerKey", "_ProblemsContainerValue"]
     def clean_key(cls, key: _ProblemsContainerKey | str) -> _ProblemsContainerKey:
         """Ensure the given problem location matches the required format."""
         if isinstance(key, str):
-            match: re.Match[str] | None = re.fullmatch(
-                r"\A(?P<line_number>\d+),(?P<column_number>\d+)\Z",
-                key,
-            )
+            match: re.Match[str] | None = _PROBLEM_LOCATION_PATTERN.fullmatch(key)
             if match is None:
                 INVALID_PROBLEM_LOCATION_MESSAGE: Final[str] = (
                     f"Invalid problem location: `{key}`."
@@ -201,6 +482,18 @@ class ProblemsContainer(dict["_ProblemsContainerKey", "_ProblemsContainerValue"]
 class BaseRule[T_plugin: BasePlugin](abc.ABC):
     """Base rule class defining common plugin-based functionality."""
 
+    REQUIRED_INPUTS: ClassVar[AbstractSet[RuleInput]] = frozenset({RuleInput.TREE})
+    """
+    The inputs of the linted file that this rule reads, within `run_check()` or its hooks.
+
+    Any input not declared is not built for this rule, & is given to `run_check()` empty.
+    This is a plain class variable, rather than a class-property,
+    so that it can still be overridden by mypyc-compiled rules.
+    """
+
+    SCOPE: ClassVar[RuleScope] = RuleScope.MODULE
+    """The part of a module whose changes can alter this rule's problems on changed lines."""
+
     @override
     def __init__(self, plugin: T_plugin) -> None:
         self.plugin: T_plugin = plugin
@@ -208,11 +501,28 @@ class BaseRule[T_plugin: BasePlugin](abc.ABC):
 
         super().__init__()
 
-    @abc.abstractmethod
-    def run_check(
+    def reset(self, plugin: T_plugin) -> None:
+        """Clear all per-file state, so this rule can be reused to lint another file."""
+        self.plugin = plugin
+        self.problems.clear()
+
+    @classproperty
+    def CODE(cls: type[BaseRule[T_plugin]]) -> str:  # noqa: N802
+        """The unique code of this rule, as reported to & selected by Flake8."""
+        return cls.__name__.lower().removeprefix("rule").upper()
+
+    @classproperty
+    def REQUIRED_ANALYSES(cls) -> AbstractSet[type[BaseAnalysis[object]]]:  # noqa: N802
+        """The shared analyses of the module's AST that this rule's checks depend upon."""
+        return frozenset()
+
+    def run_check(  # noqa: B027
         self, tree: ast.Module, file_tokens: Sequence[TokenInfo], lines: Sequence[str]
     ) -> None:
-        """Update the problems-dict from those arising from the given code."""
+        """Update the problems-dict from those arising from the given code (pre-traversal)."""
+
+    def register_traversal_hooks(self, engine: TraversalEngine) -> None:  # noqa: B027
+        """Add the pre & post node hooks this rule needs to the plugin's traversal engine."""
 
     @classmethod
     @abc.abstractmethod
@@ -223,11 +533,61 @@ class BaseRule[T_plugin: BasePlugin](abc.ABC):
     @final
     def format_error_message(cls, ctx: Mapping[str, object]) -> str:
         """Retrieve the formatted error message for this rule with the given context."""
-        return (
-            f"{cls.__name__.lower().removeprefix('rule').upper()} "
-            f"{cls._format_error_message(ctx)}"
+        return f"{cls.CODE} {cls._format_error_message(ctx)}"
+
+
+@final
+class RulePool:
+    """
+    Idle rule instances, reused across files rather than being recreated for every file.
+
+    Each instance is reset before being handed out again,
+    so that no per-file state is carried between files.
+    The pool can be shared by many threads, as each idle instance is only handed out once.
+    """
+
+    @override
+    def __init__(self) -> None:
+        self._idle_rules: dict[type[BaseRule[BasePlugin]], list[BaseRule[BasePlugin]]] = {}
+
+    def acquire[T_plugin: BasePlugin](
+        self,
+        RuleClass: type[BaseRule[T_plugin]],  # noqa: N803
+        plugin: T_plugin,
+    ) -> BaseRule[T_plugin]:
+        """Retrieve an instance of the given rule, ready to lint the given plugin's file."""
+        idle_rules: list[BaseRule[T_plugin]] | None = cast(
+            "dict[type[BaseRule[T_plugin]], list[BaseRule[T_plugin]]]", self._idle_rules
+        ).get(RuleClass, None)
+        if idle_rules is None:
+            return RuleClass(plugin=plugin)
+
+        # NOTE: Popped without checking first, as another thread may take the last idle rule
+        try:
+            rule: BaseRule[T_plugin] = idle_rules.pop()
+        except IndexError:
+            return RuleClass(plugin=plugin)
+
+        rule.reset(plugin)
+        return rule
+
+    def release[T_plugin: BasePlugin](self, rules: Iterable[BaseRule[T_plugin]]) -> None:
+        """Return the given rule instances to the pool, once their file has been linted."""
+        idle_rules: dict[type[BaseRule[T_plugin]], list[BaseRule[T_plugin]]] = cast(
+            "dict[type[BaseRule[T_plugin]], list[BaseRule[T_plugin]]]", self._idle_rules
         )
 
+        rule: BaseRule[T_plugin]
+        for rule in rules:
+            idle_rules.setdefault(type(rule), []).append(rule)
+
+    def clear(self) -> None:
+        """Discard all the idle rule instances."""
+        self._idle_rules.clear()
+
+
+_RULE_POOL: Final[RulePool] = RulePool()
+
 
 class CarrotRule(BaseRule["CarrotPlugin"], abc.ABC):
     """Base rule class for all "CAR" lint rules."""
@@ -245,59 +605,89 @@ class TeXBotRule(BaseRule["TeXBotPlugin"], abc.ABC):
         super().__init__(plugin)
 
 
-def _function_call_is_pycord_function_from_commands_module(
-    node: ast.Call, decorator_names: Collection[str]
-) -> bool:
-    function_name: str
-    match node.func:
-        case (
-            ast.Name(id=function_name)
-            | ast.Attribute(
-                value=(
-                    ast.Name(id="discord")
-                    | ast.Attribute(
-                        value=ast.Name(id="discord"),
-                        attr="commands",
-                    )
-                    | ast.Attribute(
-                        value=ast.Attribute(
-                            value=ast.Name(id="discord"),
-                            attr="commands",
-                        ),
-                        attr=("core" | "options"),
-                    )
-                ),
-                attr=function_name,
-            )
-        ):
-            return function_name in decorator_names
+def get_source_segment(lines: Sequence[str], node: ast.expr | ast.stmt) -> str | None:
+    """
+    Retrieve the source code of the given AST node from the lines of its module.
+
+    This matches `ast.get_source_segment()`,
+    without first joining the lines into a copy of the whole source.
+    """
+    if node.end_lineno is None or node.end_col_offset is None:
+        return None
+
+    if node.end_lineno > len(lines):
+        return None
 
-        case _:
-            return False
+    first_line: bytes = lines[node.lineno - 1].encode()
+    if node.lineno == node.end_lineno:
+        return first_line[node.col_offset : node.end_col_offset].decode()
+
+    return "".join(
+        (
+            first_line[node.col_offset :].decode(),
+            *lines[node.lineno : node.end_lineno - 1],
+            lines[node.end_lineno - 1].encode()[: node.end_col_offset].decode(),
+        ),
+    )
+
+
+def describe_invalid_source(error: Exception) -> tuple[int, int, str, str]:
+    """
+    Describe a source that could not be parsed or tokenized, in the same way as Flake8.
+
+    The problem is the 1-based line, the 0-based column, the error code & the message,
+    E.g. E999 for a syntax error or E902 for a tokenize error.
+    """
+    line: int = 1
+    column: int = 0
+    if len(error.args) > 1 and error.args[1] and len(error.args[1]) > 2:
+        line, column = error.args[1][1:3]
+    elif isinstance(error, tokenize.TokenError):
+        line, column = error.args[1]
+
+    return (
+        line,
+        column,
+        _TOKENIZE_ERROR_CODE if isinstance(error, tokenize.TokenError) else _SYNTAX_ERROR_CODE,
+        f"{type(error).__name__}: {error.args[0]}",
+    )
+
+
+def memoise_comment_parser[T](parse: Callable[[str], T]) -> Callable[[str], T]:
+    """
+    Cache the results of the given pure function, that parses the text of a single comment.
+
+    The same few ignore comments recur across most files,
+    so each is only parsed once per process.
+    The cached results are shared, so must not be mutated by the callers.
+    """
+    memoised_parse: functools._lru_cache_wrapper[T] = functools.lru_cache(
+        maxsize=_COMMENT_PARSE_MEMO_SIZE
+    )(parse)
+    _COMMENT_PARSE_MEMO_CLEARERS.append(memoised_parse.cache_clear)
+    return memoised_parse
+
+
+def clear_comment_parse_memos() -> None:
+    """Discard the cached results of every memoised comment parser."""
+    clear_memo: Callable[[], None]
+    for clear_memo in _COMMENT_PARSE_MEMO_CLEARERS:
+        clear_memo()
 
 
 def function_call_is_pycord_slash_command_decorator(node: ast.Call) -> bool:
     """Check if the given call AST node is calling the pycord slash-command decorator."""
-    return _function_call_is_pycord_function_from_commands_module(
-        node,
-        PYCORD_SLASH_COMMAND_DECORATOR_NAMES,
-    )
+    return _PYCORD_SLASH_COMMAND_DECORATOR_PATTERN.matches(node.func)
 
 
 def function_call_is_pycord_context_command_decorator(node: ast.Call) -> bool:
     """Check if the given call AST node is calling the pycord context-command decorator."""
-    return _function_call_is_pycord_function_from_commands_module(
-        node,
-        PYCORD_CONTEXT_COMMAND_DECORATOR_NAMES,
-    )
+    return _PYCORD_CONTEXT_COMMAND_DECORATOR_PATTERN.matches(node.func)
 
 
 def function_call_is_pycord_option_decorator(node: ast.Call) -> bool:
     """Check if the given call AST node is calling the pycord command option decorator."""
-    return _function_call_is_pycord_function_from_commands_module(
-        node,
-        PYCORD_OPTION_DECORATOR_NAMES,
-    )
+    return _PYCORD_OPTION_DECORATOR_PATTERN.matches(node.func)
 
 
 def function_call_is_pycord_task_decorator(node: ast.Call) -> bool:
@@ -394,16 +784,3 @@ def function_call_is_any_pycord_decorator(node: ast.Call) -> bool:
             function_call_is_pycord_event_listener_decorator(node),
         ),
     )
-
-
-def generic_visit_before_return[T_Visitor: ast.NodeVisitor, T_Node: ast.AST](
-    func: Callable[[T_Visitor, T_Node], None],
-) -> Callable[[T_Visitor, T_Node], None]:
-    """Ensure a NodeVisitor overridden method calls generic_visit() before returning."""
-
-    @functools.wraps(func)
-    def wrapper(self: T_Visitor, node: T_Node) -> None:
-        func(self, node)
-        self.generic_visit(node)
-
-    return wrapper
@@ -0,0 +1,537 @@
+"""Watching of source files for changes, relinting only the modified files once saved."""
+
+import abc
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from typing import TYPE_CHECKING, NamedTuple, override
+
+from . import discovery, pipeline
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Mapping, Sequence
+    from collections.abc import Set as AbstractSet
+    from typing import Final
+
+    from .session import LintSession, Problem
+
+__all__: Sequence[str] = (
+    "DEFAULT_DEBOUNCE_SECONDS",
+    "DEFAULT_POLL_INTERVAL",
+    "BaseWatcher",
+    "InotifyWatcher",
+    "PollingWatcher",
+    "WatchReport",
+    "create_watcher",
+    "watch_source_files",
+)
+
+
+if __name__ == "__main__":
+    CANNOT_RUN_AS_SCRIPT_MESSAGE: Final[str] = "This module cannot be run as a script."
+    raise RuntimeError(CANNOT_RUN_AS_SCRIPT_MESSAGE)
+
+
+DEFAULT_DEBOUNCE_SECONDS: Final[float] = 0.1
+DEFAULT_POLL_INTERVAL: Final[float] = 1.0
+
+_IN_CLOSE_WRITE: Final[int] = 0x00000008
+_IN_MOVED_FROM: Final[int] = 0x00000040
+_IN_MOVED_TO: Final[int] = 0x00000080
+_IN_CREATE: Final[int] = 0x00000100
+_IN_DELETE: Final[int] = 0x00000200
+_IN_DELETE_SELF: Final[int] = 0x00000400
+_IN_Q_OVERFLOW: Final[int] = 0x00004000
+_IN_IGNORED: Final[int] = 0x00008000
+_IN_ONLYDIR: Final[int] = 0x01000000
+_IN_EXCL_UNLINK: Final[int] = 0x04000000
+_INOTIFY_WATCH_MASK: Final[int] = (
+    _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+    | _IN_ONLYDIR
+    | _IN_EXCL_UNLINK
+)
+_INOTIFY_EVENT_HEADER: Final[struct.Struct] = struct.Struct("iIII")
+_INOTIFY_READ_SIZE: Final[int] = 64 * 1024
+_VANISHED_DIRECTORY_ERRORS: Final[AbstractSet[int]] = frozenset({errno.ENOENT, errno.ENOTDIR})
+
+
+class WatchReport(NamedTuple):
+    """The problems that appeared & disappeared after relinting a burst of changed files."""
+
+    added_problems: Sequence[Problem]
+    resolved_problems: Sequence[Problem]
+    linted_files_count: int
+    seconds: float
+
+
+class BaseWatcher(abc.ABC):
+    """Watcher of directories & source files, reporting the paths that changed within them."""
+
+    @abc.abstractmethod
+    def watch(self, directories: Iterable[str], files: Iterable[str]) -> None:
+        """Start watching the given directories & files, alongside those already watched."""
+
+    @abc.abstractmethod
+    def read_changes(self, timeout: float | None) -> AbstractSet[str] | None:
+        """
+        Wait for changes, returning the normalised paths that were changed.
+
+        If no changes happen within the timeout, an empty set is returned.
+        If changes were lost, E.g. because too many happened at once, `None` is returned,
+        so every watched file should be checked again.
+        """
+
+    @abc.abstractmethod
+    def close(self) -> None:
+        """Stop watching every directory & file."""
+
+
+class InotifyWatcher(BaseWatcher):
+    """
+    Watcher that is notified of changes by Linux's inotify API, called through `ctypes`.
+
+    Each watched directory has its own inotify watch, which reports changes to any entry
+    directly within it.
+    Files are not watched individually, as their directories already report their changes.
+    """
+
+    @override
+    def __init__(self) -> None:
+        if not sys.platform.startswith("linux"):
+            UNSUPPORTED_PLATFORM_MESSAGE: Final[str] = "inotify is only available on Linux."
+            raise OSError(errno.ENOSYS, UNSUPPORTED_PLATFORM_MESSAGE)
+
+        self._libc: ctypes.CDLL = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._libc.inotify_init1.argtypes = (ctypes.c_int,)
+        self._libc.inotify_add_watch.argtypes = (
+            ctypes.c_int,
+            ctypes.c_char_p,
+            ctypes.c_uint32,
+        )
+
+        file_descriptor: int = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if file_descriptor < 0:
+            error_number: int = ctypes.get_errno()
+            raise OSError(error_number, os.strerror(error_number))
+
+        self._file_descriptor: int = file_descriptor
+        self._directories: dict[int, str] = {}
+        self._poller: select.poll = select.poll()
+        self._poller.register(file_descriptor, select.POLLIN)
+
+    @override
+    def watch(self, directories: Iterable[str], files: Iterable[str]) -> None:
+        directory: str
+        for directory in directories:
+            watch_descriptor: int = self._libc.inotify_add_watch(
+                self._file_descriptor, os.fsencode(directory), _INOTIFY_WATCH_MASK
+            )
+            if watch_descriptor < 0:
+                error_number: int = ctypes.get_errno()
+                if error_number in _VANISHED_DIRECTORY_ERRORS:
+                    continue
+
+                raise OSError(error_number, os.strerror(error_number), directory)
+
+            self._directories[watch_descriptor] = os.path.normpath(directory)
+
+        file: str
+        for file in files:
+            # NOTE: A file given directly is watched through the directory that contains it
+            self.watch((os.path.dirname(file) or os.curdir,), ())  # noqa: PTH120
+
+    def _read_events(self) -> bytes:
+        data: bytearray = bytearray()
+        while True:
+            try:
+                chunk: bytes = os.read(self._file_descriptor, _INOTIFY_READ_SIZE)
+            except BlockingIOError:
+                return bytes(data)
+
+            if not chunk:
+                return bytes(data)
+
+            data.extend(chunk)
+
+    @override
+    def read_changes(self, timeout: float | None) -> AbstractSet[str] | None:
+        if not self._poller.poll(None if timeout is None else timeout * 1000):
+            return frozenset()
+
+        data: bytes = self._read_events()
+        changed_paths: set[str] = set()
+
+        offset: int = 0
+        while offset < len(data):
+            watch_descriptor: int
+            mask: int
+            name_length: int
+            watch_descriptor, mask, _, name_length = _INOTIFY_EVENT_HEADER.unpack_from(
+                data, offset
+            )
+            name: str = os.fsdecode(
+                data[
+                    offset + _INOTIFY_EVENT_HEADER.size : (
+                        offset + _INOTIFY_EVENT_HEADER.size + name_length
+                    )
+                ].rstrip(b"\0"),
+            )
+            offset += _INOTIFY_EVENT_HEADER.size + name_length
+
+            if mask & _IN_Q_OVERFLOW:
+                return None
+
+            directory: str | None = self._directories.get(watch_descriptor, None)
+            if directory is None:
+                continue
+
+            if mask & _IN_IGNORED:
+                del self._directories[watch_descriptor]
+                changed_paths.add(directory)
+            elif mask & _IN_DELETE_SELF:
+                changed_paths.add(directory)
+            else:
+                changed_paths.add(os.path.normpath(os.path.join(directory, name)))  # noqa: PTH118
+
+        return changed_paths
+
+    @override
+    def close(self) -> None:
+        if self._file_descriptor < 0:
+            return
+
+        self._poller.unregister(self._file_descriptor)
+        os.close(self._file_descriptor)
+        self._file_descriptor = -1
+        self._directories.clear()
+
+
+class _PolledDirectory(NamedTuple):
+    modified_time: int
+    names: AbstractSet[str]
+
+
+class PollingWatcher(BaseWatcher):
+    """
+    Watcher that finds changes by comparing the modification times of every watched path.
+
+    Changes are found within at most one poll interval, even on filesystems that do not
+    support inotify, E.g. network filesystems.
+    """
+
+    @override
+    def __init__(self, poll_interval: float = DEFAULT_POLL_INTERVAL) -> None:
+        if poll_interval <= 0:
+            INVALID_POLL_INTERVAL_MESSAGE: Final[str] = "The poll interval must be positive."
+            raise ValueError(INVALID_POLL_INTERVAL_MESSAGE)
+
+        self._poll_interval: float = poll_interval
+        self._next_poll_time: float = time.monotonic() + poll_interval
+        self._directories: dict[str, _PolledDirectory] = {}
+        self._files: dict[str, tuple[int, int]] = {}
+
+    @staticmethod
+    def _stat_directory(directory: str) -> _PolledDirectory | None:
+        try:
+            modified_time: int = os.stat(directory).st_mtime_ns  # noqa: PTH116
+            return _PolledDirectory(
+                modified_time, frozenset(entry.name for entry in os.scandir(directory))
+            )
+        except OSError:
+            return None
+
+    @staticmethod
+    def _stat_file(file: str) -> tuple[int, int] | None:
+        try:
+            stat_result: os.stat_result = os.stat(file)  # noqa: PTH116
+        except OSError:
+            return None
+
+        return stat_result.st_mtime_ns, stat_result.st_size
+
+    @override
+    def watch(self, directories: Iterable[str], files: Iterable[str]) -> None:
+        directory: str
+        for directory in map(os.path.normpath, directories):
+            polled_directory: _PolledDirectory | None = self._stat_directory(directory)
+            if polled_directory is not None:
+                self._directories[directory] = polled_directory
+
+        file: str
+        for file in map(os.path.normpath, files):
+            file_stat: tuple[int, int] | None = self._stat_file(file)
+            if file_stat is not None:
+                self._files[file] = file_stat
+
+    def _poll(self) -> AbstractSet[str]:
+        changed_paths: set[str] = set()
+
+        directory: str
+        old_directory: _PolledDirectory
+        for directory, old_directory in list(self._directories.items()):
+            new_directory: _PolledDirectory | None = self._stat_directory(directory)
+            if new_directory is None:
+                del self._directories[directory]
+                changed_paths.add(directory)
+                continue
+
+            if new_directory.modified_time == old_directory.modified_time:
+                continue
+
+            self._directories[directory] = new_directory
+            changed_paths.update(
+                os.path.normpath(os.path.join(directory, name))  # noqa: PTH118
+                for name in new_directory.names ^ old_directory.names
+            )
+
+        file: str
+        old_file_stat: tuple[int, int]
+        for file, old_file_stat in list(self._files.items()):
+            new_file_stat: tuple[int, int] | None = self._stat_file(file)
+            if new_file_stat is None:
+                del self._files[file]
+                changed_paths.add(file)
+            elif new_file_stat != old_file_stat:
+                self._files[file] = new_file_stat
+                changed_paths.add(file)
+
+        return changed_paths
+
+    @override
+    def read_changes(self, timeout: float | None) -> AbstractSet[str] | None:
+        deadline: float | None = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            wait_time: float = self._next_poll_time - time.monotonic()
+            if deadline is not None and deadline < self._next_poll_time:
+                time.sleep(max(deadline - time.monotonic(), 0))
+                return frozenset()
+
+            time.sleep(max(wait_time, 0))
+            self._next_poll_time = time.monotonic() + self._poll_interval
+
+            changed_paths: AbstractSet[str] = self._poll()
+            if changed_paths:
+                return changed_paths
+
+    @override
+    def close(self) -> None:
+        self._directories.clear()
+        self._files.clear()
+
+
+def create_watcher(
+    *, force_polling: bool = False, poll_interval: float = DEFAULT_POLL_INTERVAL
+) -> BaseWatcher:
+    """Create an inotify watcher if it is available, otherwise falling back to polling."""
+    if not force_polling:
+        try:
+            return InotifyWatcher()
+        except OSError:
+            pass
+
+    return PollingWatcher(poll_interval)
+
+
+def _read_debounced_changes(
+    watcher: BaseWatcher, debounce_seconds: float
+) -> AbstractSet[str] | None:
+    changed_paths: AbstractSet[str] | None = frozenset()
+    while not changed_paths:
+        changed_paths = watcher.read_changes(None)
+        if changed_paths is None:
+            break
+
+    all_changed_paths: set[str] | None = None if changed_paths is None else set(changed_paths)
+    while True:
+        more_changed_paths: AbstractSet[str] | None = watcher.read_changes(debounce_seconds)
+        if more_changed_paths is None:
+            all_changed_paths = None
+        elif not more_changed_paths:
+            return all_changed_paths
+        elif all_changed_paths is not None:
+            all_changed_paths.update(more_changed_paths)
+
+
+class _SourceFileTracker:
+    """The last problems of each source file found within the watched paths."""
+
+    @override
+    def __init__(
+        self,
+        lint_session: LintSession,
+        paths: Sequence[str],
+        exclude_patterns: Sequence[str],
+        watcher: BaseWatcher,
+        *,
+        respect_gitignore: bool,
+    ) -> None:
+        self._lint_session: LintSession = lint_session
+        self._paths: Sequence[str] = paths
+        self._exclude_patterns: Sequence[str] = exclude_patterns
+        self._watcher: BaseWatcher = watcher
+        self._respect_gitignore: bool = respect_gitignore
+        self._source_paths: dict[str, str] = {}
+        self._watched_directories: set[str] = set()
+        self._known_problems: dict[str, Sequence[Problem]] = {}
+
+    @property
+    def source_paths(self) -> Mapping[str, str]:
+        """The path of each source file found, by its normalised path."""
+        return self._source_paths
+
+    def discover(self) -> AbstractSet[str]:
+        """Walk the paths again, returning the normalised paths of any newly found files."""
+        walked_directories: set[str] = set()
+        discovered_paths: dict[str, str] = {
+            os.path.normpath(path): path
+            for path in discovery.find_source_paths(
+                self._paths,
+                self._exclude_patterns,
+                respect_gitignore=self._respect_gitignore,
+                walked_directories=walked_directories,
+            )
+        }
+        added_paths: AbstractSet[str] = discovered_paths.keys() - self._source_paths.keys()
+
+        # NOTE: Every directory is watched again, in case it was replaced since last walked
+        self._watcher.watch(
+            walked_directories, (discovered_paths[path] for path in added_paths)
+        )
+        self._watched_directories = set(map(os.path.normpath, walked_directories))
+        self._source_paths = discovered_paths
+
+        return added_paths
+
+    def lint_all(self) -> Sequence[Problem]:
+        """Lint every source file found, returning all their problems."""
+        source_file: pipeline.SourceFile
+        for source_file in pipeline.prefetch_source_files(self._source_paths.values()):
+            self._known_problems[os.path.normpath(source_file.path)] = (
+                self._lint_session.lint_source_file(source_file)
+            )
+
+        return [
+            problem
+            for path in sorted(self._known_problems, key=self._source_paths.__getitem__)
+            for problem in self._known_problems[path]
+        ]
+
+    def _needs_discovery(self, changed_path: str) -> bool:
+        return changed_path not in self._source_paths and bool(
+            changed_path in self._watched_directories
+            or os.path.isdir(changed_path)  # noqa: PTH112
+            or any(discovery.filter_source_paths((changed_path,), self._exclude_patterns)),
+        )
+
+    def relint(self, changed_paths: AbstractSet[str] | None) -> WatchReport:
+        """
+        Relint the changed files, reporting which problems appeared & disappeared.
+
+        If the changes were lost, every file is relinted,
+        though the unchanged files are still read from the session's result cache.
+        """
+        start: float = time.perf_counter()
+
+        relinted_paths: set[str]
+        if changed_paths is None:
+            self.discover()
+            relinted_paths = set(self._source_paths)
+        else:
+            relinted_paths = set(changed_paths & self._source_paths.keys())
+            if any(map(self._needs_discovery, changed_paths)):
+                relinted_paths.update(self.discover())
+
+        added_problems: list[Problem] = []
+        resolved_problems: list[Problem] = []
+
+        path: str
+        for path in sorted(
+            relinted_paths | (self._known_problems.keys() - self._source_paths.keys())
+        ):
+            new_problems: Sequence[Problem] = ()
+            if path in self._source_paths:
+                if os.path.exists(self._source_paths[path]):  # noqa: PTH110
+                    new_problems = self._lint_session.lint_file(self._source_paths[path])
+                else:
+                    # NOTE: Forgotten, so the file is found again if it is recreated
+                    del self._source_paths[path]
+
+            old_problems: Sequence[Problem] = self._known_problems.pop(path, ())
+            if new_problems:
+                self._known_problems[path] = new_problems
+
+            new_problems_set: AbstractSet[Problem] = frozenset(new_problems)
+            old_problems_set: AbstractSet[Problem] = frozenset(old_problems)
+            added_problems.extend(
+                problem for problem in new_problems if problem not in old_problems_set
+            )
+            resolved_problems.extend(
+                problem for problem in old_problems if problem not in new_problems_set
+            )
+
+        return WatchReport(
+            added_problems=added_problems,
+            resolved_problems=resolved_problems,
+            linted_files_count=len(relinted_paths),
+            seconds=time.perf_counter() - start,
+        )
+
+
+def watch_source_files(
+    lint_session: LintSession,
+    paths: Sequence[str],
+    exclude_patterns: Sequence[str] = (),
+    *,
+    respect_gitignore: bool = True,
+    watcher: BaseWatcher | None = None,
+    debounce_seconds: float = DEFAULT_DEBOUNCE_SECONDS,
+) -> Iterator[WatchReport]:
+    """
+    Lint the source files within the given paths, then relint each file whenever it changes.
+
+    The first report holds every problem found, & each following report holds only the
+    problems that appeared or disappeared since the previous one.
+    Changes are collected until none arrive within the debounce time,
+    so a burst of saves is relinted only once.
+    Only the changed files are relinted, using the session's warm caches,
+    & the paths are only walked again when files or directories are added or removed.
+    If no watcher is given, one is created with `create_watcher()` & closed afterwards.
+    """
+    active_watcher: BaseWatcher = create_watcher() if watcher is None else watcher
+
+    try:
+        tracker: _SourceFileTracker = _SourceFileTracker(
+            lint_session,
+            paths,
+            exclude_patterns,
+            active_watcher,
+            respect_gitignore=respect_gitignore,
+        )
+
+        start: float = time.perf_counter()
+        tracker.discover()
+        all_problems: Sequence[Problem] = tracker.lint_all()
+        yield WatchReport(
+            added_problems=all_problems,
+            resolved_problems=(),
+            linted_files_count=len(tracker.source_paths),
+            seconds=time.perf_counter() - start,
+        )
+
+        while True:
+            yield tracker.relint(_read_debounced_changes(active_watcher, debounce_seconds))
+
+    finally:
+        if watcher is None:
+            active_watcher.close()
@@ -0,0 +1,153 @@
+"""Test suite to check the functionality of the shared lazily computed AST analyses."""
+
+import argparse
+import ast
+import gc
+import tokenize
+import weakref
+from io import StringIO
+from typing import TYPE_CHECKING
+
+import pytest
+
+from flake8_carrot import CarrotPlugin, TeXBotPlugin
+from flake8_carrot.analyses import (
+    AnalysisCache,
+    FirstAllExportLineNumbersAnalysis,
+    PprintImportedForDebuggingAnalysis,
+    SlashCommandGroupNamesAnalysis,
+    get_shared_analysis_cache,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+__all__: Sequence[str] = ("TestAnalysisCache", "TestEnabledRules", "TestSharedAnalysisCache")
+
+
+SOURCE: str = (
+    '"""Module docstring."""\n'
+    "\n"
+    "from collections.abc import Sequence\n"
+    "\n"
+    "from astpretty import pprint\n"
+    "import discord\n"
+    "\n"
+    '__all__: Sequence[str] = ("foo",)\n'
+    "\n"
+    "\n"
+    'foo = discord.SlashCommandGroup("foo")\n'
+    'bar: discord.SlashCommandGroup = SlashCommandGroup("bar")\n'
+    "__all__ = ()  # comment\n"
+)
+
+
+def _make_carrot_plugin(source: str) -> CarrotPlugin:
+    return CarrotPlugin(
+        tree=ast.parse(source),
+        file_tokens=list(tokenize.generate_tokens(StringIO(source).readline)),
+        lines=source.splitlines(keepends=True),
+    )
+
+
+def _make_options(*, select: Sequence[str]) -> argparse.Namespace:
+    return argparse.Namespace(
+        select=list(select),
+        extend_select=None,
+        extended_default_select=["C90", "F", "E", "W"],
+        ignore=None,
+        extend_ignore=None,
+        extended_default_ignore=[],
+    )
+
+
+class TestAnalysisCache:
+    """Test suite for memoising the results of shared analyses."""
+
+    def test_analysis_results(self) -> None:
+        """Ensure each analysis finds the correct values from the module's AST."""
+        tree: ast.Module = ast.parse(SOURCE)
+        analysis_cache: AnalysisCache = AnalysisCache(tree)
+
+        assert analysis_cache.get(SlashCommandGroupNamesAnalysis) == {"foo", "bar"}
+        assert analysis_cache.get(FirstAllExportLineNumbersAnalysis) == (8, 8)
+        assert analysis_cache.get(PprintImportedForDebuggingAnalysis)
+
+    def test_analysis_only_computed_once(self) -> None:
+        """Ensure an analysis's result is reused rather than computed again."""
+        tree: ast.Module = ast.parse(SOURCE)
+        analysis_cache: AnalysisCache = AnalysisCache(tree)
+        analysis_cache.prepare(
+            (SlashCommandGroupNamesAnalysis, FirstAllExportLineNumbersAnalysis),
+        )
+
+        assert analysis_cache.is_computed(SlashCommandGroupNamesAnalysis)
+        assert analysis_cache.is_computed(FirstAllExportLineNumbersAnalysis)
+        assert not analysis_cache.is_computed(PprintImportedForDebuggingAnalysis)
+        assert analysis_cache.get(SlashCommandGroupNamesAnalysis) is analysis_cache.get(
+            SlashCommandGroupNamesAnalysis
+        )
+
+
+class TestSharedAnalysisCache:
+    """Test suite for sharing analyses between all the plugins that lint the same AST."""
+
+    def test_plugins_share_analysis_cache(self) -> None:
+        """Ensure every plugin given the same module's AST uses the same analysis cache."""
+        tree: ast.Module = ast.parse(SOURCE)
+        lines: Sequence[str] = SOURCE.splitlines(keepends=True)
+        carrot_plugin: CarrotPlugin = CarrotPlugin(tree=tree, file_tokens=(), lines=lines)
+        tex_bot_plugin: TeXBotPlugin = TeXBotPlugin(tree=tree, file_tokens=(), lines=lines)
+
+        assert carrot_plugin.analysis_cache is tex_bot_plugin.analysis_cache
+
+        carrot_plugin.analysis_cache.prepare((SlashCommandGroupNamesAnalysis,))
+
+        assert tex_bot_plugin.analysis_cache.is_computed(SlashCommandGroupNamesAnalysis)
+        assert tex_bot_plugin.found_slash_command_group_names == {"foo", "bar"}
+
+    def test_analysis_cache_released_with_tree(self) -> None:
+        """Ensure a shared analysis cache does not outlive the AST it was computed from."""
+        tree: ast.Module = ast.parse(SOURCE)
+        analysis_cache_reference: weakref.ReferenceType[AnalysisCache] = weakref.ref(
+            get_shared_analysis_cache(tree),
+        )
+        del tree
+        gc.collect()
+
+        assert analysis_cache_reference() is None
+
+
+class TestEnabledRules:
+    """Test suite for running only the rules, & their analyses, selected by Flake8."""
+
+    @pytest.fixture(autouse=True)
+    def _reset_enabled_rules(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(CarrotPlugin, "_enabled_rules", None)
+
+    def test_token_rules_skip_analyses(self) -> None:
+        """Ensure no analyses are computed when only token-based rules are selected."""
+        CarrotPlugin.parse_options(_make_options(select=("CAR12",)))
+        tree: ast.Module = ast.parse(SOURCE)
+        carrot_plugin: CarrotPlugin = CarrotPlugin(
+            tree=tree,
+            file_tokens=list(tokenize.generate_tokens(StringIO(SOURCE).readline)),
+            lines=SOURCE.splitlines(keepends=True),
+        )
+
+        assert all(message.startswith("CAR12") for _, _, message, _ in carrot_plugin.run())
+
+        analysis_cache: AnalysisCache = get_shared_analysis_cache(tree)
+        assert not analysis_cache.is_computed(SlashCommandGroupNamesAnalysis)
+        assert not analysis_cache.is_computed(FirstAllExportLineNumbersAnalysis)
+        assert not analysis_cache.is_computed(PprintImportedForDebuggingAnalysis)
+
+    def test_required_analyses_computed(self) -> None:
+        """Ensure only the analyses required by the selected rules are computed."""
+        CarrotPlugin.parse_options(_make_options(select=("CAR1",)))
+        carrot_plugin: CarrotPlugin = _make_carrot_plugin(SOURCE)
+        list(carrot_plugin.run())
+
+        assert carrot_plugin.analysis_cache.is_computed(FirstAllExportLineNumbersAnalysis)
+        assert not carrot_plugin.analysis_cache.is_computed(SlashCommandGroupNamesAnalysis)
+        assert not carrot_plugin.analysis_cache.is_computed(PprintImportedForDebuggingAnalysis)
@@ -0,0 +1,101 @@
+"""Test suite to check linting many files across a pool of worker processes."""
+
+import multiprocessing
+import sys
+from typing import TYPE_CHECKING
+
+import pytest
+
+from flake8_carrot import LintSession
+from flake8_carrot.batch import BatchBackend, _make_chunks, lint_paths
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from pathlib import Path
+
+    from flake8_carrot.batch import FileProblems
+
+__all__: Sequence[str] = ("TestLintPaths",)
+
+
+def _write_sources(tmp_path: Path, count: int) -> Sequence[str]:
+    paths: list[str] = []
+
+    index: int
+    for index in range(count):
+        path: Path = tmp_path / f"module_{index}.py"
+        path.write_text(f'import re\n\nre.search("\\\\d", value_{index})\n' * (index % 3 + 1))
+        paths.append(str(path))
+
+    return paths
+
+
+class TestLintPaths:
+    """Test suite for streaming each file's problems back in the order of its paths."""
+
+    def test_problems_match_session(self, tmp_path: Path) -> None:
+        """Ensure the pooled problems are yielded in order & match linting in-process."""
+        paths: Sequence[str] = _write_sources(tmp_path, 12)
+        lint_session: LintSession = LintSession()
+
+        assert list(lint_paths(paths, max_workers=2, chunk_size=3)) == [
+            (path, lint_session.lint_file(path)) for path in paths
+        ]
+
+    @pytest.mark.skipif(
+        sys.version_info < (3, 14), reason="Subinterpreter pools are not supported."
+    )
+    def test_interpreter_backend(self, tmp_path: Path) -> None:
+        """Ensure linting across subinterpreters matches linting in-process."""
+        paths: Sequence[str] = _write_sources(tmp_path, 6)
+        lint_session: LintSession = LintSession()
+
+        assert list(
+            lint_paths(paths, max_workers=2, chunk_size=2, backend=BatchBackend.INTERPRETER)
+        ) == [(path, lint_session.lint_file(path)) for path in paths]
+
+    @pytest.mark.skipif(
+        sys.version_info >= (3, 14), reason="Subinterpreter pools are supported."
+    )
+    def test_interpreter_backend_unsupported(self, tmp_path: Path) -> None:
+        """Ensure subinterpreter pools are refused before Python 3.14."""
+        paths: Sequence[str] = _write_sources(tmp_path, 2)
+
+        with pytest.raises(RuntimeError, match=r"Python 3\.14"):
+            list(lint_paths(paths, max_workers=2, backend=BatchBackend.INTERPRETER))
+
+    @pytest.mark.parametrize("start_method", ("fork", "forkserver"))
+    def test_workers_recycled(self, tmp_path: Path, start_method: str) -> None:
+        """Ensure every file is still linted when the pool is replaced after each chunk."""
+        paths: Sequence[str] = _write_sources(tmp_path, 6)
+
+        file_problems: Sequence[FileProblems] = list(
+            lint_paths(
+                paths,
+                max_workers=2,
+                chunk_size=1,
+                max_worker_rss=1,
+                mp_context=multiprocessing.get_context(start_method),
+            ),
+        )
+
+        assert [path for path, _ in file_problems] == paths
+        assert all(problems for _, problems in file_problems)
+
+    def test_large_files_chunked_alone(self, tmp_path: Path) -> None:
+        """Ensure each chunk is closed once its files reach the chunk byte limit."""
+        small_path: Path = tmp_path / "small.py"
+        small_path.write_text("value = 1\n")
+        large_path: Path = tmp_path / "large.py"
+        large_path.write_text("value = 1\n" * 100)
+
+        assert list(
+            _make_chunks(
+                (small_path, large_path, small_path, small_path),
+                chunk_size=10,
+                chunk_bytes=500,
+            ),
+        ) == [
+            [str(small_path), str(large_path)],
+            [str(small_path), str(small_path)],
+        ]
@@ -0,0 +1,107 @@
+"""Test suite to check the standalone command-line linter."""
+
+from typing import TYPE_CHECKING
+
+from flake8_carrot.cli import load_config, main
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from pathlib import Path
+
+    import pytest
+
+__all__: Sequence[str] = ("TestLoadConfig", "TestMain")
+
+
+CLEAN_SOURCE: str = '"""Docstring."""\n\nfrom typing import TYPE_CHECKING\n'
+PROBLEM_SOURCE: str = 'import re\n\nre.search("\\\\d", value)\n'
+MISSING_ALL_EXPORT_MESSAGE: str = "CAR101 Missing `__all__` export at the top of the module"
+
+
+def _write_project(tmp_path: Path, config: str) -> None:
+    (tmp_path / "pyproject.toml").write_text(f"[tool.flake8]\n{config}")
+    (tmp_path / "package").mkdir()
+    (tmp_path / "package" / "clean.py").write_text(CLEAN_SOURCE)
+    (tmp_path / "package" / "problem.py").write_text(PROBLEM_SOURCE)
+    (tmp_path / "examples").mkdir()
+    (tmp_path / "examples" / "example.py").write_text(PROBLEM_SOURCE)
+
+
+class TestLoadConfig:
+    """Test suite for reading the Flake8 options from the nearest `pyproject.toml` file."""
+
+    def test_options_read(self, tmp_path: Path) -> None:
+        """Ensure list & comma-separated options are read, with excludes made absolute."""
+        _write_project(
+            tmp_path,
+            'select = "CAR1, CAR6"\nextend-ignore = ["CAR101"]\nextend_exclude = ["a/"]\n',
+        )
+
+        assert load_config(tmp_path / "package") == {
+            "select": ["CAR1", "CAR6"],
+            "extend_ignore": ["CAR101"],
+            "extend_exclude": [str(tmp_path / "a")],
+        }
+
+    def test_missing_config(self, tmp_path: Path) -> None:
+        """Ensure no options are read when there is no Flake8 config table."""
+        (tmp_path / "pyproject.toml").write_text('[project]\nname = "package"\n')
+
+        assert load_config(tmp_path) == {}
+
+
+class TestMain:
+    """Test suite for printing Flake8-compatible output for each problem found."""
+
+    def test_output(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Ensure the problems are printed in Flake8's format, with the excludes honoured."""
+        _write_project(tmp_path, 'select = ["CAR6"]\nextend_exclude = ["examples/"]\n')
+        monkeypatch.chdir(tmp_path)
+
+        assert main([]) == 1
+        assert capsys.readouterr().out == (
+            "./package/problem.py:3:1: CAR610 Regex pattern string should use a raw string: "
+            '`r"..."`\n'
+        )
+
+    def test_noqa_honoured(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Ensure problems on lines with a matching `# noqa` comment are not printed."""
+        _write_project(tmp_path, 'select = ["CAR6"]\n')
+        (tmp_path / "package" / "problem.py").write_text(
+            f"{PROBLEM_SOURCE[:-1]}  # noqa: CAR6\n"
+        )
+        monkeypatch.chdir(tmp_path)
+
+        assert main(["package"]) == 0
+        assert not capsys.readouterr().out
+
+        assert main(["package", "--disable-noqa"]) == 1
+        assert "package/problem.py:3:1: CAR610" in capsys.readouterr().out
+
+    def test_preamble_only(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Ensure only the module-header problems are printed, with invalid files reported."""
+        _write_project(tmp_path, 'extend_exclude = ["examples/"]\n')
+        (tmp_path / "package" / "broken.py").write_text("import os\nvalue = (\n")
+        monkeypatch.chdir(tmp_path)
+
+        assert main(["--preamble-only"]) == 1
+        assert capsys.readouterr().out == (
+            "./package/broken.py:2:10: E999 SyntaxError: '(' was never closed\n"
+            f"./package/clean.py:2:1: {MISSING_ALL_EXPORT_MESSAGE}\n"
+            f"./package/problem.py:1:1: {MISSING_ALL_EXPORT_MESSAGE}\n"
+        )
@@ -0,0 +1,186 @@
+"""Test suite to check linting through the thin client of the lint daemon."""
+
+import asyncio
+import contextlib
+import io
+import json
+import socket
+import subprocess
+import sys
+import threading
+from typing import TYPE_CHECKING
+
+import pytest
+
+import flake8_carrot
+from flake8_carrot import pipeline
+from flake8_carrot.client import _read_stdin_source, main
+from flake8_carrot.daemon import LintDaemon
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+    from pathlib import Path
+
+    from _pytest.capture import CaptureResult
+
+__all__: Sequence[str] = ("TestLazyPackage", "TestMain", "TestReadStdinSource")
+
+
+PROBLEM_SOURCE: str = 'import re\n\nre.search("\\\\d", value)\n'
+PROBLEM_MESSAGE: str = 'CAR610 Regex pattern string should use a raw string: `r"..."`'
+
+
+@contextlib.contextmanager
+def _serve_daemon(lint_daemon: LintDaemon) -> Iterator[None]:
+    ready: threading.Event = threading.Event()
+    daemon_thread: threading.Thread = threading.Thread(
+        target=lambda: asyncio.run(lint_daemon.serve(ready.set)), daemon=True
+    )
+    daemon_thread.start()
+    assert ready.wait(10)
+
+    yield
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(str(lint_daemon.socket_path))
+        connection.sendall(b'{"command": "shutdown"}\n')
+        connection.recv(1024)
+
+    daemon_thread.join(10)
+
+
+@pytest.fixture()
+def socket_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    """Serve a daemon selecting only the regex rules, within the working directory."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "module.py").write_text(PROBLEM_SOURCE)
+
+    lint_daemon: LintDaemon = LintDaemon(tmp_path / "daemon.sock", select=("CAR6",))
+    with _serve_daemon(lint_daemon):
+        yield lint_daemon.socket_path
+
+
+class TestMain:
+    """Test suite for printing the problems found by the daemon, or by linting directly."""
+
+    def test_path(self, socket_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """Ensure a file's problems are printed with the path as it was given."""
+        assert main(["--socket", str(socket_path), "module.py"]) == 1
+        assert capsys.readouterr().out == f"module.py:3:1: {PROBLEM_MESSAGE}\n"
+
+    def test_stdin(
+        self,
+        socket_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Ensure an unsaved buffer is read from stdin & reported by its display name."""
+        monkeypatch.setattr(
+            sys, "stdin", io.TextIOWrapper(io.BytesIO(f"\n{PROBLEM_SOURCE}".encode()))
+        )
+
+        assert main([f"--socket={socket_path}", "--stdin-display-name", "buffer.py", "-"]) == 1
+        assert capsys.readouterr().out == f"buffer.py:4:1: {PROBLEM_MESSAGE}\n"
+
+    def test_no_daemon(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Ensure the files are linted directly if no daemon is running."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "module.py").write_text(PROBLEM_SOURCE)
+
+        assert main(["--socket", str(tmp_path / "missing.sock"), "module.py"]) == 1
+        assert f"module.py:3:1: {PROBLEM_MESSAGE}\n" in capsys.readouterr().out
+
+    def test_default_socket_from_subdirectory(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Ensure a daemon started at the project root is found from its subdirectories."""
+        (tmp_path / "pyproject.toml").write_text("")
+        (tmp_path / "package").mkdir()
+        (tmp_path / "package" / "module.py").write_text(PROBLEM_SOURCE)
+        monkeypatch.chdir(tmp_path)
+
+        with _serve_daemon(LintDaemon(select=("CAR6",))):
+            monkeypatch.chdir(tmp_path / "package")
+
+            # NOTE: Only the daemon selects just the regex rules, unlike the fallback linter
+            assert main(["module.py"]) == 1
+            assert capsys.readouterr().out == f"module.py:3:1: {PROBLEM_MESSAGE}\n"
+
+    def test_other_options(
+        self, socket_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Ensure options that the daemon cannot honour are left to the full linter."""
+        assert main(["--socket", str(socket_path), "--select", "CAR601", "module.py"]) == 0
+
+        captured: CaptureResult[str] = capsys.readouterr()
+        assert not captured.out
+        assert not captured.err
+
+    def test_minimal_imports(self) -> None:
+        """Ensure importing the client imports neither Flake8 nor any rules."""
+        imported_modules: Sequence[str] = json.loads(
+            subprocess.run(
+                (
+                    sys.executable,
+                    "-c",
+                    (
+                        "import json, sys; import flake8_carrot.client; "
+                        "print(json.dumps(list(sys.modules)))"
+                    ),
+                ),
+                capture_output=True,
+                check=True,
+                text=True,
+            ).stdout,
+        )
+
+        assert not [
+            module
+            for module in imported_modules
+            if module == "flake8"
+            or module.startswith("flake8.")
+            or module
+            in {"flake8_carrot.carrot", "flake8_carrot.session", "flake8_carrot.utils"}
+        ]
+
+
+class TestLazyPackage:
+    """Test suite for importing the package's public classes only once they are used."""
+
+    def test_attributes(self) -> None:
+        """Ensure each public class is importable from the package."""
+        assert all(getattr(flake8_carrot, name) for name in flake8_carrot.__all__)
+        assert set(flake8_carrot.__all__) <= set(dir(flake8_carrot))
+
+    def test_missing_attribute(self) -> None:
+        """Ensure an unknown attribute still raises the usual error."""
+        with pytest.raises(AttributeError, match="has no attribute 'Missing'"):
+            _ = flake8_carrot.Missing
+
+
+class TestReadStdinSource:
+    """Test suite for decoding an unsaved buffer in the same way as a saved file."""
+
+    @pytest.mark.parametrize(
+        "data",
+        (
+            b'# -*- coding: latin-1 -*-\nvalue = "\xc3\xa9"\n',
+            b'# vim: set fileencoding=cp1252 :\nvalue = "\x80"\n',
+            b'\xef\xbb\xbfvalue = "\xc3\xa9"\r\n',
+            b'value = "\xe9"\r',
+            b'# -*- coding: unknown -*-\nvalue = "\xc3\xa9"\n',
+        ),
+    )
+    def test_matches_file_decoding(self, data: bytes, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Ensure stdin is decoded with its declared encoding, as when linting the file."""
+        monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(data)))
+
+        assert _read_stdin_source() == pipeline.decode_source(data)
@@ -0,0 +1,109 @@
+"""Test suite to check the compiled rule modules match their pure-Python fallback source."""
+
+import ast
+import importlib.machinery
+import importlib.util
+import sys
+import tokenize
+from io import StringIO
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+import flake8_carrot
+from flake8_carrot import CarrotPlugin
+from flake8_carrot.traversal import TraversalEngine
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+    from types import ModuleType
+    from typing import Final
+
+    from flake8_carrot.utils import BaseRule
+
+__all__: Sequence[str] = ("TestCompiledRuleParity",)
+
+
+COMPILED_RULES: Final[Sequence[type[BaseRule[CarrotPlugin]]]] = [
+    RuleClass
+    for RuleClass in CarrotPlugin.RULES
+    if str(sys.modules[RuleClass.__module__].__file__).endswith(
+        tuple(importlib.machinery.EXTENSION_SUFFIXES)
+    )
+]
+SOURCE_PATHS: Final[Sequence[Path]] = sorted(
+    Path(flake8_carrot.__file__).parent.rglob("*.py"),
+)
+
+
+def _load_pure_python_rule(
+    RuleClass: type[BaseRule[CarrotPlugin]],  # noqa: N803
+) -> type[BaseRule[CarrotPlugin]]:
+    compiled_module: ModuleType = sys.modules[RuleClass.__module__]
+    source_path: Path = Path(str(compiled_module.__file__)).parent.joinpath(
+        f"{RuleClass.__module__.rpartition('.')[2]}.py",
+    )
+    if not source_path.is_file():
+        pytest.skip(f"Pure-Python source of `{RuleClass.__module__}` is not installed.")
+
+    spec: importlib.machinery.ModuleSpec | None = importlib.util.spec_from_file_location(
+        f"_pure_{RuleClass.__module__}", source_path
+    )
+    if spec is None or spec.loader is None:
+        pytest.skip(f"Pure-Python source of `{RuleClass.__module__}` cannot be loaded.")
+
+    pure_python_module: ModuleType = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(pure_python_module)
+
+    pure_python_rule: type[BaseRule[CarrotPlugin]] = getattr(
+        pure_python_module, RuleClass.__name__
+    )
+    return pure_python_rule
+
+
+def _get_rule_problems(
+    RuleClass: type[BaseRule[CarrotPlugin]],  # noqa: N803
+    source: str,
+) -> Mapping[tuple[int, int], Mapping[str, object]]:
+    tree: ast.Module = ast.parse(source)
+    file_tokens: Sequence[tokenize.TokenInfo] = list(
+        tokenize.generate_tokens(StringIO(source).readline),
+    )
+    lines: Sequence[str] = source.splitlines(keepends=True)
+
+    rule: BaseRule[CarrotPlugin] = RuleClass(
+        plugin=CarrotPlugin(tree=tree, file_tokens=file_tokens, lines=lines),
+    )
+    rule.run_check(tree=tree, file_tokens=file_tokens, lines=lines)
+
+    traversal_engine: TraversalEngine = TraversalEngine()
+    rule.register_traversal_hooks(traversal_engine)
+    traversal_engine.traverse(tree)
+
+    return dict(rule.problems)
+
+
+@pytest.mark.skipif(not COMPILED_RULES, reason="No compiled rule modules are installed.")
+class TestCompiledRuleParity:
+    """Test suite for comparing each compiled rule against its pure-Python fallback."""
+
+    @pytest.mark.parametrize(
+        "RuleClass",
+        COMPILED_RULES,
+        ids=[RuleClass.CODE for RuleClass in COMPILED_RULES],
+    )
+    def test_compiled_rule_parity(
+        self,
+        RuleClass: type[BaseRule[CarrotPlugin]],  # noqa: N803
+    ) -> None:
+        """Ensure a compiled rule reports the same problems as its pure-Python source."""
+        pure_python_rule: type[BaseRule[CarrotPlugin]] = _load_pure_python_rule(RuleClass)
+
+        source_path: Path
+        for source_path in SOURCE_PATHS:
+            source: str = source_path.read_text(encoding="utf-8")
+
+            assert _get_rule_problems(RuleClass, source) == _get_rule_problems(
+                pure_python_rule, source
+            ), source_path
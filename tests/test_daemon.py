@@ -0,0 +1,208 @@
+"""Test suite to check answering lint requests from the long-lived daemon."""
+
+import asyncio
+import json
+import socket
+import threading
+import time
+from typing import TYPE_CHECKING, override
+
+import pytest
+
+from flake8_carrot.cli import main
+from flake8_carrot.daemon import LintDaemon
+from flake8_carrot.session import LintSession
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator, Mapping, Sequence
+    from pathlib import Path
+    from typing import IO
+
+    from flake8_carrot.session import Problem
+
+__all__: Sequence[str] = ("TestLintDaemon", "TestMain")
+
+
+PROBLEM_SOURCE: str = 'import re\n\nre.search("\\\\d", value)\n'
+IDLE_TIMEOUT: float = 0.2
+
+
+class _RunningDaemon:
+    """A daemon serving on a background thread, with one connection to it."""
+
+    @override
+    def __init__(self, lint_daemon: LintDaemon) -> None:
+        self.lint_daemon: LintDaemon = lint_daemon
+        self._ready: threading.Event = threading.Event()
+        self.thread: threading.Thread = threading.Thread(
+            target=lambda: asyncio.run(lint_daemon.serve(self._ready.set)), daemon=True
+        )
+        self.thread.start()
+        assert self._ready.wait(10)
+
+        self.connection: socket.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.connection.connect(str(lint_daemon.socket_path))
+        self.connection.settimeout(10)
+        self._lines: IO[bytes] = self.connection.makefile("rb")
+
+    def send(self, request: Mapping[str, object]) -> None:
+        """Send a single request, without waiting for its response."""
+        self.connection.sendall(json.dumps(request).encode() + b"\n")
+
+    def receive(self) -> Mapping[str, object]:
+        """Wait for the next response."""
+        response: object = json.loads(self._lines.readline())
+        assert isinstance(response, dict)
+        return response
+
+    def close(self) -> None:
+        """Shut the daemon down & wait for it to exit."""
+        self.send({"command": "shutdown"})
+        self._lines.close()
+        self.connection.close()
+        self.thread.join(10)
+        assert not self.thread.is_alive()
+
+
+@pytest.fixture()
+def running_daemon(tmp_path: Path) -> Iterator[_RunningDaemon]:
+    """Start a daemon selecting only the regex rules, connected to from the test."""
+    running_daemon: _RunningDaemon = _RunningDaemon(
+        LintDaemon(tmp_path / "cache" / "daemon.sock", select=("CAR6",), max_workers=1)
+    )
+    yield running_daemon
+    running_daemon.close()
+
+
+class TestLintDaemon:
+    """Test suite for the JSON-lines protocol of the lint daemon."""
+
+    def test_lint_requests(self, tmp_path: Path, running_daemon: _RunningDaemon) -> None:
+        """Ensure both paths & source text are linted, & each response echoes its ID."""
+        (tmp_path / "module.py").write_text(PROBLEM_SOURCE)
+
+        running_daemon.send({"id": 1, "path": str(tmp_path / "module.py")})
+        response: Mapping[str, object] = running_daemon.receive()
+        assert response["id"] == 1
+        assert response["problems"] == [
+            {
+                "filename": str(tmp_path / "module.py"),
+                "line": 3,
+                "column": 1,
+                "code": "CAR610",
+                "message": 'Regex pattern string should use a raw string: `r"..."`',
+            },
+        ]
+
+        running_daemon.send({"id": "two", "source": PROBLEM_SOURCE, "filename": "edited.py"})
+        response = running_daemon.receive()
+        assert response["id"] == "two"
+        assert isinstance(response["problems"], list)
+        assert [problem["filename"] for problem in response["problems"]] == ["edited.py"]
+
+    @pytest.mark.parametrize(
+        "request_line",
+        (b"not json\n", b"[1]\n", b'{"id": 3, "path": 3}\n', b'{"command": "restart"}\n'),
+    )
+    def test_invalid_requests(
+        self, running_daemon: _RunningDaemon, request_line: bytes
+    ) -> None:
+        """Ensure an invalid request is answered with an error, & the connection kept open."""
+        running_daemon.connection.sendall(request_line)
+        assert "error" in running_daemon.receive()
+
+        running_daemon.send({"id": 4, "source": "", "filename": "empty.py"})
+        assert running_daemon.receive() == {"id": 4, "problems": []}
+
+    def test_failed_lint(self, running_daemon: _RunningDaemon) -> None:
+        """Ensure a request whose lint raises unexpectedly is still answered, with an error."""
+        running_daemon.send(
+            {
+                "id": 1,
+                "source": f"value = {'+'.join(['1'] * 200_000)}\n",
+                "filename": "deep.py",
+            }
+        )
+        response: Mapping[str, object] = running_daemon.receive()
+
+        assert response["id"] == 1
+        assert str(response["error"]).startswith("RecursionError: ")
+
+    def test_coalesced_requests(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, running_daemon: _RunningDaemon
+    ) -> None:
+        """Ensure queued requests for the same path share a single lint."""
+        (tmp_path / "blocking.py").write_text("")
+        (tmp_path / "module.py").write_text(PROBLEM_SOURCE)
+
+        linted_paths: list[str] = []
+        release: threading.Event = threading.Event()
+        original_lint_file: Callable[[LintSession, str], Sequence[Problem]] = (
+            LintSession.lint_file
+        )
+
+        def _lint_file(lint_session: LintSession, path: str) -> Sequence[Problem]:
+            linted_paths.append(path)
+            release.wait(10)
+            return original_lint_file(lint_session, path)
+
+        monkeypatch.setattr(LintSession, "lint_file", _lint_file)
+
+        running_daemon.send({"id": 1, "path": str(tmp_path / "blocking.py")})
+        running_daemon.send({"id": 2, "path": str(tmp_path / "module.py")})
+        running_daemon.send({"id": 3, "path": str(tmp_path / "module.py")})
+
+        # NOTE: The only worker is busy, so the later requests queue up behind it
+        time.sleep(0.2)
+        release.set()
+
+        responses: Sequence[Mapping[str, object]] = sorted(
+            (running_daemon.receive() for _ in range(3)),
+            key=lambda response: str(response["id"]),
+        )
+        assert responses[1]["problems"] == responses[2]["problems"]
+        assert linted_paths == [str(tmp_path / "blocking.py"), str(tmp_path / "module.py")]
+
+    def test_idle_timeout(self, tmp_path: Path) -> None:
+        """Ensure the daemon exits & removes its socket once no requests have arrived."""
+        socket_path: Path = tmp_path / "daemon.sock"
+
+        start: float = time.monotonic()
+        asyncio.run(LintDaemon(socket_path, idle_timeout=IDLE_TIMEOUT).serve())
+
+        assert time.monotonic() - start >= IDLE_TIMEOUT
+        assert not socket_path.exists()
+
+    def test_stale_socket(self, tmp_path: Path) -> None:
+        """Ensure a socket left behind by a crashed daemon is replaced."""
+        socket_path: Path = tmp_path / "daemon.sock"
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale_socket:
+            stale_socket.bind(str(socket_path))
+
+        asyncio.run(LintDaemon(socket_path, idle_timeout=0.01).serve())
+
+        assert not socket_path.exists()
+
+    def test_already_running(self, running_daemon: _RunningDaemon) -> None:
+        """Ensure a second daemon refuses to take over a socket that is still listening."""
+        with pytest.raises(OSError, match="already listening"):
+            asyncio.run(LintDaemon(running_daemon.lint_daemon.socket_path).serve())
+
+
+class TestMain:
+    """Test suite for starting the daemon from the command-line linter."""
+
+    def test_daemon(self, tmp_path: Path) -> None:
+        """Ensure the daemon exits successfully once idle."""
+        assert (
+            main(
+                [
+                    "--daemon",
+                    "--socket",
+                    str(tmp_path / "daemon.sock"),
+                    "--idle-timeout",
+                    "0.01",
+                ]
+            )
+            == 0
+        )
@@ -0,0 +1,177 @@
+"""Test suite to check linting only the lines changed within a Git revision range."""
+
+import shutil
+import subprocess
+from typing import TYPE_CHECKING
+
+import pytest
+
+from flake8_carrot import LintSession
+from flake8_carrot.cli import main
+from flake8_carrot.diff import ChangedFile, _parse_unified_diff, lint_diff, select_scopes
+from flake8_carrot.utils import RuleScope
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from pathlib import Path
+
+__all__: Sequence[str] = ("TestLintDiff", "TestParseUnifiedDiff", "TestSelectScopes")
+
+
+GIT_EXECUTABLE: str = shutil.which("git") or "git"
+LEGACY_SOURCE: str = 'import re\n\nre.search("\\\\d", value)\n'
+MODULE_SOURCE: str = (
+    '"""Docstring."""\n\nimport re\n\n__all__ = ()\n\n\n'
+    "def check(value):\n"
+    "    return value\n"
+    "\n"
+    "\n"
+    "def other(value):\n"
+    "    return value\n"
+)
+
+
+def _git(repository: Path, arguments: Sequence[str]) -> str:
+    return subprocess.run(
+        (
+            GIT_EXECUTABLE,
+            "-c",
+            "user.name=Test",
+            "-c",
+            "user.email=test@example.com",
+            *arguments,
+        ),
+        cwd=repository,
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+
+
+@pytest.fixture()
+def repository(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Create a Git repository with a committed legacy file, as the working directory."""
+    _git(tmp_path, ("init", "--quiet"))
+    (tmp_path / "legacy.py").write_text(LEGACY_SOURCE)
+    _git(tmp_path, ("add", "legacy.py"))
+    _git(tmp_path, ("commit", "--quiet", "-m", "Initial commit"))
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+class TestParseUnifiedDiff:
+    """Test suite for reading the changed lines of each file from `git diff` output."""
+
+    def test_changed_lines(self) -> None:
+        """Ensure added lines are changed, & deletions only touch the lines around them."""
+        assert _parse_unified_diff(
+            [
+                "diff --git a/module.py b/module.py",
+                "--- a/module.py",
+                "+++ b/module.py",
+                "@@ -2,0 +3,2 @@ def check():",
+                "+++ not a header",
+                "+value = 2",
+                "@@ -9 +10,0 @@",
+                "-removed = 1",
+                "diff --git a/removed.py b/removed.py",
+                "--- a/removed.py",
+                "+++ /dev/null",
+                "@@ -1 +0,0 @@",
+                "-value = 1",
+                'diff --git "a/caf\\303\\251.py" "b/caf\\303\\251.py"',
+                '--- "a/caf\\303\\251.py"',
+                '+++ "b/caf\\303\\251.py"',
+                "@@ -1 +1 @@",
+                "-value = 1",
+                "\\ No newline at end of file",
+                "+value = 2",
+                "diff --git a/foo bar.py b/foo bar.py",
+                "--- a/foo bar.py\t",
+                "+++ b/foo bar.py\t",
+                "@@ -1 +1 @@",
+                "-value = 1",
+                "+value = 2",
+            ],
+        ) == [
+            ChangedFile("module.py", {3, 4}, {3, 4, 10, 11}),
+            ChangedFile("café.py", {1}, {1}),
+            ChangedFile("foo bar.py", {1}, {1}),
+        ]
+
+
+class TestSelectScopes:
+    """Test suite for skipping the rules that could not report on the changed lines."""
+
+    @pytest.mark.parametrize(
+        ("changed_lines", "expected_scopes"),
+        (
+            ({13}, {RuleScope.MODULE, RuleScope.STATEMENT}),
+            ({1}, {RuleScope.MODULE, RuleScope.STATEMENT, RuleScope.PREAMBLE}),
+            ({12}, {RuleScope.MODULE, RuleScope.STATEMENT}),
+        ),
+    )
+    def test_scopes(self, changed_lines: set[int], expected_scopes: set[RuleScope]) -> None:
+        """Ensure the preamble rules only run when the preamble was touched."""
+        assert (
+            select_scopes(
+                MODULE_SOURCE, ChangedFile("module.py", changed_lines, changed_lines)
+            )
+            == expected_scopes
+        )
+
+    def test_comment_scope(self) -> None:
+        """Ensure the comment rules only run when a changed line holds a comment."""
+        source: str = MODULE_SOURCE.replace("return value\n", "return value  # noqa:X\n", 1)
+
+        assert RuleScope.COMMENTS in select_scopes(source, ChangedFile("module.py", {9}, {9}))
+        assert RuleScope.COMMENTS not in select_scopes(
+            source, ChangedFile("module.py", {13}, {13})
+        )
+
+
+@pytest.mark.skipif(shutil.which(GIT_EXECUTABLE) is None, reason="Git is not installed.")
+class TestLintDiff:
+    """Test suite for reporting only the problems on the changed lines."""
+
+    def test_working_tree(self, repository: Path) -> None:
+        """Ensure only the problems on lines changed since a revision are reported."""
+        (repository / "legacy.py").write_text(f'{LEGACY_SOURCE}re.search("\\\\w", value)\n')
+
+        assert [
+            (path, [(problem.line, problem.code) for problem in problems])
+            for path, problems in lint_diff(LintSession(select=("CAR6",)), "HEAD")
+        ] == [("legacy.py", [(4, "CAR610")])]
+
+    def test_path_with_space(self, repository: Path) -> None:
+        """Ensure a file whose name contains a space is still linted."""
+        (repository / "foo bar.py").write_text(LEGACY_SOURCE)
+        (repository / "foo_bar.py").write_text(LEGACY_SOURCE)
+        _git(repository, ("add", "foo bar.py", "foo_bar.py"))
+
+        assert sorted(
+            path for path, _ in lint_diff(LintSession(select=("CAR6",)), "HEAD")
+        ) == ["foo bar.py", "foo_bar.py"]
+
+    def test_revision_range(self, repository: Path) -> None:
+        """Ensure a range's files are read from its end revision, not the working tree."""
+        (repository / "legacy.py").write_text(f'{LEGACY_SOURCE}re.search("\\\\w", value)\n')
+        _git(repository, ("commit", "--quiet", "-am", "Add a search"))
+        (repository / "legacy.py").write_text("")
+
+        assert [
+            (path, [(problem.line, problem.code) for problem in problems])
+            for path, problems in lint_diff(LintSession(select=("CAR6",)), "HEAD~1..HEAD")
+        ] == [("legacy.py", [(4, "CAR610")])]
+
+    def test_cli(self, repository: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """Ensure the command-line linter prints only the problems on changed lines."""
+        (repository / "new.py").write_text(LEGACY_SOURCE)
+        _git(repository, ("add", "new.py"))
+
+        assert main(["--diff", "HEAD", "--select", "CAR6"]) == 1
+        assert [line.split(" ", 2)[:2] for line in capsys.readouterr().out.splitlines()] == [
+            ["new.py:3:1:", "CAR610"]
+        ]
+
+        assert main(["--diff", "HEAD", "--select", "CAR6", "--", "legacy.py"]) == 0
@@ -0,0 +1,166 @@
+"""Test suite to check discovering the source files to lint, honouring `.gitignore` files."""
+
+import fnmatch
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+from flake8_carrot.discovery import (
+    _EMPTY_GITIGNORE_RULES,
+    _compile_gitignore,
+    find_source_paths,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+    from flake8_carrot.discovery import _GitignoreRules
+
+__all__: Sequence[str] = ("TestFindSourcePaths", "TestGitignoreRules")
+
+
+def _write_tree(tmp_path: Path, relative_paths: Iterable[str]) -> None:
+    relative_path: str
+    for relative_path in relative_paths:
+        path: Path = tmp_path / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("value = 1\n")
+
+
+def _find_relative_source_paths(
+    tmp_path: Path, exclude_patterns: Sequence[str] = (), *, respect_gitignore: bool = True
+) -> Sequence[str]:
+    return sorted(
+        os.path.relpath(path, tmp_path).replace(os.sep, "/")
+        for path in find_source_paths(
+            [str(tmp_path)], exclude_patterns, respect_gitignore=respect_gitignore
+        )
+    )
+
+
+class TestGitignoreRules:
+    """Test suite for matching paths against compiled `.gitignore` patterns."""
+
+    @pytest.mark.parametrize(
+        ("gitignore", "relative_path", "is_directory", "expected_ignored"),
+        (
+            ("build/", "build", True, True),
+            ("build/", "build", False, False),
+            ("build/", "package/build", True, True),
+            ("/build", "package/build", True, False),
+            ("*.py", "package/module.py", False, True),
+            ("package/*.py", "package/module.py", False, True),
+            ("package/*.py", "package/sub/module.py", False, False),
+            ("**/generated", "a/b/generated", True, True),
+            ("docs/**/*.py", "docs/a/b/conf.py", False, True),
+            ("docs/**", "docs/conf.py", False, True),
+            ("module_[0-9].py", "module_3.py", False, True),
+            ("module_[!0-9].py", "module_3.py", False, False),
+            ("*.py\n!keep.py", "keep.py", False, False),
+            ("*.py\n!keep.py", "other.py", False, True),
+            ("\\#hash.py", "#hash.py", False, True),
+            ("# comment.py\n\n", "# comment.py", False, False),
+        ),
+    )
+    def test_matches_git(
+        self, gitignore: str, relative_path: str, *, is_directory: bool, expected_ignored: bool
+    ) -> None:
+        """Ensure each pattern matches the same paths as Git would."""
+        rules: _GitignoreRules = _EMPTY_GITIGNORE_RULES.extend(
+            _compile_gitignore(gitignore.splitlines(), "")
+        )
+
+        assert rules.is_ignored(relative_path, is_directory=is_directory) == expected_ignored
+
+    def test_nested_rules_relative(self) -> None:
+        """Ensure a nested `.gitignore` file's patterns only match within its directory."""
+        rules: _GitignoreRules = _EMPTY_GITIGNORE_RULES.extend(
+            _compile_gitignore(("/local.py",), "package")
+        )
+
+        assert rules.is_ignored("package/local.py", is_directory=False)
+        assert not rules.is_ignored("local.py", is_directory=False)
+        assert not rules.is_ignored("package/sub/local.py", is_directory=False)
+
+
+class TestFindSourcePaths:
+    """Test suite for walking the given directories in parallel, pruning skipped ones."""
+
+    TREE: Sequence[str] = (
+        "module.py",
+        "notes.txt",
+        "package/__init__.py",
+        "package/sub/module.py",
+        "examples/example.py",
+        ".venv/lib/site.py",
+        "build/generated.py",
+    )
+
+    def test_matches_naive_walk(self, tmp_path: Path) -> None:
+        """Ensure the same files are found as by walking & matching each pattern in turn."""
+        _write_tree(tmp_path, self.TREE)
+        exclude_patterns: Sequence[str] = (".venv", str(tmp_path / "examples"), "gen*.py")
+
+        expected_paths: list[str] = []
+
+        root: str
+        directory_names: list[str]
+        file_names: list[str]
+        for root, directory_names, file_names in os.walk(tmp_path):
+            directory_names[:] = [
+                directory_name
+                for directory_name in directory_names
+                if not any(
+                    fnmatch.fnmatch(directory_name, pattern)
+                    or fnmatch.fnmatch(str(Path(root, directory_name)), pattern)
+                    for pattern in exclude_patterns
+                )
+            ]
+            expected_paths.extend(
+                os.path.relpath(Path(root, file_name), tmp_path)
+                for file_name in file_names
+                if fnmatch.fnmatch(file_name, "*.py")
+                and not any(
+                    fnmatch.fnmatch(file_name, pattern) for pattern in exclude_patterns
+                )
+            )
+
+        assert _find_relative_source_paths(tmp_path, exclude_patterns) == sorted(
+            expected_paths
+        )
+
+    def test_gitignore_honoured(self, tmp_path: Path) -> None:
+        """Ensure files ignored by Git are skipped, unless `.gitignore` files are disabled."""
+        _write_tree(tmp_path, self.TREE)
+        (tmp_path / ".git").mkdir()
+        (tmp_path / ".gitignore").write_text(".venv/\nbuild/\n")
+        (tmp_path / "package" / ".gitignore").write_text("/sub/\n")
+
+        assert _find_relative_source_paths(tmp_path) == [
+            "examples/example.py",
+            "module.py",
+            "package/__init__.py",
+        ]
+        assert len(_find_relative_source_paths(tmp_path, respect_gitignore=False)) == 6
+
+    def test_gitignore_outside_repository_disregarded(self, tmp_path: Path) -> None:
+        """Ensure `.gitignore` files are only read within a Git repository."""
+        _write_tree(tmp_path / "project", self.TREE)
+        (tmp_path / "project" / ".gitignore").write_text("*.py\n")
+
+        if any((ancestor / ".git").exists() for ancestor in (tmp_path, *tmp_path.parents)):
+            pytest.skip("The temporary directory is within a Git repository.")
+
+        assert len(_find_relative_source_paths(tmp_path / "project")) == 6
+
+    def test_files_given_directly(self, tmp_path: Path) -> None:
+        """Ensure files given directly are found, even when ignored by Git."""
+        _write_tree(tmp_path, ("ignored.py",))
+        (tmp_path / ".git").mkdir()
+        (tmp_path / ".gitignore").write_text("ignored.py\n")
+
+        assert list(find_source_paths([str(tmp_path / "ignored.py")], ())) == [
+            str(tmp_path / "ignored.py")
+        ]
@@ -0,0 +1,317 @@
+"""Test suite to check publishing problems to editors through the language server."""
+
+import asyncio
+import io
+import os
+import sys
+import threading
+from typing import TYPE_CHECKING, override
+
+import pytest
+
+from flake8_carrot.carrot import CarrotPlugin
+from flake8_carrot.cli import main
+from flake8_carrot.lsp import LanguageServer, apply_content_change, read_message, write_message
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator, Mapping, Sequence
+    from typing import BinaryIO
+
+__all__: Sequence[str] = (
+    "TestApplyContentChange",
+    "TestLanguageServer",
+    "TestMain",
+    "TestMessages",
+)
+
+
+DOCUMENT_URI: str = "file:///project/module.py"
+PROBLEM_SOURCE: str = 'import re\n\nre.search("\\\\d", value)\n'
+FIXED_SOURCE: str = 'import re\n\nre.search(r"\\d", value)\n'
+
+
+def _make_range(
+    start: tuple[int, int], end: tuple[int, int]
+) -> Mapping[str, Mapping[str, int]]:
+    return {
+        "start": {"line": start[0], "character": start[1]},
+        "end": {"line": end[0], "character": end[1]},
+    }
+
+
+class _RunningServer:
+    """A language server serving on a background thread, connected to through pipes."""
+
+    @override
+    def __init__(self, debounce_seconds: float = 0.01) -> None:
+        server_input: int
+        client_output: int
+        server_input, client_output = os.pipe()
+        client_input: int
+        server_output: int
+        client_input, server_output = os.pipe()
+
+        self._client_output: BinaryIO = os.fdopen(client_output, "wb")
+        self._client_input: BinaryIO = os.fdopen(client_input, "rb")
+        self.exit_code: int | None = None
+
+        language_server: LanguageServer = LanguageServer(
+            os.fdopen(server_input, "rb"),
+            os.fdopen(server_output, "wb"),
+            select=("CAR6",),
+            debounce_seconds=debounce_seconds,
+        )
+
+        def _serve() -> None:
+            self.exit_code = asyncio.run(language_server.serve())
+
+        self.thread: threading.Thread = threading.Thread(target=_serve, daemon=True)
+        self.thread.start()
+
+    def send(self, message: Mapping[str, object]) -> None:
+        """Send a single message, without waiting for any response."""
+        write_message(self._client_output, message)
+
+    def receive(self) -> Mapping[str, object]:
+        """Wait for the next message from the server."""
+        message: Mapping[str, object] | None = read_message(self._client_input)
+        assert message is not None
+        return message
+
+    def initialize(self) -> None:
+        """Initialize the server, as the first message sent by an editor."""
+        self.send({"id": 0, "method": "initialize", "params": {"capabilities": {}}})
+        assert "capabilities" in self.receive()["result"]  # type: ignore[operator]
+        self.send({"method": "initialized", "params": {}})
+
+    def open_document(self, text: str, version: int = 1) -> None:
+        """Open the test document within the server."""
+        self.send(
+            {
+                "method": "textDocument/didOpen",
+                "params": {
+                    "textDocument": {
+                        "uri": DOCUMENT_URI,
+                        "languageId": "python",
+                        "version": version,
+                        "text": text,
+                    },
+                },
+            },
+        )
+
+    def close(self) -> None:
+        """Shut the server down & wait for it to exit."""
+        self.send({"id": "shutdown", "method": "shutdown"})
+        self.send({"method": "exit"})
+        self._client_output.close()
+        self.thread.join(10)
+        assert not self.thread.is_alive()
+        self._client_input.close()
+
+
+@pytest.fixture()
+def running_server() -> Iterator[_RunningServer]:
+    """Start an initialized language server selecting only the regex rules."""
+    running_server: _RunningServer = _RunningServer()
+    running_server.initialize()
+    yield running_server
+    running_server.close()
+
+
+class TestMessages:
+    """Test suite for the `Content-Length` framing of JSON-RPC messages."""
+
+    def test_round_trip(self) -> None:
+        """Ensure a written message is read back unchanged, including non-ASCII text."""
+        stream: io.BytesIO = io.BytesIO()
+        write_message(stream, {"id": 1, "result": "π"})
+        write_message(stream, {"method": "exit"})
+        stream.seek(0)
+
+        assert read_message(stream) == {"jsonrpc": "2.0", "id": 1, "result": "π"}
+        assert read_message(stream) == {"jsonrpc": "2.0", "method": "exit"}
+        assert read_message(stream) is None
+
+    def test_missing_content_length(self) -> None:
+        """Ensure a message without its length is rejected."""
+        with pytest.raises(ValueError, match="Content-Length"):
+            read_message(io.BytesIO(b"Content-Type: application/json\r\n\r\n{}"))
+
+
+class TestApplyContentChange:
+    """Test suite for applying the incremental changes of an edited document."""
+
+    @pytest.mark.parametrize(
+        ("text", "change", "expected_text"),
+        (
+            ("a\nb\n", {"text": "c\n"}, "c\n"),
+            ("a\nbc\n", {"range": _make_range((1, 1), (1, 1)), "text": "x"}, "a\nbxc\n"),
+            ("a\nb\nc\n", {"range": _make_range((0, 1), (2, 0)), "text": ""}, "ac\n"),
+            ("a\r\nb\r\n", {"range": _make_range((1, 0), (1, 1)), "text": "c"}, "a\r\nc\r\n"),
+            ("a\n", {"range": _make_range((5, 0), (5, 0)), "text": "b\n"}, "a\nb\n"),
+            ("😀x = 1\n", {"range": _make_range((0, 2), (0, 3)), "text": "y"}, "😀y = 1\n"),
+        ),
+    )
+    def test_changes(
+        self, text: str, change: Mapping[str, object], expected_text: str
+    ) -> None:
+        """Ensure each range is found by line & UTF-16 character, & replaced."""
+        assert apply_content_change(text, change) == expected_text
+
+
+class TestLanguageServer:
+    """Test suite for the language server's document synchronisation & diagnostics."""
+
+    def test_diagnostics_published(self, running_server: _RunningServer) -> None:
+        """Ensure an opened document's problems are published, & cleared once fixed."""
+        running_server.open_document(PROBLEM_SOURCE)
+
+        notification: Mapping[str, object] = running_server.receive()
+        assert notification["method"] == "textDocument/publishDiagnostics"
+        assert notification["params"] == {
+            "uri": DOCUMENT_URI,
+            "version": 1,
+            "diagnostics": [
+                {
+                    "range": _make_range((2, 0), (2, 0)),
+                    "severity": 2,
+                    "code": "CAR610",
+                    "source": "flake8-carrot",
+                    "message": 'Regex pattern string should use a raw string: `r"..."`',
+                },
+            ],
+        }
+
+        running_server.send(
+            {
+                "method": "textDocument/didChange",
+                "params": {
+                    "textDocument": {"uri": DOCUMENT_URI, "version": 2},
+                    "contentChanges": [
+                        {"range": _make_range((2, 10), (2, 14)), "text": 'r"\\d"'},
+                    ],
+                },
+            },
+        )
+        assert running_server.receive()["params"] == {
+            "uri": DOCUMENT_URI,
+            "version": 2,
+            "diagnostics": [],
+        }
+
+        running_server.send(
+            {
+                "method": "textDocument/didClose",
+                "params": {"textDocument": {"uri": DOCUMENT_URI}},
+            }
+        )
+        assert running_server.receive()["params"] == {"uri": DOCUMENT_URI, "diagnostics": []}
+
+    def test_failed_lint(self, running_server: _RunningServer) -> None:
+        """Ensure a lint that raises unexpectedly is logged, & clears the old problems."""
+        running_server.open_document(PROBLEM_SOURCE)
+        assert running_server.receive()["params"]["diagnostics"]  # type: ignore[index]
+
+        running_server.send(
+            {
+                "method": "textDocument/didChange",
+                "params": {
+                    "textDocument": {"uri": DOCUMENT_URI, "version": 2},
+                    "contentChanges": [
+                        {"text": f"value = {'+'.join(['1'] * 200_000)}\n"},
+                    ],
+                },
+            },
+        )
+
+        log_notification: Mapping[str, object] = running_server.receive()
+        assert log_notification["method"] == "window/logMessage"
+        assert "RecursionError" in str(log_notification["params"])
+        assert running_server.receive()["params"] == {
+            "uri": DOCUMENT_URI,
+            "version": 2,
+            "diagnostics": [],
+        }
+
+    def test_stale_lint_not_published(
+        self, monkeypatch: pytest.MonkeyPatch, running_server: _RunningServer
+    ) -> None:
+        """Ensure a lint overtaken by a newer edit is abandoned rather than published."""
+        lint_started: threading.Event = threading.Event()
+        release: threading.Event = threading.Event()
+        original_from_source: Callable[[str], CarrotPlugin] = CarrotPlugin.from_source
+
+        def _from_source(source: str) -> CarrotPlugin:
+            lint_started.set()
+            release.wait(10)
+            return original_from_source(source)
+
+        # NOTE: Blocks the first lint part-way through, before its statement rules are run
+        monkeypatch.setattr(CarrotPlugin, "from_source", _from_source)
+
+        running_server.open_document(PROBLEM_SOURCE)
+        assert lint_started.wait(10)
+        running_server.send(
+            {
+                "method": "textDocument/didChange",
+                "params": {
+                    "textDocument": {"uri": DOCUMENT_URI, "version": 2},
+                    "contentChanges": [{"text": FIXED_SOURCE}],
+                },
+            },
+        )
+        release.set()
+
+        assert running_server.receive()["params"] == {
+            "uri": DOCUMENT_URI,
+            "version": 2,
+            "diagnostics": [],
+        }
+
+    def test_unknown_request(self, running_server: _RunningServer) -> None:
+        """Ensure a request for an unsupported method is answered with an error."""
+        running_server.send({"id": 7, "method": "textDocument/hover", "params": {}})
+        response: Mapping[str, object] = running_server.receive()
+
+        assert response["id"] == 7
+        assert response["error"] == {
+            "code": -32601,
+            "message": "Unknown method 'textDocument/hover'.",
+        }
+
+    def test_exit_codes(self) -> None:
+        """Ensure the server only exits successfully if it was shut down first."""
+        running_server: _RunningServer = _RunningServer()
+        running_server.initialize()
+        running_server.close()
+        assert running_server.exit_code == 0
+
+        running_server = _RunningServer()
+        running_server.send({"method": "exit"})
+        running_server.thread.join(10)
+        assert running_server.exit_code == 1
+
+
+class TestMain:
+    """Test suite for starting the language server from the command-line linter."""
+
+    def test_lsp(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Ensure the server answers over stdin & stdout, & exits once told to."""
+        requests: io.BytesIO = io.BytesIO()
+        write_message(requests, {"id": 1, "method": "initialize", "params": {}})
+        write_message(requests, {"id": 2, "method": "shutdown"})
+        write_message(requests, {"method": "exit"})
+        requests.seek(0)
+
+        responses: io.BytesIO = io.BytesIO()
+        monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(requests))
+        monkeypatch.setattr(sys, "stdout", io.TextIOWrapper(responses))
+
+        assert main(["--lsp"]) == 0
+
+        responses.seek(0)
+        initialize_response: Mapping[str, object] | None = read_message(responses)
+        assert initialize_response is not None
+        assert initialize_response["id"] == 1
+        assert read_message(responses) == {"jsonrpc": "2.0", "id": 2, "result": None}
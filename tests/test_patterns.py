@@ -0,0 +1,93 @@
+"""Test suite to check the functionality of the declarative AST patterns."""
+
+import ast
+from typing import TYPE_CHECKING
+
+import pytest
+
+from flake8_carrot.patterns import DottedNamePattern, ImportPattern, resolve_dotted_name
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+__all__: Sequence[str] = ("TestDottedNamePattern", "TestImportPattern")
+
+
+def _parse_expression(raw_expression: str) -> ast.expr:
+    return ast.parse(raw_expression, mode="eval").body
+
+
+def _parse_statement(raw_statement: str) -> ast.stmt:
+    return ast.parse(raw_statement).body[0]
+
+
+class TestDottedNamePattern:
+    """Test suite for matching expressions against a set of dotted names."""
+
+    PATTERN: DottedNamePattern = DottedNamePattern(
+        ("override", "typing.override", "typing_extensions.override"), match_calls=True
+    )
+
+    @pytest.mark.parametrize(
+        ("raw_expression", "expected_dotted_name"),
+        (
+            ("foo", "foo"),
+            ("foo.bar.baz", "foo.bar.baz"),
+            ("foo().bar", None),
+            ("foo[0].bar", None),
+        ),
+    )
+    def test_resolve_dotted_name(
+        self, raw_expression: str, expected_dotted_name: str | None
+    ) -> None:
+        """Ensure dotted names are only resolved from plain chains of attribute lookups."""
+        assert resolve_dotted_name(_parse_expression(raw_expression)) == expected_dotted_name
+
+    @pytest.mark.parametrize(
+        "raw_expression",
+        ("override", "typing.override", "typing_extensions.override()", "override()"),
+    )
+    def test_matches(self, raw_expression: str) -> None:
+        """Ensure any of the pattern's names, or calls of them, are matched."""
+        assert self.PATTERN.matches(_parse_expression(raw_expression))
+
+    @pytest.mark.parametrize(
+        "raw_expression",
+        ("overrides", "foo.override", "a.typing.override", "override()()", "typing"),
+    )
+    def test_no_match(self, raw_expression: str) -> None:
+        """Ensure names not in the pattern, or with extra parts, are not matched."""
+        assert not self.PATTERN.matches(_parse_expression(raw_expression))
+
+
+class TestImportPattern:
+    """Test suite for matching import statements against a set of imported names."""
+
+    IMPORT_FROM_NAMES: Sequence[tuple[str, str]] = (("collections.abc", "Sequence"),)
+    IMPORT_NAMES: Sequence[str] = ("collections.abc",)
+
+    @pytest.mark.parametrize(
+        ("raw_statement", "allow_trailing_names", "expected_match"),
+        (
+            ("from collections.abc import Sequence", False, True),
+            ("from collections.abc import Sequence as S", False, True),
+            ("from collections.abc import Sequence, Iterable", False, False),
+            ("from collections.abc import Sequence, Iterable", True, True),
+            ("from collections.abc import Iterable, Sequence", True, False),
+            ("import collections.abc", False, True),
+            ("import collections.abc, os", True, False),
+            ("from typing import Sequence", True, False),
+            ("__all__ = ()", True, False),
+        ),
+    )
+    def test_matches(
+        self, raw_statement: str, *, allow_trailing_names: bool, expected_match: bool
+    ) -> None:
+        """Ensure import statements are matched by their module & first imported name."""
+        import_pattern: ImportPattern = ImportPattern(
+            import_from_names=self.IMPORT_FROM_NAMES,
+            import_names=self.IMPORT_NAMES,
+            allow_trailing_names=allow_trailing_names,
+        )
+
+        assert import_pattern.matches(_parse_statement(raw_statement)) is expected_match
@@ -0,0 +1,89 @@
+"""Test suite to check reading & prefetching source files ahead of linting them."""
+
+import tokenize
+from typing import TYPE_CHECKING
+
+import pytest
+
+from flake8_carrot import pipeline
+from flake8_carrot.pipeline import SourceFile, prefetch_source_files, read_source_file
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from pathlib import Path
+
+__all__: Sequence[str] = ("TestPrefetchSourceFiles", "TestReadSourceFile")
+
+
+UNREADABLE_FILE_ERRORS: tuple[type[Exception], ...] = (SyntaxError, UnicodeError)
+
+
+class TestReadSourceFile:
+    """Test suite for decoding source files in the same way as Flake8."""
+
+    @pytest.mark.parametrize(
+        "data",
+        (
+            b"value = 1\r\nother = 2\r\n",
+            b"value = 1\rother = 2\r",
+            b"\xef\xbb\xbfvalue = '\xc3\xa9'\n",
+            b"# -*- coding: cp1252 -*-\nvalue = '\xe9'\n",
+            b"value = '\xe9'\n",
+        ),
+    )
+    @pytest.mark.parametrize("memory_mapped", (False, True))
+    def test_matches_text_mode(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        data: bytes,
+        *,
+        memory_mapped: bool,
+    ) -> None:
+        """Ensure the decoded source matches reading the file as Flake8 does."""
+        if memory_mapped:
+            monkeypatch.setattr(pipeline, "_MMAP_THRESHOLD", 1)
+
+        path: Path = tmp_path / "source.py"
+        path.write_bytes(data)
+
+        expected_source: str
+        try:
+            with tokenize.open(path) as file:
+                expected_source = file.read()
+        except UNREADABLE_FILE_ERRORS:
+            expected_source = path.read_text(encoding="latin-1")
+
+        assert read_source_file(path) == SourceFile(str(path), expected_source, None)
+
+    def test_missing_file(self, tmp_path: Path) -> None:
+        """Ensure the error raised while opening a file is returned instead of its source."""
+        source_file: SourceFile = read_source_file(tmp_path / "missing.py")
+
+        assert source_file.source is None
+        assert isinstance(source_file.error, FileNotFoundError)
+
+
+class TestPrefetchSourceFiles:
+    """Test suite for reading upcoming files on a thread pool, in the given order."""
+
+    @pytest.mark.parametrize("max_workers", (0, 1, 3))
+    def test_order_preserved(self, tmp_path: Path, max_workers: int) -> None:
+        """Ensure the files are yielded in the given order, however many threads read them."""
+        paths: list[str] = []
+
+        index: int
+        for index in range(20):
+            path: Path = tmp_path / f"module_{index}.py"
+            path.write_text(f"value = {index}\n")
+            paths.append(str(path))
+
+        assert [
+            (source_file.path, source_file.source)
+            for source_file in prefetch_source_files(paths, max_workers=max_workers)
+        ] == [(path, f"value = {index}\n") for index, path in enumerate(paths)]
+
+    def test_negative_workers(self) -> None:
+        """Ensure a negative number of prefetch threads is rejected."""
+        with pytest.raises(ValueError, match="at least 0"):
+            next(prefetch_source_files(("source.py",), max_workers=-1))
@@ -0,0 +1,158 @@
+"""Test suite to check linting only the module-header rules over each module's preamble."""
+
+from io import StringIO
+from typing import TYPE_CHECKING, override
+
+import pytest
+
+from flake8_carrot import CarrotPlugin
+from flake8_carrot.preamble import (
+    PREAMBLE_RULES,
+    lint_preamble,
+    lint_preamble_file,
+    read_preamble,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from pathlib import Path
+
+    from flake8_carrot.preamble import Preamble
+
+__all__: Sequence[str] = ("TestLintPreamble", "TestReadPreamble")
+
+
+BODY: str = "".join(f"value_{index} = {index}\n" for index in range(1000))
+NESTED_ALL_EXPORT_SOURCE: str = (
+    'import os\n\ntry:\n    __all__ = ("value",)\nexcept ImportError:\n    pass\n\n\n'
+    "value = 1\n"
+)
+
+
+class _CountingReadline:
+    @override
+    def __init__(self, source: str) -> None:
+        self._readline = StringIO(source).readline
+        self.lines_read_count: int = 0
+
+    def __call__(self) -> str:
+        line: str = self._readline()
+        if line:
+            self.lines_read_count += 1
+
+        return line
+
+
+class TestLintPreamble:
+    """Test suite for reporting the same module-header problems as a whole-file run."""
+
+    @pytest.mark.parametrize(
+        "source",
+        (
+            (
+                '"""Docstring."""\n\nfrom collections.abc import Sequence\n\n'
+                "__all__: Sequence[str] = ()\n\n\nvalue = 1\n"
+            ),
+            '"""Docstring."""\n\n\nimport os\n__all__ = ("value",)\nvalue = 1\n',
+            '"""Docstring."""\nimport os\n\ndef function() -> None:\n    pass\n',
+            (
+                '"""Docstring."""\ntry:\n    import tomllib\n'
+                "except ImportError:\n    tomllib = None\n\n"
+            ),
+            (
+                'import os\n\nVERSION = "1.0"\nDEBUG = False\n'
+                '__all__ = ("VERSION",)\nvalue = 1\n'
+            ),
+            (
+                "import os\n\nif TYPE_CHECKING:\n    import sys\n"
+                '__all__ = ("value",)\n\n\n\nvalue = 1'
+            ),
+            'import os\n\nHELP = """\n__all__ = ()\n"""\n\nvalue = 1\n',
+            '"""Docstring."""\n',
+            "",
+        ),
+    )
+    def test_problems_match_whole_file(self, source: str) -> None:
+        """Ensure the preamble's problems match those of linting the whole file."""
+        assert sorted(lint_preamble(StringIO(source).readline)) == sorted(
+            CarrotPlugin.from_source(source).run_rules(PREAMBLE_RULES)
+        )
+
+    def test_nested_all_export_reported_as_missing(self) -> None:
+        """Ensure the documented mismatch for an `__all__` export nested in a block holds."""
+        assert [
+            text[:6]
+            for _, _, text, _ in lint_preamble(StringIO(NESTED_ALL_EXPORT_SOURCE).readline)
+        ] == ["CAR101"]
+        assert sorted(
+            text[:6]
+            for _, _, text, _ in CarrotPlugin.from_source(NESTED_ALL_EXPORT_SOURCE).run_rules(
+                PREAMBLE_RULES
+            )
+        ) == ["CAR105", "CAR110"]
+
+    @pytest.mark.parametrize(
+        ("source", "expected_problem"),
+        (
+            ("import os\nx = (\n", (2, 5, "E999 SyntaxError: '(' was never closed")),
+            ('"""Docstring."""\nimport os.\n', (2, 11, "E999 SyntaxError: invalid syntax")),
+            (
+                'import os\n\nHELP = """\n',
+                (
+                    3,
+                    8,
+                    (
+                        "E999 SyntaxError: unterminated triple-quoted string literal "
+                        "(detected at line 3)"
+                    ),
+                ),
+            ),
+        ),
+    )
+    def test_invalid_source_reported(
+        self, source: str, expected_problem: tuple[int, int, str]
+    ) -> None:
+        """Ensure a preamble that cannot be parsed is reported as a problem, not raised."""
+        assert [problem[:3] for problem in lint_preamble(StringIO(source).readline)] == [
+            expected_problem
+        ]
+
+    def test_unreadable_file_reported(self, tmp_path: Path) -> None:
+        """Ensure a file that cannot be read is reported as a single E902 problem."""
+        problems: Sequence[tuple[int, int, str, type[CarrotPlugin]]] = lint_preamble_file(
+            tmp_path / "missing.py"
+        )
+
+        assert len(problems) == 1
+        assert problems[0][2].startswith("E902 FileNotFoundError: ")
+
+    def test_undecodable_file_read(self, tmp_path: Path) -> None:
+        """Ensure a file that does not match its declared encoding is read as latin-1."""
+        (tmp_path / "module.py").write_bytes(b'import os\n\nNAME = "caf\xe9"\n')
+
+        assert [text[:6] for _, _, text, _ in lint_preamble_file(tmp_path / "module.py")] == [
+            "CAR101"
+        ]
+
+
+class TestReadPreamble:
+    """Test suite for reading only the leading statements of each module."""
+
+    def test_stops_after_preamble(self) -> None:
+        """Ensure the lines after the first statement following the preamble are not read."""
+        readline: _CountingReadline = _CountingReadline(
+            f'"""Docstring."""\n\nimport os\n\n__all__ = ("value_0",)\n\n\n{BODY}'
+        )
+        preamble: Preamble = read_preamble(readline)
+
+        assert preamble.next_statement_line_number == 8
+        assert readline.lines_read_count < 15
+
+    def test_extended_to_later_all_export(self) -> None:
+        """Ensure a top-level `__all__` export after other statements is still parsed."""
+        preamble: Preamble = read_preamble(
+            StringIO(f'import os\n\nVERSION = "1.0"\n__all__ = ("VERSION",)\n{BODY}').readline
+        )
+
+        assert preamble.next_statement_line_number == 5
+        assert len(preamble.tree.body) == 4
@@ -0,0 +1,228 @@
+"""Test suite to check the garbage-collection modes & the rule allocation audit."""
+
+import argparse
+import ast
+import gc
+import multiprocessing
+import os
+import subprocess
+import sys
+import tokenize
+from io import StringIO
+from typing import TYPE_CHECKING
+
+import pytest
+
+from flake8_carrot import CarrotPlugin
+from flake8_carrot.profiling import (
+    TUNED_GC_THRESHOLD,
+    GCMode,
+    audit_rule_allocations,
+    format_allocation_report,
+    gc_execution_mode,
+    register_gc_freeze_at_fork,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+    from tokenize import TokenInfo
+
+    from flake8_carrot.profiling import RuleAllocations
+
+__all__: Sequence[str] = ("TestAllocationAudit", "TestGCExecutionMode")
+
+
+SOURCE: str = (
+    '"""Module docstring."""\n'
+    "\n"
+    "import re\n"
+    "\n"
+    '__all__ = ("foo",)\n'
+    "\n"
+    "\n"
+    "def foo(*args: object) -> None:  #noqa: CAR150\n"
+    '    re.search("\\\\d", str(args))\n'
+)
+
+
+def _parse_source(source: str) -> tuple[ast.Module, Sequence[TokenInfo], Sequence[str]]:
+    return (
+        ast.parse(source),
+        list(tokenize.generate_tokens(StringIO(source).readline)),
+        source.splitlines(keepends=True),
+    )
+
+
+def _raise_within_gc_execution_mode(gc_mode: GCMode) -> None:
+    with gc_execution_mode(gc_mode):
+        LINTING_FAILED_MESSAGE: str = "Linting failed."
+        raise RuntimeError(LINTING_FAILED_MESSAGE)
+
+
+class TestGCExecutionMode:
+    """Test suite for configuring the garbage collector while rules are run."""
+
+    @pytest.fixture(autouse=True)
+    def _restore_gc(self) -> Iterator[None]:
+        gc_was_enabled: bool = gc.isenabled()
+        original_thresholds: tuple[int, int, int] = gc.get_threshold()
+
+        yield
+
+        gc.set_threshold(*original_thresholds)
+        if gc_was_enabled:
+            gc.enable()
+
+    def test_pause_mode(self) -> None:
+        """Ensure automatic collection is disabled within the pause mode, then re-enabled."""
+        gc.enable()
+
+        with gc_execution_mode(GCMode.PAUSE):
+            assert not gc.isenabled()
+
+        assert gc.isenabled()
+
+    def test_pause_mode_leaves_disabled_gc_disabled(self) -> None:
+        """Ensure the pause mode does not enable a garbage collector that was disabled."""
+        gc.disable()
+
+        with gc_execution_mode(GCMode.PAUSE):
+            pass
+
+        assert not gc.isenabled()
+
+    def test_tune_mode(self) -> None:
+        """Ensure the youngest generation's threshold is raised, then restored."""
+        gc.set_threshold(700, 10, 10)
+
+        with gc_execution_mode(GCMode.TUNE):
+            assert gc.get_threshold() == (TUNED_GC_THRESHOLD, 10, 10)
+
+        assert gc.get_threshold() == (700, 10, 10)
+
+    @pytest.mark.parametrize("gc_mode", (GCMode.PAUSE, GCMode.TUNE))
+    def test_restored_after_error(self, gc_mode: GCMode) -> None:
+        """Ensure the garbage collector's configuration is restored if linting fails."""
+        gc.enable()
+        gc.set_threshold(700, 10, 10)
+
+        with pytest.raises(RuntimeError, match="Linting failed"):
+            _raise_within_gc_execution_mode(gc_mode)
+
+        assert gc.isenabled()
+        assert gc.get_threshold() == (700, 10, 10)
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="Forking is not supported.")
+    def test_gc_frozen_in_forked_worker(self) -> None:
+        """Ensure forked workers start with every existing object frozen, unlike the parent."""
+        register_gc_freeze_at_fork()
+        register_gc_freeze_at_fork()
+
+        process_id: int = os.fork()
+        if process_id == 0:
+            os._exit(0 if gc.get_freeze_count() > 0 else 1)
+
+        assert os.waitstatus_to_exitcode(os.waitpid(process_id, 0)[1]) == 0
+        assert gc.get_freeze_count() == 0
+
+    @pytest.mark.skipif(
+        "forkserver" not in multiprocessing.get_all_start_methods(),
+        reason="The forkserver start method is not supported.",
+    )
+    def test_gc_frozen_in_forkserver_worker(self) -> None:
+        """Ensure workers forked from a forkserver start with the preloaded rules frozen."""
+        # NOTE: Run in a new interpreter, so that no forkserver has been started already
+        worker_output: str = subprocess.run(
+            (
+                sys.executable,
+                "-c",
+                (
+                    "import gc, multiprocessing\n"
+                    "from flake8_carrot.profiling import register_gc_freeze_at_fork\n"
+                    "register_gc_freeze_at_fork()\n"
+                    "context = multiprocessing.get_context('forkserver')\n"
+                    "with context.Pool(1) as pool:\n"
+                    "    print(pool.apply(gc.get_freeze_count) > 0, gc.get_freeze_count())\n"
+                ),
+            ),
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout
+
+        assert worker_output == "True 0\n"
+
+    @pytest.mark.parametrize("gc_mode", tuple(GCMode))
+    def test_plugin_results_unaffected(
+        self, monkeypatch: pytest.MonkeyPatch, gc_mode: GCMode
+    ) -> None:
+        """Ensure every garbage-collection mode reports identical problems."""
+        expected_problems: Sequence[tuple[int, int, str, type[CarrotPlugin]]] = list(
+            CarrotPlugin(*_parse_source(SOURCE)).run()
+        )
+
+        monkeypatch.setattr(CarrotPlugin, "_enabled_rules", None)
+        monkeypatch.setattr(CarrotPlugin, "_gc_mode", GCMode.DEFAULT)
+        CarrotPlugin.parse_options(
+            argparse.Namespace(
+                select=["CAR"],
+                extend_select=None,
+                extended_default_select=["C90", "F", "E", "W"],
+                ignore=None,
+                extend_ignore=None,
+                extended_default_ignore=[],
+                carrot_gc_mode=gc_mode.value,
+            ),
+        )
+
+        assert CarrotPlugin._gc_mode is gc_mode  # noqa: SLF001
+        assert list(CarrotPlugin(*_parse_source(SOURCE)).run()) == expected_problems
+
+    def test_only_applied_by_flake8_entry_point(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Ensure running selected rules, E.g. from many threads, leaves the GC unchanged."""
+        monkeypatch.setattr(CarrotPlugin, "_gc_mode", GCMode.PAUSE)
+        gc.enable()
+
+        gc_enabled_states: list[bool] = []
+
+        def _run_rules(_plugin: CarrotPlugin, _rule_classes: object) -> Sequence[object]:
+            gc_enabled_states.append(gc.isenabled())
+            return []
+
+        monkeypatch.setattr(CarrotPlugin, "_run_rules", _run_rules)
+
+        list(CarrotPlugin.from_source(SOURCE).run_rules(CarrotPlugin.RULES))
+        list(CarrotPlugin.from_source(SOURCE).run())
+
+        assert gc_enabled_states == [True, False]
+        assert gc.isenabled()
+
+
+class TestAllocationAudit:
+    """Test suite for measuring the memory allocated by each rule."""
+
+    def test_every_enabled_rule_audited(self) -> None:
+        """Ensure each enabled rule is measured once per file, ordered by peak allocation."""
+        allocations: Sequence[RuleAllocations] = audit_rule_allocations(
+            CarrotPlugin, (_parse_source(SOURCE), _parse_source(SOURCE))
+        )
+
+        assert {rule_allocations.code for rule_allocations in allocations} == {
+            RuleClass.CODE for RuleClass in CarrotPlugin.RULES
+        }
+        assert all(rule_allocations.files_count == 2 for rule_allocations in allocations)
+        assert [
+            rule_allocations.mean_peak_bytes for rule_allocations in allocations
+        ] == sorted(
+            (rule_allocations.mean_peak_bytes for rule_allocations in allocations),
+            reverse=True,
+        )
+
+    def test_format_allocation_report(self) -> None:
+        """Ensure the report contains a heading row & one row for each reported rule."""
+        report: str = format_allocation_report(
+            audit_rule_allocations(CarrotPlugin, (_parse_source(SOURCE),)), limit=5
+        )
+
+        assert report.splitlines()[0].split()[0] == "rule"
+        assert len(report.splitlines()) == 6
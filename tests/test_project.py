@@ -0,0 +1,49 @@
+"""Test suite to check locating the project root & the lint daemon's socket."""
+
+from typing import TYPE_CHECKING
+
+from flake8_carrot.project import find_project_root, get_default_socket_path
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from pathlib import Path
+
+    import pytest
+
+__all__: Sequence[str] = ("TestFindProjectRoot",)
+
+
+class TestFindProjectRoot:
+    """Test suite for finding the nearest project root above a directory."""
+
+    def test_pyproject_marker(self, tmp_path: Path) -> None:
+        """Ensure the nearest directory with a `pyproject.toml` file is the root."""
+        (tmp_path / "pyproject.toml").write_text("")
+        (tmp_path / "package" / "nested").mkdir(parents=True)
+
+        assert find_project_root(str(tmp_path / "package" / "nested")) == str(tmp_path)
+
+    def test_git_marker(self, tmp_path: Path) -> None:
+        """Ensure the nearest directory with a `.git` directory is the root."""
+        (tmp_path / ".git").mkdir()
+        (tmp_path / "package").mkdir()
+
+        assert find_project_root(str(tmp_path / "package")) == str(tmp_path)
+
+    def test_no_project(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Ensure the starting directory is used when it is not within any project."""
+        monkeypatch.setattr("os.path.exists", lambda _path: False)
+
+        assert find_project_root(str(tmp_path)) == str(tmp_path)
+
+    def test_socket_within_project_root(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Ensure the default socket path is the same from anywhere within the project."""
+        (tmp_path / "pyproject.toml").write_text("")
+        (tmp_path / "package").mkdir()
+        monkeypatch.chdir(tmp_path / "package")
+
+        assert get_default_socket_path() == str(
+            tmp_path / ".flake8_carrot_cache" / "daemon.sock"
+        )
@@ -0,0 +1,98 @@
+"""Test suite to check scheduling batch linting from each file's size & historical cost."""
+
+import os
+from typing import TYPE_CHECKING
+
+from flake8_carrot.batch import lint_paths
+from flake8_carrot.scheduling import CostScheduler, CriticalPathReport
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from pathlib import Path
+
+__all__: Sequence[str] = ("TestCostScheduler",)
+
+
+def _write_source(tmp_path: Path, name: str, lines_count: int) -> str:
+    path: Path = tmp_path / name
+    path.write_text('import re\n\nre.search("\\\\d", value)\n' * lines_count)
+    return str(path)
+
+
+class TestCostScheduler:
+    """Test suite for ordering files longest-first & reporting the critical path."""
+
+    def test_largest_first_without_history(self, tmp_path: Path) -> None:
+        """Ensure files without a recorded cost are ordered from the largest to smallest."""
+        small_path: str = _write_source(tmp_path, "small.py", 1)
+        large_path: str = _write_source(tmp_path, "large.py", 50)
+        medium_path: str = _write_source(tmp_path, "medium.py", 10)
+
+        assert [
+            path
+            for chunk in CostScheduler().make_chunks(
+                (small_path, large_path, medium_path), workers_count=1
+            )
+            for path in chunk
+        ] == [large_path, medium_path, small_path]
+
+    def test_history_preferred_over_size(self, tmp_path: Path) -> None:
+        """Ensure a small file that was slow to lint is scheduled before a larger one."""
+        slow_path: str = _write_source(tmp_path, "slow.py", 1)
+        large_path: str = _write_source(tmp_path, "large.py", 10)
+
+        scheduler: CostScheduler = CostScheduler(
+            {
+                os.path.abspath(slow_path): (os.stat(slow_path).st_size, 5.0),  # noqa: PTH100, PTH116
+                os.path.abspath(large_path): (os.stat(large_path).st_size, 0.1),  # noqa: PTH100, PTH116
+            },
+        )
+
+        assert next(scheduler.make_chunks((large_path, slow_path), workers_count=2)) == [
+            slow_path
+        ]
+
+    def test_costs_saved_and_loaded(self, tmp_path: Path) -> None:
+        """Ensure the costs recorded while linting are stored in the cache directory."""
+        paths: Sequence[str] = [
+            _write_source(tmp_path, f"module_{index}.py", index + 1) for index in range(3)
+        ]
+        cache_directory: Path = tmp_path / "cache"
+        scheduler: CostScheduler = CostScheduler.load(cache_directory)
+
+        assert sorted(
+            path for path, _ in lint_paths(paths, max_workers=1, scheduler=scheduler)
+        ) == sorted(paths)
+
+        scheduler.save()
+
+        assert (cache_directory / ".gitignore").read_text() == "*\n"
+        assert CostScheduler.load(cache_directory)._costs.keys() == {  # noqa: SLF001
+            os.path.abspath(path)  # noqa: PTH100
+            for path in paths
+        }
+
+    def test_invalid_costs_file_ignored(self, tmp_path: Path) -> None:
+        """Ensure an unreadable costs file is treated the same as having no history."""
+        (tmp_path / "costs.json").write_text("{not json")
+
+        assert not CostScheduler.load(tmp_path)._costs  # noqa: SLF001
+
+    def test_critical_path_reported(self) -> None:
+        """Ensure the busiest worker's longest files are reported as the critical path."""
+        scheduler: CostScheduler = CostScheduler()
+        scheduler.record("a.py", 3.0, "worker-1")
+        scheduler.record("b.py", 0.5, "worker-2")
+        scheduler.record("c.py", 0.5, "worker-2")
+
+        report: CriticalPathReport = scheduler.report(wall_time=3.1, workers_count=2)
+
+        assert report == CriticalPathReport(
+            wall_time=3.1,
+            total_cost=4.0,
+            workers_count=2,
+            critical_worker_cost=3.0,
+            critical_paths=[("a.py", 3.0)],
+        )
+        assert report.dominated
+        assert "a.py" in report.format()
@@ -0,0 +1,196 @@
+"""Test suite to check linting many sources through a long-lived session."""
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from flake8_carrot import CarrotPlugin, LintSession
+from flake8_carrot.carrot import RuleCAR120
+from flake8_carrot.session import LintCancelledError, StatementProblemsCache
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from pathlib import Path
+
+    from flake8_carrot import Problem
+
+__all__: Sequence[str] = ("TestLintSession", "TestStatementProblemsCache")
+
+
+SOURCE: str = 'import re\n\nre.search("\\\\d", value)  #noqa: CAR610\n'
+STATEMENTS_SOURCE: str = (
+    '"""Module."""\n\nimport re\n\n__all__ = ()\n\n\n'
+    'FIRST = re.compile("\\\\d")\n\n'
+    "@decorator\n"
+    'def second() -> None:\n    re.search("\\\\w", value)\n\n'
+    'third = 1; re.search("\\\\s", value)\n'
+)
+
+
+class TestLintSession:
+    """Test suite for returning problem records from a session's warm caches."""
+
+    def test_problems_match_plugin(self) -> None:
+        """Ensure the session reports the same problems as running the plugin directly."""
+        assert sorted(
+            (problem.line, problem.column - 1, f"{problem.code} {problem.message}")
+            for problem in LintSession((CarrotPlugin,)).lint_source(SOURCE, "module.py")
+        ) == sorted(
+            (line, column, text)
+            for line, column, text, _ in CarrotPlugin.from_source(SOURCE).run()
+        )
+
+    def test_cached_problems_relabelled(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Ensure an unchanged source is not linted again, but takes each given filename."""
+        lint_session: LintSession = LintSession()
+        first_problems: Sequence[Problem] = lint_session.lint_source(SOURCE, "first.py")
+
+        monkeypatch.setattr(CarrotPlugin, "from_source", None)
+        second_problems: Sequence[Problem] = lint_session.lint_source(SOURCE, "second.py")
+
+        assert first_problems
+        assert {problem.filename for problem in second_problems} == {"second.py"}
+        assert [problem._replace(filename="first.py") for problem in second_problems] == (
+            first_problems
+        )
+
+    def test_result_cache_bounded(self) -> None:
+        """Ensure only the most recently linted sources are kept in the result cache."""
+        lint_session: LintSession = LintSession(result_cache_size=2)
+
+        index: int
+        for index in range(5):
+            lint_session.lint_source(f"{SOURCE}value_{index} = {index}\n")
+
+        assert len(lint_session._result_cache) == 2  # noqa: SLF001
+
+    def test_noqa_spans_multi_line_string(self) -> None:
+        """Ensure a `# noqa` comment applies to every line of the string before it."""
+        source: str = 'import re\n\nre.search("""\\\\d\n""", value)  # noqa: CAR610\n'
+
+        assert "CAR610" not in {problem.code for problem in LintSession().lint_source(source)}
+        assert "CAR610" in {
+            problem.code for problem in LintSession(disable_noqa=True).lint_source(source)
+        }
+
+    def test_syntax_error(self) -> None:
+        """Ensure a source that cannot be parsed is reported as a single E999 problem."""
+        problems: Sequence[Problem] = LintSession().lint_source("value = (\n", "broken.py")
+
+        assert len(problems) == 1
+        assert problems[0].code == "E999"
+        assert problems[0].format().startswith("broken.py:1:")
+
+    @pytest.mark.parametrize(
+        ("select", "ignore", "expected_codes"),
+        (
+            (None, None, {"CAR101", "CAR120", "CAR610"}),
+            (["CAR12"], None, {"CAR120"}),
+            (None, ["CAR6"], {"CAR101", "CAR120"}),
+            (["CAR"], ["CAR120"], {"CAR101", "CAR610"}),
+        ),
+    )
+    def test_rule_selection(
+        self,
+        select: Sequence[str] | None,
+        ignore: Sequence[str] | None,
+        expected_codes: set[str],
+    ) -> None:
+        """Ensure only the rules chosen by the select & ignore codes are run."""
+        lint_session: LintSession = LintSession(select=select, ignore=ignore)
+
+        assert (RuleCAR120 in lint_session.rules[CarrotPlugin]) is ("CAR120" in expected_codes)
+        assert {problem.code for problem in lint_session.lint_source(SOURCE)} == (
+            expected_codes
+        )
+
+    def test_preamble_file(self, tmp_path: Path) -> None:
+        """Ensure only the selected module-header problems of a preamble are reported."""
+        (tmp_path / "module.py").write_text(
+            f'import os\n\nVERSION = "1.0"\n__all__ = ("VERSION",)\n{SOURCE}', encoding="utf-8"
+        )
+
+        assert [
+            (problem.line, problem.code)
+            for problem in LintSession().lint_preamble_file(tmp_path / "module.py")
+        ] == [(3, "CAR105"), (5, "CAR110")]
+        assert [
+            problem.code
+            for problem in LintSession(ignore=["CAR105"]).lint_preamble_file(
+                tmp_path / "module.py"
+            )
+        ] == ["CAR110"]
+
+    def test_preamble_file_noqa(self, tmp_path: Path) -> None:
+        """Ensure a `# noqa` comment within the preamble applies to its problems."""
+        (tmp_path / "module.py").write_text(
+            "import os  # noqa: CAR101\n\nvalue = 1\n", encoding="utf-8"
+        )
+
+        assert not LintSession().lint_preamble_file(tmp_path / "module.py")
+
+    def test_preamble_file_syntax_error(self, tmp_path: Path) -> None:
+        """Ensure a preamble that cannot be parsed is reported as a single E999 problem."""
+        (tmp_path / "broken.py").write_text("import os\nvalue = (\n", encoding="utf-8")
+        problems: Sequence[Problem] = LintSession().lint_preamble_file(tmp_path / "broken.py")
+
+        assert [(problem.line, problem.code) for problem in problems] == [(2, "E999")]
+        assert problems[0].filename == str(tmp_path / "broken.py")
+
+
+class TestStatementProblemsCache:
+    """Test suite for relinting only the changed statements of an edited document."""
+
+    def test_problems_match_full_lint(self) -> None:
+        """Ensure linting statement by statement reports the same problems as a full lint."""
+        lint_session: LintSession = LintSession(result_cache_size=0)
+        statement_cache: StatementProblemsCache = StatementProblemsCache()
+
+        assert lint_session.lint_source(
+            STATEMENTS_SOURCE, statement_cache=statement_cache
+        ) == lint_session.lint_source(STATEMENTS_SOURCE)
+        assert statement_cache.linted_statements_count == 6
+
+    def test_only_changed_statements_linted(self) -> None:
+        """Ensure an edit reruns the statement rules on only the statements it changed."""
+        lint_session: LintSession = LintSession(result_cache_size=0)
+        statement_cache: StatementProblemsCache = StatementProblemsCache()
+        lint_session.lint_source(STATEMENTS_SOURCE, statement_cache=statement_cache)
+
+        edited_source: str = STATEMENTS_SOURCE.replace('"\\\\w"', 'r"\\w"')
+        problems: Sequence[Problem] = lint_session.lint_source(
+            edited_source, statement_cache=statement_cache
+        )
+        assert statement_cache.linted_statements_count == 1
+        assert problems == lint_session.lint_source(edited_source)
+        assert 12 not in {problem.line for problem in problems if problem.code == "CAR610"}
+
+    def test_moved_statements_reused(self) -> None:
+        """Ensure statements moved by lines added above them are not linted again."""
+        lint_session: LintSession = LintSession(result_cache_size=0)
+        statement_cache: StatementProblemsCache = StatementProblemsCache()
+        lint_session.lint_source(STATEMENTS_SOURCE, statement_cache=statement_cache)
+
+        moved_source: str = STATEMENTS_SOURCE.replace("\n\n\nFIRST", "\n\n\n\n\n\nFIRST")
+        problems: Sequence[Problem] = lint_session.lint_source(
+            moved_source, statement_cache=statement_cache
+        )
+        assert statement_cache.linted_statements_count == 0
+        assert problems == lint_session.lint_source(moved_source)
+
+    def test_syntax_error(self) -> None:
+        """Ensure a document that cannot be parsed is still reported as an E999 problem."""
+        problems: Sequence[Problem] = LintSession().lint_source(
+            "value = (\n", statement_cache=StatementProblemsCache()
+        )
+
+        assert [problem.code for problem in problems] == ["E999"]
+
+    def test_cancelled(self) -> None:
+        """Ensure a cancelled lint raises, rather than returning partial problems."""
+        with pytest.raises(LintCancelledError):
+            LintSession().lint_source(
+                STATEMENTS_SOURCE,
+                statement_cache=StatementProblemsCache(),
+                is_cancelled=lambda: True,
+            )
@@ -0,0 +1,227 @@
+"""Test suite to check linting the staged versions of changed files."""
+
+import shutil
+import subprocess
+from typing import TYPE_CHECKING
+
+import pytest
+
+from flake8_carrot import LintSession, staged
+from flake8_carrot.cli import main
+from flake8_carrot.staged import (
+    BlobProblemsCache,
+    BlobReader,
+    lint_staged_files,
+    list_staged_files,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from pathlib import Path
+
+    from flake8_carrot.batch import FileProblems
+    from flake8_carrot.staged import StagedFile
+
+__all__: Sequence[str] = ("TestBlobReader", "TestLintStagedFiles", "TestMain")
+
+
+GIT_EXECUTABLE: str = shutil.which("git") or "git"
+CLEAN_SOURCE: str = '"""Docstring."""\n\n__all__ = ()\n'
+PROBLEM_SOURCE: str = 'import re\n\nre.search("\\\\d", value)\n'
+
+pytestmark: pytest.MarkDecorator = pytest.mark.skipif(
+    shutil.which(GIT_EXECUTABLE) is None, reason="Git is not installed."
+)
+
+
+def _git(repository: Path, arguments: Sequence[str]) -> str:
+    return subprocess.run(
+        (
+            GIT_EXECUTABLE,
+            "-c",
+            "user.name=Test",
+            "-c",
+            "user.email=test@example.com",
+            *arguments,
+        ),
+        cwd=repository,
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+
+
+@pytest.fixture()
+def repository(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Create an empty Git repository & make it the working directory."""
+    _git(tmp_path, ("init", "--quiet"))
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+class TestLintStagedFiles:
+    """Test suite for linting the staged blobs, rather than the working tree."""
+
+    def test_staged_version_linted(self, repository: Path) -> None:
+        """Ensure the staged version of each file is linted, ignoring unstaged changes."""
+        (repository / "unchanged.py").write_text(PROBLEM_SOURCE)
+        _git(repository, ("add", "unchanged.py"))
+        _git(repository, ("commit", "--quiet", "-m", "Initial commit"))
+
+        (repository / "problem.py").write_text(PROBLEM_SOURCE)
+        (repository / "fixed.py").write_text(PROBLEM_SOURCE)
+        (repository / "notes.txt").write_text(PROBLEM_SOURCE)
+        _git(repository, ("add", "problem.py", "fixed.py", "notes.txt"))
+        (repository / "problem.py").write_text(CLEAN_SOURCE)
+
+        file_problems: Sequence[FileProblems] = sorted(
+            lint_staged_files(LintSession(select=("CAR6",)))
+        )
+
+        assert [
+            (path, [problem.code for problem in problems]) for path, problems in file_problems
+        ] == [("fixed.py", ["CAR610"]), ("problem.py", ["CAR610"])]
+
+    def test_before_first_commit(self, repository: Path) -> None:
+        """Ensure files staged before the first commit are listed."""
+        (repository / "package").mkdir()
+        (repository / "package" / "module.py").write_text(CLEAN_SOURCE)
+        _git(repository, ("add", "package"))
+
+        assert [path for path, _ in list_staged_files()] == ["package/module.py"]
+
+    def test_excludes_honoured(self, repository: Path) -> None:
+        """Ensure staged files matching an exclude pattern are not linted."""
+        (repository / "examples").mkdir()
+        (repository / "examples" / "example.py").write_text(PROBLEM_SOURCE)
+        (repository / "module.py").write_text(PROBLEM_SOURCE)
+        _git(repository, ("add", "."))
+
+        assert [
+            path
+            for path, _ in lint_staged_files(
+                LintSession(), exclude_patterns=(str(repository / "examples"),)
+            )
+        ] == ["module.py"]
+
+    def test_cached_by_blob_id(self, repository: Path) -> None:
+        """Ensure identical staged blobs are only linted once, keyed by their blob ID."""
+        (repository / "first.py").write_text(PROBLEM_SOURCE)
+        (repository / "second.py").write_text(PROBLEM_SOURCE)
+        _git(repository, ("add", "."))
+
+        staged_files: Sequence[StagedFile] = list_staged_files()
+        assert staged_files[0].blob_id == staged_files[1].blob_id
+
+        lint_session: LintSession = LintSession()
+        file_problems: Sequence[FileProblems] = list(lint_staged_files(lint_session))
+
+        assert file_problems[0].problems[0].code == file_problems[1].problems[0].code
+        assert (
+            lint_session.get_cached_problems(
+                f"git-blob:{staged_files[0].blob_id}".encode(), "cached.py"
+            )
+            is not None
+        )
+
+    def test_blob_cache_persisted(
+        self, repository: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Ensure stored blob problems are reused by a later run with the same fingerprint."""
+        (repository / "problem.py").write_text(PROBLEM_SOURCE)
+        _git(repository, ("add", "."))
+        cache_directory: Path = repository / ".cache"
+
+        lint_session: LintSession = LintSession(select=("CAR6",))
+        first_file_problems: Sequence[FileProblems] = list(
+            lint_staged_files(
+                lint_session,
+                blob_cache=BlobProblemsCache.load(lint_session.fingerprint, cache_directory),
+            ),
+        )
+
+        monkeypatch.setattr(staged, "BlobReader", None)
+        lint_session = LintSession(select=("CAR6",))
+
+        assert (
+            list(
+                lint_staged_files(
+                    lint_session,
+                    blob_cache=BlobProblemsCache.load(
+                        lint_session.fingerprint, cache_directory
+                    ),
+                ),
+            )
+            == first_file_problems
+        )
+        assert (
+            BlobProblemsCache.load(
+                LintSession(select=("CAR1",)).fingerprint, cache_directory
+            ).get(list_staged_files()[0].blob_id, "problem.py")
+            is None
+        )
+
+
+class TestBlobReader:
+    """Test suite for reading blobs through a long-lived `git cat-file` process."""
+
+    def test_blobs_read(self, repository: Path) -> None:
+        """Ensure each blob's exact contents are read, & missing blobs raise an error."""
+        blob_ids: Sequence[str] = [
+            subprocess.run(
+                (GIT_EXECUTABLE, "hash-object", "-w", "--stdin"),
+                cwd=repository,
+                input=contents,
+                capture_output=True,
+                check=True,
+            )
+            .stdout.decode()
+            .strip()
+            for contents in (b"", b"first\n", b"\xff" * 100_000)
+        ]
+
+        blob_reader: BlobReader = BlobReader()
+        try:
+            assert [blob_reader.read(blob_id) for blob_id in blob_ids] == [
+                b"",
+                b"first\n",
+                b"\xff" * 100_000,
+            ]
+
+            with pytest.raises(FileNotFoundError):
+                blob_reader.read("0" * len(blob_ids[0]))
+        finally:
+            blob_reader.close()
+
+
+class TestMain:
+    """Test suite for the command-line linter's staged mode."""
+
+    def test_staged(self, repository: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """Ensure only the staged problems are printed, with a failing exit status."""
+        (repository / "problem.py").write_text(PROBLEM_SOURCE)
+        _git(repository, ("add", "problem.py"))
+        (repository / "unstaged.py").write_text(PROBLEM_SOURCE)
+
+        assert main(["--staged", "--select", "CAR6"]) == 1
+        assert capsys.readouterr().out == (
+            'problem.py:3:1: CAR610 Regex pattern string should use a raw string: `r"..."`\n'
+        )
+
+    def test_staged_cached_across_runs(
+        self,
+        repository: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Ensure a later run prints the stored problems without reading the blobs again."""
+        (repository / "problem.py").write_text(PROBLEM_SOURCE)
+        _git(repository, ("add", "problem.py"))
+
+        assert main(["--staged", "--select", "CAR6"]) == 1
+        first_output: str = capsys.readouterr().out
+
+        monkeypatch.setattr(staged, "BlobReader", None)
+
+        assert main(["--staged", "--select", "CAR6"]) == 1
+        assert capsys.readouterr().out == first_output
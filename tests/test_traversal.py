@@ -0,0 +1,156 @@
+"""Test suite to check the functionality of the iterative AST traversal engine."""
+
+import ast
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, override
+
+import pytest
+
+from flake8_carrot import CarrotPlugin
+from flake8_carrot.traversal import CHILD_FIELDS, TraversalEngine, TraversalSignal
+from tests._testing_utils import apply_plugin_to_ast
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+__all__: Sequence[str] = ("TestTraversalEngine",)
+
+
+class _RecordingVisitor(ast.NodeVisitor):
+    @override
+    def __init__(self) -> None:
+        self.visited_nodes: list[ast.AST] = []
+
+    @override
+    def generic_visit(self, node: ast.AST) -> None:
+        self.visited_nodes.append(node)
+        super().generic_visit(node)
+
+
+class _RecordingOwner:
+    @override
+    def __init__(self, skipped_node_type: type[ast.AST] | None = None) -> None:
+        self.skipped_node_type: type[ast.AST] | None = skipped_node_type
+        self.entered_nodes: list[ast.AST] = []
+        self.exited_nodes: list[ast.AST] = []
+
+    def register_traversal_hooks(self, engine: TraversalEngine) -> None:
+        node_type: type[ast.AST]
+        for node_type in CHILD_FIELDS:
+            engine.add_pre_hook(node_type, self._enter, owner=self)
+            engine.add_post_hook(node_type, self.exited_nodes.append, owner=self)
+
+    def _enter(self, node: ast.AST) -> TraversalSignal | None:
+        self.entered_nodes.append(node)
+
+        if self.skipped_node_type is not None and isinstance(node, self.skipped_node_type):
+            return TraversalSignal.SKIP_CHILDREN
+
+        return None
+
+
+class TestTraversalEngine:
+    """Test suite for the explicit-stack traversal engine."""
+
+    SOURCE: str = (
+        "import os\n"
+        "x: int = 3\n"
+        "def foo(a, *args, b=None, **kwargs):\n"
+        "    class Inner:\n"
+        "        y = {1: [a, b], **kwargs}\n"
+        "    return lambda z: (z, x) if a else None\n"
+        "match x:\n"
+        "    case [1, *rest] if rest:\n"
+        '        print(f"{rest!r:>10}")\n'
+    )
+
+    @pytest.mark.parametrize("compiled", (True, False))
+    def test_same_order_as_node_visitor(self, *, compiled: bool) -> None:
+        """Ensure nodes are entered in the same order as `ast.NodeVisitor` visits them."""
+        tree: ast.Module = ast.parse(self.SOURCE)
+
+        recording_visitor: _RecordingVisitor = _RecordingVisitor()
+        recording_visitor.visit(tree)
+
+        recording_owner: _RecordingOwner = _RecordingOwner()
+        engine: TraversalEngine = TraversalEngine(compiled=compiled)
+        recording_owner.register_traversal_hooks(engine)
+        engine.traverse(tree)
+
+        assert recording_owner.entered_nodes == recording_visitor.visited_nodes
+        assert recording_owner.exited_nodes[-1] is tree
+        assert len(recording_owner.exited_nodes) == len(recording_owner.entered_nodes)
+
+    @pytest.mark.parametrize("compiled", (True, False))
+    def test_skip_children_only_affects_owner(self, *, compiled: bool) -> None:
+        """Ensure skipping children only stops the hooks of the owner that requested it."""
+        tree: ast.Module = ast.parse(self.SOURCE)
+
+        skipping_owner: _RecordingOwner = _RecordingOwner(skipped_node_type=ast.FunctionDef)
+        recording_owner: _RecordingOwner = _RecordingOwner()
+        engine: TraversalEngine = TraversalEngine(compiled=compiled)
+        skipping_owner.register_traversal_hooks(engine)
+        recording_owner.register_traversal_hooks(engine)
+        engine.traverse(tree)
+
+        assert not any(isinstance(node, ast.ClassDef) for node in skipping_owner.entered_nodes)
+        assert any(isinstance(node, ast.ClassDef) for node in recording_owner.entered_nodes)
+        assert any(isinstance(node, ast.FunctionDef) for node in skipping_owner.exited_nodes)
+        assert any(isinstance(node, ast.Match) for node in skipping_owner.entered_nodes)
+
+    @pytest.mark.parametrize("module_name", ("ast", "dataclasses", "typing", "asyncio.tasks"))
+    def test_compiled_traversal_parity(self, module_name: str) -> None:
+        """Ensure the generated traversal calls the same hooks as the interpreted traversal."""
+        module_path: Path = (
+            Path(ast.__file__).parent.joinpath(*module_name.split(".")).with_suffix(".py")
+        )
+        tree: ast.Module = ast.parse(module_path.read_text(encoding="utf-8"))
+
+        recorded_nodes: list[tuple[list[ast.AST], list[ast.AST]]] = []
+        compiled: bool
+        for compiled in (True, False):
+            skipping_owner: _RecordingOwner = _RecordingOwner(skipped_node_type=ast.ClassDef)
+            recording_owner: _RecordingOwner = _RecordingOwner()
+            engine: TraversalEngine = TraversalEngine(compiled=compiled)
+            skipping_owner.register_traversal_hooks(engine)
+            recording_owner.register_traversal_hooks(engine)
+            engine.traverse(tree)
+
+            recorded_nodes.extend(
+                (
+                    (skipping_owner.entered_nodes, skipping_owner.exited_nodes),
+                    (recording_owner.entered_nodes, recording_owner.exited_nodes),
+                )
+            )
+
+        assert recorded_nodes[:2] == recorded_nodes[2:]
+
+    def test_compiled_traversal_cached_to_disk(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Ensure the generated traversal code is cached within the `__pycache__` directory."""
+        monkeypatch.setattr(sys, "pycache_prefix", str(tmp_path))
+        monkeypatch.setattr(sys, "dont_write_bytecode", False)
+
+        recording_owner: _RecordingOwner = _RecordingOwner()
+        engine: TraversalEngine = TraversalEngine()
+        engine.add_pre_hook(ast.Nonlocal, recording_owner.entered_nodes.append, owner=self)
+        engine.add_pre_hook(ast.Global, recording_owner.entered_nodes.append, owner=self)
+        engine.traverse(ast.parse("def foo():\n    global x\n    nonlocal y\n"))
+
+        assert len(recording_owner.entered_nodes) == 2
+        assert any(tmp_path.rglob(f"traversal-*.{sys.implementation.cache_tag}.bin"))
+
+    @pytest.mark.parametrize("elif_count", (1_000, 5_000))
+    def test_deeply_nested_tree_does_not_recurse(self, elif_count: int) -> None:
+        """Ensure a very long `elif` chain does not raise a `RecursionError`."""
+        raw_test_ast: str = (
+            '"""Generated module."""\n\n'
+            "from collections.abc import Sequence\n\n"
+            "__all__: Sequence[str] = ()\n\n\n"
+            "if x == 0:\n    pass\n"
+            + "".join(f"elif x == {index}:\n    pass\n" for index in range(1, elif_count))
+        )
+
+        assert not apply_plugin_to_ast(raw_test_ast, CarrotPlugin)
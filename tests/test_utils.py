@@ -0,0 +1,304 @@
+"""Test suite to check the functionality of the shared utility classes."""
+
+import argparse
+import ast
+import concurrent.futures
+import inspect
+import json.decoder
+import logging
+import tokenize
+import tracemalloc
+from io import StringIO
+from typing import TYPE_CHECKING
+
+import pytest
+
+from flake8_carrot import CarrotPlugin
+from flake8_carrot.carrot import RuleCAR120, RuleCAR121, RuleCAR170, RuleCAR610
+from flake8_carrot.utils import RuleInput, RulePool, get_source_segment
+from tests._testing_utils import apply_plugin_to_ast
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+    from collections.abc import Set as AbstractSet
+    from typing import ClassVar
+
+    from flake8_carrot.utils import BaseRule
+
+__all__: Sequence[str] = ("TestFromSource", "TestInputLifecycle", "TestRulePool")
+
+
+SOURCE: str = 'import re\n\nre.search("\\\\d", value)  #noqa: CAR610\n'
+OTHER_SOURCE: str = 'import re\n\nre.match(r"\\d", value)\n'
+SEGMENTS_SOURCE: str = (
+    'café = re.compile("a+")\n'
+    "values = [\n"
+    '    "naïve",\n'
+    '    f"{café!r}",\n'
+    "]\n"
+    "result = re.search(\n"
+    '    values[0], "naïve"\n'
+    ")\n"
+)
+# NOTE: Triggers most of the rules, so that each of their inputs is built from the source
+RULES_SOURCE: str = (
+    '"""Module docstring."""\n'
+    "import abc\n"
+    "import logging\n"
+    "import re\n"
+    "from dataclasses import dataclass\n"
+    "\n"
+    "import discord\n"
+    "from astpretty import pprint\n"
+    '__all__ = ["Foo", "Base"]\n'
+    '__all__ = ["Data"]\n'
+    "value = 1\n"
+    'log = logging.getLogger("x")\n'
+    "value = 1  #type: ignore\n"
+    "value = 2  # noqa: E501,  # type: ignore\n"
+    "value = 3  # noqa: E501  # type: ignore\n"
+    "value = 4  # type: ignore  # note\n"
+    "value = 5  # noinspection PyUnusedLocal\n"
+    "value = 6  # noqa: E501,\n"
+    'text = "a".strip().strip()\n'
+    '"a".upper()\n'
+    "isinstance(value, int | str)\n"
+    're.match("a", text)\n'
+    're.search(r"^a$", text)\n'
+    're.search("\\\\d", text)\n'
+    "pprint(value)\n"
+    "\n"
+    "\n"
+    "@dataclass\n"
+    "class Data:\n"
+    "    value: int\n"
+    "\n"
+    "\n"
+    "class Base(abc.ABC):\n"
+    "    @classproperty\n"
+    "    def name(cls) -> str:\n"
+    '        return ""\n'
+    "\n"
+    "    @abc.abstractmethod\n"
+    "    def method(self) -> None:\n"
+    "        return None\n"
+    "\n"
+    "    def __init__(self, *args: object) -> None:\n"
+    "        super().__init__(*args)\n"
+    "        if value == 1 or value == 2 or value == 3:\n"
+    "            pass\n"
+    "\n"
+    "\n"
+    "def make() -> None:\n"
+    "    class Inner:\n"
+    "        pass\n"
+    "\n"
+    "\n"
+    "class Foo(discord.Cog):\n"
+    '    @discord.slash_command(name="Bad_Name!", description="No full stop")\n'
+    '    @discord.option(name="Opt", description="Also none")\n'
+    "    async def command(self, ctx: object) -> None: ...\n"
+    "\n"
+    '    @discord.user_command(name="lowercase")\n'
+    "    async def user(self, ctx: object) -> None: ...\n"
+)
+LARGE_SOURCE_SIZE: int = 10 * 1024 * 1024
+
+
+def _make_carrot_plugin(source: str) -> CarrotPlugin:
+    return CarrotPlugin(
+        tree=ast.parse(source),
+        file_tokens=list(tokenize.generate_tokens(StringIO(source).readline)),
+        lines=source.splitlines(keepends=True),
+    )
+
+
+class _LinesOnlyRuleCAR170(RuleCAR170):
+    REQUIRED_INPUTS: ClassVar[AbstractSet[RuleInput]] = frozenset({RuleInput.LINES})
+
+
+class TestRulePool:
+    """Test suite for reusing rule instances across the linting of many files."""
+
+    def test_rule_reused_after_release(self) -> None:
+        """Ensure a released rule instance is handed out again, rather than recreated."""
+        rule_pool: RulePool = RulePool()
+        rule: BaseRule[CarrotPlugin] = rule_pool.acquire(
+            RuleCAR120, plugin=_make_carrot_plugin(SOURCE)
+        )
+        rule_pool.release((rule,))
+
+        assert rule_pool.acquire(RuleCAR120, plugin=_make_carrot_plugin(SOURCE)) is rule
+        assert rule_pool.acquire(RuleCAR120, plugin=_make_carrot_plugin(SOURCE)) is not rule
+
+    def test_reset_clears_per_file_state(self) -> None:
+        """Ensure a reused rule carries no problems or state over from its previous file."""
+        rule_pool: RulePool = RulePool()
+        plugin: CarrotPlugin = _make_carrot_plugin(SOURCE)
+        rule: BaseRule[CarrotPlugin] = rule_pool.acquire(RuleCAR610, plugin=plugin)
+        rule.problems.add_without_ctx((1, 0))
+        rule_pool.release((rule,))
+
+        other_plugin: CarrotPlugin = _make_carrot_plugin(OTHER_SOURCE)
+        reused_rule: BaseRule[CarrotPlugin] = rule_pool.acquire(
+            RuleCAR610, plugin=other_plugin
+        )
+
+        assert reused_rule is rule
+        assert reused_rule.plugin is other_plugin
+        assert not reused_rule.problems
+
+    def test_shared_between_threads(self) -> None:
+        """Ensure threads racing for the last idle rule each still acquire an instance."""
+        rule_pool: RulePool = RulePool()
+        plugin: CarrotPlugin = _make_carrot_plugin(SOURCE)
+        rule_pool.release((rule_pool.acquire(RuleCAR120, plugin=plugin),))
+
+        def _acquire_repeatedly() -> None:
+            for _ in range(2000):
+                rule_pool.release((rule_pool.acquire(RuleCAR120, plugin=plugin),))
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+            futures: Sequence[concurrent.futures.Future[None]] = [
+                executor.submit(_acquire_repeatedly) for _ in range(8)
+            ]
+
+        future: concurrent.futures.Future[None]
+        for future in futures:
+            future.result()
+
+    def test_repeated_runs_report_identical_problems(self) -> None:
+        """Ensure linting with pooled rule instances gives the same results every time."""
+        first_problems: Sequence[tuple[int, int, str]] = [
+            (line, column, message)
+            for line, column, message, _ in _make_carrot_plugin(SOURCE).run()
+        ]
+        list(_make_carrot_plugin(OTHER_SOURCE).run())
+
+        assert first_problems
+        assert [
+            (line, column, message)
+            for line, column, message, _ in _make_carrot_plugin(SOURCE).run()
+        ] == first_problems
+
+    def test_interleaved_runs_do_not_share_rules(self) -> None:
+        """Ensure two files being linted at the same time never share a rule instance."""
+        first_run: Iterator[tuple[int, int, str, type[CarrotPlugin]]] = _make_carrot_plugin(
+            SOURCE
+        ).run()
+        first_problem: tuple[int, int, str, type[CarrotPlugin]] = next(first_run)
+        other_problems: Sequence[tuple[int, int, str, type[CarrotPlugin]]] = list(
+            _make_carrot_plugin(OTHER_SOURCE).run()
+        )
+
+        assert [first_problem, *first_run] == list(_make_carrot_plugin(SOURCE).run())
+        assert other_problems == list(_make_carrot_plugin(OTHER_SOURCE).run())
+
+
+def _raise_not_built(_source: object) -> object:
+    INPUT_BUILT_MESSAGE: str = "This input should not have been built."
+    raise AssertionError(INPUT_BUILT_MESSAGE)
+
+
+class TestFromSource:
+    """Test suite for linting raw source, building only the inputs that rules require."""
+
+    def test_problems_match_given_inputs(self) -> None:
+        """Ensure linting from the source reports the same problems as from all inputs."""
+        assert list(CarrotPlugin.from_source(SOURCE).run()) == list(
+            _make_carrot_plugin(SOURCE).run()
+        )
+
+    @pytest.mark.parametrize(
+        "source",
+        (
+            RULES_SOURCE,
+            *(
+                inspect.getsource(module)
+                for module in (argparse, ast, inspect, json.decoder, logging)
+            ),
+        ),
+        ids=("rules", "argparse", "ast", "inspect", "json.decoder", "logging"),
+    )
+    def test_matches_flake8_inputs(self, source: str) -> None:
+        """Ensure every rule reports the same problems from the source as through Flake8."""
+        assert {
+            f"{line}:{column + 1} {message}"
+            for line, column, message, _ in CarrotPlugin.from_source(source).run()
+        } == apply_plugin_to_ast(source, CarrotPlugin)
+
+    def test_token_rules_skip_parsing(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Ensure the source is never parsed when only token-based rules are enabled."""
+        monkeypatch.setattr(CarrotPlugin, "_enabled_rules", (RuleCAR120, RuleCAR121))
+        monkeypatch.setattr(ast, "parse", _raise_not_built)
+
+        assert list(CarrotPlugin.from_source("value = 1  #type: ignore\n").run())
+
+    def test_tree_rules_skip_tokenizing(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Ensure the source is never tokenized when only AST-based rules are enabled."""
+        monkeypatch.setattr(CarrotPlugin, "_enabled_rules", (RuleCAR170,))
+        monkeypatch.setattr(tokenize, "generate_tokens", _raise_not_built)
+
+        assert list(CarrotPlugin.from_source("isinstance(value, int | str)\n").run())
+
+    def test_hook_rule_without_tree_input(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Ensure the tree is built for a rule that registers hooks without declaring it."""
+        monkeypatch.setattr(CarrotPlugin, "_enabled_rules", (_LinesOnlyRuleCAR170,))
+
+        assert list(CarrotPlugin.from_source("isinstance(value, int | str)\n").run())
+
+    def test_missing_inputs(self) -> None:
+        """Ensure a plugin cannot be created without either all its inputs or the source."""
+        with pytest.raises(TypeError, match="without either all its inputs or the source"):
+            CarrotPlugin(tree=ast.parse(SOURCE), file_tokens=None, lines=())
+
+
+class TestInputLifecycle:
+    """Test suite for releasing each plugin's per-file inputs once no rule requires them."""
+
+    def test_inputs_released_after_run(self) -> None:
+        """Ensure the tree, tokens & lines are no longer held once the plugin has run."""
+        carrot_plugin: CarrotPlugin = _make_carrot_plugin(SOURCE)
+        list(carrot_plugin.run())
+
+        with pytest.raises(RuntimeError, match="already been released"):
+            _ = carrot_plugin.tree
+        with pytest.raises(RuntimeError, match="already been released"):
+            _ = carrot_plugin.file_tokens
+        with pytest.raises(RuntimeError, match="already been released"):
+            _ = carrot_plugin.lines
+
+    def test_get_source_segment(self) -> None:
+        """Ensure segments retrieved from the lines match those retrieved from the source."""
+        lines: Sequence[str] = SEGMENTS_SOURCE.splitlines(keepends=True)
+
+        node: ast.AST
+        for node in ast.walk(ast.parse(SEGMENTS_SOURCE)):
+            if isinstance(node, (ast.expr, ast.stmt)):
+                assert get_source_segment(lines, node) == ast.get_source_segment(
+                    SEGMENTS_SOURCE, node
+                )
+
+    def test_large_module_memory(self) -> None:
+        """Ensure linting a large module never copies its source, & then releases it."""
+        line: str = f're.search("{"a" * 1000}", value)\n'
+        source: str = "import re\n\n" + line * (LARGE_SOURCE_SIZE // len(line))
+
+        tracemalloc.start()
+        try:
+            carrot_plugin: CarrotPlugin = _make_carrot_plugin(source)
+            del source
+
+            baseline_bytes: int = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            problems_count: int = sum(
+                message.startswith("CAR610") for _, _, message, _ in carrot_plugin.run()
+            )
+            current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+
+        finally:
+            tracemalloc.stop()
+
+        assert problems_count == LARGE_SOURCE_SIZE // len(line)
+        assert peak_bytes - baseline_bytes < LARGE_SOURCE_SIZE // 2
+        assert baseline_bytes - current_bytes > LARGE_SOURCE_SIZE
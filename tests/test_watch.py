@@ -0,0 +1,230 @@
+"""Test suite to check relinting source files as they change."""
+
+import sys
+from typing import TYPE_CHECKING, override
+
+import pytest
+
+from flake8_carrot import LintSession, watch
+from flake8_carrot.cli import main
+from flake8_carrot.watch import (
+    BaseWatcher,
+    InotifyWatcher,
+    PollingWatcher,
+    create_watcher,
+    watch_source_files,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator, Sequence
+    from collections.abc import Set as AbstractSet
+    from pathlib import Path
+
+    from _pytest.capture import CaptureResult
+    from _pytest.mark import ParameterSet
+
+    from flake8_carrot.watch import WatchReport
+
+__all__: Sequence[str] = ("TestMain", "TestWatchSourceFiles", "TestWatchers")
+
+
+CLEAN_SOURCE: str = 'import re\n\nre.search(r"\\d", value)\n'
+PROBLEM_SOURCE: str = 'import re\n\nre.search("\\\\d", value)\n'
+
+
+class _ScriptedWatcher(BaseWatcher):
+    """Watcher that reports each of the given changes in turn, then interrupts."""
+
+    @override
+    def __init__(self, changes: Iterable[AbstractSet[str] | None]) -> None:
+        self._changes: Iterator[AbstractSet[str] | None] = iter(changes)
+        self.watched_directories: set[str] = set()
+
+    @override
+    def watch(self, directories: Iterable[str], files: Iterable[str]) -> None:
+        self.watched_directories.update(directories)
+
+    @override
+    def read_changes(self, timeout: float | None) -> AbstractSet[str] | None:
+        if timeout is not None:
+            return frozenset()
+
+        try:
+            return next(self._changes)
+        except StopIteration:
+            raise KeyboardInterrupt from None
+
+    @override
+    def close(self) -> None:
+        pass
+
+
+def _format_report(report: WatchReport) -> tuple[Sequence[str], Sequence[str]]:
+    return (
+        [f"{problem.filename}:{problem.code}" for problem in report.added_problems],
+        [f"{problem.filename}:{problem.code}" for problem in report.resolved_problems],
+    )
+
+
+WATCHER_FACTORIES: Sequence[ParameterSet] = (
+    pytest.param(
+        InotifyWatcher,
+        marks=pytest.mark.skipif(
+            not sys.platform.startswith("linux"), reason="inotify is only available on Linux."
+        ),
+        id="inotify",
+    ),
+    pytest.param(lambda: PollingWatcher(0.01), id="polling"),
+)
+
+
+class TestWatchers:
+    """Test suite for finding the paths changed within the watched directories."""
+
+    @pytest.mark.parametrize("make_watcher", WATCHER_FACTORIES)
+    def test_changes(self, tmp_path: Path, make_watcher: Callable[[], BaseWatcher]) -> None:
+        """Ensure modified, added & removed files are each reported by their path."""
+        (tmp_path / "modified.py").write_text(CLEAN_SOURCE)
+        (tmp_path / "removed.py").write_text(CLEAN_SOURCE)
+
+        watcher: BaseWatcher = make_watcher()
+        try:
+            watcher.watch((str(tmp_path),), (str(tmp_path / "modified.py"),))
+            assert watcher.read_changes(0.05) == frozenset()
+
+            (tmp_path / "modified.py").write_text(PROBLEM_SOURCE)
+            (tmp_path / "added.py").write_text(CLEAN_SOURCE)
+            (tmp_path / "removed.py").unlink()
+
+            changed_paths: set[str] = set()
+            while True:
+                more_changed_paths: AbstractSet[str] | None = watcher.read_changes(0.2)
+                assert more_changed_paths is not None
+                if not more_changed_paths:
+                    break
+
+                changed_paths.update(more_changed_paths)
+
+            assert changed_paths == {
+                str(tmp_path / "modified.py"),
+                str(tmp_path / "added.py"),
+                str(tmp_path / "removed.py"),
+            }
+
+        finally:
+            watcher.close()
+
+    def test_forced_polling(self) -> None:
+        """Ensure polling can be chosen even when inotify is available."""
+        assert isinstance(create_watcher(force_polling=True), PollingWatcher)
+
+    def test_invalid_poll_interval(self) -> None:
+        """Ensure polling without waiting between polls is rejected."""
+        with pytest.raises(ValueError, match="poll interval must be positive"):
+            PollingWatcher(0)
+
+
+class TestWatchSourceFiles:
+    """Test suite for relinting only the changed files & reporting their new problems."""
+
+    @pytest.mark.parametrize("make_watcher", WATCHER_FACTORIES)
+    def test_relinted(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        make_watcher: Callable[[], BaseWatcher],
+    ) -> None:
+        """Ensure each burst of changes reports only the problems that changed."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "first.py").write_text(PROBLEM_SOURCE)
+        (tmp_path / "second.py").write_text(CLEAN_SOURCE)
+
+        watcher: BaseWatcher = make_watcher()
+        reports: Iterator[WatchReport] = watch_source_files(
+            LintSession(select=("CAR610",)), ["."], watcher=watcher, debounce_seconds=0.1
+        )
+        try:
+            assert _format_report(next(reports)) == (["./first.py:CAR610"], [])
+
+            (tmp_path / "first.py").write_text(CLEAN_SOURCE)
+            (tmp_path / "second.py").write_text(PROBLEM_SOURCE)
+            report: WatchReport = next(reports)
+            assert report.linted_files_count == 2
+            assert _format_report(report) == (["./second.py:CAR610"], ["./first.py:CAR610"])
+
+            (tmp_path / "package").mkdir()
+            (tmp_path / "package" / "third.py").write_text(PROBLEM_SOURCE)
+            assert _format_report(next(reports)) == (["./package/third.py:CAR610"], [])
+
+            (tmp_path / "second.py").unlink()
+            assert _format_report(next(reports)) == ([], ["./second.py:CAR610"])
+
+        finally:
+            watcher.close()
+
+    def test_lost_changes(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Ensure every file is checked again if the watcher lost track of the changes."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "first.py").write_text(CLEAN_SOURCE)
+        (tmp_path / "ignored").mkdir()
+        (tmp_path / "ignored" / "second.py").write_text(CLEAN_SOURCE)
+
+        watcher: _ScriptedWatcher = _ScriptedWatcher((None,))
+        reports: Iterator[WatchReport] = watch_source_files(
+            LintSession(select=("CAR610",)), ["."], ["ignored"], watcher=watcher
+        )
+        assert _format_report(next(reports)) == ([], [])
+        assert watcher.watched_directories == {"."}
+
+        (tmp_path / "first.py").write_text(PROBLEM_SOURCE)
+        report: WatchReport = next(reports)
+        assert report.linted_files_count == 1
+        assert _format_report(report) == (["./first.py:CAR610"], [])
+
+    def test_unrelated_changes(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Ensure changes to files that are not linted neither relint nor walk anything."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "first.py").write_text(PROBLEM_SOURCE)
+
+        reports: Iterator[WatchReport] = watch_source_files(
+            LintSession(select=("CAR610",)),
+            ["."],
+            watcher=_ScriptedWatcher(({"notes.txt", "first.py.swp"},)),
+        )
+        next(reports)
+
+        (tmp_path / "notes.txt").write_text(PROBLEM_SOURCE)
+        assert next(reports).linted_files_count == 0
+
+
+class TestMain:
+    """Test suite for watching from the command-line linter."""
+
+    def test_watch(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Ensure the first problems are printed as usual, then each change as a delta."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "first.py").write_text(PROBLEM_SOURCE)
+
+        def _fix_first_file() -> Iterator[AbstractSet[str]]:
+            (tmp_path / "first.py").write_text(CLEAN_SOURCE)
+            yield {"first.py"}
+
+        def _make_watcher(*, force_polling: bool) -> BaseWatcher:
+            assert not force_polling
+            return _ScriptedWatcher(_fix_first_file())
+
+        monkeypatch.setattr(watch, "create_watcher", _make_watcher)
+
+        assert main(["--watch", "--select", "CAR610"]) == 0
+
+        captured: CaptureResult[str] = capsys.readouterr()
+        assert [line.split(" ", 2)[:2] for line in captured.out.splitlines()] == [
+            ["./first.py:3:1:", "CAR610"],
+            ["-", "./first.py:3:1:"],
+        ]
+        assert "1 files" in captured.err